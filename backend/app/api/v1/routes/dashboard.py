@@ -6,7 +6,7 @@ from typing import List
 
 from ....api.deps import db_session, current_user
 from ....models.users import User
-from ....services.data_retrieval import DataRetrievalService
+from ....services.data_retrieval import DashboardCacheService
 from ....schemas.dashboard import (
     DashboardAnalytics,
     ConflictHotspot,
@@ -24,8 +24,8 @@ async def get_dashboard_analytics(
     user: User = Depends(current_user),
 ):
     """Retrieve all dashboard analytics data in a single call."""
-    service = DataRetrievalService(db)
-    analytics_data = await service.get_dashboard_analytics(session_id)
+    service = DashboardCacheService(db)
+    analytics_data = await service.get(session_id, "analytics")
     if not analytics_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -41,8 +41,8 @@ async def get_dashboard_kpis(
     user: User = Depends(current_user),
 ):
     """Retrieve Key Performance Indicators for the dashboard."""
-    service = DataRetrievalService(db)
-    kpis = await service.get_dashboard_kpis(session_id)
+    service = DashboardCacheService(db)
+    kpis = await service.get(session_id, "kpis")
     if not kpis:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,8 +58,8 @@ async def get_conflict_hotspots(
     user: User = Depends(current_user),
 ):
     """Retrieve the top 5 time slots with the highest conflict density."""
-    service = DataRetrievalService(db)
-    hotspots = await service.get_conflict_hotspots(session_id)
+    service = DashboardCacheService(db)
+    hotspots = await service.get(session_id, "conflict_hotspots")
     if hotspots is None:
         # Return an empty list if no hotspots are found, which is a valid state
         return []
@@ -73,8 +73,8 @@ async def get_top_bottlenecks(
     user: User = Depends(current_user),
 ):
     """Retrieve the top 5 items causing the most scheduling issues."""
-    service = DataRetrievalService(db)
-    bottlenecks = await service.get_top_bottlenecks(session_id)
+    service = DashboardCacheService(db)
+    bottlenecks = await service.get(session_id, "top_bottlenecks")
     if bottlenecks is None:
         # Return an empty list if no bottlenecks are identified
         return []
@@ -13,6 +13,7 @@ from ....api.deps import db_session, current_user
 from ....models.users import User
 from ....services.data_retrieval import DataRetrievalService
 from ....services.scheduling import (
+    EditValidationService,
     SchedulingService,
     TimetableManagementService,
 )
@@ -21,6 +22,7 @@ from ....schemas.scheduling import (
     TimetableGenerationResponse,
     ConflictAnalysisResponse,
     TimetableValidationRequest,
+    TimetableEditValidationRequest,
 )
 from ....schemas.system import GenericResponse
 from ....schemas.jobs import TimetableJobRead
@@ -199,3 +201,32 @@ async def validate_timetable_assignments(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to validate timetable: {e}",
         )
+
+
+@router.post("/validate-edit", response_model=GenericResponse)
+async def validate_timetable_edit(
+    request: TimetableEditValidationRequest,
+    db: AsyncSession = Depends(db_session),
+    user: User = Depends(current_user),
+):
+    """
+    Check a single proposed move or swap against the version's occupancy index.
+    Intended for instant feedback while dragging exams in the timetable editor.
+    """
+    service = EditValidationService(db)
+    try:
+        validation_result = await service.validate_move(
+            version_id=request.version_id,
+            exam_id=request.exam_id,
+            exam_date=request.exam_date,
+            time_slot_id=request.time_slot_id,
+            room_ids=request.room_ids,
+            swap_with_exam_id=request.swap_with_exam_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return GenericResponse(
+        success=True,
+        message="Edit validation completed.",
+        data=validation_result,
+    )
@@ -4,7 +4,7 @@
 import logging
 from uuid import UUID
 from datetime import date
-from typing import Callable, Coroutine, Any
+from typing import Callable, Coroutine, Any, List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -69,6 +69,53 @@ async def get_staged_session_data(
         )
 
 
+# =================================================================
+# Batch Operations
+# =================================================================
+
+
+@router.post(
+    "/{session_id}/batch", response_model=GenericResponse, tags=["Staging Data"]
+)
+async def apply_staged_batch(
+    session_id: UUID,
+    batches: List[staging_schemas.StagingBatchRequest],
+    db: AsyncSession = Depends(db_session),
+    user: User = Depends(current_user),
+):
+    """
+    Apply add, update and delete operations for one or more staging entities
+    in a single transaction.
+
+    Each entity's operations are validated up front and written with
+    set-based statements. The response carries a per-row result so the UI
+    can highlight the rows that were rejected.
+    """
+    service = StagingService(db)
+    try:
+        results = [
+            await service.apply_batch(
+                session_id, batch.entity, batch.operations, user_id=user.id
+            )
+            for batch in batches
+        ]
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logging.error(f"Staging batch operation failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch operation failed: {str(e)}",
+        )
+
+    failed = sum(r.failed for r in results)
+    return GenericResponse(
+        success=failed == 0,
+        message=f"Applied {sum(r.applied for r in results)} operation(s), {failed} failed.",
+        data=[r.model_dump(mode="json") for r in results],
+    )
+
+
 # =================================================================
 # Buildings Endpoints
 # =================================================================
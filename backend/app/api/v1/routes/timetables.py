@@ -1,15 +1,19 @@
 # backend/app/api/v1/routes/timetables.py
 
+import os
 from uuid import UUID
 from typing import List, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Query
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 from ....services.export import TimetableExportService
+from ....tasks.celery_app import celery_app
+from ....tasks.export_tasks import export_timetable_task
 from ....api.deps import db_session, current_user
 from ....models.users import User
+from ....services.data_retrieval.dashboard_cache_service import get_cache_redis
 from ....services.data_retrieval.data_retrieval_service import DataRetrievalService
 from ....services.scheduling import TimetableManagementService
 from ....schemas.system import GenericResponse
@@ -300,6 +304,22 @@ async def export_timetable_version(
     Exports a fully structured timetable version to a downloadable file (PDF or CSV).
     """
     service = TimetableExportService(db)
+
+    if format.lower() == "csv":
+        rows = await service.load_timetable_rows(version_id)
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Could not generate export for timetable version '{version_id}'. The version may not exist or contains no data.",
+            )
+        return StreamingResponse(
+            service.iter_csv(rows),
+            media_type="text/csv",
+            headers={
+                "Content-Disposition": f'attachment; filename="timetable_{version_id}.csv"'
+            },
+        )
+
     file_bytes = await service.export_timetable(
         version_id=version_id, output_format=format
     )
@@ -321,3 +341,127 @@ async def export_timetable_version(
     headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
 
     return Response(content=file_bytes, media_type=media_type, headers=headers)
+
+
+@router.post(
+    "/versions/{version_id}/export/jobs",
+    response_model=GenericResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start a Background Timetable Export",
+    tags=["Timetables", "Export"],
+)
+async def start_timetable_export_job(
+    version_id: UUID,
+    format: str = Query("pdf", enum=["pdf", "csv"]),
+    split_by: str = Query(
+        "faculty",
+        description="How PDF exports are split for parallel rendering.",
+        enum=["faculty", "department"],
+    ),
+    user: User = Depends(current_user),
+):
+    """
+    Queues a full-session export as a background task. Poll the returned task
+    ID for progress and download the file once it has finished.
+    """
+    task = export_timetable_task.apply_async(
+        kwargs={
+            "version_id": str(version_id),
+            "output_format": format,
+            "split_by": split_by,
+            "requested_by": str(user.id),
+        }
+    )
+    await _remember_export_owner(task.id, user)
+    return GenericResponse(
+        success=True,
+        message="Export started.",
+        data={"task_id": task.id},
+    )
+
+
+def _export_owner_key(task_id: str) -> str:
+    return f"export:{task_id}:owner"
+
+
+async def _remember_export_owner(task_id: str, user: User) -> None:
+    """Records who started an export for as long as Celery keeps its result."""
+    redis = await get_cache_redis()
+    if redis is not None:
+        await redis.set(
+            _export_owner_key(task_id),
+            str(user.id),
+            ex=int(celery_app.conf.result_expires),
+        )
+
+
+async def _ensure_export_access(task_id: str, info: Any, user: User) -> None:
+    """Exports are visible only to the user who started them, or a superuser."""
+    if user.is_superuser:
+        return
+    owner = info.get("requested_by") if isinstance(info, dict) else None
+    if owner is None:
+        # A failed task's result is the exception, which names no owner.
+        redis = await get_cache_redis()
+        if redis is not None:
+            owner = await redis.get(_export_owner_key(task_id))
+    if owner != str(user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export '{task_id}' not found.",
+        )
+
+
+@router.get(
+    "/exports/{task_id}",
+    response_model=GenericResponse,
+    summary="Get Background Export Status",
+    tags=["Timetables", "Export"],
+)
+async def get_timetable_export_status(
+    task_id: str,
+    user: User = Depends(current_user),
+):
+    """Reports the state and progress of a background export task."""
+    result = celery_app.AsyncResult(task_id)
+    if result.state != "PENDING":
+        await _ensure_export_access(task_id, result.info, user)
+    data: Dict[str, Any] = {"task_id": task_id, "state": result.state}
+    if result.state == "PROGRESS" and isinstance(result.info, dict):
+        data.update(result.info)
+    elif result.successful():
+        outcome = result.result or {}
+        data["success"] = outcome.get("success", False)
+        data["error"] = outcome.get("error")
+        data["size_bytes"] = outcome.get("size_bytes")
+    elif result.failed():
+        data["error"] = str(result.result)
+    return GenericResponse(success=True, data=data)
+
+
+@router.get(
+    "/exports/{task_id}/download",
+    summary="Download a Finished Export",
+    tags=["Timetables", "Export"],
+)
+async def download_timetable_export(
+    task_id: str,
+    user: User = Depends(current_user),
+):
+    """Streams the artifact produced by a finished background export."""
+    result = celery_app.AsyncResult(task_id)
+    if not result.successful() or not (result.result or {}).get("success"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export '{task_id}' is not ready or did not produce a file.",
+        )
+    outcome = result.result
+    await _ensure_export_access(task_id, outcome, user)
+    path = outcome["artifact_path"]
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f"The file for export '{task_id}' is no longer available.",
+        )
+    media_type = "text/csv" if outcome["format"] == "csv" else "application/pdf"
+    return FileResponse(path, media_type=media_type, filename=outcome["filename"])
@@ -5,7 +5,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.api.deps import get_current_active_superuser, get_db
-from backend.app.services.data_retrieval import DataRetrievalService
+from backend.app.services.data_retrieval import (
+    DataRetrievalService,
+    DashboardCacheService,
+)
 from backend.app.models import User
 
 logger = logging.getLogger(__name__)
@@ -49,6 +52,10 @@ async def publish_version_from_job(
                 detail=error_message,
             )
 
+        # get_db never commits; invalidate only once the publish is visible,
+        # or a concurrent read could cache the old version again.
+        await db.commit()
+        await DashboardCacheService(db).invalidate_for_job(job_id)
         logger.info(f"Successfully published timetable version for job '{job_id}'.")
         return {
             "success": True,
@@ -47,6 +47,29 @@ class Settings(BaseSettings):
     REDIS_URL: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
     REDIS_CELERY_DB: int = Field(default=1, alias="REDIS_CELERY_DB")
     REDIS_CACHE_DB: int = Field(default=0, alias="REDIS_CACHE_DB")
+    DASHBOARD_CACHE_TTL_SECONDS: int = Field(
+        default=3600, alias="DASHBOARD_CACHE_TTL"
+    )  # 1 hour
+    # Versions whose edit-validation occupancy index is kept in memory per process.
+    EDIT_VALIDATION_INDEX_CACHE_SIZE: int = Field(
+        default=8, alias="EDIT_VALIDATION_INDEX_CACHE_SIZE"
+    )
+
+    # Audit log writer: buffered entries are COPY'd in batches; entries that
+    # cannot be written are spooled to AUDIT_SPOOL_PATH and replayed later.
+    AUDIT_BATCH_SIZE: int = Field(default=500, alias="AUDIT_BATCH_SIZE")
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=1.0, alias="AUDIT_FLUSH_INTERVAL"
+    )
+    AUDIT_MAX_BUFFERED_ENTRIES: int = Field(
+        default=10000, alias="AUDIT_MAX_BUFFERED_ENTRIES"
+    )
+    AUDIT_BACKPRESSURE_TIMEOUT_SECONDS: float = Field(
+        default=0.5, alias="AUDIT_BACKPRESSURE_TIMEOUT"
+    )
+    AUDIT_SPOOL_PATH: str = Field(
+        default="./uploads/audit_spool.jsonl", alias="AUDIT_SPOOL_PATH"
+    )
 
     # Security settings
     SECRET_KEY: str = Field(
@@ -116,6 +139,16 @@ class Settings(BaseSettings):
     GA_GENERATIONS: int = Field(default=100, alias="GA_GENERATIONS")
     GA_MUTATION_RATE: float = Field(default=0.1, alias="GA_MUTATION_RATE")
     GA_CROSSOVER_RATE: float = Field(default=0.8, alias="GA_CROSSOVER_RATE")
+    # "auto" switches to the columnar loader above the registration threshold.
+    SCHEDULING_DATASET_LOADER: str = Field(
+        default="auto", alias="SCHEDULING_DATASET_LOADER"
+    )  # auto | columnar | jsonb
+    COLUMNAR_DATASET_MIN_REGISTRATIONS: int = Field(
+        default=20000, alias="COLUMNAR_DATASET_MIN_REGISTRATIONS"
+    )
+    COLUMNAR_DATASET_BATCH_ROWS: int = Field(
+        default=5000, alias="COLUMNAR_DATASET_BATCH_ROWS"
+    )
 
     # Celery settings
     CELERY_BROKER_URL: Optional[str] = None
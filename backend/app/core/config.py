@@ -44,6 +44,24 @@ class Settings(BaseSettings):
         validation_alias="MAIL_TEMPLATE_FOLDER",
     )
 
+    # Bulk email delivery
+    SMTP_POOL_SIZE: int = Field(default=4, validation_alias="SMTP_POOL_SIZE")
+    SMTP_RATE_LIMIT_PER_SECOND: float = Field(
+        default=10.0, validation_alias="SMTP_RATE_LIMIT_PER_SECOND"
+    )
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = Field(
+        default=500, validation_alias="SMTP_MAX_MESSAGES_PER_CONNECTION"
+    )
+    BULK_EMAIL_MAX_RETRIES: int = Field(
+        default=3, validation_alias="BULK_EMAIL_MAX_RETRIES"
+    )
+    BULK_EMAIL_RETRY_DELAY_SECONDS: float = Field(
+        default=30.0, validation_alias="BULK_EMAIL_RETRY_DELAY_SECONDS"
+    )
+    NOTIFICATION_PROGRESS_INTERVAL_SECONDS: float = Field(
+        default=2.0, validation_alias="NOTIFICATION_PROGRESS_INTERVAL_SECONDS"
+    )
+
     # Redis + Celery
     REDIS_URL: str = Field(
         default="redis://localhost:6379/0", validation_alias="REDIS_URL"
@@ -58,6 +76,65 @@ class Settings(BaseSettings):
         default="redis://localhost:6379/1", validation_alias="CELERY_RESULT_BACKEND"
     )
 
+    # Celery worker pools (see app/tasks/routing.py)
+    SOLVER_CORES_PER_JOB: int = Field(
+        default=8, validation_alias="SOLVER_CORES_PER_JOB"
+    )
+    HEAVY_WORKER_CONCURRENCY: int = Field(
+        default=0, validation_alias="HEAVY_WORKER_CONCURRENCY"
+    )
+    LIGHT_WORKER_CONCURRENCY: int = Field(
+        default=50, validation_alias="LIGHT_WORKER_CONCURRENCY"
+    )
+    LIGHT_WORKER_POOL: str = Field(
+        default="threads", validation_alias="LIGHT_WORKER_POOL"
+    )
+
+    # CP-SAT portfolio racing (see scheduling_engine/cp_sat/portfolio.py)
+    SOLVER_RACE_SIZE: int = Field(default=0, validation_alias="SOLVER_RACE_SIZE")
+    SOLVER_PORTFOLIO_STORE: str = Field(
+        default="./solver_portfolio.json", validation_alias="SOLVER_PORTFOLIO_STORE"
+    )
+    # Offline parameter tuning (see scheduling_engine/cp_sat/tuning.py);
+    # an empty export directory disables model export.
+    SOLVER_TUNED_PROFILES: str = Field(
+        default="./solver_profiles.json", validation_alias="SOLVER_TUNED_PROFILES"
+    )
+    SOLVER_TUNING_EXPORT_DIR: str = Field(
+        default="", validation_alias="SOLVER_TUNING_EXPORT_DIR"
+    )
+    # Decomposed Phase 1 over weakly coupled exam groups
+    # (see scheduling_engine/cp_sat/decomposed_phase1.py).
+    SOLVER_PHASE1_DECOMPOSITION: bool = Field(
+        default=False, validation_alias="SOLVER_PHASE1_DECOMPOSITION"
+    )
+    SOLVER_DECOMPOSITION_MAX_CUT_STUDENTS: int = Field(
+        default=0, validation_alias="SOLVER_DECOMPOSITION_MAX_CUT_STUDENTS"
+    )
+    # Built Phase 1 models kept for weight-only reruns
+    # (see scheduling_engine/cp_sat/model_cache.py); 0 disables the cache.
+    # Solver workers recycle after every job, so reruns only hit the cache
+    # through the directory, which all solver workers must share.
+    SOLVER_MODEL_CACHE_SIZE: int = Field(
+        default=2, validation_alias="SOLVER_MODEL_CACHE_SIZE"
+    )
+    SOLVER_MODEL_CACHE_DIR: str = Field(
+        default="./solver_model_cache", validation_alias="SOLVER_MODEL_CACHE_DIR"
+    )
+    # Phase 2 room formulation: "assignment" or "patterns"
+    # (see scheduling_engine/core/room_patterns.py).
+    SOLVER_PHASE2_ROOM_MODEL: str = Field(
+        default="assignment", validation_alias="SOLVER_PHASE2_ROOM_MODEL"
+    )
+    SOLVER_ROOM_PATTERNS_PER_EXAM: int = Field(
+        default=8, validation_alias="SOLVER_ROOM_PATTERNS_PER_EXAM"
+    )
+    # Wall-clock deadline per job shared by all solve stages
+    # (see scheduling_engine/cp_sat/time_budget.py); 0 disables it.
+    SOLVER_JOB_DEADLINE_SECONDS: float = Field(
+        default=0.0, validation_alias="SOLVER_JOB_DEADLINE_SECONDS"
+    )
+
     # Security
     SECRET_KEY: str = Field(
         default="your-super-secret-key-change-this-in-production",
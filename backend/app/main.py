@@ -31,11 +31,16 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}", exc_info=True)
         raise
 
+    from .services.auditing import start_audit_writer, stop_audit_writer
+
+    await start_audit_writer()
+
     yield
 
     logger.info("Shutting down the application...")
     from .database import db_manager
 
+    await stop_audit_writer()
     await db_manager.close()
 
 
@@ -46,6 +46,10 @@ from .versioning import (
     VersionDependency,
     SessionTemplate,
     TimetableConflict,
+    VersionConflictAnalytics,
+    ScheduleProjectionVersion,
+    StudentScheduleProjection,
+    StaffDutyProjection,
 )
 from .constraints import (
     ConstraintRule,
@@ -110,6 +114,10 @@ __all__ = [
     "VersionDependency",
     "SessionTemplate",
     "TimetableConflict",
+    "VersionConflictAnalytics",
+    "ScheduleProjectionVersion",
+    "StudentScheduleProjection",
+    "StaffDutyProjection",
     # Constraint models
     "ConstraintRule",
     "ConstraintParameter",
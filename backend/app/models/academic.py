@@ -451,4 +451,6 @@ class CourseRegistration(Base):
         UniqueConstraint(
             "student_id", "course_id", "session_id", name="course_registrations_unique"
         ),
+        Index("idx_course_registrations_course_session", "course_id", "session_id"),
+        Index("idx_course_registrations_student_session", "student_id", "session_id"),
     )
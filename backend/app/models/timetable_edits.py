@@ -1,6 +1,6 @@
 # app/models/timetable_edits.py
 import uuid
-from sqlalchemy import String, Text, ForeignKey
+from sqlalchemy import String, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from .base import Base, TimestampMixin
@@ -26,3 +26,12 @@ class TimetableEdit(Base, TimestampMixin):
     new_values: Mapped[dict | None] = mapped_column(JSONB)
     reason: Mapped[str | None] = mapped_column(Text)
     validation_status: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "idx_timetable_edits_version_exam_created",
+            "version_id",
+            "exam_id",
+            "created_at",
+        ),
+    )
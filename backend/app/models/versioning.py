@@ -2,8 +2,18 @@
 
 import uuid
 from typing import List, Optional, TYPE_CHECKING
-from datetime import datetime
-from sqlalchemy import String, DateTime, Boolean, ForeignKey, Text, Integer, Index, func
+from datetime import date, datetime
+from sqlalchemy import (
+    String,
+    Date,
+    DateTime,
+    Boolean,
+    ForeignKey,
+    Text,
+    Integer,
+    Index,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from .base import Base, TimestampMixin
@@ -194,6 +204,128 @@ class TimetableConflict(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
+    # Populated by materialize_timetable_conflicts for per-assignment conflicts.
+    source: Mapped[str] = mapped_column(
+        String(20), nullable=False, server_default="solution"
+    )
+    exam_id: Mapped[uuid.UUID | None] = mapped_column(PG_UUID(as_uuid=True))
+    exam_date: Mapped[date | None] = mapped_column(Date)
+    start_time: Mapped[str | None] = mapped_column(Text)
+    item: Mapped[str | None] = mapped_column(Text)
 
     version: Mapped["TimetableVersion"] = relationship(back_populates="conflicts")
-    __table_args__ = (Index("idx_timetable_conflicts_version_id", "version_id"),)
+    __table_args__ = (
+        Index("idx_timetable_conflicts_version_id", "version_id"),
+        Index(
+            "idx_timetable_conflicts_version_source_slot",
+            "version_id",
+            "source",
+            "exam_date",
+            "start_time",
+        ),
+    )
+
+
+class VersionConflictAnalytics(Base):
+    """Hotspot and bottleneck aggregates cached per version at materialization."""
+
+    __tablename__ = "version_conflict_analytics"
+
+    version_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("timetable_versions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    conflict_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    hotspots: Mapped[list] = mapped_column(JSONB, nullable=False, server_default="[]")
+    bottlenecks: Mapped[list] = mapped_column(
+        JSONB, nullable=False, server_default="[]"
+    )
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class ScheduleProjectionVersion(Base):
+    """Marks a version whose per-student and per-staff projections are built."""
+
+    __tablename__ = "schedule_projection_versions"
+
+    version_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("timetable_versions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    job_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True), nullable=False
+    )
+    student_rows: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    staff_rows: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    built_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("idx_schedule_projection_versions_job_id", "job_id"),
+        Index("idx_schedule_projection_versions_session_id", "session_id"),
+    )
+
+
+class StudentScheduleProjection(Base):
+    """One published assignment row per (student, exam), read by the portal."""
+
+    __tablename__ = "student_schedule_projections"
+
+    student_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True), primary_key=True
+    )
+    version_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("schedule_projection_versions.version_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    exam_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True), nullable=False
+    )
+    exam_date: Mapped[date | None] = mapped_column(Date)
+    start_time: Mapped[str | None] = mapped_column(Text)
+    assignment: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "idx_student_schedule_projections_version_exam", "version_id", "exam_id"
+        ),
+    )
+
+
+class StaffDutyProjection(Base):
+    """One published instructor or invigilator duty per (staff, exam, role)."""
+
+    __tablename__ = "staff_duty_projections"
+
+    staff_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    version_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("schedule_projection_versions.version_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    exam_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    role: Mapped[str] = mapped_column(String(20), primary_key=True)
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        PG_UUID(as_uuid=True), nullable=False
+    )
+    exam_date: Mapped[date | None] = mapped_column(Date)
+    start_time: Mapped[str | None] = mapped_column(Text)
+    assignment: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    __table_args__ = (
+        Index("idx_staff_duty_projections_version_exam", "version_id", "exam_id"),
+    )
@@ -170,3 +170,12 @@ class ManualTimetableEditCreate(BaseModel):
 class TimetableValidationRequest(BaseModel):
     version_id: UUID
     assignments: List[Dict[str, Any]]
+
+
+class TimetableEditValidationRequest(BaseModel):
+    version_id: UUID
+    exam_id: UUID
+    exam_date: Optional[date] = None
+    time_slot_id: Optional[UUID] = None
+    room_ids: Optional[List[UUID]] = None
+    swap_with_exam_id: Optional[UUID] = None
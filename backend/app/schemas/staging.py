@@ -2,9 +2,10 @@
 """Pydantic schemas for interacting with staging table records."""
 
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 from datetime import date
+from enum import Enum
 
 
 # =================== Buildings ===================
@@ -340,3 +341,66 @@ class StagedSessionData(BaseModel):
     staff: List[Staff]
     staff_unavailability: List[StaffUnavailability]
     students: List[Student]
+
+
+# =================================================================
+# Batch Operation Models
+# =================================================================
+
+StagingEntity = Literal[
+    "buildings",
+    "course_departments",
+    "course_faculties",
+    "course_instructors",
+    "course_registrations",
+    "courses",
+    "departments",
+    "faculties",
+    "programmes",
+    "rooms",
+    "staff",
+    "staff_unavailability",
+    "students",
+]
+
+
+class StagingOperationType(str, Enum):
+    ADD = "add"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class StagingOperation(BaseModel):
+    """
+    A single typed change to a staging table.
+
+    `key` identifies the existing record for updates and deletes (for example
+    `{"code": "CSC101"}`); for adds it is taken from `data`. `data` holds the
+    full record for adds and only the changed fields for updates.
+    """
+
+    op: StagingOperationType
+    key: Dict[str, Any] = Field(default_factory=dict)
+    data: Dict[str, Any] = Field(default_factory=dict)
+
+
+class StagingBatchRequest(BaseModel):
+    """A list of operations against one staging entity."""
+
+    entity: StagingEntity
+    operations: List[StagingOperation] = Field(..., min_length=1)
+
+
+class StagingRowResult(BaseModel):
+    index: int
+    op: StagingOperationType
+    key: Dict[str, Any] = Field(default_factory=dict)
+    success: bool
+    error: Optional[str] = None
+
+
+class StagingBatchResult(BaseModel):
+    entity: StagingEntity
+    applied: int
+    failed: int
+    results: List[StagingRowResult]
@@ -12,6 +12,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from datetime import date
 
+from ..auditing import AuditService
+
 logger = logging.getLogger(__name__)
 
 
@@ -96,32 +98,19 @@ class SystemService:
         query = text(f"SELECT exam_system.update_academic_session({param_str})")
 
         try:
-            # Note: The update function itself doesn't log, so we log it here.
-            # For more complex updates, it's better to have the PG function handle logging.
-            log_query = text(
-                """
-                SELECT exam_system.log_audit_activity(
-                    p_user_id => :p_user_id,
-                    p_action => :p_action,
-                    p_entity_type => :p_entity_type,
-                    p_entity_id => :p_entity_id,
-                    p_new_values => :p_new_values
-                )
-                """
-            )
-            await self.session.execute(
-                log_query,
-                {
-                    "p_user_id": user_id,
-                    "p_action": "UPDATE",
-                    "p_entity_type": "ACADEMIC_SESSION",
-                    "p_entity_id": session_id,
-                    "p_new_values": json.dumps(update_data, default=str),
-                },
-            )
             result = await self.session.execute(query, params)
+            updated = result.scalar_one_or_none()
             await self.session.commit()
-            return result.scalar_one_or_none()
+            # The update function itself doesn't log; queue the entry on the
+            # batched audit writer so the request doesn't wait for it.
+            await AuditService(self.session).log(
+                user_id=user_id,
+                action="UPDATE",
+                entity_type="ACADEMIC_SESSION",
+                entity_id=session_id,
+                new_values=update_data,
+            )
+            return updated
         except Exception as e:
             await self.session.rollback()
             logger.error(
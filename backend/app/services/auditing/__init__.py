@@ -5,5 +5,19 @@ Auditing Services Package.
 Provides services for logging user actions and system events.
 """
 from .audit_service import AuditService
+from .audit_writer import (
+    AuditEntry,
+    AuditLogWriter,
+    get_audit_writer,
+    start_audit_writer,
+    stop_audit_writer,
+)
 
-__all__ = ["AuditService"]
+__all__ = [
+    "AuditService",
+    "AuditEntry",
+    "AuditLogWriter",
+    "get_audit_writer",
+    "start_audit_writer",
+    "stop_audit_writer",
+]
@@ -1,18 +1,62 @@
 # backend/app/services/auditing/audit_service.py
 """
 Service for logging audit trails.
-Provides a simple interface to the `log_audit_activity` PostgreSQL function.
+Entries go through the process-wide batched AuditLogWriter when it is running
+(the API process); elsewhere they fall back to the `log_audit_activity`
+PostgreSQL function.
+
+Audit rows written by PL/pgSQL functions themselves (create_course,
+publish_timetable_version, setup_new_exam_session, ...) still call
+`log_audit_activity` in-database: they are committed atomically with the
+change they describe, which a buffered writer cannot offer.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple
 from uuid import UUID
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 import json
 
+from .audit_writer import AuditEntry, AuditLogWriter, get_audit_writer
+
 logger = logging.getLogger(__name__)
 
+_PENDING_KEY = "audit_pending_entries"
+# Submissions started by commit hooks, kept referenced until they finish.
+_commit_tasks: "Set[asyncio.Task[None]]" = set()
+
+_LOG_QUERY = text("""
+    SELECT exam_system.log_audit_activity(
+        p_user_id => :user_id, p_action => :action, p_entity_type => :entity_type,
+        p_entity_id => :entity_id, p_old_values => :old_values,
+        p_new_values => :new_values, p_notes => :notes,
+        p_ip_address => :ip_address, p_user_agent => :user_agent,
+        p_session_id => :session_id
+    )
+    """)
+
+
+def _log_params(entry: AuditEntry) -> Dict[str, Any]:
+    return {
+        "user_id": entry.user_id,
+        "action": entry.action,
+        "entity_type": entry.entity_type,
+        "entity_id": entry.entity_id,
+        "notes": entry.notes,
+        "ip_address": entry.ip_address,
+        "user_agent": entry.user_agent,
+        "session_id": entry.session_id,
+        "old_values": (
+            json.dumps(entry.old_values, default=str) if entry.old_values else None
+        ),
+        "new_values": (
+            json.dumps(entry.new_values, default=str) if entry.new_values else None
+        ),
+    }
+
 
 class AuditService:
     """Handles the creation of audit log entries by calling the DB function."""
@@ -34,7 +78,9 @@ class AuditService:
         session_id: Optional[UUID] = None,
     ) -> None:
         """
-        Logs an audit activity by calling the `log_audit_activity` PostgreSQL function.
+        Logs an audit activity. Queues it on the batched writer when one is
+        running, so the caller does not wait for the write; otherwise calls the
+        `log_audit_activity` PostgreSQL function.
 
         Args:
             user_id: The ID of the user performing the action.
@@ -43,39 +89,71 @@ class AuditService:
             session_id: The academic session ID related to the action, if any.
             ... and other audit parameters.
         """
+        logger.debug(
+            f"Logging audit: user={user_id}, action='{action}', entity='{entity_type}'"
+        )
+        entry = AuditEntry(
+            user_id=user_id,
+            action=action,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            old_values=old_values,
+            new_values=new_values,
+            notes=notes,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            session_id=str(session_id) if session_id else None,
+        )
+        writer = get_audit_writer()
+        if writer is not None:
+            await writer.submit(entry)
+            return
+
         try:
-            logger.debug(
-                f"Logging audit: user={user_id}, action='{action}', entity='{entity_type}'"
-            )
-            query = text(
-                """
-                SELECT exam_system.log_audit_activity(
-                    p_user_id => :user_id, p_action => :action, p_entity_type => :entity_type,
-                    p_entity_id => :entity_id, p_old_values => :old_values,
-                    p_new_values => :new_values, p_notes => :notes,
-                    p_ip_address => :ip_address, p_user_agent => :user_agent,
-                    p_session_id => :session_id
-                )
-                """
-            )
-            params = {
-                "user_id": user_id,
-                "action": action,
-                "entity_type": entity_type,
-                "entity_id": entity_id,
-                "notes": notes,
-                "ip_address": ip_address,
-                "user_agent": user_agent,
-                "session_id": str(session_id) if session_id else None,
-                "old_values": (
-                    json.dumps(old_values, default=str) if old_values else None
-                ),
-                "new_values": (
-                    json.dumps(new_values, default=str) if new_values else None
-                ),
-            }
-            await self.session.execute(query, params)
+            await self.session.execute(_LOG_QUERY, _log_params(entry))
             await self.session.commit()
         except Exception as e:
             await self.session.rollback()
             logger.error(f"Failed to log audit activity: {e}", exc_info=True)
+
+    async def log_on_commit(self, entries: Sequence[AuditEntry]) -> None:
+        """
+        Queues entries on the batched writer once the current transaction
+        commits; for callers that leave committing to their caller. A rollback
+        drops them. Without a running writer they are written straight away
+        by the database function, inside the caller's transaction.
+        """
+        if not entries:
+            return
+        writer = get_audit_writer()
+        if writer is None:
+            for entry in entries:
+                await self.session.execute(_LOG_QUERY, _log_params(entry))
+            return
+        sync_session = self.session.sync_session
+        pending = sync_session.info.setdefault(_PENDING_KEY, [])
+        pending.extend((writer, entry) for entry in entries)
+        if not event.contains(sync_session, "after_commit", _submit_committed):
+            event.listen(sync_session, "after_commit", _submit_committed)
+            event.listen(sync_session, "after_rollback", _drop_pending)
+
+
+def _submit_committed(sync_session: Session) -> None:
+    pending: List[Tuple[AuditLogWriter, AuditEntry]] = sync_session.info.pop(
+        _PENDING_KEY, []
+    )
+    if not pending:
+        return
+
+    async def submit() -> None:
+        for writer, entry in pending:
+            await writer.submit(entry)
+
+    # The hook runs inside AsyncSession.commit(), on the caller's loop.
+    task = asyncio.get_running_loop().create_task(submit())
+    _commit_tasks.add(task)
+    task.add_done_callback(_commit_tasks.discard)
+
+
+def _drop_pending(sync_session: Session) -> None:
+    sync_session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,309 @@
+# backend/app/services/auditing/audit_writer.py
+"""
+Batched, asynchronous audit log writer.
+
+Audited actions enqueue an AuditEntry into a per-process buffer and return
+immediately. A background task drains the buffer and writes entries to
+`exam_system.audit_logs` with a single COPY per batch, flushing whenever a
+batch fills up, when the oldest buffered entry reaches the flush interval, and
+at shutdown.
+
+The buffer is bounded: when it is full, callers wait briefly for room (back-
+pressure) and, failing that, the entry is appended to a local JSON-lines spool
+file. Batches that cannot be written because the database is unavailable are
+spooled the same way, and the spool is replayed after the next successful
+flush, so entries are not lost during a short outage.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+from ...config import get_settings
+
+logger = logging.getLogger(__name__)
+
+AUDIT_COLUMNS = (
+    "user_id",
+    "action",
+    "entity_type",
+    "entity_id",
+    "old_values",
+    "new_values",
+    "ip_address",
+    "user_agent",
+    "session_id",
+    "notes",
+    "created_at",
+    "updated_at",
+)
+
+AuditSink = Callable[[List["AuditEntry"]], Awaitable[None]]
+
+
+def _uuid(value: Any) -> Optional[UUID]:
+    if value is None or isinstance(value, UUID):
+        return value
+    return UUID(str(value))
+
+
+@dataclass
+class AuditEntry:
+    """One audit_logs row, captured at the time of the action."""
+
+    user_id: Optional[UUID]
+    action: str
+    entity_type: str
+    entity_id: Optional[UUID] = None
+    old_values: Optional[Dict[str, Any]] = None
+    new_values: Optional[Dict[str, Any]] = None
+    notes: Optional[str] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    session_id: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+
+    def to_record(self) -> tuple:
+        """Row tuple in AUDIT_COLUMNS order, typed for asyncpg's binary COPY."""
+        return (
+            _uuid(self.user_id),
+            self.action,
+            self.entity_type,
+            _uuid(self.entity_id),
+            json.dumps(self.old_values, default=str) if self.old_values else None,
+            json.dumps(self.new_values, default=str) if self.new_values else None,
+            self.ip_address,
+            self.user_agent,
+            str(self.session_id) if self.session_id else None,
+            self.notes,
+            self.created_at,
+            self.created_at,
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, line: str) -> "AuditEntry":
+        data = json.loads(line)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+
+async def copy_audit_entries(entries: List[AuditEntry]) -> None:
+    """Writes a batch to exam_system.audit_logs with one COPY."""
+    from ...database import db_manager
+
+    if not db_manager.AsyncSessionLocal:
+        raise RuntimeError("AsyncSessionLocal not initialized")
+    async with db_manager.AsyncSessionLocal() as session:
+        connection = await session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "audit_logs",
+            schema_name="exam_system",
+            columns=AUDIT_COLUMNS,
+            records=[entry.to_record() for entry in entries],
+        )
+        await session.commit()
+
+
+class AuditLogWriter:
+    """Buffers audit entries in memory and writes them in batches."""
+
+    def __init__(
+        self,
+        sink: Optional[AuditSink] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_buffered: Optional[int] = None,
+        backpressure_timeout: Optional[float] = None,
+        spool_path: Optional[str] = None,
+    ):
+        settings = get_settings()
+        self.sink = sink or copy_audit_entries
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else settings.AUDIT_FLUSH_INTERVAL_SECONDS
+        )
+        self.backpressure_timeout = (
+            backpressure_timeout
+            if backpressure_timeout is not None
+            else settings.AUDIT_BACKPRESSURE_TIMEOUT_SECONDS
+        )
+        self.spool_path = Path(spool_path or settings.AUDIT_SPOOL_PATH)
+        self._queue: "asyncio.Queue[AuditEntry]" = asyncio.Queue(
+            maxsize=max_buffered or settings.AUDIT_MAX_BUFFERED_ENTRIES
+        )
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._batch: List[AuditEntry] = []
+        self._flushing: Optional["asyncio.Future[bool]"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.written = 0
+        self.spooled = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run())
+        logger.info(
+            f"Audit log writer started (batch={self.batch_size}, "
+            f"interval={self.flush_interval}s, spool={self.spool_path})"
+        )
+
+    async def stop(self) -> None:
+        """Flushes everything buffered and replays the spool before exiting."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flushing is not None:
+            await self._flushing
+            self._flushing = None
+        batch, self._batch = self._batch, []
+        await self._flush(batch)
+        while not self._queue.empty():
+            await self._flush(self._take(self.batch_size))
+        await self._replay_spool()
+        logger.info(
+            f"Audit log writer stopped: {self.written} written, "
+            f"{self.spooled} spooled"
+        )
+
+    async def submit(self, entry: AuditEntry) -> None:
+        """
+        Queues an entry without touching the database. Waits up to
+        `backpressure_timeout` when the buffer is full, then spools it.
+        """
+        try:
+            self._queue.put_nowait(entry)
+            return
+        except asyncio.QueueFull:
+            pass
+        try:
+            await asyncio.wait_for(self._queue.put(entry), self.backpressure_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Audit buffer full; spooling entry to disk")
+            self._spool([entry])
+
+    def _take(self, limit: int) -> List[AuditEntry]:
+        batch: List[AuditEntry] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                self._batch.extend(self._take(self.batch_size - len(self._batch)))
+                remaining = deadline - loop.time()
+                if len(self._batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    self._batch.append(
+                        await asyncio.wait_for(self._queue.get(), remaining)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            batch, self._batch = self._batch, []
+            # Shield the write so cancellation at shutdown cannot drop a batch.
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._flushing)
+
+    async def _flush(self, batch: List[AuditEntry]) -> bool:
+        if not batch:
+            return True
+        try:
+            await self.sink(batch)
+        except Exception as e:
+            logger.error(f"Audit batch of {len(batch)} failed, spooling: {e}")
+            self._spool(batch)
+            return False
+        self.written += len(batch)
+        await self._replay_spool()
+        return True
+
+    def _spool(self, entries: List[AuditEntry]) -> None:
+        self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spool_path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(entry.to_json() + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.spooled += len(entries)
+
+    async def _replay_spool(self) -> None:
+        """Writes spooled entries back to the database, oldest first."""
+        # A leftover .replay file means a previous replay was interrupted.
+        replaying = self.spool_path.with_suffix(self.spool_path.suffix + ".replay")
+        if not replaying.exists():
+            if not self.spool_path.exists():
+                return
+            os.replace(self.spool_path, replaying)
+        with open(replaying, encoding="utf-8") as f:
+            entries = [AuditEntry.from_json(line) for line in f if line.strip()]
+
+        for start in range(0, len(entries), self.batch_size):
+            batch = entries[start : start + self.batch_size]
+            try:
+                await self.sink(batch)
+            except Exception as e:
+                logger.warning(f"Audit spool replay deferred: {e}")
+                self._spool(entries[start:])
+                replaying.unlink()
+                return
+            self.written += len(batch)
+        replaying.unlink()
+        logger.info(f"Replayed {len(entries)} spooled audit entries")
+
+
+_writer: Optional[AuditLogWriter] = None
+
+
+def get_audit_writer() -> Optional[AuditLogWriter]:
+    """The process-wide writer, if one is running on the current event loop."""
+    if _writer is None or not _writer.running:
+        return None
+    try:
+        if _writer._loop is not asyncio.get_running_loop():
+            return None
+    except RuntimeError:
+        return None
+    return _writer
+
+
+async def start_audit_writer(**kwargs: Any) -> AuditLogWriter:
+    global _writer
+    if _writer is None or not _writer.running:
+        _writer = AuditLogWriter(**kwargs)
+        _writer.start()
+    return _writer
+
+
+async def stop_audit_writer() -> None:
+    global _writer
+    if _writer is not None:
+        await _writer.stop()
+        _writer = None
@@ -9,8 +9,11 @@ complex data aggregation to the database layer.
 """
 
 from .data_retrieval_service import DataRetrievalService
+from .dashboard_cache_service import DashboardCacheService
 
 __all__ = [
     # Unified service for complex data retrieval via PSQL functions
     "DataRetrievalService",
+    # Redis cache for dashboard aggregates
+    "DashboardCacheService",
 ]
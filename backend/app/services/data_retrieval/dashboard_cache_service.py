@@ -0,0 +1,277 @@
+# backend/app/services/data_retrieval/dashboard_cache_service.py
+"""
+Redis-backed cache for the dashboard aggregates (KPIs, analytics, conflict
+hotspots and top bottlenecks).
+
+Entries live in the Redis cache database (`REDIS_CACHE_DB`) under keys of the
+form `dashboard:{session_id}:{version}:{generation}:{metric}`. The version is
+the session's published timetable version, so publishing a new version moves
+readers to fresh keys. The generation counter is bumped by every invalidation
+(manual edits, publication, staging changes, job completion), which makes all
+older entries for the session unreachable in O(1); they then age out via TTL.
+
+Writers that do not own their transaction (the staging batch API) queue the
+invalidation with `invalidate_session_on_commit`; it runs after the session's
+next commit and is dropped on rollback, so readers never recache a state that
+is not yet visible.
+
+Cold reads are coalesced: within a process concurrent misses share one
+in-flight computation, and across processes a short Redis lock lets a single
+caller run the aggregation while the others wait for its result.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ...config import get_settings
+from .data_retrieval_service import DataRetrievalService
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_METRICS = ("kpis", "analytics", "conflict_hotspots", "top_bottlenecks")
+
+_NO_VERSION = "none"
+_LOCK_TTL_MS = 30_000
+_WAIT_POLL_SECONDS = 0.05
+
+_redis_client: Optional[Any] = None
+_redis_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Per-process single-flight registry: cache key -> in-flight computation.
+_inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+# Session.info key of the invalidations waiting for a commit.
+_PENDING_KEY = "dashboard_cache_pending_invalidations"
+# Invalidations started by commit hooks, kept referenced until they finish.
+_commit_tasks: "Set[asyncio.Task[None]]" = set()
+
+
+def _cache_redis_url() -> str:
+    settings = get_settings()
+    base = settings.REDIS_URL.rsplit("/", 1)[0]
+    return f"{base}/{settings.REDIS_CACHE_DB}"
+
+
+async def get_cache_redis() -> Optional[Any]:
+    """
+    Returns a Redis client for the cache database, or None if Redis is
+    unavailable. Clients are bound to an event loop, so a new one is created
+    when called from a different loop (e.g. inside a Celery task).
+    """
+    global _redis_client, _redis_loop
+    loop = asyncio.get_running_loop()
+    if _redis_client is not None and _redis_loop is loop:
+        return _redis_client
+    try:
+        from redis.asyncio import Redis
+
+        client = Redis.from_url(
+            _cache_redis_url(), encoding="utf-8", decode_responses=True
+        )
+        await client.ping()
+    except Exception as e:
+        logger.warning(f"Dashboard cache Redis not available: {e}")
+        return None
+    _redis_client, _redis_loop = client, loop
+    return client
+
+
+class DashboardCacheService:
+    """Caches dashboard aggregates per session and timetable version."""
+
+    def __init__(self, session: AsyncSession, redis: Optional[Any] = None):
+        self.session = session
+        self.retrieval = DataRetrievalService(session)
+        self._redis = redis
+        self.ttl_seconds = get_settings().DASHBOARD_CACHE_TTL_SECONDS
+
+    async def _get_redis(self) -> Optional[Any]:
+        if self._redis is None:
+            self._redis = await get_cache_redis()
+        return self._redis
+
+    # --- Key management ---
+
+    @staticmethod
+    def _generation_key(session_id: UUID) -> str:
+        return f"dashboard:{session_id}:generation"
+
+    async def _current_version(self, session_id: UUID) -> str:
+        version_id = await self.retrieval.get_published_timetable_version(session_id)
+        return str(version_id) if version_id else _NO_VERSION
+
+    async def _metric_key(self, redis: Any, session_id: UUID, metric: str) -> str:
+        version = await self._current_version(session_id)
+        generation = await redis.get(self._generation_key(session_id)) or "0"
+        return f"dashboard:{session_id}:{version}:{generation}:{metric}"
+
+    def _loader(self, session_id: UUID, metric: str) -> Callable[[], Awaitable[Any]]:
+        loaders = {
+            "kpis": self.retrieval.get_dashboard_kpis,
+            "analytics": self.retrieval.get_dashboard_analytics,
+            "conflict_hotspots": self.retrieval.get_conflict_hotspots,
+            "top_bottlenecks": self.retrieval.get_top_bottlenecks,
+        }
+        if metric not in loaders:
+            raise ValueError(f"Unknown dashboard metric '{metric}'.")
+        return lambda: loaders[metric](session_id)
+
+    # --- Reads ---
+
+    async def get(self, session_id: UUID, metric: str) -> Any:
+        """
+        Returns the cached value for a dashboard metric, computing and storing
+        it on a miss. Falls back to a direct database call if Redis is down.
+        """
+        loader = self._loader(session_id, metric)
+        redis = await self._get_redis()
+        if redis is None:
+            return await loader()
+
+        key = await self._metric_key(redis, session_id, metric)
+        cached = await redis.get(key)
+        if cached is not None:
+            return json.loads(cached)
+
+        inflight = _inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+        try:
+            value = await self._fill(redis, key, loader)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting.
+            future.exception()
+            raise
+        finally:
+            _inflight.pop(key, None)
+
+    async def _fill(
+        self, redis: Any, key: str, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Computes a value under a cross-process lock and stores it."""
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + _LOCK_TTL_MS / 1000
+
+        while not await redis.set(lock_key, token, nx=True, px=_LOCK_TTL_MS):
+            # Another process is computing this value; wait for its result.
+            await asyncio.sleep(_WAIT_POLL_SECONDS)
+            cached = await redis.get(key)
+            if cached is not None:
+                return json.loads(cached)
+            if time.monotonic() > deadline:
+                logger.warning(f"Timed out waiting for dashboard cache fill of {key}")
+                return await loader()
+
+        try:
+            value = await loader()
+            await redis.set(key, json.dumps(value, default=str), ex=self.ttl_seconds)
+            return value
+        finally:
+            if await redis.get(lock_key) == token:
+                await redis.delete(lock_key)
+
+    # --- Population & invalidation ---
+
+    async def invalidate_session(self, session_id: UUID) -> None:
+        """Makes every cached dashboard entry for the session stale."""
+        redis = await self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.incr(self._generation_key(session_id))
+            logger.info(f"Invalidated dashboard cache for session {session_id}")
+        except Exception as e:
+            logger.warning(
+                f"Failed to invalidate dashboard cache for session {session_id}: {e}"
+            )
+
+    def invalidate_session_on_commit(self, session_id: UUID) -> None:
+        """
+        Invalidates the session once the current transaction commits; for
+        callers that leave committing to their caller. A rollback drops it.
+        """
+        sync_session = self.session.sync_session
+        pending = sync_session.info.setdefault(_PENDING_KEY, [])
+        pending.append((self, session_id))
+        if not event.contains(sync_session, "after_commit", _invalidate_committed):
+            event.listen(sync_session, "after_commit", _invalidate_committed)
+            event.listen(sync_session, "after_rollback", _drop_pending)
+
+    async def refresh_session(self, session_id: UUID) -> None:
+        """Invalidates the session and eagerly recomputes every metric."""
+        await self.invalidate_session(session_id)
+        for metric in DASHBOARD_METRICS:
+            try:
+                await self.get(session_id, metric)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to warm dashboard metric '{metric}' for session {session_id}: {e}"
+                )
+
+    async def invalidate_for_version(self, version_id: UUID) -> None:
+        session_id = await self._scalar(
+            """
+            SELECT tj.session_id
+            FROM exam_system.timetable_versions tv
+            JOIN exam_system.timetable_jobs tj ON tv.job_id = tj.id
+            WHERE tv.id = :id
+            """,
+            version_id,
+        )
+        if session_id:
+            await self.invalidate_session(session_id)
+
+    async def invalidate_for_job(self, job_id: UUID) -> None:
+        session_id = await self.session_for_job(job_id)
+        if session_id:
+            await self.invalidate_session(session_id)
+
+    async def session_for_job(self, job_id: UUID) -> Optional[UUID]:
+        return await self._scalar(
+            "SELECT session_id FROM exam_system.timetable_jobs WHERE id = :id", job_id
+        )
+
+    async def _scalar(self, sql: str, entity_id: UUID) -> Optional[UUID]:
+        try:
+            result = await self.session.execute(text(sql), {"id": entity_id})
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.warning(f"Could not resolve session for dashboard cache: {e}")
+            return None
+
+
+def _invalidate_committed(sync_session: Session) -> None:
+    pending: List[Tuple[DashboardCacheService, UUID]] = sync_session.info.pop(
+        _PENDING_KEY, []
+    )
+    if not pending:
+        return
+
+    async def invalidate() -> None:
+        for service, session_id in dict.fromkeys(pending):
+            await service.invalidate_session(session_id)
+
+    # The hook runs inside AsyncSession.commit(), on the caller's loop.
+    task = asyncio.get_running_loop().create_task(invalidate())
+    _commit_tasks.add(task)
+    task.add_done_callback(_commit_tasks.discard)
+
+
+def _drop_pending(sync_session: Session) -> None:
+    sync_session.info.pop(_PENDING_KEY, None)
@@ -13,7 +13,10 @@ import re
 import chardet
 from decimal import Decimal, InvalidOperation
 import uuid
-import pandas as pd
+
+from ...utils.lazy_imports import lazy_import
+
+pd = lazy_import("pandas")
 
 logger = logging.getLogger(__name__)
 
@@ -304,7 +307,7 @@ class CSVProcessor:
 
     def _process_chunk(
         self,
-        chunk_df: pd.DataFrame,
+        chunk_df: "pd.DataFrame",
         entity_type: str,
         row_offset: int,
         validate_data: bool,
@@ -367,8 +370,8 @@ class CSVProcessor:
         return result
 
     def _apply_column_mappings(
-        self, df: pd.DataFrame, entity_type: str
-    ) -> pd.DataFrame:
+        self, df: "pd.DataFrame", entity_type: str
+    ) -> "pd.DataFrame":
         """Apply column mappings to DataFrame."""
         if entity_type not in self.column_mappings:
             return df
@@ -1,20 +1,37 @@
 # C:\Users\fresh\OneDrive\Dokumen\thesis\proj\CODE\adaptive-exam-timetabling\backend\app\services\export\csv_exporter.py
 import csv
 import io
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 
 
 class CSVExporter:
     """Exports data to CSV format."""
 
-    def __init__(self, fieldnames: List[str]):
+    def __init__(self, fieldnames: List[str], chunk_rows: int = 500):
         self.fieldnames = fieldnames
+        self.chunk_rows = chunk_rows
 
-    def export(self, rows: List[Dict[str, Any]]) -> bytes:
-        """Return CSV bytes for the given rows."""
+    def iter_export(self, rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+        """
+        Yields the CSV output in encoded chunks of `chunk_rows` rows, so a
+        `StreamingResponse` can send it without building one large buffer.
+        """
         output = io.StringIO()
         writer = csv.DictWriter(output, fieldnames=self.fieldnames)
         writer.writeheader()
+        pending = 0
         for row in rows:
             writer.writerow({k: row.get(k) for k in self.fieldnames})
-        return output.getvalue().encode("utf-8")
+            pending += 1
+            if pending >= self.chunk_rows:
+                yield output.getvalue().encode("utf-8")
+                output.seek(0)
+                output.truncate(0)
+                pending = 0
+        remainder = output.getvalue()
+        if remainder:
+            yield remainder.encode("utf-8")
+
+    def export(self, rows: List[Dict[str, Any]]) -> bytes:
+        """Return CSV bytes for the given rows."""
+        return b"".join(self.iter_export(rows))
@@ -1,12 +1,22 @@
 # C:\Users\fresh\OneDrive\Dokumen\thesis\proj\CODE\adaptive-exam-timetabling\backend\app\services\export\pdf_generator.py
 import io
-from typing import List, Dict, Any
-from collections import defaultdict
+import logging
+import os
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+)
+from collections import defaultdict, deque
 from datetime import datetime
 import jinja2
-from weasyprint import HTML
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 
 # --- START OF FIX ---
 # A dedicated HTML template for the timetable view. In a real application,
@@ -139,6 +149,169 @@ TIMETABLE_TEMPLATE = """
 """
 # --- END OF FIX ---
 
+logger = logging.getLogger(__name__)
+
+SplitBy = Literal["faculty", "department"]
+
+
+def render_timetable_part(title: str, rows: List[Dict[str, Any]]) -> bytes:
+    """
+    Renders one self-contained timetable PDF. Defined at module level so it
+    can be pickled into a worker process.
+    """
+    return PDFGenerator(title=title)._generate_timetable_view(rows)
+
+
+def _render_windowed(
+    pool: Any,
+    titles: List[str],
+    part_rows: List[List[Dict[str, Any]]],
+    window: int,
+) -> Iterator[bytes]:
+    """
+    Yields the rendered parts in order, keeping at most `window` renders in
+    flight so that finished parts cannot pile up behind a slow one.
+    """
+    jobs = iter(zip(titles, part_rows))
+    in_flight: Deque[Any] = deque()
+
+    def _submit() -> None:
+        job = next(jobs, None)
+        if job is not None:
+            in_flight.append(pool.apply_async(render_timetable_part, job))
+
+    for _ in range(window):
+        _submit()
+    while in_flight:
+        pdf_bytes = in_flight.popleft().get()
+        _submit()
+        yield pdf_bytes
+
+
+class _PdfConcatenator:
+    """
+    Appends the pages of whole PDFs to `output` as they arrive. Each part's
+    objects are renumbered and written straight away; only their byte offsets
+    and the page numbers are kept, and close() writes the page tree, catalog
+    and cross-reference table that tie them together.
+    """
+
+    _ROOT = 1  # The page tree, written last once every kid is known.
+
+    def __init__(self, output: BinaryIO):
+        self.output = output
+        self.position = 0
+        self.offsets: List[Optional[int]] = [None]
+        self.page_ids: List[int] = []
+        self._write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes) -> None:
+        self.output.write(data)
+        self.position += len(data)
+
+    def _reserve(self) -> int:
+        self.offsets.append(None)
+        return len(self.offsets)
+
+    def _write_object(self, object_id: int, body: bytes) -> None:
+        self.offsets[object_id - 1] = self.position
+        self._write(b"%d 0 obj\n" % object_id + body + b"\nendobj\n")
+
+    def append(self, pdf_bytes: bytes) -> None:
+        from pypdf import PdfReader
+        from pypdf.generic import (
+            ArrayObject,
+            DictionaryObject,
+            IndirectObject,
+            NameObject,
+            NumberObject,
+            StreamObject,
+        )
+
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        renumbered: Dict[Tuple[int, int], int] = {}
+        pending: Deque[Any] = deque()
+
+        def ref(indirect: Any) -> Any:
+            key = (indirect.idnum, indirect.generation)
+            if key not in renumbered:
+                renumbered[key] = self._reserve()
+                pending.append(indirect)
+            return IndirectObject(renumbered[key], 0, None)
+
+        def remap(obj: Any) -> Any:
+            if isinstance(obj, IndirectObject):
+                return ref(obj)
+            if isinstance(obj, DictionaryObject):
+                return DictionaryObject(
+                    {key: remap(value) for key, value in dict.items(obj)}
+                )
+            if isinstance(obj, ArrayObject):
+                return ArrayObject(remap(value) for value in list.__iter__(obj))
+            return obj
+
+        # Pages come from reader.pages, which carries inherited attributes
+        # such as /Resources and /MediaBox down onto each page.
+        pages: Dict[Tuple[int, int], Any] = {}
+        for page in reader.pages:
+            indirect = page.indirect_reference
+            self.page_ids.append(ref(indirect).idnum)
+            pages[(indirect.idnum, indirect.generation)] = page
+
+        while pending:
+            indirect = pending.popleft()
+            key = (indirect.idnum, indirect.generation)
+            body = io.BytesIO()
+            if key in pages:
+                page = remap(DictionaryObject(dict.items(pages[key])))
+                page[NameObject("/Parent")] = IndirectObject(self._ROOT, 0, None)
+                page.write_to_stream(body)
+            elif isinstance(indirect.get_object(), StreamObject):
+                stream = indirect.get_object()
+                data = stream._data  # Still encoded, as read from the part.
+                head = remap(DictionaryObject(dict.items(stream)))
+                head[NameObject("/Length")] = NumberObject(len(data))
+                head.write_to_stream(body)
+                body.write(b"\nstream\n" + data + b"\nendstream")
+            else:
+                remap(indirect.get_object()).write_to_stream(body)
+            self._write_object(renumbered[key], body.getvalue())
+
+    def close(self) -> int:
+        """Writes the document trailer and returns the number of pages."""
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self.page_ids)
+        self._write_object(
+            self._ROOT,
+            b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_ids)),
+        )
+        catalog = self._reserve()
+        self._write_object(catalog, b"<< /Type /Catalog /Pages %d 0 R >>" % self._ROOT)
+
+        xref = self.position
+        entries = [b"0000000000 65535 f \n"]
+        entries.extend(b"%010d 00000 n \n" % offset for offset in self.offsets)
+        self._write(b"xref\n0 %d\n" % len(entries) + b"".join(entries))
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(entries), catalog, xref)
+        )
+        return len(self.page_ids)
+
+
+def split_timetable_rows(
+    rows: List[Dict[str, Any]], split_by: SplitBy = "faculty"
+) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """Splits timetable rows into (label, rows) parts, ordered by label."""
+    parts: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        faculty = row.get("faculty_name") or "Uncategorized"
+        if split_by == "department":
+            label = f"{faculty} => {row.get('department_name') or ''}"
+        else:
+            label = faculty
+        parts[label].append(row)
+    return sorted(parts.items())
+
 
 class PDFGenerator:
     """Generates visually appealing PDFs for timetables and simple tabular reports."""
@@ -178,7 +351,9 @@ class PDFGenerator:
         template = self.jinja_env.get_template("timetable.html")
         html_str = template.render(title=self.title, grouped_data=grouped_data)
 
-        # Generate PDF from HTML
+        # Generate PDF from HTML (weasyprint is heavy, so load it on first use)
+        from weasyprint import HTML
+
         assert html_str is not None
         pdf_bytes = HTML(string=html_str).write_pdf()
         return pdf_bytes or b""
@@ -187,6 +362,9 @@ class PDFGenerator:
         self, rows: List[Dict[str, Any]], columns: List[str]
     ) -> bytes:
         """Generates a simple tabular PDF for generic reports (backward compatibility)."""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+
         buffer = io.BytesIO()
         p = canvas.Canvas(buffer, pagesize=letter)
         width, height = letter
@@ -208,6 +386,64 @@ class PDFGenerator:
         buffer.seek(0)
         return buffer.getvalue()
 
+    def generate_timetable_parts(
+        self,
+        rows: List[Dict[str, Any]],
+        output: BinaryIO,
+        split_by: SplitBy = "faculty",
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """
+        Renders the timetable as one PDF per faculty (or department) in a
+        process pool and merges the parts page by page into `output`.
+
+        The pool is billiard's (Celery's fork of multiprocessing), which unlike
+        the standard library may start children from a daemonic prefork worker.
+        At most `workers` parts are rendered ahead of the one being merged, so
+        no more than that many rendered parts wait in memory, and each merged
+        part is written to `output` before the next is read. Falls back to
+        rendering in-process when no pool can be started. Returns the number
+        of pages written.
+        """
+        parts = split_timetable_rows(rows, split_by)
+        if not parts:
+            return 0
+
+        titles = [f"{self.title} - {label}" for label, _ in parts]
+        part_rows = [part for _, part in parts]
+        workers = min(len(parts), max_workers or os.cpu_count() or 1)
+
+        writer = _PdfConcatenator(output)
+
+        def _merge(rendered) -> None:
+            for index, pdf_bytes in enumerate(rendered, start=1):
+                writer.append(pdf_bytes)
+                if progress_callback:
+                    progress_callback(index, len(parts))
+
+        if workers <= 1:
+            _merge(map(render_timetable_part, titles, part_rows))
+        else:
+            try:
+                from billiard import Pool
+
+                pool = Pool(processes=workers)
+            except (ImportError, RuntimeError, AssertionError, OSError) as e:
+                logger.warning(
+                    f"Process pool unavailable ({e}); rendering {len(parts)} "
+                    "timetable part(s) in-process."
+                )
+                _merge(map(render_timetable_part, titles, part_rows))
+            else:
+                try:
+                    _merge(_render_windowed(pool, titles, part_rows, workers))
+                finally:
+                    pool.terminate()
+                    pool.join()
+
+        return writer.close()
+
     def generate(
         self,
         rows: List[Dict[str, Any]],
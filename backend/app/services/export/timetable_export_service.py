@@ -1,14 +1,27 @@
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, BinaryIO, Callable, Iterator, List, Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
+from .csv_exporter import CSVExporter
+from .pdf_generator import PDFGenerator, SplitBy
 from .report_builder import ReportBuilder
 from ...services.data_retrieval.data_retrieval_service import DataRetrievalService
 
 logger = logging.getLogger(__name__)
 
+TIMETABLE_EXPORT_COLUMNS = [
+    "date",
+    "start_time",
+    "end_time",
+    "course_code",
+    "course_title",
+    "rooms",
+    "instructor",
+    "student_count",
+]
+
 
 class TimetableExportService:
     """
@@ -73,6 +86,81 @@ class TimetableExportService:
 
         return processed_rows
 
+    async def load_timetable_rows(
+        self, version_id: UUID
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetches a timetable version's results and flattens them into sorted
+        export rows. Returns None if the version or its data cannot be found.
+        """
+        # 1. Get the job_id from the version_id
+        job_id = await self.data_retrieval_service.get_job_id_from_version(version_id)
+        if not job_id:
+            logger.warning(f"No job found for timetable version ID '{version_id}'.")
+            return None
+
+        # 2. Get the timetable results data from the job
+        timetable_data = await self.data_retrieval_service.get_timetable_job_results(
+            job_id=job_id
+        )
+        if not timetable_data:
+            logger.warning(f"No timetable result data found for job ID '{job_id}'.")
+            return None
+
+        # 3. Process the data into a tabular format
+        rows = self._process_timetable_data(timetable_data)
+        if not rows:
+            logger.warning(
+                f"Processed data for job '{job_id}' resulted in an empty list."
+            )
+            return None
+        return rows
+
+    @staticmethod
+    def export_title(version_id: UUID) -> str:
+        return f"Examination Timetable (Version: {version_id})"
+
+    @staticmethod
+    def iter_csv(rows: List[Dict[str, Any]]) -> Iterator[bytes]:
+        """Streams timetable rows as CSV chunks for a `StreamingResponse`."""
+        return CSVExporter(fieldnames=TIMETABLE_EXPORT_COLUMNS).iter_export(rows)
+
+    async def export_timetable_to_file(
+        self,
+        version_id: UUID,
+        output_format: str,
+        destination: BinaryIO,
+        split_by: SplitBy = "faculty",
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> bool:
+        """
+        Writes a full-session export to `destination`. PDFs are rendered per
+        faculty or department in parallel and merged; CSVs are written in
+        chunks. Returns False if the version has no exportable data.
+        """
+        rows = await self.load_timetable_rows(version_id)
+        if not rows:
+            return False
+
+        if output_format.lower() == "csv":
+            for chunk in self.iter_csv(rows):
+                destination.write(chunk)
+            if progress_callback:
+                progress_callback(1, 1)
+        elif output_format.lower() == "pdf":
+            generator = PDFGenerator(title=self.export_title(version_id))
+            generator.generate_timetable_parts(
+                rows,
+                destination,
+                split_by=split_by,
+                max_workers=max_workers,
+                progress_callback=progress_callback,
+            )
+        else:
+            raise ValueError(f"Unsupported report format: {output_format}")
+        return True
+
     async def export_timetable(
         self, version_id: UUID, output_format: str
     ) -> Optional[bytes]:
@@ -91,46 +179,14 @@ class TimetableExportService:
                 f"Starting export for version '{version_id}' in '{output_format}' format."
             )
 
-            # 1. Get the job_id from the version_id
-            job_id = await self.data_retrieval_service.get_job_id_from_version(
-                version_id
-            )
-            if not job_id:
-                logger.warning(f"No job found for timetable version ID '{version_id}'.")
-                return None
-
-            # 2. Get the timetable results data from the job
-            timetable_data = (
-                await self.data_retrieval_service.get_timetable_job_results(
-                    job_id=job_id
-                )
-            )
-            if not timetable_data:
-                logger.warning(f"No timetable result data found for job ID '{job_id}'.")
-                return None
-
-            # 3. Process the data into a tabular format
-            rows = self._process_timetable_data(timetable_data)
+            rows = await self.load_timetable_rows(version_id)
             if not rows:
-                logger.warning(
-                    f"Processed data for job '{job_id}' resulted in an empty list."
-                )
                 return None
 
-            # 4. Define columns and title for the report
-            columns = [
-                "date",
-                "start_time",
-                "end_time",
-                "course_code",
-                "course_title",
-                "rooms",
-                "instructor",
-                "student_count",
-            ]
-            title = f"Examination Timetable (Version: {version_id})"
-
-            # 5. Build the report using the appropriate builder
+            columns = TIMETABLE_EXPORT_COLUMNS
+            title = self.export_title(version_id)
+
+            # Build the report using the appropriate builder
             if output_format.lower() == "csv":
                 logger.info("Building CSV report.")
                 return self.report_builder.build_csv(rows, columns)
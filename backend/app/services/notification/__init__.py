@@ -5,6 +5,11 @@ Consolidated notification service for real-time updates and email notifications.
 """
 
 from .email_service import EmailService, EmailConfig, EmailMessage
+from .bulk_delivery import (
+    BulkEmailDelivery,
+    BulkDeliveryResult,
+    SMTPConnectionPool,
+)
 from .websocket_manager import (
     ConnectionManager,
     connection_manager,
@@ -23,6 +28,10 @@ __all__ = [
     "EmailService",
     "EmailConfig",
     "EmailMessage",
+    # Bulk email delivery
+    "BulkEmailDelivery",
+    "BulkDeliveryResult",
+    "SMTPConnectionPool",
     # WebSocket manager
     "ConnectionManager",
     "connection_manager",
@@ -0,0 +1,372 @@
+# backend/app/services/notification/bulk_delivery.py
+
+"""
+Pipelined bulk email delivery.
+
+Messages are sent by a fixed number of workers, each borrowing a persistent
+SMTP connection from a bounded pool, so the TLS handshake and login happen
+once per connection instead of once per message. Sends to a server are
+throttled by a token bucket shared by every pipeline in the process. Transient
+failures are queued and retried in later rounds with backoff, without holding
+up or restarting the rest of the batch, and progress is reported at a fixed
+cadence rather than per message.
+"""
+
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .email_service import EmailService, EmailMessage
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name: str, default: Any) -> Any:
+    try:
+        from ...core.config import settings
+
+        return getattr(settings, name, default)
+    except Exception:
+        return default
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` acquisitions per second with a small burst.
+
+    Each acquisition reserves a token under a thread lock and then sleeps
+    until its turn, so the bucket is bound to no event loop: Celery tasks run
+    in a fresh loop each, and light-task workers run several loops at once on
+    threads, all drawing from the same bucket.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token, possibly ahead of time; returns the wait until it is due."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# (server, port) -> limiter, so concurrent batches share one server budget.
+_server_limiters: Dict[Tuple[str, int], RateLimiter] = {}
+_server_limiters_lock = threading.Lock()
+
+
+def get_server_rate_limiter(server: str, port: int, rate: float) -> RateLimiter:
+    with _server_limiters_lock:
+        limiter = _server_limiters.get((server, port))
+        if limiter is None or limiter.rate != rate:
+            limiter = RateLimiter(rate)
+            _server_limiters[(server, port)] = limiter
+        return limiter
+
+
+class ProgressThrottle:
+    """Calls a progress callback at most once per `interval` seconds."""
+
+    def __init__(self, callback: Optional[Callable[..., Any]], interval: float):
+        self.callback = callback
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, *args: Any, force: bool = False) -> None:
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        if force or now - self._last >= self.interval:
+            self._last = now
+            try:
+                self.callback(*args)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+
+
+@dataclass
+class _PooledConnection:
+    server: Optional[smtplib.SMTP] = None
+    messages_sent: int = 0
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of persistent SMTP connections to the configured server.
+
+    Connections are opened lazily, reused across messages and recycled after
+    `max_messages_per_connection` sends; a connection that errors is dropped
+    and reopened on its next use. smtplib is blocking, so each slot runs on a
+    dedicated thread of the pool's executor.
+    """
+
+    def __init__(
+        self,
+        email_service: EmailService,
+        size: int,
+        max_messages_per_connection: int = 500,
+    ):
+        self.email_service = email_service
+        self.size = size
+        self.max_messages_per_connection = max_messages_per_connection
+        self._slots: "asyncio.Queue[_PooledConnection]" = asyncio.Queue()
+        for _ in range(size):
+            self._slots.put_nowait(_PooledConnection())
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="smtp-pool"
+        )
+        self.connections_opened = 0
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[smtplib.SMTP]:
+        slot = await self._slots.get()
+        try:
+            if (
+                slot.server is not None
+                and slot.messages_sent >= self.max_messages_per_connection
+            ):
+                await self._run(self._quit, slot.server)
+                slot.server = None
+            if slot.server is None:
+                slot.server = await self._run(self.email_service.open_smtp_connection)
+                slot.messages_sent = 0
+                self.connections_opened += 1
+            try:
+                yield slot.server
+                slot.messages_sent += 1
+            except (smtplib.SMTPServerDisconnected, OSError):
+                await self._run(self._close, slot.server)
+                slot.server = None
+                raise
+        finally:
+            self._slots.put_nowait(slot)
+
+    async def send(self, msg: Any, from_addr: str, to_addrs: List[str]) -> Dict:
+        """Send one message on a pooled connection; returns refused recipients."""
+        async with self.connection() as server:
+            return await self._run(
+                lambda: server.send_message(msg, from_addr=from_addr, to_addrs=to_addrs)
+            )
+
+    async def close(self) -> None:
+        while not self._slots.empty():
+            slot = self._slots.get_nowait()
+            if slot.server is not None:
+                await self._run(self._quit, slot.server)
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+@dataclass
+class BulkDeliveryResult:
+    total: int
+    sent: int = 0
+    retried: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    connections_opened: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return self.sent + len(self.failed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "sent": self.sent,
+            "failed": len(self.failed),
+            "retried": self.retried,
+            "failed_recipients": self.failed,
+            "connections_opened": self.connections_opened,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+        }
+
+
+class BulkEmailDelivery:
+    """Sends many messages concurrently over a pool of persistent connections."""
+
+    def __init__(
+        self,
+        email_service: Optional[EmailService] = None,
+        pool_size: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_delay: Optional[float] = None,
+        max_messages_per_connection: Optional[int] = None,
+        progress_callback: Optional[Callable[[BulkDeliveryResult], Any]] = None,
+        progress_interval: Optional[float] = None,
+    ):
+        self.email_service = email_service or EmailService()
+        self.pool_size = pool_size or _setting("SMTP_POOL_SIZE", 4)
+        self.rate_per_second = (
+            rate_per_second
+            if rate_per_second is not None
+            else _setting("SMTP_RATE_LIMIT_PER_SECOND", 10.0)
+        )
+        self.max_retries = (
+            max_retries
+            if max_retries is not None
+            else _setting("BULK_EMAIL_MAX_RETRIES", 3)
+        )
+        self.retry_delay = (
+            retry_delay
+            if retry_delay is not None
+            else _setting("BULK_EMAIL_RETRY_DELAY_SECONDS", 30.0)
+        )
+        self.max_messages_per_connection = max_messages_per_connection or _setting(
+            "SMTP_MAX_MESSAGES_PER_CONNECTION", 500
+        )
+        self.progress = ProgressThrottle(
+            progress_callback,
+            (
+                progress_interval
+                if progress_interval is not None
+                else _setting("NOTIFICATION_PROGRESS_INTERVAL_SECONDS", 2.0)
+            ),
+        )
+
+    async def deliver(self, messages: Iterable[EmailMessage]) -> BulkDeliveryResult:
+        """
+        Deliver every message, retrying transient failures in later rounds.
+        Messages that still fail, or are permanently refused, are reported in
+        `result.failed` keyed by recipient.
+        """
+        pending = list(messages)
+        result = BulkDeliveryResult(total=len(pending))
+        start = time.monotonic()
+        config = self.email_service.config
+        limiter = get_server_rate_limiter(
+            config.smtp_server, config.smtp_port, self.rate_per_second
+        )
+        pool = SMTPConnectionPool(
+            self.email_service, self.pool_size, self.max_messages_per_connection
+        )
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                if not pending:
+                    break
+                if attempt:
+                    delay = self.retry_delay * 2 ** (attempt - 1)
+                    logger.info(
+                        f"Retrying {len(pending)} failed emails in {delay:.1f}s "
+                        f"(round {attempt}/{self.max_retries})"
+                    )
+                    await asyncio.sleep(delay)
+                    result.retried += len(pending)
+                last_round = attempt == self.max_retries
+                pending = await self._deliver_round(
+                    pending, pool, limiter, result, last_round
+                )
+        finally:
+            result.connections_opened = pool.connections_opened
+            await pool.close()
+
+        result.elapsed_seconds = time.monotonic() - start
+        self.progress(result, force=True)
+        logger.info(
+            f"Bulk email delivery finished: {result.sent}/{result.total} sent, "
+            f"{len(result.failed)} failed in {result.elapsed_seconds:.1f}s"
+        )
+        return result
+
+    async def _deliver_round(
+        self,
+        messages: List[EmailMessage],
+        pool: SMTPConnectionPool,
+        limiter: RateLimiter,
+        result: BulkDeliveryResult,
+        last_round: bool,
+    ) -> List[EmailMessage]:
+        queue: "asyncio.Queue[EmailMessage]" = asyncio.Queue()
+        for message in messages:
+            queue.put_nowait(message)
+        retry: List[EmailMessage] = []
+
+        async def worker() -> None:
+            while True:
+                try:
+                    message = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                key = ", ".join(message.recipients)
+                try:
+                    await limiter.acquire()
+                    refused = await pool.send(
+                        self.email_service.build_mime_message(message),
+                        self.email_service.config.smtp_from,
+                        self.email_service.all_recipients(message),
+                    )
+                    result.failed.pop(key, None)
+                    if refused:
+                        result.failed[key] = f"Refused recipients: {sorted(refused)}"
+                    else:
+                        result.sent += 1
+                except Exception as e:
+                    if self._is_permanent(e) or last_round:
+                        result.failed[key] = str(e)
+                    else:
+                        retry.append(message)
+                    logger.warning(f"Email to {key} failed: {e}")
+                self.progress(result)
+
+        workers = min(self.pool_size, len(messages))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return retry
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        """5xx replies (bad mailbox, rejected content) are not worth retrying."""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(code >= 500 for code, _ in error.recipients.values())
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code >= 500
+        return False
@@ -6,8 +6,10 @@ retry logic, and configuration management.
 """
 
 import logging
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Union, Dict, Any
+from typing import List, Optional, Union, Dict, Any, Tuple
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -16,10 +18,41 @@ import smtplib
 import ssl
 import asyncio
 from dataclasses import dataclass
+from jinja2 import Environment, Template, Undefined
 
 logger = logging.getLogger(__name__)
 
 
+class _LiteralUndefined(Undefined):
+    """Renders a missing context key as its `{{key}}` placeholder, unchanged."""
+
+    def __str__(self) -> str:
+        return f"{{{{{self._undefined_name}}}}}"
+
+
+_template_environment = Environment(
+    keep_trailing_newline=True, undefined=_LiteralUndefined
+)
+
+
+@lru_cache(maxsize=128)
+def compile_template(source: str) -> Template:
+    """Compiles template source once per process."""
+    return _template_environment.from_string(source)
+
+
+def render_batch(
+    subject_source: str, body_source: str, contexts: List[Dict[str, Any]]
+) -> List[Tuple[str, str]]:
+    """
+    Renders (subject, body) for each context. Module-level and keyed by source
+    so process-pool workers can compile each template once and reuse it.
+    """
+    subject = compile_template(subject_source)
+    body = compile_template(body_source)
+    return [(subject.render(context), body.render(context)) for context in contexts]
+
+
 @dataclass
 class EmailConfig:
     """Email configuration container"""
@@ -52,7 +85,8 @@ class EmailService:
 
     def __init__(self, config: Optional[EmailConfig] = None):
         self.config = config or self._load_config_from_settings()
-        self._template_cache: Dict[str, str] = {}
+        self._template_cache: Dict[str, Template] = {}
+        self._template_sources: Dict[str, str] = {}
 
     def _load_config_from_settings(self) -> EmailConfig:
         """Load email configuration from settings"""
@@ -163,38 +197,82 @@ class EmailService:
             logger.error(f"Email service error: {e}", exc_info=True)
             return False
 
+    async def get_template(self, template_name: str) -> Optional[Template]:
+        """Return the compiled template, loading and compiling it on first use"""
+        template = self._template_cache.get(template_name)
+        if template is None:
+            source = await self._load_template(template_name)
+            if not source:
+                return None
+            template = compile_template(source)
+            self._template_sources[template_name] = source
+            self._template_cache[template_name] = template
+        return template
+
     async def _render_template(
         self, template_name: str, context: Dict[str, Any]
     ) -> Optional[str]:
         """Render email template with context"""
         try:
-            # Try to load template from cache
-            if template_name in self._template_cache:
-                template_content = self._template_cache[template_name]
-            else:
-                # Load template from file
-                template_content = await self._load_template(template_name)  # type: ignore
-                if template_content:
-                    self._template_cache[template_name] = template_content
-                else:
-                    return None
-
-            # Handle case where template_content might be None
-            if template_content is None:
+            template = await self.get_template(template_name)
+            if template is None:
                 return None
-
-            # Simple template rendering (in production, use Jinja2 or similar)
-            rendered = template_content
-            for key, value in context.items():
-                placeholder = f"{{{{{key}}}}}"
-                rendered = rendered.replace(placeholder, str(value))
-
-            return rendered
+            return template.render(context)
 
         except Exception as e:
             logger.error(f"Template rendering failed: {e}")
             return None
 
+    async def render_bulk(
+        self,
+        template_name: str,
+        subject: str,
+        contexts: List[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> Optional[List[Tuple[str, str]]]:
+        """
+        Render (subject, body) for every context in order. Batches larger than
+        `chunk_size` are split across a process pool, falling back to
+        in-process rendering where a pool cannot be started.
+
+        Rendering runs in an executor thread, so the pool is billiard's with a
+        spawn context: forking from a thread of a multi-threaded process can
+        copy locks held by other threads into the children.
+        """
+        if await self.get_template(template_name) is None:
+            return None
+        body_source = self._template_sources[template_name]
+        chunks = [
+            contexts[i : i + chunk_size] for i in range(0, len(contexts), chunk_size)
+        ]
+        workers = min(len(chunks), max_workers or os.cpu_count() or 1)
+
+        def _render() -> List[Tuple[str, str]]:
+            if workers <= 1:
+                return render_batch(subject, body_source, contexts)
+            try:
+                from billiard import get_context
+
+                pool = get_context("spawn").Pool(processes=workers)
+            except (ImportError, RuntimeError, AssertionError, OSError) as e:
+                logger.warning(
+                    f"Process pool unavailable ({e}); rendering "
+                    f"{len(contexts)} emails in-process."
+                )
+                return render_batch(subject, body_source, contexts)
+            try:
+                parts = pool.starmap(
+                    render_batch, [(subject, body_source, chunk) for chunk in chunks]
+                )
+                return [rendered for part in parts for rendered in part]
+            finally:
+                pool.terminate()
+                pool.join()
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _render)
+
     async def _load_template(self, template_name: str) -> Optional[str]:
         """Load template from file system"""
         try:
@@ -220,47 +298,51 @@ class EmailService:
     async def _send_message(self, message: EmailMessage) -> bool:
         """Send email message via SMTP"""
         try:
-            # Create MIME message
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = message.subject
-            msg["From"] = self.config.smtp_from
-            msg["To"] = ", ".join(message.recipients)
-
-            if message.cc:
-                msg["Cc"] = ", ".join(message.cc)
-
-            # Add text and HTML parts
-            if message.text_body:
-                text_part = MIMEText(message.text_body, "plain", "utf-8")
-                msg.attach(text_part)
-
-            if message.html_body:
-                html_part = MIMEText(message.html_body, "html", "utf-8")
-                msg.attach(html_part)
-
-            # Add attachments
-            if message.attachments:
-                for attachment in message.attachments:
-                    await self._add_attachment(msg, attachment)
-
-            # Prepare recipient list
-            all_recipients = message.recipients.copy()
-            if message.cc:
-                all_recipients.extend(message.cc)
-            if message.bcc:
-                all_recipients.extend(message.bcc)
-
-            # Send email
-            await self._send_via_smtp(msg, all_recipients)
+            msg = self.build_mime_message(message)
+            await self._send_via_smtp(msg, self.all_recipients(message))
             return True
 
         except Exception as e:
             logger.error(f"Failed to send message: {e}")
             return False
 
-    async def _add_attachment(
-        self, msg: MIMEMultipart, attachment: Dict[str, Any]
-    ) -> None:
+    def build_mime_message(self, message: EmailMessage) -> MIMEMultipart:
+        """Build the MIME message for an EmailMessage"""
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = message.subject
+        msg["From"] = self.config.smtp_from
+        msg["To"] = ", ".join(message.recipients)
+
+        if message.cc:
+            msg["Cc"] = ", ".join(message.cc)
+
+        # Add text and HTML parts
+        if message.text_body:
+            text_part = MIMEText(message.text_body, "plain", "utf-8")
+            msg.attach(text_part)
+
+        if message.html_body:
+            html_part = MIMEText(message.html_body, "html", "utf-8")
+            msg.attach(html_part)
+
+        # Add attachments
+        if message.attachments:
+            for attachment in message.attachments:
+                self._add_attachment(msg, attachment)
+
+        return msg
+
+    @staticmethod
+    def all_recipients(message: EmailMessage) -> List[str]:
+        """To, Cc and Bcc addresses of a message"""
+        all_recipients = message.recipients.copy()
+        if message.cc:
+            all_recipients.extend(message.cc)
+        if message.bcc:
+            all_recipients.extend(message.bcc)
+        return all_recipients
+
+    def _add_attachment(self, msg: MIMEMultipart, attachment: Dict[str, Any]) -> None:
         """Add attachment to email message"""
         try:
             filename = attachment.get("filename", "attachment")
@@ -281,40 +363,47 @@ class EmailService:
                 f"Failed to add attachment {attachment.get('filename', 'unknown')}: {e}"
             )
 
+    def open_smtp_connection(self, timeout: Optional[int] = None) -> smtplib.SMTP:
+        """
+        Open an SMTP connection with TLS and authentication applied.
+        Blocking; call it from an executor.
+        """
+        timeout = timeout or self.config.timeout
+        server: smtplib.SMTP
+        if self.config.use_ssl:
+            server = smtplib.SMTP_SSL(
+                self.config.smtp_server, self.config.smtp_port, timeout=timeout
+            )
+        else:
+            server = smtplib.SMTP(
+                self.config.smtp_server, self.config.smtp_port, timeout=timeout
+            )
+
+        try:
+            if self.config.use_tls and not self.config.use_ssl:
+                server.starttls(context=ssl.create_default_context())
+
+            # Authenticate if credentials provided
+            if self.config.smtp_user and self.config.smtp_password:
+                server.login(self.config.smtp_user, self.config.smtp_password)
+        except Exception:
+            server.close()
+            raise
+
+        return server
+
     async def _send_via_smtp(self, msg: MIMEMultipart, recipients: List[str]) -> None:
         """Send email via SMTP server"""
 
         def _send_sync():
-            # Create SMTP connection
-            if self.config.use_ssl:
-                server = smtplib.SMTP_SSL(
-                    self.config.smtp_server,
-                    self.config.smtp_port,
-                    timeout=self.config.timeout,
-                )
-            else:
-                server = smtplib.SMTP(
-                    self.config.smtp_server,
-                    self.config.smtp_port,
-                    timeout=self.config.timeout,
-                )
-
+            server = self.open_smtp_connection()
             try:
-                if self.config.use_tls and not self.config.use_ssl:
-                    server.starttls(context=ssl.create_default_context())
-
-                # Authenticate if credentials provided
-                if self.config.smtp_user and self.config.smtp_password:
-                    server.login(self.config.smtp_user, self.config.smtp_password)
-
-                # Send email
                 server.send_message(msg, to_addrs=recipients)
-
             finally:
                 server.quit()
 
         # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         await loop.run_in_executor(None, _send_sync)
 
     async def send_job_notification(
@@ -382,27 +471,13 @@ class EmailService:
         try:
 
             def _test_sync():
-                if self.config.use_ssl:
-                    server = smtplib.SMTP_SSL(
-                        self.config.smtp_server, self.config.smtp_port, timeout=10
-                    )
-                else:
-                    server = smtplib.SMTP(
-                        self.config.smtp_server, self.config.smtp_port, timeout=10
-                    )
-
+                server = self.open_smtp_connection(timeout=10)
                 try:
-                    if self.config.use_tls and not self.config.use_ssl:
-                        server.starttls(context=ssl.create_default_context())
-
-                    if self.config.smtp_user and self.config.smtp_password:
-                        server.login(self.config.smtp_user, self.config.smtp_password)
-
                     return True
                 finally:
                     server.quit()
 
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(None, _test_sync)
 
             if result:
@@ -7,7 +7,9 @@ and managing the scheduling process.
 """
 
 from .data_preparation_service import ExactDataFlowService
+from .columnar_dataset_loader import ColumnarDatasetLoader, ColumnarSchedulingDataset
 from .conflict_detection_service import ConflictDetectionService
+from .edit_validation_service import EditValidationService
 from .scheduling_service import SchedulingService
 from .timetable_management_service import TimetableManagementService
 from .enrichment_service import EnrichmentService
@@ -15,7 +17,10 @@ from .enrichment_service import EnrichmentService
 
 __all__ = [
     "ExactDataFlowService",
+    "ColumnarDatasetLoader",
+    "ColumnarSchedulingDataset",
     "ConflictDetectionService",
+    "EditValidationService",
     "SchedulingService",
     "TimetableManagementService",
     "EnrichmentService",
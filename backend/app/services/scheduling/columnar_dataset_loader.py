@@ -0,0 +1,631 @@
+# backend/app/services/scheduling/columnar_dataset_loader.py
+"""
+Columnar scheduling dataset loader.
+
+`exam_system.get_scheduling_dataset` assembles a whole session into one nested
+jsonb document, which PostgreSQL, asyncpg, `json.loads` and `ExactDataMapper`
+all have to materialise in full. For large sessions this loader instead
+streams each entity as typed rows over a server-side cursor and appends them
+to column buffers (NumPy arrays for numeric and index columns, plain lists
+for identifiers and labels). Registrations are dictionary-encoded into
+(exam index, student code, registration type code) arrays, which
+`ExamSchedulingProblem.load_from_columnar` consumes directly.
+
+The jsonb function remains the path for small sessions and for anything that
+still expects `ProblemModelCompatibleDataset`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from array import array
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import text
+
+from ...config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Column type tags understood by ColumnBuffer. Anything else is kept as a list.
+_ARRAY_TYPECODES = {"int32": ("i", np.int32), "int8": ("b", np.int8)}
+
+MAX_DURATION_MINUTES = 540
+
+
+class ColumnBuffer:
+    """Accumulates streamed rows into per-column buffers."""
+
+    def __init__(self, schema: Dict[str, str]):
+        self.schema = schema
+        self._columns: Dict[str, Any] = {
+            name: array(_ARRAY_TYPECODES[kind][0]) if kind in _ARRAY_TYPECODES else []
+            for name, kind in schema.items()
+        }
+        self.size = 0
+
+    def append(self, row: Sequence[Any]) -> None:
+        for column, value in zip(self._columns.values(), row):
+            column.append(value)
+        self.size += 1
+
+    def finish(self) -> Dict[str, Any]:
+        """Returns the columns, converting numeric buffers to NumPy arrays."""
+        finished: Dict[str, Any] = {}
+        for name, kind in self.schema.items():
+            column = self._columns[name]
+            if kind in _ARRAY_TYPECODES:
+                finished[name] = np.frombuffer(column, dtype=_ARRAY_TYPECODES[kind][1])
+            else:
+                finished[name] = column
+        return finished
+
+
+@dataclass
+class ColumnarSchedulingDataset:
+    """A scheduling session held as column buffers rather than a dict tree."""
+
+    session_id: UUID
+    exam_period_start: date
+    exam_period_end: date
+    slot_generation_mode: str = "fixed"
+
+    # Small, already-structured sections in the same shape as the jsonb path.
+    days: List[Dict[str, Any]] = field(default_factory=list)
+    constraints: Dict[str, Any] = field(default_factory=dict)
+    locks: List[Dict[str, Any]] = field(default_factory=list)
+
+    # Entity columns.
+    exams: Dict[str, Any] = field(default_factory=dict)
+    students: Dict[str, Any] = field(default_factory=dict)
+    rooms: Dict[str, Any] = field(default_factory=dict)
+    invigilators: Dict[str, Any] = field(default_factory=dict)
+
+    # Exam, room and staff side tables, keyed by row index into the entity
+    # columns.
+    exam_instructors: Dict[str, Any] = field(default_factory=dict)
+    exam_departments: Dict[str, Any] = field(default_factory=dict)
+    exam_faculties: Dict[str, Any] = field(default_factory=dict)
+    room_departments: Dict[str, Any] = field(default_factory=dict)
+    staff_unavailability: Dict[str, Any] = field(default_factory=dict)
+
+    # Registrations: exam row index, student code and registration type code.
+    registrations: Dict[str, Any] = field(default_factory=dict)
+    registration_students: List[UUID] = field(default_factory=list)
+    registration_types: List[Optional[str]] = field(default_factory=list)
+
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def exam_count(self) -> int:
+        return len(self.exams.get("id", []))
+
+    @property
+    def registration_count(self) -> int:
+        return len(self.registrations.get("exam_idx", []))
+
+
+class ColumnarDatasetLoader:
+    """Streams a job's scheduling data into a ColumnarSchedulingDataset."""
+
+    def __init__(self, session, batch_size: Optional[int] = None):
+        self.session = session
+        self.batch_size = batch_size or get_settings().COLUMNAR_DATASET_BATCH_ROWS
+
+    async def should_use(self, job_id: UUID, requested: Optional[str] = None) -> bool:
+        """
+        Decides between the columnar loader and the jsonb function.
+
+        `requested` (a job option) or the SCHEDULING_DATASET_LOADER setting may
+        force "columnar" or "jsonb"; "auto" picks columnar once the session has
+        at least COLUMNAR_DATASET_MIN_REGISTRATIONS registrations.
+        """
+        settings = get_settings()
+        mode = (requested or settings.SCHEDULING_DATASET_LOADER).lower()
+        if mode in ("columnar", "jsonb"):
+            return mode == "columnar"
+
+        result = await self.session.execute(
+            text("""
+                SELECT count(*)
+                FROM exam_system.course_registrations cr
+                JOIN exam_system.timetable_jobs tj ON tj.session_id = cr.session_id
+                WHERE tj.id = :job_id
+                """),
+            {"job_id": job_id},
+        )
+        registrations = result.scalar_one()
+        use_columnar = registrations >= settings.COLUMNAR_DATASET_MIN_REGISTRATIONS
+        logger.info(
+            f"Job {job_id} session has {registrations} registrations; using "
+            f"{'columnar' if use_columnar else 'jsonb'} dataset loader."
+        )
+        return use_columnar
+
+    async def load(self, job_id: UUID) -> ColumnarSchedulingDataset:
+        """Loads every section of the job's session into column buffers."""
+        started = datetime.now()
+        context = await self._load_job_context(job_id)
+        session_id = context["session_id"]
+
+        dataset = ColumnarSchedulingDataset(
+            session_id=session_id,
+            exam_period_start=context["start_date"],
+            exam_period_end=context["end_date"],
+            slot_generation_mode=context["slot_generation_mode"] or "fixed",
+        )
+        dataset.days = await self._load_days(context)
+        dataset.constraints = await self._load_constraints(context)
+        dataset.locks = await self._load_locks(context["scenario_id"])
+
+        params = {"session_id": session_id}
+        dataset.exams = await self._load_columns(
+            """
+            SELECT e.id, e.course_id, c.code, c.title, e.duration_minutes,
+                   e.expected_students, e.is_practical, e.morning_only
+            FROM exam_system.exams e
+            JOIN exam_system.courses c ON e.course_id = c.id
+            WHERE e.session_id = :session_id
+            ORDER BY e.id
+            """,
+            params,
+            {
+                "id": "object",
+                "course_id": "object",
+                "course_code": "object",
+                "course_title": "object",
+                "duration_minutes": "int32",
+                "expected_students": "int32",
+                "is_practical": "int8",
+                "morning_only": "int8",
+            },
+            convert=self._convert_exam_row,
+        )
+        exam_index = {exam_id: i for i, exam_id in enumerate(dataset.exams["id"])}
+
+        dataset.exam_instructors = await self._load_indexed(
+            """
+            SELECT DISTINCT e.id, st.id, st.first_name, st.last_name, u.email,
+                   d.name
+            FROM exam_system.exams e
+            JOIN exam_system.course_instructors ci
+              ON ci.course_id = e.course_id AND ci.session_id = :session_id
+            JOIN exam_system.staff st ON st.id = ci.staff_id
+            LEFT JOIN exam_system.users u ON st.user_id = u.id
+            LEFT JOIN exam_system.departments d ON st.department_id = d.id
+            WHERE e.session_id = :session_id
+            """,
+            params,
+            exam_index,
+            ["id", "first_name", "last_name", "email", "department"],
+        )
+        dataset.exam_departments = await self._load_indexed(
+            """
+            SELECT e.id, d.id, d.name
+            FROM exam_system.exams e
+            JOIN exam_system.course_departments cd
+              ON cd.course_id = e.course_id AND cd.session_id = :session_id
+            JOIN exam_system.departments d ON cd.department_id = d.id
+            WHERE e.session_id = :session_id
+            """,
+            params,
+            exam_index,
+            ["id", "name"],
+        )
+        dataset.exam_faculties = await self._load_indexed(
+            """
+            SELECT e.id, f.id, f.name
+            FROM exam_system.exams e
+            JOIN exam_system.course_faculties cf
+              ON cf.course_id = e.course_id AND cf.session_id = :session_id
+            JOIN exam_system.faculties f ON cf.faculty_id = f.id
+            WHERE e.session_id = :session_id
+            UNION
+            SELECT e.id, f.id, f.name
+            FROM exam_system.exams e
+            JOIN exam_system.course_departments cd
+              ON cd.course_id = e.course_id AND cd.session_id = :session_id
+            JOIN exam_system.departments d ON cd.department_id = d.id
+            JOIN exam_system.faculties f ON d.faculty_id = f.id
+            WHERE e.session_id = :session_id
+            """,
+            params,
+            exam_index,
+            ["id", "name"],
+        )
+
+        dataset.students = await self._load_columns(
+            """
+            SELECT s.id, s.matric_number, d.name
+            FROM exam_system.students s
+            JOIN exam_system.programmes p ON s.programme_id = p.id
+            JOIN exam_system.departments d ON p.department_id = d.id
+            WHERE s.session_id = :session_id
+            """,
+            params,
+            {"id": "object", "matric_number": "object", "department": "object"},
+        )
+        await self._load_registrations(dataset, exam_index, params)
+
+        dataset.rooms = await self._load_columns(
+            """
+            SELECT r.id, r.code, r.capacity, r.exam_capacity, r.overbookable,
+                   r.has_computers, b.name, b.faculty_id, r.adjacency_pairs
+            FROM exam_system.rooms r
+            JOIN exam_system.buildings b ON r.building_id = b.id
+            WHERE r.is_active = true AND r.session_id = :session_id
+            """,
+            params,
+            {
+                "id": "object",
+                "code": "object",
+                "capacity": "int32",
+                "exam_capacity": "int32",
+                "overbookable": "int8",
+                "has_computers": "int8",
+                "building_name": "object",
+                "building_faculty_id": "object",
+                "adjacent_seat_pairs": "object",
+            },
+            convert=self._convert_room_row,
+        )
+        room_index = {room_id: i for i, room_id in enumerate(dataset.rooms["id"])}
+        dataset.room_departments = await self._load_indexed(
+            """
+            SELECT rd.room_id, d.id, d.name
+            FROM exam_system.room_departments rd
+            JOIN exam_system.departments d ON rd.department_id = d.id
+            JOIN exam_system.rooms r ON r.id = rd.room_id
+            WHERE r.is_active = true AND r.session_id = :session_id
+            """,
+            params,
+            room_index,
+            ["id", "name"],
+        )
+
+        dataset.invigilators = await self._load_columns(
+            """
+            SELECT s.id, s.first_name, s.last_name, u.email, s.department_id,
+                   d.name, s.staff_number, s.staff_type::text, s.can_invigilate,
+                   s.max_concurrent_exams, s.max_students_per_invigilator,
+                   s.max_daily_sessions, s.max_consecutive_sessions
+            FROM exam_system.staff s
+            LEFT JOIN exam_system.departments d ON s.department_id = d.id
+            LEFT JOIN exam_system.users u ON s.user_id = u.id
+            WHERE s.is_active = true AND s.can_invigilate = true
+              AND s.session_id = :session_id
+            """,
+            params,
+            {
+                "id": "object",
+                "first_name": "object",
+                "last_name": "object",
+                "email": "object",
+                "department_id": "object",
+                "department": "object",
+                "staff_number": "object",
+                "staff_type": "object",
+                "can_invigilate": "int8",
+                "max_concurrent_exams": "int32",
+                "max_students_per_exam": "int32",
+                "max_daily_sessions": "int32",
+                "max_consecutive_sessions": "int32",
+            },
+            convert=self._convert_staff_row,
+        )
+        staff_index = {
+            staff_id: i for i, staff_id in enumerate(dataset.invigilators["id"])
+        }
+        dataset.staff_unavailability = await self._load_indexed(
+            """
+            SELECT su.staff_id, su.unavailable_date::text, su.time_slot_period
+            FROM exam_system.staff_unavailability su
+            WHERE su.session_id = :session_id
+            """,
+            params,
+            staff_index,
+            ["date", "periods"],
+        )
+
+        dataset.metadata = {
+            "created_at": datetime.now().isoformat(),
+            "total_exams": dataset.exam_count,
+            "total_students": len(dataset.students["id"]),
+            "total_rooms": len(dataset.rooms["id"]),
+            "total_registrations": dataset.registration_count,
+            "total_days": len(dataset.days),
+            "dataset_version": "2.0-columnar",
+            "load_seconds": (datetime.now() - started).total_seconds(),
+        }
+        logger.info(f"Columnar dataset for job {job_id} loaded: {dataset.metadata}")
+
+        if dataset.exam_count == 0:
+            raise ValueError("No valid exams could be loaded")
+        if len(dataset.rooms["id"]) == 0:
+            raise ValueError("No valid rooms could be loaded")
+        if not dataset.days:
+            raise ValueError("No exam days defined for the session.")
+        return dataset
+
+    # ------------------------------------------------------------------
+    # Streaming helpers
+    # ------------------------------------------------------------------
+
+    async def _stream(self, sql: str, params: Dict[str, Any]) -> AsyncIterator[Any]:
+        """Yields row batches from a server-side cursor."""
+        result = await self.session.stream(text(sql), params)
+        async for partition in result.partitions(self.batch_size):
+            yield partition
+
+    async def _load_columns(
+        self,
+        sql: str,
+        params: Dict[str, Any],
+        schema: Dict[str, str],
+        convert=None,
+    ) -> Dict[str, Any]:
+        buffer = ColumnBuffer(schema)
+        async for rows in self._stream(sql, params):
+            for row in rows:
+                buffer.append(convert(row) if convert else row)
+        return buffer.finish()
+
+    async def _load_indexed(
+        self,
+        sql: str,
+        params: Dict[str, Any],
+        owner_index: Dict[Any, int],
+        columns: List[str],
+    ) -> Dict[str, Any]:
+        """Loads a side table whose first column is the owning entity's id."""
+        schema = {"owner_idx": "int32", **{name: "object" for name in columns}}
+        buffer = ColumnBuffer(schema)
+        async for rows in self._stream(sql, params):
+            for owner_id, *values in rows:
+                idx = owner_index.get(owner_id)
+                if idx is not None:
+                    buffer.append((idx, *values))
+        return buffer.finish()
+
+    async def _load_registrations(
+        self,
+        dataset: ColumnarSchedulingDataset,
+        exam_index: Dict[Any, int],
+        params: Dict[str, Any],
+    ) -> None:
+        """Dictionary-encodes registrations into three parallel arrays."""
+        exam_idx, student_code, type_code = array("i"), array("i"), array("b")
+        student_codes: Dict[Any, int] = {}
+        type_codes: Dict[Optional[str], int] = {}
+
+        async for rows in self._stream(
+            """
+            SELECT e.id, cr.student_id, cr.registration_type
+            FROM exam_system.course_registrations cr
+            JOIN exam_system.exams e
+              ON e.course_id = cr.course_id AND e.session_id = cr.session_id
+            WHERE cr.session_id = :session_id
+            """,
+            params,
+        ):
+            for exam_id, student_id, registration_type in rows:
+                idx = exam_index.get(exam_id)
+                if idx is None:
+                    continue
+                code = student_codes.get(student_id)
+                if code is None:
+                    code = student_codes[student_id] = len(student_codes)
+                tcode = type_codes.get(registration_type)
+                if tcode is None:
+                    tcode = type_codes[registration_type] = len(type_codes)
+                exam_idx.append(idx)
+                student_code.append(code)
+                type_code.append(tcode)
+
+        dataset.registrations = {
+            "exam_idx": np.frombuffer(exam_idx, dtype=np.int32),
+            "student_code": np.frombuffer(student_code, dtype=np.int32),
+            "type_code": np.frombuffer(type_code, dtype=np.int8),
+        }
+        dataset.registration_students = list(student_codes)
+        dataset.registration_types = list(type_codes)
+
+    # ------------------------------------------------------------------
+    # Row conversion (mirrors ExactDataMapper's normalisation)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _convert_exam_row(row) -> tuple:
+        exam_id, course_id, code, title, duration, expected, practical, morning = row
+        if not duration or duration <= 0:
+            logger.warning(
+                f"Invalid duration_minutes for exam {exam_id}: {duration}, using default 180"
+            )
+            duration = 180
+        elif duration > MAX_DURATION_MINUTES:
+            logger.error(
+                f"CRITICAL: Exam {exam_id} has a duration of {duration} minutes, which exceeds the daily maximum of {MAX_DURATION_MINUTES}. Capping duration."
+            )
+            duration = MAX_DURATION_MINUTES
+        return (
+            exam_id,
+            course_id,
+            code or f"COURSE_{course_id}",
+            title or "Unknown Course",
+            int(duration),
+            max(int(expected or 0), 0),
+            int(bool(practical)),
+            int(bool(morning)),
+        )
+
+    @staticmethod
+    def _convert_room_row(row) -> tuple:
+        *head, adjacency = row
+        if isinstance(adjacency, str):
+            adjacency = json.loads(adjacency)
+        if not isinstance(adjacency, list):
+            adjacency = []
+        room_id, code, capacity, exam_capacity, overbookable, computers = head[:6]
+        return (
+            room_id,
+            code or "",
+            int(capacity or 0),
+            int(exam_capacity if exam_capacity is not None else capacity or 0),
+            int(bool(overbookable)),
+            int(bool(computers)),
+            head[6],
+            head[7],
+            adjacency,
+        )
+
+    @staticmethod
+    def _convert_staff_row(row) -> tuple:
+        return (
+            *row[:8],
+            int(row[8] if row[8] is not None else True),
+            int(row[9] or 1),
+            int(row[10] or 50),
+            int(row[11] or 2),
+            int(row[12] or 1),
+        )
+
+    # ------------------------------------------------------------------
+    # Small sections
+    # ------------------------------------------------------------------
+
+    async def _load_job_context(self, job_id: UUID) -> Dict[str, Any]:
+        result = await self.session.execute(
+            text("""
+                SELECT tj.session_id, tj.configuration_id, tj.scenario_id,
+                       s.start_date, s.end_date, s.timeslot_template_id,
+                       s.slot_generation_mode::text AS slot_generation_mode
+                FROM exam_system.timetable_jobs tj
+                JOIN exam_system.academic_sessions s ON tj.session_id = s.id
+                WHERE tj.id = :job_id
+                """),
+            {"job_id": job_id},
+        )
+        row = result.mappings().one_or_none()
+        if row is None:
+            raise ValueError(f"Timetable job with ID {job_id} not found")
+        context = dict(row)
+
+        # Fall back to the default configuration like get_scheduling_dataset.
+        result = await self.session.execute(
+            text("""
+                SELECT sc.id, sc.constraint_config_id, sc.solver_parameters
+                FROM exam_system.system_configurations sc
+                WHERE sc.id = CAST(:configuration_id AS uuid) OR sc.is_default = true
+                ORDER BY (sc.id = CAST(:configuration_id AS uuid)) DESC NULLS LAST
+                LIMIT 1
+                """),
+            {"configuration_id": context["configuration_id"]},
+        )
+        config = result.mappings().one_or_none()
+        if config is None:
+            raise ValueError("No default system configuration found. Cannot proceed.")
+        context["configuration_id"] = config["id"]
+        context["constraint_config_id"] = config["constraint_config_id"]
+        context["solver_parameters"] = config["solver_parameters"]
+        return context
+
+    async def _load_days(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        result = await self.session.execute(
+            text("""
+                SELECT id, period_name, start_time, end_time
+                FROM exam_system.timeslot_template_periods
+                WHERE timeslot_template_id = :template_id
+                ORDER BY start_time
+                """),
+            {"template_id": context["timeslot_template_id"]},
+        )
+        periods = [
+            {
+                "id": str(period_id),
+                "period_name": name,
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+            }
+            for period_id, name, start, end in result.all()
+        ]
+
+        days = []
+        current, end_date = context["start_date"], context["end_date"]
+        while current <= end_date:
+            if current.weekday() < 5:  # No weekend exams, as in the jsonb path.
+                days.append({"exam_date": current.isoformat(), "time_periods": periods})
+            current += timedelta(days=1)
+        return days
+
+    async def _load_constraints(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        result = await self.session.execute(
+            text("""
+                WITH rule_params AS (
+                    SELECT cp.rule_id,
+                           jsonb_object_agg(
+                               cp.key,
+                               CASE
+                                   WHEN cp.data_type = 'integer' THEN to_jsonb(cp.default_value::bigint)
+                                   WHEN cp.data_type = 'float' THEN to_jsonb(cp.default_value::double precision)
+                                   WHEN cp.data_type = 'boolean' THEN to_jsonb(cp.default_value::boolean)
+                                   ELSE to_jsonb(cp.default_value)
+                               END
+                           ) AS params
+                    FROM exam_system.constraint_parameters cp
+                    GROUP BY cp.rule_id
+                )
+                SELECT cr.id, cr.code, cr.name, cr.description, cr.type,
+                       cr.category, crs.weight, crs.is_enabled,
+                       (COALESCE(rp.params, '{}'::jsonb)
+                        || COALESCE(crs.parameter_overrides, '{}'::jsonb))::text
+                       AS custom_parameters
+                FROM exam_system.configuration_rule_settings crs
+                JOIN exam_system.constraint_rules cr ON crs.rule_id = cr.id
+                LEFT JOIN rule_params rp ON cr.id = rp.rule_id
+                WHERE crs.configuration_id = :constraint_config_id
+                """),
+            {"constraint_config_id": context["constraint_config_id"]},
+        )
+        rules = []
+        for row in result.mappings():
+            rule = dict(row)
+            rule["id"] = str(rule["id"])
+            rule["weight"] = (
+                float(rule["weight"]) if rule["weight"] is not None else None
+            )
+            rule["custom_parameters"] = json.loads(rule["custom_parameters"] or "{}")
+            rules.append(rule)
+
+        solver_parameters = context["solver_parameters"]
+        if isinstance(solver_parameters, str):
+            solver_parameters = json.loads(solver_parameters)
+        return {
+            "system_configuration_id": str(context["configuration_id"]),
+            "solver_parameters": solver_parameters,
+            "rules": rules,
+        }
+
+    async def _load_locks(self, scenario_id: Optional[UUID]) -> List[Dict[str, Any]]:
+        result = await self.session.execute(
+            text("""
+                SELECT exam_id, exam_date, timeslot_template_period_id, room_ids
+                FROM exam_system.timetable_locks
+                WHERE is_active = true
+                  AND (CAST(:scenario_id AS uuid) IS NULL OR scenario_id = :scenario_id)
+                """),
+            {"scenario_id": scenario_id},
+        )
+        return [
+            {
+                "exam_id": str(exam_id),
+                "exam_date": exam_date.isoformat() if exam_date else None,
+                "timeslot_period_id": str(period_id) if period_id else None,
+                "room_ids": [str(r) for r in room_ids] if room_ids else None,
+            }
+            for exam_id, exam_date, period_id, room_ids in result.all()
+        ]
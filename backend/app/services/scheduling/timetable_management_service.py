@@ -9,6 +9,10 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
+from ..auditing import AuditService
+from ..data_retrieval.dashboard_cache_service import DashboardCacheService
+from .edit_validation_service import EditValidationService
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,18 +38,43 @@ class TimetableManagementService:
         query = text(
             "SELECT exam_system.create_manual_timetable_edit(:p_version_id, :p_exam_id, :p_edited_by, :p_new_values, :p_old_values, :p_reason)"
         )
-        result = await self.session.execute(
-            query,
-            {
-                "p_version_id": version_id,
-                "p_exam_id": exam_id,
-                "p_edited_by": edited_by,
-                "p_new_values": json.dumps(new_values, default=str),
-                "p_old_values": json.dumps(old_values, default=str),
-                "p_reason": reason,
-            },
-        )
-        return result.scalar_one()
+        try:
+            result = await self.session.execute(
+                query,
+                {
+                    "p_version_id": version_id,
+                    "p_exam_id": exam_id,
+                    "p_edited_by": edited_by,
+                    "p_new_values": json.dumps(new_values, default=str),
+                    "p_old_values": json.dumps(old_values, default=str),
+                    "p_reason": reason,
+                },
+            )
+            edit_result = result.scalar_one()
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Failed to record edit of exam {exam_id}: {e}", exc_info=True)
+            raise
+        await DashboardCacheService(self.session).invalidate_for_version(version_id)
+        # Only a committed edit may reach the shared index; a rolled-back one
+        # would leave it out of step with the database.
+        if edit_result.get("status") == "success":
+            await EditValidationService(self.session).record_edit(
+                version_id, exam_id, new_values
+            )
+            # The edit function doesn't log; queue the entry on the batched
+            # audit writer so the request doesn't wait for it.
+            await AuditService(self.session).log(
+                user_id=edited_by,
+                action="manual_edit",
+                entity_type="timetable_assignment",
+                entity_id=exam_id,
+                old_values=old_values,
+                new_values=new_values,
+                notes=reason,
+            )
+        return edit_result
 
     async def create_scenario_from_version(
         self,
@@ -137,6 +166,7 @@ class TimetableManagementService:
             )
             publish_result = result.scalar_one()
             await self.session.commit()
+            await DashboardCacheService(self.session).invalidate_for_job(job_id)
             logger.info(f"Successfully published timetable from job {job_id}")
             return publish_result
         except Exception as e:
@@ -144,6 +174,29 @@ class TimetableManagementService:
             logger.error(f"Failed to publish from job {job_id}: {e}", exc_info=True)
             raise
 
+    async def refresh_schedule_projections(
+        self, version_id: UUID, exam_ids: Optional[List[UUID]] = None
+    ) -> Dict[str, Any]:
+        """
+        Rebuilds the per-student and per-staff portal projections of a version by
+        calling `refresh_schedule_projections`. Publishing and manual edits do this
+        in the database already; this is for backfilling existing versions.
+        """
+        logger.info(f"Refreshing schedule projections for version {version_id}")
+        query = text(
+            "SELECT exam_system.refresh_schedule_projections(:p_version_id, CAST(:p_exam_ids AS uuid[]))"
+        )
+        result = await self.session.execute(
+            query,
+            {
+                "p_version_id": version_id,
+                "p_exam_ids": [str(e) for e in exam_ids] if exam_ids else None,
+            },
+        )
+        refresh_result = result.scalar_one()
+        await self.session.commit()
+        return refresh_result
+
     async def unpublish_timetable_version(
         self, version_id: UUID, user_id: UUID
     ) -> Dict[str, Any]:
@@ -159,6 +212,7 @@ class TimetableManagementService:
             )
             await self.session.execute(query, {"p_version_id": version_id})
             await self.session.commit()
+            await DashboardCacheService(self.session).invalidate_for_version(version_id)
             logger.info(f"Successfully unpublished timetable version {version_id}")
             return {"success": True, "message": "Timetable version unpublished."}
         except Exception as e:
@@ -2,7 +2,6 @@
 import logging
 from uuid import UUID
 from typing import Dict, Any, Optional, List
-import pandas as pd
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import inspect, text, VARCHAR
 from sqlalchemy.engine import RowMapping
@@ -1,21 +1,224 @@
 # backend/app/services/seeding/staging_service.py
 
+import json
 import logging
+from collections import defaultdict
+from dataclasses import dataclass
 from uuid import UUID
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Type
 from datetime import date
 
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...schemas import staging as staging_schemas
+from ...schemas.staging import (
+    StagingBatchResult,
+    StagingOperation,
+    StagingOperationType,
+    StagingRowResult,
+)
+from ..auditing import AuditEntry, AuditService
+from ..data_retrieval.dashboard_cache_service import DashboardCacheService
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class _StagingEntitySpec:
+    """Describes how one staging table is addressed by the batch API."""
+
+    table: str
+    label: str
+    key_columns: Tuple[str, ...]
+    columns: Dict[str, str]  # column name -> PostgreSQL type
+    create_schema: Type[BaseModel]
+    update_schema: Optional[Type[BaseModel]] = None
+
+
+_ENTITY_SPECS: Dict[str, _StagingEntitySpec] = {
+    "buildings": _StagingEntitySpec(
+        table="buildings",
+        label="Building",
+        key_columns=("code",),
+        columns={"code": "varchar", "name": "varchar", "faculty_code": "varchar"},
+        create_schema=staging_schemas.BuildingCreate,
+        update_schema=staging_schemas.BuildingUpdate,
+    ),
+    "course_departments": _StagingEntitySpec(
+        table="course_departments",
+        label="Course department link",
+        key_columns=("course_code", "department_code"),
+        columns={"course_code": "varchar", "department_code": "varchar"},
+        create_schema=staging_schemas.CourseDepartmentCreate,
+        update_schema=staging_schemas.CourseDepartmentUpdate,
+    ),
+    "course_faculties": _StagingEntitySpec(
+        table="course_faculties",
+        label="Course faculty link",
+        key_columns=("course_code", "faculty_code"),
+        columns={"course_code": "varchar", "faculty_code": "varchar"},
+        create_schema=staging_schemas.CourseFacultyCreate,
+        update_schema=staging_schemas.CourseFacultyUpdate,
+    ),
+    "course_instructors": _StagingEntitySpec(
+        table="course_instructors",
+        label="Course instructor link",
+        key_columns=("staff_number", "course_code"),
+        columns={"staff_number": "varchar", "course_code": "varchar"},
+        create_schema=staging_schemas.CourseInstructorCreate,
+    ),
+    "course_registrations": _StagingEntitySpec(
+        table="course_registrations",
+        label="Registration",
+        key_columns=("student_matric_number", "course_code"),
+        columns={
+            "student_matric_number": "varchar",
+            "course_code": "varchar",
+            "registration_type": "varchar",
+        },
+        create_schema=staging_schemas.CourseRegistrationCreate,
+        update_schema=staging_schemas.CourseRegistrationUpdate,
+    ),
+    "courses": _StagingEntitySpec(
+        table="courses",
+        label="Course",
+        key_columns=("code",),
+        columns={
+            "code": "varchar",
+            "title": "varchar",
+            "credit_units": "integer",
+            "exam_duration_minutes": "integer",
+            "course_level": "integer",
+            "semester": "integer",
+            "is_practical": "boolean",
+            "morning_only": "boolean",
+        },
+        create_schema=staging_schemas.CourseCreate,
+        update_schema=staging_schemas.CourseUpdate,
+    ),
+    "departments": _StagingEntitySpec(
+        table="departments",
+        label="Department",
+        key_columns=("code",),
+        columns={"code": "varchar", "name": "varchar", "faculty_code": "varchar"},
+        create_schema=staging_schemas.DepartmentCreate,
+        update_schema=staging_schemas.DepartmentUpdate,
+    ),
+    "faculties": _StagingEntitySpec(
+        table="faculties",
+        label="Faculty",
+        key_columns=("code",),
+        columns={"code": "varchar", "name": "varchar"},
+        create_schema=staging_schemas.FacultyCreate,
+        update_schema=staging_schemas.FacultyUpdate,
+    ),
+    "programmes": _StagingEntitySpec(
+        table="programmes",
+        label="Programme",
+        key_columns=("code",),
+        columns={
+            "code": "varchar",
+            "name": "varchar",
+            "department_code": "varchar",
+            "degree_type": "varchar",
+            "duration_years": "integer",
+        },
+        create_schema=staging_schemas.ProgrammeCreate,
+        update_schema=staging_schemas.ProgrammeUpdate,
+    ),
+    "rooms": _StagingEntitySpec(
+        table="rooms",
+        label="Room",
+        key_columns=("code",),
+        columns={
+            "code": "varchar",
+            "name": "varchar",
+            "building_code": "varchar",
+            "capacity": "integer",
+            "exam_capacity": "integer",
+            "has_ac": "boolean",
+            "has_projector": "boolean",
+            "has_computers": "boolean",
+            "max_inv_per_room": "integer",
+            "room_type_code": "varchar",
+            "floor_number": "integer",
+            "accessibility_features": "varchar[]",
+            "notes": "text",
+        },
+        create_schema=staging_schemas.RoomCreate,
+        update_schema=staging_schemas.RoomUpdate,
+    ),
+    "staff": _StagingEntitySpec(
+        table="staff",
+        label="Staff",
+        key_columns=("staff_number",),
+        columns={
+            "staff_number": "varchar",
+            "first_name": "varchar",
+            "last_name": "varchar",
+            "email": "varchar",
+            "department_code": "varchar",
+            "staff_type": "varchar",
+            "can_invigilate": "boolean",
+            "is_instructor": "boolean",
+            "max_daily_sessions": "integer",
+            "max_consecutive_sessions": "integer",
+            "max_concurrent_exams": "integer",
+            "max_students_per_invigilator": "integer",
+            "user_email": "varchar",
+        },
+        create_schema=staging_schemas.StaffCreate,
+        update_schema=staging_schemas.StaffUpdate,
+    ),
+    "staff_unavailability": _StagingEntitySpec(
+        table="staff_unavailability",
+        label="Staff unavailability record",
+        key_columns=("staff_number", "unavailable_date", "period_name"),
+        columns={
+            "staff_number": "varchar",
+            "unavailable_date": "date",
+            "period_name": "varchar",
+            "reason": "varchar",
+        },
+        create_schema=staging_schemas.StaffUnavailabilityCreate,
+        update_schema=staging_schemas.StaffUnavailabilityUpdate,
+    ),
+    "students": _StagingEntitySpec(
+        table="students",
+        label="Student",
+        key_columns=("matric_number",),
+        columns={
+            "matric_number": "varchar",
+            "first_name": "varchar",
+            "last_name": "varchar",
+            "entry_year": "integer",
+            "programme_code": "varchar",
+            "user_email": "varchar",
+        },
+        create_schema=staging_schemas.StudentCreate,
+        update_schema=staging_schemas.StudentUpdate,
+    ),
+}
+
+
+@dataclass
+class _ValidatedRow:
+    index: int
+    op: StagingOperationType
+    key: Dict[str, Any]
+    data: Dict[str, Any]
+
+
 class StagingService:
     """
-    Provides methods to interact with the staging tables. This service layer
-    supports partial updates by fetching the existing record, merging the
-    changes, and then calling the database function with the full payload.
+    Provides methods to interact with the staging tables.
+
+    All writes go through `apply_batch`, which validates a list of typed
+    operations up front and applies each operation type with a single
+    set-based `MERGE` over `unnest`-ed parameter arrays. The single-record
+    methods are thin wrappers that submit a batch of one.
     """
 
     def __init__(self, session: AsyncSession):
@@ -42,62 +245,358 @@ class StagingService:
         return session_data
 
     # =================================================================
-    # Private Helper for Partial Updates
+    # Batch API
     # =================================================================
 
-    async def _get_single_record(
-        self, table: str, session_id: UUID, pks: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """Fetches a single record from a staging table by its primary key(s)."""
-        conditions = " AND ".join([f"{key} = :{key}" for key in pks.keys()])
-        query = text(
-            f"SELECT * FROM staging.{table} WHERE session_id = :session_id AND {conditions}"
+    async def apply_batch(
+        self,
+        session_id: UUID,
+        entity: str,
+        operations: Sequence[StagingOperation],
+        user_id: Optional[UUID] = None,
+    ) -> StagingBatchResult:
+        """
+        Validates and applies a batch of operations against one staging table.
+
+        Operations are applied in three set-based phases: deletes, then
+        updates, then adds, so a delete followed by an add of the same key
+        replaces the record. A key may appear at most once per operation type.
+        Rows that fail validation, or that do not match (updates/deletes) or
+        already exist (adds), are reported per row and do not abort the batch.
+        The caller owns the transaction and is responsible for committing.
+        Given a user_id, every applied row is audited once the caller commits.
+        """
+        spec = _ENTITY_SPECS.get(entity)
+        if spec is None:
+            raise ValueError(f"Unknown staging entity '{entity}'.")
+
+        results: Dict[int, StagingRowResult] = {}
+        valid_rows: Dict[StagingOperationType, List[_ValidatedRow]] = defaultdict(
+            list
+        )
+        seen_keys: Dict[StagingOperationType, set] = defaultdict(set)
+
+        for index, operation in enumerate(operations):
+            try:
+                row = self._validate_operation(spec, index, operation)
+            except ValueError as e:
+                results[index] = StagingRowResult(
+                    index=index,
+                    op=operation.op,
+                    key=operation.key or {},
+                    success=False,
+                    error=str(e),
+                )
+                continue
+
+            key_tuple = tuple(row.key[k] for k in spec.key_columns)
+            if key_tuple in seen_keys[row.op]:
+                results[index] = StagingRowResult(
+                    index=index,
+                    op=row.op,
+                    key=row.key,
+                    success=False,
+                    error=f"Duplicate {row.op.value} for the same key in this batch.",
+                )
+                continue
+            seen_keys[row.op].add(key_tuple)
+            valid_rows[row.op].append(row)
+
+        phases = (
+            (StagingOperationType.DELETE, self._merge_deletes),
+            (StagingOperationType.UPDATE, self._merge_updates),
+            (StagingOperationType.ADD, self._merge_adds),
+        )
+        for op_type, merge in phases:
+            rows = valid_rows.get(op_type)
+            if not rows:
+                continue
+            touched = await merge(session_id, spec, rows)
+            for row in rows:
+                if row.index in touched:
+                    error = None
+                elif op_type is StagingOperationType.ADD:
+                    error = f"{spec.label} with {self._describe_key(row.key)} already exists."
+                else:
+                    error = f"{spec.label} with {self._describe_key(row.key)} not found."
+                results[row.index] = StagingRowResult(
+                    index=row.index,
+                    op=row.op,
+                    key=row.key,
+                    success=error is None,
+                    error=error,
+                )
+
+        ordered = [results[i] for i in sorted(results)]
+        applied = sum(1 for r in ordered if r.success)
+        if applied:
+            DashboardCacheService(self.session).invalidate_session_on_commit(
+                session_id
+            )
+        if applied and user_id is not None:
+            rows_by_index = {
+                row.index: row for rows in valid_rows.values() for row in rows
+            }
+            await AuditService(self.session).log_on_commit(
+                [
+                    AuditEntry(
+                        user_id=user_id,
+                        action=r.op.value,
+                        entity_type=f"staging_{entity}",
+                        new_values=(
+                            {"key": r.key}
+                            if r.op is StagingOperationType.DELETE
+                            else {"key": r.key, "data": rows_by_index[r.index].data}
+                        ),
+                        session_id=str(session_id),
+                    )
+                    for r in ordered
+                    if r.success
+                ]
+            )
+        logger.info(
+            f"Staging batch on '{entity}' for session {session_id}: "
+            f"{applied} applied, {len(ordered) - applied} failed"
+        )
+        return StagingBatchResult(
+            entity=entity,  # type: ignore[arg-type]
+            applied=applied,
+            failed=len(ordered) - applied,
+            results=ordered,
         )
 
-        params = {"session_id": session_id, **pks}
-        result = await self.session.execute(query, params)
-        record = result.mappings().first()
-        return dict(record) if record else None
+    # =================================================================
+    # Private Helpers for the Batch API
+    # =================================================================
+
+    def _validate_operation(
+        self, spec: _StagingEntitySpec, index: int, operation: StagingOperation
+    ) -> _ValidatedRow:
+        """Validates one operation against the entity's Pydantic schemas."""
+        try:
+            if operation.op is StagingOperationType.ADD:
+                record = spec.create_schema.model_validate(operation.data)
+                # Fields the caller left out are not inserted, so the table's
+                # column defaults apply to them.
+                data = record.model_dump(exclude_unset=True)
+                key = {k: data[k] for k in spec.key_columns}
+                return _ValidatedRow(index, operation.op, key, data)
+
+            key = self._validate_key(spec, operation.key)
+            if operation.op is StagingOperationType.DELETE:
+                return _ValidatedRow(index, operation.op, key, {})
+
+            if spec.update_schema is None:
+                raise ValueError(f"{spec.label} records cannot be updated.")
+            changes = spec.update_schema.model_validate(operation.data)
+            data = changes.model_dump(exclude_unset=True)
+            if not data:
+                raise ValueError("No updatable fields were supplied.")
+            return _ValidatedRow(index, operation.op, key, data)
+        except ValidationError as e:
+            raise ValueError(
+                "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                    for err in e.errors()
+                )
+            ) from e
+
+    @staticmethod
+    def _validate_key(
+        spec: _StagingEntitySpec, key: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        missing = [k for k in spec.key_columns if key.get(k) in (None, "")]
+        if missing:
+            raise ValueError(f"Missing key field(s): {', '.join(missing)}.")
+        fields = spec.create_schema.model_fields
+        return {
+            k: TypeAdapter(fields[k].annotation).validate_python(key[k])
+            for k in spec.key_columns
+        }
+
+    @staticmethod
+    def _describe_key(key: Dict[str, Any]) -> str:
+        return " and ".join(f"{k} '{v}'" for k, v in key.items())
+
+    @staticmethod
+    def _bind_value(pg_type: str, value: Any) -> Any:
+        # Array-typed columns travel as JSON text so they survive the unnest
+        # of a one-dimensional parameter array.
+        if pg_type.endswith("[]") and value is not None:
+            return json.dumps(list(value))
+        return value
+
+    @staticmethod
+    def _source_type(pg_type: str) -> str:
+        return "text" if pg_type.endswith("[]") else pg_type
+
+    @staticmethod
+    def _value_expr(alias: str, pg_type: str) -> str:
+        if pg_type.endswith("[]"):
+            return (
+                f"CASE WHEN {alias} IS NULL THEN NULL ELSE "
+                f"CAST(ARRAY(SELECT jsonb_array_elements_text(CAST({alias} AS jsonb))) "
+                f"AS {pg_type}) END"
+            )
+        return alias
+
+    def _build_source(
+        self,
+        spec: _StagingEntitySpec,
+        rows: List[_ValidatedRow],
+        key_columns: Sequence[str],
+        data_columns: Sequence[str],
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Builds an `unnest(...)` source relation with one parameter array per
+        column. Key columns are exposed as `k_<col>` and data columns as
+        `d_<col>` so updates may also rewrite key columns.
+        """
+        aliases = ["ord"]
+        arrays = ["CAST(:ord AS integer[])"]
+        params: Dict[str, Any] = {"ord": [r.index for r in rows]}
+        for prefix, columns, source in (
+            ("k", key_columns, "key"),
+            ("d", data_columns, "data"),
+        ):
+            for col in columns:
+                name = f"{prefix}_{col}"
+                pg_type = spec.columns[col]
+                aliases.append(name)
+                arrays.append(f"CAST(:{name} AS {self._source_type(pg_type)}[])")
+                params[name] = [
+                    self._bind_value(pg_type, getattr(r, source).get(col))
+                    for r in rows
+                ]
+        source = (
+            f"(SELECT * FROM unnest({', '.join(arrays)}) "
+            f"AS u({', '.join(aliases)})) AS s"
+        )
+        return source, params
+
+    @staticmethod
+    def _match_condition(spec: _StagingEntitySpec) -> str:
+        return " AND ".join(
+            ["t.session_id = :session_id"]
+            + [f"t.{k} = s.k_{k}" for k in spec.key_columns]
+        )
+
+    async def _run_merge(self, sql: str, params: Dict[str, Any]) -> set:
+        result = await self.session.execute(text(sql), params)
+        return {row[0] for row in result.fetchall()}
+
+    async def _merge_deletes(
+        self, session_id: UUID, spec: _StagingEntitySpec, rows: List[_ValidatedRow]
+    ) -> set:
+        source, params = self._build_source(spec, rows, spec.key_columns, ())
+        sql = (
+            f"MERGE INTO staging.{spec.table} AS t USING {source} "
+            f"ON {self._match_condition(spec)} "
+            f"WHEN MATCHED THEN DELETE RETURNING s.ord"
+        )
+        return await self._run_merge(sql, {"session_id": session_id, **params})
+
+    async def _merge_updates(
+        self, session_id: UUID, spec: _StagingEntitySpec, rows: List[_ValidatedRow]
+    ) -> set:
+        # Rows are grouped by the set of fields they change so that each
+        # group is one MERGE with a fixed SET list (partial updates).
+        groups: Dict[Tuple[str, ...], List[_ValidatedRow]] = defaultdict(list)
+        for row in rows:
+            groups[tuple(c for c in spec.columns if c in row.data)].append(row)
+
+        touched: set = set()
+        for columns, group in groups.items():
+            source, params = self._build_source(spec, group, spec.key_columns, columns)
+            assignments = ", ".join(
+                f"{c} = {self._value_expr(f's.d_{c}', spec.columns[c])}"
+                for c in columns
+            )
+            sql = (
+                f"MERGE INTO staging.{spec.table} AS t USING {source} "
+                f"ON {self._match_condition(spec)} "
+                f"WHEN MATCHED THEN UPDATE SET {assignments} RETURNING s.ord"
+            )
+            touched |= await self._run_merge(sql, {"session_id": session_id, **params})
+        return touched
+
+    async def _merge_adds(
+        self, session_id: UUID, spec: _StagingEntitySpec, rows: List[_ValidatedRow]
+    ) -> set:
+        # Rows are grouped by the set of fields they supply so that each group
+        # is one MERGE inserting only those columns; the rest take the table's
+        # defaults instead of NULL.
+        groups: Dict[Tuple[str, ...], List[_ValidatedRow]] = defaultdict(list)
+        for row in rows:
+            groups[tuple(c for c in spec.columns if c in row.data)].append(row)
+
+        touched: set = set()
+        for columns, group in groups.items():
+            source, params = self._build_source(spec, group, spec.key_columns, columns)
+            values = ", ".join(
+                self._value_expr(f"s.d_{c}", spec.columns[c]) for c in columns
+            )
+            sql = (
+                f"MERGE INTO staging.{spec.table} AS t USING {source} "
+                f"ON {self._match_condition(spec)} "
+                f"WHEN NOT MATCHED THEN INSERT (session_id, {', '.join(columns)}) "
+                f"VALUES (:session_id, {values}) RETURNING s.ord"
+            )
+            touched |= await self._run_merge(sql, {"session_id": session_id, **params})
+        return touched
+
+    async def _apply_single(
+        self,
+        session_id: UUID,
+        entity: str,
+        op: StagingOperationType,
+        key: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Submits a batch of one and raises ValueError if the row failed."""
+        result = await self.apply_batch(
+            session_id,
+            entity,
+            [StagingOperation(op=op, key=key or {}, data=data or {})],
+        )
+        row = result.results[0]
+        if not row.success:
+            raise ValueError(row.error)
 
     # =================================================================
     # buildings Table Functions
     # =================================================================
 
     async def add_building(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_building(:session_id, :code, :name, :faculty_code)"
+        await self._apply_single(
+            session_id, "buildings", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_building(
         self, session_id: UUID, code: str, **update_data: Any
     ) -> None:
         """Performs a partial update on a staged building."""
-        existing = await self._get_single_record(
-            "buildings", session_id, {"code": code}
-        )
-        if not existing:
-            raise ValueError(f"Building with code '{code}' not found.")
-
-        merged_data = {**existing, **update_data}
-        query = text(
-            "SELECT staging.update_building(:session_id, :code, :name, :faculty_code)"
+        await self._apply_single(
+            session_id,
+            "buildings",
+            StagingOperationType.UPDATE,
+            key={"code": code},
+            data=update_data,
         )
-        await self.session.execute(query, merged_data)
 
     async def delete_building(self, session_id: UUID, code: str) -> None:
-        query = text("SELECT staging.delete_building(:session_id, :code)")
-        await self.session.execute(query, {"session_id": session_id, "code": code})
+        await self._apply_single(
+            session_id, "buildings", StagingOperationType.DELETE, key={"code": code}
+        )
 
     # =================================================================
     # course_departments Table Functions
     # =================================================================
 
     async def add_course_department(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_course_department(:session_id, :course_code, :department_code)"
+        await self._apply_single(
+            session_id, "course_departments", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_course_department(
         self,
@@ -106,37 +605,25 @@ class StagingService:
         old_department_code: str,
         **update_data: Any,
     ) -> None:
-        """Handles updates for the course-department link table by deleting and re-adding."""
-        new_department_code = update_data.get("department_code")
-        if not new_department_code:
+        """Moves a course-department link to a new department."""
+        if not update_data.get("department_code"):
             raise ValueError("new_department_code must be provided for the update.")
-
-        query = text(
-            "SELECT staging.update_course_department(:session_id, :course_code, :old_department_code, :new_department_code)"
-        )
-        await self.session.execute(
-            query,
-            {
-                "session_id": session_id,
-                "course_code": course_code,
-                "old_department_code": old_department_code,
-                "new_department_code": new_department_code,
-            },
+        await self._apply_single(
+            session_id,
+            "course_departments",
+            StagingOperationType.UPDATE,
+            key={"course_code": course_code, "department_code": old_department_code},
+            data=update_data,
         )
 
     async def delete_course_department(
         self, session_id: UUID, course_code: str, department_code: str
     ) -> None:
-        query = text(
-            "SELECT staging.delete_course_department(:session_id, :course_code, :department_code)"
-        )
-        await self.session.execute(
-            query,
-            {
-                "session_id": session_id,
-                "course_code": course_code,
-                "department_code": department_code,
-            },
+        await self._apply_single(
+            session_id,
+            "course_departments",
+            StagingOperationType.DELETE,
+            key={"course_code": course_code, "department_code": department_code},
         )
 
     # =================================================================
@@ -144,10 +631,9 @@ class StagingService:
     # =================================================================
 
     async def add_course_faculty(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_course_faculty(:session_id, :course_code, :faculty_code)"
+        await self._apply_single(
+            session_id, "course_faculties", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_course_faculty(
         self,
@@ -156,71 +642,52 @@ class StagingService:
         old_faculty_code: str,
         **update_data: Any,
     ) -> None:
-        """Handles updates for the course-faculty link table by deleting and re-adding."""
-        new_faculty_code = update_data.get("faculty_code")
-        if not new_faculty_code:
+        """Moves a course-faculty link to a new faculty."""
+        if not update_data.get("faculty_code"):
             raise ValueError("new_faculty_code must be provided for the update.")
-
-        query = text(
-            "SELECT staging.update_course_faculty(:session_id, :course_code, :old_faculty_code, :new_faculty_code)"
-        )
-        await self.session.execute(
-            query,
-            {
-                "session_id": session_id,
-                "course_code": course_code,
-                "old_faculty_code": old_faculty_code,
-                "new_faculty_code": new_faculty_code,
-            },
+        await self._apply_single(
+            session_id,
+            "course_faculties",
+            StagingOperationType.UPDATE,
+            key={"course_code": course_code, "faculty_code": old_faculty_code},
+            data=update_data,
         )
 
     async def delete_course_faculty(
         self, session_id: UUID, course_code: str, faculty_code: str
     ) -> None:
-        query = text(
-            "SELECT staging.delete_course_faculty(:session_id, :course_code, :faculty_code)"
-        )
-        await self.session.execute(
-            query,
-            {
-                "session_id": session_id,
-                "course_code": course_code,
-                "faculty_code": faculty_code,
-            },
+        await self._apply_single(
+            session_id,
+            "course_faculties",
+            StagingOperationType.DELETE,
+            key={"course_code": course_code, "faculty_code": faculty_code},
         )
 
     # =================================================================
     # course_instructors Table Functions
     # =================================================================
     async def add_course_instructor(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_course_instructor(:session_id, :staff_number, :course_code)"
+        await self._apply_single(
+            session_id, "course_instructors", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def delete_course_instructor(
         self, session_id: UUID, staff_number: str, course_code: str
     ) -> None:
-        query = text(
-            "SELECT staging.delete_course_instructor(:session_id, :staff_number, :course_code)"
-        )
-        await self.session.execute(
-            query,
-            {
-                "session_id": session_id,
-                "staff_number": staff_number,
-                "course_code": course_code,
-            },
+        await self._apply_single(
+            session_id,
+            "course_instructors",
+            StagingOperationType.DELETE,
+            key={"staff_number": staff_number, "course_code": course_code},
         )
 
     # =================================================================
     # course_registrations Table Functions
     # =================================================================
     async def add_course_registration(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_course_registration(:session_id, :student_matric_number, :course_code, :registration_type)"
+        await self._apply_single(
+            session_id, "course_registrations", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_course_registration(
         self,
@@ -229,34 +696,25 @@ class StagingService:
         course_code: str,
         **update_data: Any,
     ) -> None:
-        existing = await self._get_single_record(
-            "course_registrations",
+        await self._apply_single(
             session_id,
-            {
+            "course_registrations",
+            StagingOperationType.UPDATE,
+            key={
                 "student_matric_number": student_matric_number,
                 "course_code": course_code,
             },
+            data=update_data,
         )
-        if not existing:
-            raise ValueError(
-                f"Registration for student '{student_matric_number}' in course '{course_code}' not found."
-            )
-        merged_data = {**existing, **update_data}
-        query = text(
-            "SELECT staging.update_course_registration(:session_id, :student_matric_number, :course_code, :registration_type)"
-        )
-        await self.session.execute(query, merged_data)
 
     async def delete_course_registration(
         self, session_id: UUID, student_matric_number: str, course_code: str
     ) -> None:
-        query = text(
-            "SELECT staging.delete_course_registration(:session_id, :student_matric_number, :course_code)"
-        )
-        await self.session.execute(
-            query,
-            {
-                "session_id": session_id,
+        await self._apply_single(
+            session_id,
+            "course_registrations",
+            StagingOperationType.DELETE,
+            key={
                 "student_matric_number": student_matric_number,
                 "course_code": course_code,
             },
@@ -266,166 +724,156 @@ class StagingService:
     # courses Table Functions
     # =================================================================
     async def add_course(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_course(:session_id, :code, :title, :credit_units, :exam_duration_minutes, :course_level, :semester, :is_practical, :morning_only)"
+        await self._apply_single(
+            session_id, "courses", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_course(
         self, session_id: UUID, code: str, **update_data: Any
     ) -> None:
-        existing = await self._get_single_record("courses", session_id, {"code": code})
-        if not existing:
-            raise ValueError(f"Course with code '{code}' not found.")
-        merged_data = {**existing, **update_data}
-        query = text(
-            "SELECT staging.update_course(:session_id, :code, :title, :credit_units, :exam_duration_minutes, :course_level, :semester, :is_practical, :morning_only)"
+        await self._apply_single(
+            session_id,
+            "courses",
+            StagingOperationType.UPDATE,
+            key={"code": code},
+            data=update_data,
         )
-        await self.session.execute(query, merged_data)
 
     async def delete_course(self, session_id: UUID, code: str) -> None:
-        query = text("SELECT staging.delete_course(:session_id, :code)")
-        await self.session.execute(query, {"session_id": session_id, "code": code})
+        await self._apply_single(
+            session_id, "courses", StagingOperationType.DELETE, key={"code": code}
+        )
 
     # =================================================================
     # departments Table Functions
     # =================================================================
     async def add_department(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_department(:session_id, :code, :name, :faculty_code)"
+        await self._apply_single(
+            session_id, "departments", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_department(
         self, session_id: UUID, code: str, **update_data: Any
     ) -> None:
-        existing = await self._get_single_record(
-            "departments", session_id, {"code": code}
-        )
-        if not existing:
-            raise ValueError(f"Department with code '{code}' not found.")
-        merged_data = {**existing, **update_data}
-        query = text(
-            "SELECT staging.update_department(:session_id, :code, :name, :faculty_code)"
+        await self._apply_single(
+            session_id,
+            "departments",
+            StagingOperationType.UPDATE,
+            key={"code": code},
+            data=update_data,
         )
-        await self.session.execute(query, merged_data)
 
     async def delete_department(self, session_id: UUID, code: str) -> None:
-        query = text("SELECT staging.delete_department(:session_id, :code)")
-        await self.session.execute(query, {"session_id": session_id, "code": code})
+        await self._apply_single(
+            session_id, "departments", StagingOperationType.DELETE, key={"code": code}
+        )
 
     # =================================================================
     # faculties Table Functions
     # =================================================================
     async def add_faculty(self, session_id: UUID, **data: Any) -> None:
-        query = text("SELECT staging.add_faculty(:session_id, :code, :name)")
-        await self.session.execute(query, {"session_id": session_id, **data})
+        await self._apply_single(
+            session_id, "faculties", StagingOperationType.ADD, data=data
+        )
 
     async def update_faculty(
         self, session_id: UUID, code: str, **update_data: Any
     ) -> None:
-        existing = await self._get_single_record(
-            "faculties", session_id, {"code": code}
+        await self._apply_single(
+            session_id,
+            "faculties",
+            StagingOperationType.UPDATE,
+            key={"code": code},
+            data=update_data,
         )
-        if not existing:
-            raise ValueError(f"Faculty with code '{code}' not found.")
-        merged_data = {**existing, **update_data}
-        query = text("SELECT staging.update_faculty(:session_id, :code, :name)")
-        await self.session.execute(query, merged_data)
 
     async def delete_faculty(self, session_id: UUID, code: str) -> None:
-        query = text("SELECT staging.delete_faculty(:session_id, :code)")
-        await self.session.execute(query, {"session_id": session_id, "code": code})
+        await self._apply_single(
+            session_id, "faculties", StagingOperationType.DELETE, key={"code": code}
+        )
 
     # =================================================================
     # programmes Table Functions
     # =================================================================
     async def add_programme(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_programme(:session_id, :code, :name, :department_code, :degree_type, :duration_years)"
+        await self._apply_single(
+            session_id, "programmes", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_programme(
         self, session_id: UUID, code: str, **update_data: Any
     ) -> None:
-        existing = await self._get_single_record(
-            "programmes", session_id, {"code": code}
-        )
-        if not existing:
-            raise ValueError(f"Programme with code '{code}' not found.")
-        merged_data = {**existing, **update_data}
-        query = text(
-            "SELECT staging.update_programme(:session_id, :code, :name, :department_code, :degree_type, :duration_years)"
+        await self._apply_single(
+            session_id,
+            "programmes",
+            StagingOperationType.UPDATE,
+            key={"code": code},
+            data=update_data,
         )
-        await self.session.execute(query, merged_data)
 
     async def delete_programme(self, session_id: UUID, code: str) -> None:
-        query = text("SELECT staging.delete_programme(:session_id, :code)")
-        await self.session.execute(query, {"session_id": session_id, "code": code})
+        await self._apply_single(
+            session_id, "programmes", StagingOperationType.DELETE, key={"code": code}
+        )
 
     # =================================================================
     # rooms Table Functions
     # =================================================================
     async def add_room(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_room(:session_id, :code, :name, :building_code, :capacity, :exam_capacity, :has_ac, :has_projector, :has_computers, :max_inv_per_room, :room_type_code, :floor_number, :accessibility_features, :notes)"
+        await self._apply_single(
+            session_id, "rooms", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_room(
         self, session_id: UUID, code: str, **update_data: Any
     ) -> None:
-        existing = await self._get_single_record("rooms", session_id, {"code": code})
-        if not existing:
-            raise ValueError(f"Room with code '{code}' not found.")
-        merged_data = {**existing, **update_data}
-        query = text(
-            "SELECT staging.update_room(:session_id, :code, :name, :building_code, :capacity, :exam_capacity, :has_ac, :has_projector, :has_computers, :max_inv_per_room, :room_type_code, :floor_number, :accessibility_features, :notes)"
+        await self._apply_single(
+            session_id,
+            "rooms",
+            StagingOperationType.UPDATE,
+            key={"code": code},
+            data=update_data,
         )
-        await self.session.execute(query, merged_data)
 
     async def delete_room(self, session_id: UUID, code: str) -> None:
-        query = text("SELECT staging.delete_room(:session_id, :code)")
-        await self.session.execute(query, {"session_id": session_id, "code": code})
+        await self._apply_single(
+            session_id, "rooms", StagingOperationType.DELETE, key={"code": code}
+        )
 
     # =================================================================
     # staff Table Functions
     # =================================================================
     async def add_staff(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_staff(:session_id, :staff_number, :first_name, :last_name, :email, :department_code, :staff_type, :can_invigilate, :is_instructor, :max_daily_sessions, :max_consecutive_sessions, :max_concurrent_exams, :max_students_per_invigilator, :user_email)"
+        await self._apply_single(
+            session_id, "staff", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_staff(
         self, session_id: UUID, staff_number: str, **update_data: Any
     ) -> None:
-        existing = await self._get_single_record(
-            "staff", session_id, {"staff_number": staff_number}
-        )
-        if not existing:
-            raise ValueError(f"Staff with number '{staff_number}' not found.")
-        merged_data = {**existing, **update_data}
-        query = text(
-            "SELECT staging.update_staff(:session_id, :staff_number, :first_name, :last_name, :email, :department_code, :staff_type, :can_invigilate, :is_instructor, :max_daily_sessions, :max_consecutive_sessions, :max_concurrent_exams, :max_students_per_invigilator, :user_email)"
+        await self._apply_single(
+            session_id,
+            "staff",
+            StagingOperationType.UPDATE,
+            key={"staff_number": staff_number},
+            data=update_data,
         )
-        await self.session.execute(query, merged_data)
 
     async def delete_staff(self, session_id: UUID, staff_number: str) -> None:
-        query = text("SELECT staging.delete_staff(:session_id, :staff_number)")
-        await self.session.execute(
-            query, {"session_id": session_id, "staff_number": staff_number}
+        await self._apply_single(
+            session_id,
+            "staff",
+            StagingOperationType.DELETE,
+            key={"staff_number": staff_number},
         )
 
     # =================================================================
     # staff_unavailability Table Functions
     # =================================================================
     async def add_staff_unavailability(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_staff_unavailability(:session_id, :staff_number, :unavailable_date, :period_name, :reason)"
+        await self._apply_single(
+            session_id, "staff_unavailability", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_staff_unavailability(
         self,
@@ -435,22 +883,17 @@ class StagingService:
         period_name: str,
         **update_data: Any,
     ) -> None:
-        existing = await self._get_single_record(
-            "staff_unavailability",
+        await self._apply_single(
             session_id,
-            {
+            "staff_unavailability",
+            StagingOperationType.UPDATE,
+            key={
                 "staff_number": staff_number,
                 "unavailable_date": unavailable_date,
                 "period_name": period_name,
             },
+            data=update_data,
         )
-        if not existing:
-            raise ValueError("Staff unavailability record not found.")
-        merged_data = {**existing, **update_data}
-        query = text(
-            "SELECT staging.update_staff_unavailability(:session_id, :staff_number, :unavailable_date, :period_name, :reason)"
-        )
-        await self.session.execute(query, merged_data)
 
     async def delete_staff_unavailability(
         self,
@@ -459,13 +902,11 @@ class StagingService:
         unavailable_date: date,
         period_name: str,
     ) -> None:
-        query = text(
-            "SELECT staging.delete_staff_unavailability(:session_id, :staff_number, :unavailable_date, :period_name)"
-        )
-        await self.session.execute(
-            query,
-            {
-                "session_id": session_id,
+        await self._apply_single(
+            session_id,
+            "staff_unavailability",
+            StagingOperationType.DELETE,
+            key={
                 "staff_number": staff_number,
                 "unavailable_date": unavailable_date,
                 "period_name": period_name,
@@ -476,27 +917,25 @@ class StagingService:
     # students Table Functions
     # =================================================================
     async def add_student(self, session_id: UUID, **data: Any) -> None:
-        query = text(
-            "SELECT staging.add_student(:session_id, :matric_number, :first_name, :last_name, :entry_year, :programme_code, :user_email)"
+        await self._apply_single(
+            session_id, "students", StagingOperationType.ADD, data=data
         )
-        await self.session.execute(query, {"session_id": session_id, **data})
 
     async def update_student(
         self, session_id: UUID, matric_number: str, **update_data: Any
     ) -> None:
-        existing = await self._get_single_record(
-            "students", session_id, {"matric_number": matric_number}
-        )
-        if not existing:
-            raise ValueError(f"Student with matric number '{matric_number}' not found.")
-        merged_data = {**existing, **update_data}
-        query = text(
-            "SELECT staging.update_student(:session_id, :matric_number, :first_name, :last_name, :entry_year, :programme_code, :user_email)"
+        await self._apply_single(
+            session_id,
+            "students",
+            StagingOperationType.UPDATE,
+            key={"matric_number": matric_number},
+            data=update_data,
         )
-        await self.session.execute(query, merged_data)
 
     async def delete_student(self, session_id: UUID, matric_number: str) -> None:
-        query = text("SELECT staging.delete_student(:session_id, :matric_number)")
-        await self.session.execute(
-            query, {"session_id": session_id, "matric_number": matric_number}
+        await self._apply_single(
+            session_id,
+            "students",
+            StagingOperationType.DELETE,
+            key={"matric_number": matric_number},
         )
@@ -27,6 +27,11 @@ from .post_processing_tasks import (
     enrich_timetable_result_task,
 )
 
+# Import and re-export export tasks
+from .export_tasks import (
+    export_timetable_task,
+)
+
 __all__ = [
     # Core celery components
     "celery_app",
@@ -44,4 +49,6 @@ __all__ = [
     "process_csv_upload_task",
     # Post-processing tasks
     "enrich_timetable_result_task",
+    # Export tasks
+    "export_timetable_task",
 ]
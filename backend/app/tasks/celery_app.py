@@ -9,6 +9,7 @@ from ..core.config import settings
 from ..database import check_db_health
 from typing import Any, Optional, Dict
 from ..database import db_manager, DatabaseManager
+from .routing import route_task
 import re
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy import event
@@ -29,13 +30,9 @@ def make_celery() -> Celery:
         accept_content=["json"],
         timezone="UTC",
         enable_utc=True,
-        task_routes={
-            "generate_timetable": {"queue": "scheduling"},
-            "backend.app.tasks.scheduling_tasks.*": {"queue": "scheduling"},
-            "backend.app.tasks.post_processing_tasks.*": {"queue": "post_processing"},
-            "backend.app.tasks.data_processing_tasks.*": {"queue": "data_processing"},
-            "backend.app.tasks.notification_tasks.*": {"queue": "notifications"},
-        },
+        # Tasks are registered under short names, so route by name and cost
+        # class rather than by module path.
+        task_routes=(route_task,),
         task_default_queue="default",
         task_queues=(
             Queue("default", routing_key="default"),
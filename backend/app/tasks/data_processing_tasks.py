@@ -6,12 +6,12 @@ import csv
 import io
 from uuid import UUID
 import asyncpg
-import pandas as pd
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy import event, text
 
 from ..core.config import settings
 from .celery_app import celery_app, _run_coro_in_new_loop
+from ..services.auditing import AuditService
 from ..services.seeding.file_upload_service import FileUploadService
 from ..services.data_validation.validation_schemas import ENTITY_SCHEMAS
 from ..services.data_validation.csv_processor import transform_string_to_array
@@ -46,6 +46,8 @@ async def _prepare_csv_and_bulk_load(file_path: str, session_id: str, entity_typ
     if entity_type not in ENTITY_SCHEMAS:
         raise ValueError(f"No schema defined for entity type: {entity_type}")
 
+    import pandas as pd
+
     entity_schema = ENTITY_SCHEMAS[entity_type]
     conn = None
     try:
@@ -178,6 +180,14 @@ async def _async_process_csv_upload(
             await upload_service.update_file_upload_status(
                 upload_uuid, "completed", validation_errors=status_details
             )
+            await AuditService(session).log(
+                user_id=UUID(user_id),
+                action="upload",
+                entity_type=f"staging_{entity_type}",
+                entity_id=upload_uuid,
+                session_id=UUID(academic_session_id),
+                notes="File loaded into staging table.",
+            )
             logger.info(
                 f"Successfully staged upload {file_upload_id} for entity '{entity_type}'."
             )
@@ -0,0 +1,137 @@
+# backend/app/tasks/export_tasks.py
+
+"""
+Celery tasks for large timetable exports that are too slow to build inside
+a request. The finished file is written to the export directory and its path
+is returned in the task result so the API can serve it for download. The
+requesting user is carried in every progress update and in the result, so the
+API only serves an export to the user who started it (or a superuser).
+"""
+
+import logging
+import os
+from typing import Dict, Any, Optional
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from .celery_app import celery_app, _run_coro_in_new_loop
+from ..core.config import settings
+from ..services.export.timetable_export_service import TimetableExportService
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = os.path.join(settings.UPLOAD_DIR, "exports")
+
+
+def export_artifact_path(task_id: str, output_format: str) -> str:
+    """Location of the artifact produced by an export task."""
+    return os.path.join(EXPORT_DIR, f"{task_id}.{output_format.lower()}")
+
+
+async def _async_export_timetable(
+    task,
+    version_id: str,
+    output_format: str,
+    split_by: str,
+    max_workers: Optional[int],
+    requested_by: Optional[str],
+) -> Dict[str, Any]:
+    """Async implementation of a full-session timetable export."""
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    schema_search_path = "exam_system, staging, public"
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_search_path(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"SET search_path TO {schema_search_path};")
+        cursor.close()
+
+    async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    artifact_path = export_artifact_path(task.request.id, output_format)
+    partial_path = f"{artifact_path}.part"
+
+    def report_progress(done: int, total: int) -> None:
+        # Rendering spans 20%..95% of the task.
+        task.update_state(
+            state="PROGRESS",
+            meta={
+                "current": 20 + int(75 * done / max(total, 1)),
+                "total": 100,
+                "phase": "rendering",
+                "parts_done": done,
+                "parts_total": total,
+                "requested_by": requested_by,
+            },
+        )
+
+    try:
+        async with async_session_factory() as session:
+            task.update_state(
+                state="PROGRESS",
+                meta={
+                    "current": 5,
+                    "total": 100,
+                    "phase": "loading",
+                    "requested_by": requested_by,
+                },
+            )
+            service = TimetableExportService(session)
+            with open(partial_path, "wb") as destination:
+                exported = await service.export_timetable_to_file(
+                    UUID(version_id),
+                    output_format,
+                    destination,
+                    split_by=split_by,  # type: ignore[arg-type]
+                    max_workers=max_workers,
+                    progress_callback=report_progress,
+                )
+        if not exported:
+            os.remove(partial_path)
+            return {
+                "success": False,
+                "error": f"Timetable version '{version_id}' has no exportable data.",
+                "requested_by": requested_by,
+            }
+
+        os.replace(partial_path, artifact_path)
+        logger.info(f"Export of version {version_id} written to {artifact_path}")
+        return {
+            "success": True,
+            "version_id": version_id,
+            "format": output_format.lower(),
+            "artifact_path": artifact_path,
+            "filename": f"timetable_{version_id}.{output_format.lower()}",
+            "size_bytes": os.path.getsize(artifact_path),
+            "requested_by": requested_by,
+        }
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(bind=True, name="export_timetable")
+def export_timetable_task(
+    self,
+    version_id: str,
+    output_format: str = "pdf",
+    split_by: str = "faculty",
+    max_workers: Optional[int] = None,
+    requested_by: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Celery task that exports a whole timetable version to a downloadable
+    artifact, reporting per-part progress while rendering.
+    """
+    logger.info(f"Received export task for version {version_id} ({output_format})")
+    return _run_coro_in_new_loop(
+        _async_export_timetable(
+            self, version_id, output_format, split_by, max_workers, requested_by
+        )
+    )
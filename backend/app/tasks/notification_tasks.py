@@ -11,7 +11,12 @@ from uuid import UUID
 from datetime import datetime, timedelta
 
 from .celery_app import celery_app, _run_coro_in_new_loop
-from ..services.notification.email_service import EmailService
+from ..services.notification.email_service import EmailService, EmailMessage
+from ..services.notification.bulk_delivery import (
+    BulkDeliveryResult,
+    BulkEmailDelivery,
+    ProgressThrottle,
+)
 from ..services.notification.websocket_manager import (
     connection_manager,
     publish_job_update,
@@ -169,33 +174,43 @@ async def _async_send_bulk_notifications(
                 }
 
             logger.info(f"Sending notifications to {total_users} users")
-            successful_sends = 0
-            failed_sends = 0
-
-            for i, user in enumerate(users):
-                progress = int(((i + 1) / total_users) * 80) + 15
-                task.update_state(
+            progress = ProgressThrottle(
+                lambda done: task.update_state(
                     state="PROGRESS",
                     meta={
-                        "current": progress,
+                        "current": int((done / total_users) * 80) + 15,
                         "total": 100,
                         "phase": "sending",
-                        "message": f"Sending to user {i+1}/{total_users}...",
+                        "message": f"Sent to {done}/{total_users} users...",
                     },
+                ),
+                settings.NOTIFICATION_PROGRESS_INTERVAL_SECONDS,
+            )
+
+            if notification_type == "email":
+                delivery_result = await _deliver_bulk_emails(
+                    users,
+                    notification_config,
+                    progress_callback=lambda result: progress(result.completed),
                 )
-                try:
-                    if notification_type == "email":
-                        await _send_user_email_notification(user, notification_config)
-                    elif notification_type == "websocket":
-                        await _send_user_websocket_notification(
-                            user, notification_config
+                successful_sends = delivery_result.sent
+                failed_sends = delivery_result.total - delivery_result.sent
+            else:
+                successful_sends = 0
+                failed_sends = 0
+                for i, user in enumerate(users):
+                    try:
+                        if notification_type == "websocket":
+                            await _send_user_websocket_notification(
+                                user, notification_config
+                            )
+                        successful_sends += 1
+                    except Exception as e:
+                        logger.warning(
+                            f"Failed to send notification to user {user['id']}: {e}"
                         )
-                    successful_sends += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to send notification to user {user['id']}: {e}"
-                    )
-                    failed_sends += 1
+                        failed_sends += 1
+                    progress(i + 1)
 
             task.update_state(
                 state="SUCCESS",
@@ -464,24 +479,57 @@ async def _get_filtered_users(
     return users if users is not None else []
 
 
-async def _send_user_email_notification(
-    user: Dict[str, Any], notification_config: Dict[str, Any]
-) -> None:
-    """Send email notification to a specific user"""
-    send_email_notification_task.apply_async(
-        kwargs={
-            "recipient_email": user["email"],
-            "subject": notification_config.get("subject", "Notification"),
-            "template_name": notification_config.get(
-                "template", "generic_notification"
-            ),
-            "template_data": {
-                "user_name": user.get("first_name", "User"),
-                **notification_config.get("template_data", {}),
-            },
+def _build_recipient_contexts(
+    users: List[Dict[str, Any]], shared_data: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Per-recipient template contexts, built from the rows of the single filtered
+    users query with the shared template data merged in.
+    """
+    return [
+        {
+            **shared_data,
+            "user_name": user.get("first_name") or "User",
+            "first_name": user.get("first_name"),
+            "last_name": user.get("last_name"),
+            "email": user["email"],
         }
+        for user in users
+    ]
+
+
+async def _deliver_bulk_emails(
+    users: List[Dict[str, Any]],
+    notification_config: Dict[str, Any],
+    progress_callback=None,
+) -> BulkDeliveryResult:
+    """
+    Render one message per user and send them all through a pooled, rate-limited
+    pipeline instead of queueing a separate Celery task per recipient.
+    """
+    email_service = EmailService()
+    recipients = [user for user in users if user.get("email")]
+    rendered = await email_service.render_bulk(
+        notification_config.get("template", "generic_notification"),
+        notification_config.get("subject", "Notification"),
+        _build_recipient_contexts(
+            recipients, notification_config.get("template_data", {})
+        ),
     )
 
+    messages = [
+        EmailMessage(subject=subject, recipients=[user["email"]], html_body=html_body)
+        for user, (subject, html_body) in zip(recipients, rendered or [])
+        if html_body
+    ]
+
+    result = await BulkEmailDelivery(
+        email_service, progress_callback=progress_callback
+    ).deliver(messages)
+    # Users without an address or a renderable message count as failures.
+    result.total = len(users)
+    return result
+
 
 async def _send_user_websocket_notification(
     user: Dict[str, Any], notification_config: Dict[str, Any]
@@ -9,6 +9,7 @@ from typing import Dict, Any
 from uuid import UUID
 from .celery_app import celery_app, _run_coro_in_new_loop
 from ..services.data_retrieval.data_retrieval_service import DataRetrievalService
+from ..services.data_retrieval.dashboard_cache_service import DashboardCacheService
 from ..services.scheduling.enrichment_service import EnrichmentService
 from ..services.notification.websocket_manager import publish_job_update
 from ..core.config import settings
@@ -69,7 +70,13 @@ async def _async_enrich_timetable_result(job_id: str):
             )
             await session.commit()
 
-            # 5. Notify frontend of completion
+            # 5. Rebuild the cached dashboard aggregates for the session
+            dashboard_cache = DashboardCacheService(session)
+            session_id = await dashboard_cache.session_for_job(job_uuid)
+            if session_id:
+                await dashboard_cache.refresh_session(session_id)
+
+            # 6. Notify frontend of completion
             await publish_job_update(
                 job_id,
                 {
@@ -0,0 +1,137 @@
+# backend/app/tasks/routing.py
+"""
+Cost-aware queue routing and worker pool sizing for Celery tasks.
+
+Tasks fall into three cost classes, each with its own queues and worker pool:
+
+* ``solver`` - CP-SAT timetable generation. CPU-bound, long-running and
+  multi-threaded, so a solver worker runs one job per SOLVER_CORES_PER_JOB
+  cores in a prefork pool.
+* ``heavy`` - CSV ingestion, result enrichment and exports. CPU-bound but
+  short; one prefork process per core.
+* ``light`` - notifications, health checks and anything unrouted. I/O-bound,
+  served by a high-concurrency thread (or gevent) pool so they never wait
+  behind a solve.
+
+Start one worker per pool with ``python -m app.tasks.routing <pool>``.
+"""
+
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+
+SOLVER = "solver"
+HEAVY = "heavy"
+LIGHT = "light"
+
+# Queues consumed by each worker pool.
+POOL_QUEUES: Dict[str, List[str]] = {
+    SOLVER: ["scheduling"],
+    HEAVY: ["data_processing", "post_processing"],
+    LIGHT: ["notifications", "default"],
+}
+
+# Registered task name -> queue. Tasks not listed go to the default queue,
+# which the light pool consumes.
+TASK_QUEUES: Dict[str, str] = {
+    "generate_timetable": "scheduling",
+    "process_csv_upload": "data_processing",
+    "enrich_timetable_result": "post_processing",
+    "export_timetable": "post_processing",
+    "send_email_notification": "notifications",
+    "send_bulk_notifications": "notifications",
+    "notify_job_status_change": "notifications",
+    "send_system_maintenance_notification": "notifications",
+    "cleanup_old_notifications": "notifications",
+    "health_check": "notifications",
+}
+
+
+def task_class(task_name: str) -> str:
+    """The cost class (solver, heavy or light) of a registered task."""
+    queue = TASK_QUEUES.get(task_name, "default")
+    for pool, queues in POOL_QUEUES.items():
+        if queue in queues:
+            return pool
+    return LIGHT
+
+
+def route_task(
+    name: str,
+    args: Any,
+    kwargs: Any,
+    options: Dict[str, Any],
+    task: Any = None,
+    **kw: Any,
+) -> Optional[Dict[str, str]]:
+    """Celery router: sends each task to the queue of its cost class."""
+    queue = TASK_QUEUES.get(name)
+    if queue is None:
+        return None
+    return {"queue": queue, "routing_key": queue}
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on (honours affinity / cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def free_search_workers(
+    cores: Optional[int] = None, load: Optional[float] = None
+) -> int:
+    """
+    CP-SAT search workers for a job starting now: the cores not already busy
+    (by the 1-minute load average), capped at SOLVER_CORES_PER_JOB.
+    """
+    cores = cores or available_cores()
+    if load is None:
+        try:
+            load = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            load = 0.0
+    free = int(cores - load)
+    return max(1, min(settings.SOLVER_CORES_PER_JOB, free))
+
+
+def worker_concurrency(pool: str, cores: Optional[int] = None) -> int:
+    """Number of concurrent tasks a worker of the given pool should run."""
+    cores = cores or available_cores()
+    if pool == SOLVER:
+        return max(1, cores // settings.SOLVER_CORES_PER_JOB)
+    if pool == HEAVY:
+        return settings.HEAVY_WORKER_CONCURRENCY or cores
+    return settings.LIGHT_WORKER_CONCURRENCY
+
+
+def worker_argv(pool: str, cores: Optional[int] = None) -> List[str]:
+    """`celery worker` arguments for one of the pools in POOL_QUEUES."""
+    if pool not in POOL_QUEUES:
+        raise ValueError(
+            f"Unknown worker pool '{pool}', expected one of {sorted(POOL_QUEUES)}"
+        )
+    argv = [
+        "worker",
+        f"--queues={','.join(POOL_QUEUES[pool])}",
+        f"--concurrency={worker_concurrency(pool, cores)}",
+        f"--hostname={pool}@%h",
+        "--loglevel=INFO",
+    ]
+    if pool == LIGHT:
+        argv.append(f"--pool={settings.LIGHT_WORKER_POOL}")
+    else:
+        argv.append("--pool=prefork")
+    if pool == SOLVER:
+        # A solve can leave hundreds of MB of model behind; recycle the child.
+        argv.append("--max-tasks-per-child=1")
+    return argv
+
+
+if __name__ == "__main__":
+    from . import celery_app
+
+    celery_app.worker_main(worker_argv(sys.argv[1] if len(sys.argv) > 1 else LIGHT))
@@ -18,10 +18,12 @@ from celery import Task
 
 # --- Core Application Imports ---
 from .celery_app import celery_app, _run_coro_in_new_loop
+from .routing import free_search_workers
 from .post_processing_tasks import (
     enrich_timetable_result_task,
 )
 from ..services.scheduling.data_preparation_service import ExactDataFlowService
+from ..services.scheduling.columnar_dataset_loader import ColumnarDatasetLoader
 from ..services.notification.websocket_manager import publish_job_update
 from ..core.exceptions import SchedulingError
 from ..core.config import settings
@@ -35,12 +37,6 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy import event, text
 from sqlalchemy.pool import NullPool
 
-# --- SCHEDULING ENGINE IMPORTS (CP-SAT ONLY) ---
-from scheduling_engine.core.problem_model import ExamSchedulingProblem
-from scheduling_engine.core.solution import TimetableSolution, SolutionStatus
-from scheduling_engine.cp_sat.solver_manager import CPSATSolverManager
-from ortools.sat.python import cp_model
-
 logger = logging.getLogger(__name__)
 
 
@@ -144,6 +140,11 @@ async def _async_generate_timetable(
     options: Optional[Dict[str, Any]],
 ) -> Dict[str, Any]:
     """Async implementation of timetable generation using CP-SAT solver."""
+    # The solver stack is imported here rather than at module level so that
+    # the API process and solver-free workers never load ortools.
+    from scheduling_engine.core.problem_model import ExamSchedulingProblem
+    from scheduling_engine.cp_sat.solver_manager import CPSATSolverManager
+    from ortools.sat.python import cp_model
 
     engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
     schema_search_path = "staging, exam_system, public"
@@ -182,10 +183,17 @@ async def _async_generate_timetable(
             await task.update_progress(
                 5, "preparing_data", "Preparing scheduling dataset..."
             )
-            data_prep = ExactDataFlowService(db)
-            dataset = await data_prep.build_exact_problem_model_dataset(job_uuid)
-            session_id = dataset.session_id
             assert options is not None
+            columnar_loader = ColumnarDatasetLoader(db)
+            use_columnar = await columnar_loader.should_use(
+                job_uuid, options.get("dataset_loader")
+            )
+            if use_columnar:
+                dataset = await columnar_loader.load(job_uuid)
+            else:
+                data_prep = ExactDataFlowService(db)
+                dataset = await data_prep.build_exact_problem_model_dataset(job_uuid)
+            session_id = dataset.session_id
             start_date = dataset.exam_period_start
             end_date = dataset.exam_period_end
             logger.info(f"Using date range from dataset: {start_date} to {end_date}")
@@ -205,8 +213,55 @@ async def _async_generate_timetable(
                 exam_period_end=end_date,
                 db_session=db,
             )
-            await problem.load_from_backend(dataset)
+            if use_columnar:
+                await problem.load_from_columnar(dataset)
+            else:
+                await problem.load_from_backend(dataset)
             problem.ensure_constraints_activated()
+            problem.diagnose_infeasibility = bool(
+                options.get("diagnose_infeasibility", False)
+            )
+            # Size the search portfolio to the cores actually free on this
+            # worker so concurrent solves don't oversubscribe the machine.
+            problem.solver_num_workers = int(
+                options.get("num_search_workers") or free_search_workers()
+            )
+            # Optionally race several CP-SAT configurations on Phase 1; the
+            # winner is remembered for similar sessions either way.
+            problem.solver_race_size = int(
+                options.get("solver_race_size", settings.SOLVER_RACE_SIZE)
+            )
+            problem.solver_portfolio_store = settings.SOLVER_PORTFOLIO_STORE
+            problem.solver_tuned_profiles = settings.SOLVER_TUNED_PROFILES
+            problem.tuning_export_dir = settings.SOLVER_TUNING_EXPORT_DIR or None
+            # Timetable faculties that share (almost) no students side by side.
+            problem.phase1_decomposition = bool(
+                options.get(
+                    "phase1_decomposition", settings.SOLVER_PHASE1_DECOMPOSITION
+                )
+            )
+            problem.decomposition_max_cut_students = int(
+                options.get(
+                    "decomposition_max_cut_students",
+                    settings.SOLVER_DECOMPOSITION_MAX_CUT_STUDENTS,
+                )
+            )
+            # Reruns that only change soft-constraint weights reuse the model.
+            problem.model_cache_size = settings.SOLVER_MODEL_CACHE_SIZE
+            problem.model_cache_dir = settings.SOLVER_MODEL_CACHE_DIR or None
+            # Split large exams over rooms by choosing precomputed room patterns.
+            problem.phase2_room_model = str(
+                options.get("phase2_room_model", settings.SOLVER_PHASE2_ROOM_MODEL)
+            )
+            problem.room_patterns_per_exam = int(
+                options.get(
+                    "room_patterns_per_exam", settings.SOLVER_ROOM_PATTERNS_PER_EXAM
+                )
+            )
+            # Share one deadline across GA, Phase 1 and the Phase 2 groups.
+            problem.solver_deadline_seconds = float(
+                options.get("deadline_seconds", settings.SOLVER_JOB_DEADLINE_SECONDS)
+            )
 
             # Step 4: Initialize the solver manager.
             await task.update_progress(
@@ -223,8 +278,13 @@ async def _async_generate_timetable(
             logger.info(f"CP-SAT solver finished in {solver_duration_seconds} seconds.")
 
             if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+                diagnosis = " ".join(
+                    explanation.summary()
+                    for explanation in solver_manager.infeasibility_explanations
+                )
                 raise SchedulingError(
                     f"Solver failed to find a solution. Status: {solver_manager.solver.StatusName(status)}"
+                    + (f". Diagnosis: {diagnosis}" if diagnosis else "")
                 )
 
             # Step 7: Process the solution and prepare for saving.
@@ -256,7 +316,10 @@ async def _async_generate_timetable(
                 "completion_percentage": solution.get_completion_percentage(),
                 "statistics": solution.statistics.to_dict(),
                 "is_enriched": False,
+                "phase1_model_reused": solver_manager.phase1_model_reused,
             }
+            if solver_manager.time_budget:
+                results_payload["time_budget"] = solver_manager.time_budget.report()
 
             # Step 8: Save results and solver duration to the database.
             await task.update_progress(
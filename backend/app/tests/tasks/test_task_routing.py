@@ -0,0 +1,145 @@
+# backend/app/tests/tasks/test_task_routing.py
+"""
+Cost-aware task routing and worker pool sizing.
+
+The load test runs real Celery workers against an in-memory broker: a solve
+occupies the solver worker while light tasks are fired at the light worker,
+and their queueing latency must stay well below the solve time.
+"""
+
+import time
+
+import pytest
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+from kombu import Queue
+
+from app.core.config import settings
+from app.tasks import routing
+
+SOLVE_SECONDS = 3.0
+LIGHT_LATENCY_BUDGET = 1.0
+
+
+@pytest.fixture
+def load_test_routes(monkeypatch):
+    monkeypatch.setitem(routing.TASK_QUEUES, "load_test.solve", "scheduling")
+    monkeypatch.setitem(routing.TASK_QUEUES, "load_test.notify", "notifications")
+
+
+def _memory_app():
+    app = Celery("routing_load_test", broker="memory://", backend="cache+memory://")
+    app.conf.update(
+        task_routes=(routing.route_task,),
+        task_default_queue="default",
+        task_queues=[
+            Queue(queue, routing_key=queue)
+            for queues in routing.POOL_QUEUES.values()
+            for queue in queues
+        ],
+        worker_prefetch_multiplier=1,
+        task_acks_late=True,
+        broker_transport_options={"polling_interval": 0.05},
+    )
+
+    @app.task(name="load_test.solve")
+    def solve():
+        time.sleep(SOLVE_SECONDS)
+        return "solved"
+
+    @app.task(name="load_test.notify")
+    def notify(sent_at):
+        return time.monotonic() - sent_at
+
+    return app, solve, notify
+
+
+def _light_latencies(solve, notify, count=20, interval=0.1):
+    solve_result = solve.delay()
+    time.sleep(0.3)  # let the solve get picked up first
+    results = []
+    for _ in range(count):
+        results.append(notify.delay(time.monotonic()))
+        time.sleep(interval)
+    latencies = [r.get(timeout=SOLVE_SECONDS * 3) for r in results]
+    assert solve_result.get(timeout=SOLVE_SECONDS * 3) == "solved"
+    return latencies
+
+
+class TestRouting:
+    def test_tasks_are_routed_to_their_cost_class_queue(self):
+        assert routing.route_task("generate_timetable", (), {}, {}) == {
+            "queue": "scheduling",
+            "routing_key": "scheduling",
+        }
+        assert routing.task_class("generate_timetable") == routing.SOLVER
+        assert routing.task_class("process_csv_upload") == routing.HEAVY
+        assert routing.task_class("export_timetable") == routing.HEAVY
+        assert routing.task_class("send_bulk_notifications") == routing.LIGHT
+        assert routing.task_class("health_check") == routing.LIGHT
+        assert routing.route_task("some_new_task", (), {}, {}) is None
+        assert routing.task_class("some_new_task") == routing.LIGHT
+
+    def test_every_registered_task_has_a_route(self):
+        from app.tasks import celery_app
+
+        names = {n for n in celery_app.tasks if not n.startswith("celery.")}
+        assert names <= set(routing.TASK_QUEUES)
+
+    def test_solver_pool_runs_one_job_per_n_cores(self, monkeypatch):
+        monkeypatch.setattr(settings, "SOLVER_CORES_PER_JOB", 8)
+        assert routing.worker_concurrency(routing.SOLVER, cores=32) == 4
+        assert routing.worker_concurrency(routing.SOLVER, cores=4) == 1
+
+        argv = routing.worker_argv(routing.SOLVER, cores=32)
+        assert "--queues=scheduling" in argv
+        assert "--concurrency=4" in argv
+        assert "--pool=prefork" in argv
+
+        light = routing.worker_argv(routing.LIGHT)
+        assert "--queues=notifications,default" in light
+        assert f"--pool={settings.LIGHT_WORKER_POOL}" in light
+
+        with pytest.raises(ValueError):
+            routing.worker_argv("gpu")
+
+    def test_search_workers_follow_free_cores(self, monkeypatch):
+        monkeypatch.setattr(settings, "SOLVER_CORES_PER_JOB", 8)
+        assert routing.free_search_workers(cores=32, load=0.0) == 8
+        assert routing.free_search_workers(cores=16, load=11.5) == 4
+        assert routing.free_search_workers(cores=8, load=20.0) == 1
+
+
+class TestLightTaskLatencyDuringSolve:
+    def test_light_tasks_stay_responsive_with_dedicated_pools(self, load_test_routes):
+        app, solve, notify = _memory_app()
+        with start_worker(
+            app,
+            pool="solo",
+            concurrency=1,
+            queues=routing.POOL_QUEUES[routing.SOLVER],
+            perform_ping_check=False,
+        ), start_worker(
+            app,
+            pool="threads",
+            concurrency=4,
+            queues=routing.POOL_QUEUES[routing.LIGHT],
+            perform_ping_check=False,
+        ):
+            latencies = _light_latencies(solve, notify)
+
+        assert max(latencies) < LIGHT_LATENCY_BUDGET
+
+    def test_shared_worker_queues_light_tasks_behind_the_solve(self, load_test_routes):
+        # Control: one undifferentiated worker makes light tasks wait.
+        app, solve, notify = _memory_app()
+        with start_worker(
+            app,
+            pool="solo",
+            concurrency=1,
+            queues=["scheduling", "notifications"],
+            perform_ping_check=False,
+        ):
+            latencies = _light_latencies(solve, notify)
+
+        assert max(latencies) > SOLVE_SECONDS / 2
@@ -0,0 +1,211 @@
+# backend/app/tests/unit/test_audit_writer.py
+"""
+Unit tests for the batched audit log writer.
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.auditing import AuditEntry, AuditLogWriter, AuditService
+from app.services.auditing import audit_writer
+
+
+class RecordingSink:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+
+    async def __call__(self, entries):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(entries))
+
+    @property
+    def entries(self):
+        return [entry for batch in self.batches for entry in batch]
+
+
+def _entry(i):
+    return AuditEntry(
+        user_id=uuid4(),
+        action="update",
+        entity_type="exam",
+        entity_id=uuid4(),
+        new_values={"seq": i},
+    )
+
+
+def _writer(sink, tmp_path, **kwargs):
+    options = {
+        "batch_size": 500,
+        "flush_interval": 60,
+        "max_buffered": 10000,
+        "backpressure_timeout": 0.01,
+    }
+    options.update(kwargs)
+    return AuditLogWriter(
+        sink=sink, spool_path=str(tmp_path / "audit.jsonl"), **options
+    )
+
+
+class TestAuditLogWriter:
+    def test_flushes_full_batches_and_remainder_at_shutdown(self, tmp_path):
+        sink = RecordingSink()
+
+        async def run():
+            writer = _writer(sink, tmp_path)
+            writer.start()
+            for i in range(1200):
+                await writer.submit(_entry(i))
+            await asyncio.sleep(0.05)
+            full_batches = [len(b) for b in sink.batches]
+            await writer.stop()
+            return full_batches
+
+        assert asyncio.run(run()) == [500, 500]
+        assert [len(b) for b in sink.batches] == [500, 500, 200]
+        assert [e.new_values["seq"] for e in sink.entries] == list(range(1200))
+
+    def test_flushes_partial_batch_after_interval(self, tmp_path):
+        sink = RecordingSink()
+
+        async def run():
+            writer = _writer(sink, tmp_path, flush_interval=0.05)
+            writer.start()
+            for i in range(3):
+                await writer.submit(_entry(i))
+            await asyncio.sleep(0.2)
+            flushed = len(sink.entries)
+            await writer.stop()
+            return flushed
+
+        assert asyncio.run(run()) == 3
+
+    def test_failed_batches_are_spooled_and_replayed(self, tmp_path):
+        sink = RecordingSink(failures=1)
+
+        async def run():
+            writer = _writer(sink, tmp_path, batch_size=10, flush_interval=0.01)
+            writer.start()
+            for i in range(10):
+                await writer.submit(_entry(i))
+            await asyncio.sleep(0.1)
+            spooled = (tmp_path / "audit.jsonl").exists()
+            await writer.submit(_entry(10))
+            await writer.stop()
+            return spooled, writer
+
+        spooled, writer = asyncio.run(run())
+        assert spooled
+        assert sorted(e.new_values["seq"] for e in sink.entries) == list(range(11))
+        assert writer.spooled == 10 and writer.written == 11
+        assert not list(tmp_path.iterdir())
+
+    def test_full_buffer_applies_backpressure_then_spools(self, tmp_path):
+        sink = RecordingSink()
+
+        async def run():
+            writer = _writer(sink, tmp_path, max_buffered=2)
+            for i in range(3):
+                await writer.submit(_entry(i))
+            return writer
+
+        writer = asyncio.run(run())
+        assert writer.spooled == 1
+        lines = (tmp_path / "audit.jsonl").read_text().splitlines()
+        restored = AuditEntry.from_json(lines[0])
+        assert restored.new_values == {"seq": 2}
+        assert isinstance(restored.created_at, datetime)
+
+    def test_record_matches_copy_columns(self):
+        entry = _entry(1)
+        entry.user_id = str(entry.user_id)
+        record = entry.to_record()
+        assert len(record) == len(audit_writer.AUDIT_COLUMNS)
+        assert isinstance(record[0], UUID)
+        assert record[4] is None and record[5] == '{"seq": 1}'
+
+
+class TestAuditServiceRouting:
+    def test_log_is_queued_without_touching_the_session(self, tmp_path):
+        sink = RecordingSink()
+        session = AsyncMock()
+
+        async def run():
+            writer = _writer(sink, tmp_path)
+            writer.start()
+            audit_writer._writer = writer
+            try:
+                await AuditService(session).log(
+                    user_id=uuid4(), action="create", entity_type="room"
+                )
+                await writer.stop()
+            finally:
+                audit_writer._writer = None
+
+        asyncio.run(run())
+        session.execute.assert_not_called()
+        assert [e.entity_type for e in sink.entries] == ["room"]
+
+    def test_log_falls_back_to_db_function_without_writer(self):
+        session = AsyncMock()
+        asyncio.run(
+            AuditService(session).log(
+                user_id=uuid4(), action="create", entity_type="room"
+            )
+        )
+        session.execute.assert_awaited_once()
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_log_on_commit_waits_for_the_commit(self, tmp_path):
+        sink = RecordingSink()
+        writer = _writer(sink, tmp_path)
+        writer.start()
+        audit_writer._writer = writer
+        db = AsyncSession()
+        try:
+            await db.begin()
+            await AuditService(db).log_on_commit([_entry(0), _entry(1)])
+            await asyncio.sleep(0)
+            queued_before_commit = writer._queue.qsize()
+            await db.commit()
+            await asyncio.sleep(0)
+            await writer.stop()
+        finally:
+            audit_writer._writer = None
+
+        assert queued_before_commit == 0
+        assert [e.new_values["seq"] for e in sink.entries] == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_log_on_commit_is_dropped_on_rollback(self, tmp_path):
+        sink = RecordingSink()
+        writer = _writer(sink, tmp_path)
+        writer.start()
+        audit_writer._writer = writer
+        db = AsyncSession()
+        try:
+            await db.begin()
+            await AuditService(db).log_on_commit([_entry(0)])
+            await db.rollback()
+            await db.begin()
+            await db.commit()
+            await asyncio.sleep(0)
+            await writer.stop()
+        finally:
+            audit_writer._writer = None
+
+        assert sink.entries == []
+
+    def test_log_on_commit_writes_inline_without_writer(self):
+        session = AsyncMock()
+        asyncio.run(AuditService(session).log_on_commit([_entry(0), _entry(1)]))
+        assert session.execute.await_count == 2
+        session.commit.assert_not_called()
@@ -0,0 +1,233 @@
+# backend/app/tests/unit/test_bulk_email_delivery.py
+"""
+Tests for pooled bulk email delivery against a local aiosmtpd server.
+"""
+
+import asyncio
+import socket
+import threading
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.services.notification import (
+    BulkEmailDelivery,
+    EmailConfig,
+    EmailMessage,
+    EmailService,
+)
+from app.services.notification.bulk_delivery import (
+    ProgressThrottle,
+    RateLimiter,
+    get_server_rate_limiter,
+)
+
+
+class RecordingHandler:
+    """Counts sessions and messages; can refuse chosen recipients."""
+
+    def __init__(self, transient=(), permanent=()):
+        self.transient = set(transient)
+        self.permanent = set(permanent)
+        self.connections = 0
+        self.delivered = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.permanent:
+            return "550 No such user"
+        if address in self.transient:
+            self.transient.discard(address)
+            return "451 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    servers = []
+
+    def start(**kwargs):
+        handler = RecordingHandler(**kwargs)
+        controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+        controller.start()
+        servers.append(controller)
+        return handler, controller.port
+
+    yield start
+    for controller in servers:
+        controller.stop()
+
+
+def _service(port):
+    return EmailService(
+        EmailConfig(
+            smtp_server="127.0.0.1",
+            smtp_port=port,
+            smtp_from="exams@example.com",
+            use_tls=False,
+            timeout=5,
+        )
+    )
+
+
+def _messages(count):
+    return [
+        EmailMessage(
+            subject=f"Timetable {i}",
+            recipients=[f"student{i}@example.com"],
+            html_body=f"<p>Hello {i}</p>",
+        )
+        for i in range(count)
+    ]
+
+
+class TestBulkEmailDelivery:
+    def test_messages_share_a_bounded_connection_pool(self, smtp_server):
+        handler, port = smtp_server()
+        delivery = BulkEmailDelivery(
+            _service(port), pool_size=3, rate_per_second=0, retry_delay=0
+        )
+
+        result = asyncio.run(delivery.deliver(_messages(60)))
+
+        assert result.sent == 60 and not result.failed
+        assert sorted(handler.delivered) == sorted(
+            f"student{i}@example.com" for i in range(60)
+        )
+        assert result.connections_opened == handler.connections <= 3
+
+    def test_connections_are_recycled_after_message_limit(self, smtp_server):
+        handler, port = smtp_server()
+        delivery = BulkEmailDelivery(
+            _service(port),
+            pool_size=1,
+            rate_per_second=0,
+            max_messages_per_connection=5,
+        )
+
+        result = asyncio.run(delivery.deliver(_messages(12)))
+
+        assert result.sent == 12
+        assert handler.connections == 3
+
+    def test_transient_failures_are_retried_without_restarting(self, smtp_server):
+        flaky = {"student3@example.com", "student7@example.com"}
+        handler, port = smtp_server(transient=flaky)
+        delivery = BulkEmailDelivery(
+            _service(port), pool_size=2, rate_per_second=0, retry_delay=0
+        )
+
+        result = asyncio.run(delivery.deliver(_messages(10)))
+
+        assert result.sent == 10 and not result.failed
+        assert result.retried == 2
+        assert len(handler.delivered) == 10
+
+    def test_consecutive_rate_limited_runs_in_fresh_loops(self, smtp_server):
+        handler, port = smtp_server()
+
+        # 30 messages against a burst of 20: workers wait on the limiter.
+        for _ in range(2):
+            delivery = BulkEmailDelivery(
+                _service(port), pool_size=3, rate_per_second=20, retry_delay=0
+            )
+            result = asyncio.run(delivery.deliver(_messages(30)))
+            assert result.sent == 30 and not result.failed
+
+        assert len(handler.delivered) == 60
+
+    def test_permanent_failures_are_reported_not_retried(self, smtp_server):
+        handler, port = smtp_server(permanent={"student4@example.com"})
+        delivery = BulkEmailDelivery(
+            _service(port), pool_size=2, rate_per_second=0, retry_delay=0
+        )
+
+        result = asyncio.run(delivery.deliver(_messages(6)))
+
+        assert result.sent == 5
+        assert list(result.failed) == ["student4@example.com"]
+        assert result.retried == 0
+
+    def test_progress_is_throttled(self, smtp_server):
+        _, port = smtp_server()
+        calls = []
+        delivery = BulkEmailDelivery(
+            _service(port),
+            pool_size=2,
+            rate_per_second=0,
+            progress_callback=lambda result: calls.append(result.completed),
+            progress_interval=60,
+        )
+
+        asyncio.run(delivery.deliver(_messages(30)))
+
+        # One report for the first message and a forced final one.
+        assert calls == [1, 30]
+
+
+class TestThrottling:
+    def test_rate_limiter_spaces_out_acquisitions(self):
+        async def run():
+            limiter = RateLimiter(rate=50, burst=1)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(6):
+                await limiter.acquire()
+            return loop.time() - start
+
+        assert asyncio.run(run()) >= 5 / 50 * 0.9
+
+    def test_shared_limiter_works_across_event_loops(self):
+        # Each Celery task runs in a fresh loop; light workers run several
+        # loops at once on threads. All must draw from the one server bucket.
+        limiter = RateLimiter(rate=200, burst=1)
+
+        async def contend():
+            # More acquisitions than the burst, so callers have to wait.
+            await asyncio.gather(*(limiter.acquire() for _ in range(10)))
+
+        asyncio.run(contend())
+        asyncio.run(contend())
+        errors = []
+
+        def in_thread():
+            try:
+                asyncio.run(contend())
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=in_thread) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+
+    def test_server_limiter_is_shared(self):
+        limiter = get_server_rate_limiter("shared.example.com", 25, rate=5)
+
+        assert get_server_rate_limiter("shared.example.com", 25, 5) is limiter
+        assert get_server_rate_limiter("shared.example.com", 25, 6) is not limiter
+
+    def test_progress_throttle_forces_final_report(self):
+        calls = []
+        throttle = ProgressThrottle(calls.append, interval=60)
+        for i in range(5):
+            throttle(i)
+        throttle(5, force=True)
+        assert calls == [0, 5]
@@ -0,0 +1,308 @@
+# backend/app/tests/unit/test_columnar_dataset_loader.py
+"""
+Unit tests for the columnar scheduling dataset loader and
+ExamSchedulingProblem.load_from_columnar.
+"""
+
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+
+from app.services.scheduling.columnar_dataset_loader import (
+    ColumnarDatasetLoader,
+    ColumnarSchedulingDataset,
+)
+from scheduling_engine.core.problem_model import ExamSchedulingProblem
+
+
+class FakeStreamResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def partitions(self, size):
+        for i in range(0, len(self.rows), size):
+            yield self.rows[i : i + size]
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def stream(self, statement, params):
+        return FakeStreamResult(self.rows)
+
+
+DAYS = [
+    {
+        "exam_date": "2025-01-06",
+        "time_periods": [
+            {
+                "id": str(uuid4()),
+                "period_name": "Morning",
+                "start_time": "09:00:00",
+                "end_time": "12:00:00",
+            },
+            {
+                "id": str(uuid4()),
+                "period_name": "Afternoon",
+                "start_time": "13:00:00",
+                "end_time": "16:00:00",
+            },
+        ],
+    }
+]
+
+CONSTRAINTS = {"system_configuration_id": str(uuid4()), "rules": []}
+
+
+def _entities():
+    students = [uuid4() for _ in range(4)]
+    exams = [
+        {
+            "id": uuid4(),
+            "course_id": uuid4(),
+            "course_code": code,
+            "course_title": f"{code} title",
+            "duration_minutes": 180,
+            "expected_students": expected,
+            "is_practical": False,
+            "morning_only": code == "MTH201",
+        }
+        for code, expected in (("CSC101", 1), ("MTH201", 10), ("PHY301", 0))
+    ]
+    registrations = [
+        (exams[0]["id"], students[0], "normal"),
+        (exams[0]["id"], students[1], "carryover"),
+        (exams[1]["id"], students[1], "normal"),
+        (exams[1]["id"], students[2], "normal"),
+        (exams[0]["id"], students[3], "normal"),
+    ]  # PHY301 has no registrations and is a phantom exam.
+    department = {"id": uuid4(), "name": "Computing"}
+    room = {
+        "id": uuid4(),
+        "code": "LT1",
+        "capacity": 100,
+        "exam_capacity": 60,
+        "overbookable": False,
+        "has_computers": True,
+        "building_name": "Main",
+        "building_faculty_id": None,
+        "adjacent_seat_pairs": [],
+    }
+    staff = {
+        "id": uuid4(),
+        "first_name": "Ada",
+        "last_name": "Obi",
+        "email": "ada@example.com",
+        "department_id": department["id"],
+        "department": "Computing",
+        "staff_number": "S001",
+        "staff_type": "academic",
+        "can_invigilate": True,
+        "max_concurrent_exams": 1,
+        "max_students_per_exam": 50,
+        "max_daily_sessions": 2,
+        "max_consecutive_sessions": 1,
+    }
+    return students, exams, registrations, department, room, staff
+
+
+def _jsonb_dataset(students, exams, registrations, department, room, staff):
+    """The equivalent ProblemModelCompatibleDataset-shaped namespace."""
+    exam_dicts = []
+    for exam in exams:
+        regs = {s: t for e, s, t in registrations if e == exam["id"]}
+        if not regs:
+            continue
+        exam_dicts.append(
+            {
+                **exam,
+                "students": regs,
+                "departments": [department] if exam is exams[0] else [],
+                "department_ids": [department["id"]] if exam is exams[0] else [],
+            }
+        )
+    return SimpleNamespace(
+        session_id=uuid4(),
+        exams=exam_dicts,
+        students=[{"id": s, "department": "Computing"} for s in students],
+        rooms=[room],
+        invigilators=[{**staff, "name": f"{staff['first_name']} {staff['last_name']}"}],
+        instructors=[],
+        locks=[],
+        constraints=CONSTRAINTS,
+        days=DAYS,
+        slot_generation_mode="fixed",
+    )
+
+
+def _columnar_dataset(students, exams, registrations, department, room, staff):
+    exam_index = {exam["id"]: i for i, exam in enumerate(exams)}
+    student_codes = {s: i for i, s in enumerate(students)}
+    types = ["normal", "carryover"]
+    dataset = ColumnarSchedulingDataset(
+        session_id=uuid4(),
+        exam_period_start=date(2025, 1, 6),
+        exam_period_end=date(2025, 1, 6),
+        days=DAYS,
+        constraints=CONSTRAINTS,
+    )
+    dataset.exams = {
+        key: [exam[key] for exam in exams]
+        for key in ("id", "course_id", "course_code", "course_title")
+    }
+    for key, dtype in (
+        ("duration_minutes", np.int32),
+        ("expected_students", np.int32),
+        ("is_practical", np.int8),
+        ("morning_only", np.int8),
+    ):
+        dataset.exams[key] = np.array([exam[key] for exam in exams], dtype=dtype)
+    dataset.exam_departments = {
+        "owner_idx": np.array([0], dtype=np.int32),
+        "id": [department["id"]],
+        "name": [department["name"]],
+    }
+    dataset.students = {
+        "id": students,
+        "matric_number": [None] * len(students),
+        "department": ["Computing"] * len(students),
+    }
+    dataset.registrations = {
+        "exam_idx": np.array([exam_index[e] for e, _, _ in registrations], np.int32),
+        "student_code": np.array(
+            [student_codes[s] for _, s, _ in registrations], np.int32
+        ),
+        "type_code": np.array([types.index(t) for _, _, t in registrations], np.int8),
+    }
+    dataset.registration_students = students
+    dataset.registration_types = types
+    dataset.rooms = {key: [value] for key, value in room.items()}
+    dataset.invigilators = {key: [value] for key, value in staff.items()}
+    return dataset
+
+
+def _load(loader_name, dataset):
+    problem = ExamSchedulingProblem(
+        session_id=dataset.session_id,
+        exam_period_start=date(2025, 1, 6),
+        exam_period_end=date(2025, 1, 6),
+    )
+    asyncio.run(getattr(problem, loader_name)(dataset))
+    return problem
+
+
+class TestColumnarProblemLoading:
+    def test_matches_jsonb_loading(self):
+        entities = _entities()
+        from_jsonb = _load("load_from_backend", _jsonb_dataset(*entities))
+        from_columns = _load("load_from_columnar", _columnar_dataset(*entities))
+
+        assert set(from_columns.exams) == set(from_jsonb.exams)
+        for exam_id, expected in from_jsonb.exams.items():
+            exam = from_columns.exams[exam_id]
+            assert exam.students == expected.students
+            assert exam.expected_students == expected.expected_students
+            assert exam.duration_minutes == expected.duration_minutes
+            assert exam.morning_only == expected.morning_only
+            assert exam.department_ids == expected.department_ids
+            assert exam.course_code == expected.course_code
+        assert set(from_columns.students) == set(from_jsonb.students)
+        assert from_columns.course_students == from_jsonb.course_students
+        assert len(from_columns.timeslots) == len(from_jsonb.timeslots) == 2
+
+        room_id = next(iter(from_jsonb.rooms))
+        assert from_columns.rooms[room_id].exam_capacity == 60
+        assert from_columns.rooms[room_id].overbookable is False
+        invigilator = next(iter(from_columns.invigilators.values()))
+        expected_invigilator = next(iter(from_jsonb.invigilators.values()))
+        assert invigilator.name == expected_invigilator.name == "Ada Obi"
+        assert invigilator.department_id == expected_invigilator.department_id
+
+    def test_staff_unavailability_matches_jsonb_loading(self):
+        entities = _entities()
+        availability = {"2025-01-06": ["Afternoon", "Morning"]}
+        jsonb = _jsonb_dataset(*entities)
+        jsonb.invigilators[0]["availability"] = availability
+        columnar = _columnar_dataset(*entities)
+        columnar.staff_unavailability = {
+            "owner_idx": np.array([0, 0], dtype=np.int32),
+            "date": ["2025-01-06", "2025-01-06"],
+            "periods": ["Morning,Afternoon", "Morning"],
+        }
+
+        from_jsonb = _load("load_from_backend", jsonb)
+        from_columns = _load("load_from_columnar", columnar)
+
+        staff_id = entities[-1]["id"]
+        assert from_jsonb.invigilators[staff_id].availability == availability
+        assert from_columns.invigilators[staff_id].availability == availability
+
+    def test_phantom_exams_are_dropped(self):
+        students, exams, *rest = _entities()
+        problem = _load("load_from_columnar", _columnar_dataset(students, exams, *rest))
+        assert exams[2]["id"] not in problem.exams
+        assert problem.exams[exams[1]["id"]].expected_students == 10
+        assert problem.exams[exams[0]["id"]].expected_students == 3
+
+
+class TestColumnarDatasetLoader:
+    def test_registrations_are_dictionary_encoded_across_batches(self):
+        exam_a, exam_b, unknown = uuid4(), uuid4(), uuid4()
+        s1, s2 = uuid4(), uuid4()
+        rows = [
+            (exam_a, s1, "normal"),
+            (exam_b, s1, "carryover"),
+            (unknown, s2, "normal"),
+            (exam_a, s2, "normal"),
+        ]
+        loader = ColumnarDatasetLoader(FakeSession(rows), batch_size=2)
+        dataset = ColumnarSchedulingDataset(
+            session_id=uuid4(),
+            exam_period_start=date(2025, 1, 6),
+            exam_period_end=date(2025, 1, 6),
+        )
+
+        asyncio.run(loader._load_registrations(dataset, {exam_a: 0, exam_b: 1}, {}))
+
+        assert dataset.registrations["exam_idx"].tolist() == [0, 1, 0]
+        assert dataset.registrations["exam_idx"].dtype == np.int32
+        assert dataset.registration_students == [s1, s2]
+        assert [
+            dataset.registration_types[c]
+            for c in dataset.registrations["type_code"].tolist()
+        ] == ["normal", "carryover", "normal"]
+
+    def test_exam_rows_are_normalised(self):
+        course_id = uuid4()
+        rows = [
+            (uuid4(), course_id, "CSC101", "Intro", 0, None, True, False),
+            (uuid4(), course_id, None, None, 900, 5, False, True),
+        ]
+        loader = ColumnarDatasetLoader(FakeSession(rows), batch_size=10)
+
+        columns = asyncio.run(
+            loader._load_columns(
+                "",
+                {},
+                {
+                    "id": "object",
+                    "course_id": "object",
+                    "course_code": "object",
+                    "course_title": "object",
+                    "duration_minutes": "int32",
+                    "expected_students": "int32",
+                    "is_practical": "int8",
+                    "morning_only": "int8",
+                },
+                convert=ColumnarDatasetLoader._convert_exam_row,
+            )
+        )
+
+        assert columns["duration_minutes"].tolist() == [180, 540]
+        assert columns["expected_students"].tolist() == [0, 5]
+        assert columns["course_code"][1] == f"COURSE_{course_id}"
+        assert columns["is_practical"].tolist() == [1, 0]
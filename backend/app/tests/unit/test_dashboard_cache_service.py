@@ -0,0 +1,129 @@
+# backend/app/tests/unit/test_dashboard_cache_service.py
+"""
+Unit tests for the Redis-backed dashboard KPI cache.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.data_retrieval.dashboard_cache_service import (
+    DashboardCacheService,
+)
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio commands used."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def ping(self):
+        return True
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = str(value)
+        return True
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+
+@pytest.fixture
+def cache():
+    service = DashboardCacheService(MagicMock(), redis=FakeRedis())
+    service.retrieval = MagicMock()
+    service.retrieval.get_published_timetable_version = AsyncMock(
+        return_value=uuid4()
+    )
+    return service
+
+
+class TestDashboardCacheService:
+    @pytest.mark.asyncio
+    async def test_second_read_is_served_from_cache(self, cache):
+        cache.retrieval.get_dashboard_kpis = AsyncMock(
+            return_value={"total_exams_scheduled": 12}
+        )
+        session_id = uuid4()
+
+        first = await cache.get(session_id, "kpis")
+        second = await cache.get(session_id, "kpis")
+
+        assert first == second == {"total_exams_scheduled": 12}
+        cache.retrieval.get_dashboard_kpis.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_run_the_aggregation_once(self, cache):
+        async def slow_hotspots(session_id):
+            await asyncio.sleep(0.05)
+            return [{"timeslot": "Mon AM", "conflict_count": 3}]
+
+        cache.retrieval.get_conflict_hotspots = AsyncMock(side_effect=slow_hotspots)
+        session_id = uuid4()
+
+        results = await asyncio.gather(
+            *(cache.get(session_id, "conflict_hotspots") for _ in range(20))
+        )
+
+        assert all(r == results[0] for r in results)
+        assert cache.retrieval.get_conflict_hotspots.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_forces_recompute(self, cache):
+        cache.retrieval.get_top_bottlenecks = AsyncMock(side_effect=[[1], [2]])
+        session_id = uuid4()
+
+        assert await cache.get(session_id, "top_bottlenecks") == [1]
+        await cache.invalidate_session(session_id)
+        assert await cache.get(session_id, "top_bottlenecks") == [2]
+
+    @pytest.mark.asyncio
+    async def test_unknown_metric_is_rejected(self, cache):
+        with pytest.raises(ValueError):
+            await cache.get(uuid4(), "unknown")
+
+    @pytest.mark.asyncio
+    async def test_queued_invalidation_waits_for_commit(self):
+        redis = FakeRedis()
+        db = AsyncSession()
+        cache = DashboardCacheService(db, redis=redis)
+        session_id = uuid4()
+        generation = cache._generation_key(session_id)
+
+        await db.begin()
+        cache.invalidate_session_on_commit(session_id)
+        await asyncio.sleep(0)
+        assert generation not in redis.store
+
+        await db.commit()
+        await asyncio.sleep(0)
+        assert redis.store[generation] == "1"
+
+    @pytest.mark.asyncio
+    async def test_rollback_drops_the_queued_invalidation(self):
+        redis = FakeRedis()
+        db = AsyncSession()
+        cache = DashboardCacheService(db, redis=redis)
+        session_id = uuid4()
+
+        await db.begin()
+        cache.invalidate_session_on_commit(session_id)
+        await db.rollback()
+        await db.begin()
+        await db.commit()
+        await asyncio.sleep(0)
+
+        assert cache._generation_key(session_id) not in redis.store
@@ -0,0 +1,111 @@
+# backend/app/tests/unit/test_email_template_rendering.py
+"""
+Tests for compiled email templates and bulk rendering.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from jinja2 import Template
+
+from app.services.notification import EmailConfig, EmailService
+from app.services.notification.email_service import compile_template, render_batch
+from app.tasks.notification_tasks import _build_recipient_contexts
+
+TEMPLATE = (
+    "<html><body><h2>{{title}}</h2><p>Dear {{user_name}},</p>"
+    + "<p>{{message}}</p>" * 20
+    + "<p>Session: {{session_name}} ({{ start_date }} to {{ end_date }})</p>"
+    + "<footer>{{footer}}</footer></body></html>"
+)
+SHARED = {
+    "title": "Exam timetable published",
+    "message": "Your personal timetable is now available on the portal.",
+    "session_name": "2024/2025 Harmattan",
+    "start_date": "2025-01-06",
+    "end_date": "2025-01-24",
+    "footer": "Exam Timetabling System",
+}
+
+
+def _service():
+    return EmailService(EmailConfig(smtp_server="localhost", smtp_port=25))
+
+
+def _users(count):
+    return [
+        {"id": i, "email": f"user{i}@example.com", "first_name": f"Name{i}"}
+        for i in range(count)
+    ]
+
+
+class TestCompiledTemplates:
+    def test_template_is_loaded_and_compiled_once(self):
+        service = _service()
+        loader = AsyncMock(return_value="Hi {{user_name}}")
+
+        async def run():
+            with patch.object(service, "_load_template", loader):
+                first = await service._render_template("t", {"user_name": "Ada"})
+                second = await service._render_template("t", {"user_name": "Obi"})
+            return first, second
+
+        assert asyncio.run(run()) == ("Hi Ada", "Hi Obi")
+        assert loader.await_count == 1
+        assert isinstance(service._template_cache["t"], Template)
+
+    def test_compilation_is_shared_across_instances(self):
+        assert compile_template(TEMPLATE) is compile_template(TEMPLATE)
+
+    def test_missing_keys_keep_their_placeholder(self):
+        rendered = render_batch(
+            "Re: {{course_code}}", "Dear {{user_name}}, see {{portal_url}}.", [{}]
+        )
+
+        assert rendered == [
+            ("Re: {{course_code}}", "Dear {{user_name}}, see {{portal_url}}.")
+        ]
+
+    def test_render_bulk_renders_subjects_and_bodies_in_order(self):
+        service = _service()
+        contexts = _build_recipient_contexts(_users(2500), SHARED)
+
+        async def run():
+            with patch.object(
+                service, "_load_template", AsyncMock(return_value=TEMPLATE)
+            ):
+                return await service.render_bulk(
+                    "timetable",
+                    "Timetable for {{user_name}}",
+                    contexts,
+                    chunk_size=1000,
+                )
+
+        rendered = asyncio.run(run())
+        assert len(rendered) == 2500
+        subject, body = rendered[1234]
+        assert subject == "Timetable for Name1234"
+        assert "Dear Name1234," in body and "2024/2025 Harmattan" in body
+
+    def test_render_bulk_returns_none_for_missing_template(self):
+        service = _service()
+
+        async def run():
+            with patch.object(service, "_load_template", AsyncMock(return_value=None)):
+                return await service.render_bulk("missing", "Subject", [{}])
+
+        assert asyncio.run(run()) is None
+
+
+class TestRecipientContexts:
+    def test_shared_data_is_merged_into_every_context(self):
+        users = _users(3) + [{"id": 9, "email": "x@example.com", "first_name": None}]
+        contexts = _build_recipient_contexts(users, SHARED)
+
+        assert [c["user_name"] for c in contexts] == [
+            "Name0",
+            "Name1",
+            "Name2",
+            "User",
+        ]
+        assert all(c["session_name"] == SHARED["session_name"] for c in contexts)
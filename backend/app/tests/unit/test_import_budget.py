@@ -0,0 +1,79 @@
+# backend/app/tests/unit/test_import_budget.py
+"""
+Import-time budget for the API and Celery worker entry points.
+
+Each entry point is imported in a fresh interpreter. The heavy solver and PDF
+dependencies must stay out of the startup import graph, and the graph itself
+must stay under a module-count budget so regressions show up in CI rather
+than as slower cold starts and fatter replicas.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.utils.lazy_imports import HEAVY_MODULES, LazyModule, lazy_import
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+# About 1,250 modules at the time of writing; leave headroom for growth.
+STARTUP_MODULE_BUDGET = 1500
+STARTUP_SECONDS_BUDGET = float(os.getenv("STARTUP_IMPORT_SECONDS_BUDGET", "15"))
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "modules": len(sys.modules),
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def _probe(module):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(REPO_ROOT), str(REPO_ROOT / "backend"), env.get("PYTHONPATH", "")]
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if result.returncode != 0:
+        if "ModuleNotFoundError" in result.stderr:
+            pytest.skip(f"{module} dependencies not installed")
+        raise AssertionError(result.stderr[-2000:])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "entry_point", ["backend.app.main", "backend.app.tasks.celery_app"]
+)
+def test_startup_import_graph_stays_within_budget(entry_point):
+    stats = _probe(entry_point)
+
+    assert stats["heavy"] == []
+    assert stats["modules"] <= STARTUP_MODULE_BUDGET
+    assert stats["seconds"] <= STARTUP_SECONDS_BUDGET
+
+
+def test_lazy_module_imports_on_first_attribute_access():
+    sys.modules.pop("colorsys", None)
+
+    module = lazy_import("colorsys")
+
+    assert isinstance(module, LazyModule)
+    assert "colorsys" not in sys.modules
+    assert module.rgb_to_hsv(1, 0, 0) == (0.0, 1.0, 1)
+    assert "colorsys" in sys.modules
+    assert lazy_import("colorsys") is sys.modules["colorsys"]
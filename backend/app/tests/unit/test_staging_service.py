@@ -0,0 +1,193 @@
+# backend/app/tests/unit/test_staging_service.py
+"""
+Unit tests for the batched StagingService API.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from app.services.auditing import AuditService
+from app.services.seeding.staging_service import StagingService
+from app.schemas.staging import StagingOperation, StagingOperationType
+
+
+def _session_returning(*ord_batches):
+    """Mock AsyncSession whose successive executes return the given ords."""
+    session = MagicMock()
+    session.sync_session = Session()
+    results = []
+    for ords in ord_batches:
+        result = MagicMock()
+        result.fetchall.return_value = [(o,) for o in ords]
+        results.append(result)
+    session.execute = AsyncMock(side_effect=results)
+    return session
+
+
+def _course(code, **overrides):
+    data = {
+        "code": code,
+        "title": f"Course {code}",
+        "credit_units": 3,
+        "exam_duration_minutes": 120,
+        "course_level": 100,
+        "semester": 1,
+        "is_practical": False,
+        "morning_only": False,
+    }
+    data.update(overrides)
+    return data
+
+
+class TestStagingBatch:
+    """Test validation and set-based application of staging batches."""
+
+    @pytest.mark.asyncio
+    async def test_adds_are_applied_in_one_statement(self):
+        session = _session_returning([0, 1, 2])
+        service = StagingService(session)
+        ops = [
+            StagingOperation(op=StagingOperationType.ADD, data=_course(f"C{i}"))
+            for i in range(3)
+        ]
+
+        result = await service.apply_batch(uuid4(), "courses", ops)
+
+        assert result.applied == 3
+        assert result.failed == 0
+        assert session.execute.await_count == 1
+        sql = str(session.execute.await_args.args[0])
+        assert "MERGE INTO staging.courses" in sql
+        assert "unnest(" in sql
+        params = session.execute.await_args.args[1]
+        assert params["d_code"] == ["C0", "C1", "C2"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_rows_are_reported_without_aborting(self):
+        session = _session_returning([0])
+        service = StagingService(session)
+        ops = [
+            StagingOperation(op=StagingOperationType.ADD, data=_course("C0")),
+            StagingOperation(
+                op=StagingOperationType.ADD, data=_course("C1", credit_units="x")
+            ),
+            StagingOperation(op=StagingOperationType.DELETE, key={}),
+        ]
+
+        result = await service.apply_batch(uuid4(), "courses", ops)
+
+        assert [r.success for r in result.results] == [True, False, False]
+        assert "credit_units" in result.results[1].error
+        assert "code" in result.results[2].error
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unmatched_update_reports_not_found(self):
+        session = _session_returning([1])
+        service = StagingService(session)
+        ops = [
+            StagingOperation(
+                op=StagingOperationType.UPDATE, key={"code": "A"}, data={"name": "x"}
+            ),
+            StagingOperation(
+                op=StagingOperationType.UPDATE, key={"code": "B"}, data={"name": "y"}
+            ),
+        ]
+
+        result = await service.apply_batch(uuid4(), "faculties", ops)
+
+        assert result.results[0].error == "Faculty with code 'A' not found."
+        assert result.results[1].success
+
+    @pytest.mark.asyncio
+    async def test_updates_are_grouped_by_changed_fields(self):
+        session = _session_returning([0, 2], [1])
+        service = StagingService(session)
+        ops = [
+            StagingOperation(
+                op=StagingOperationType.UPDATE, key={"code": "A"}, data={"title": "a"}
+            ),
+            StagingOperation(
+                op=StagingOperationType.UPDATE,
+                key={"code": "B"},
+                data={"semester": 2},
+            ),
+            StagingOperation(
+                op=StagingOperationType.UPDATE, key={"code": "C"}, data={"title": "c"}
+            ),
+        ]
+
+        result = await service.apply_batch(uuid4(), "courses", ops)
+
+        assert result.applied == 3
+        assert session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_adds_insert_only_the_fields_supplied(self):
+        session = _session_returning([0])
+        service = StagingService(session)
+        ops = [
+            StagingOperation(
+                op=StagingOperationType.ADD,
+                data={"student_matric_number": "M1", "course_code": "C1"},
+            )
+        ]
+
+        result = await service.apply_batch(uuid4(), "course_registrations", ops)
+
+        assert result.applied == 1
+        sql = str(session.execute.await_args.args[0])
+        assert "INSERT (session_id, student_matric_number, course_code)" in sql
+        assert "d_registration_type" not in session.execute.await_args.args[1]
+
+    @pytest.mark.asyncio
+    async def test_applied_rows_are_audited_for_the_user(self, monkeypatch):
+        audited = []
+
+        async def log_on_commit(self, entries):
+            audited.extend(entries)
+
+        monkeypatch.setattr(AuditService, "log_on_commit", log_on_commit)
+        session = _session_returning([1])
+        service = StagingService(session)
+        user_id = uuid4()
+        ops = [
+            StagingOperation(
+                op=StagingOperationType.UPDATE, key={"code": "A"}, data={"name": "x"}
+            ),
+            StagingOperation(
+                op=StagingOperationType.UPDATE, key={"code": "B"}, data={"name": "y"}
+            ),
+        ]
+
+        await service.apply_batch(uuid4(), "faculties", ops, user_id=user_id)
+
+        assert [(e.user_id, e.action, e.entity_type) for e in audited] == [
+            (user_id, "update", "staging_faculties")
+        ]
+        assert audited[0].new_values == {"key": {"code": "B"}, "data": {"name": "y"}}
+
+    @pytest.mark.asyncio
+    async def test_duplicate_keys_in_one_phase_are_rejected(self):
+        session = _session_returning([0])
+        service = StagingService(session)
+        ops = [
+            StagingOperation(op=StagingOperationType.DELETE, key={"code": "A"}),
+            StagingOperation(op=StagingOperationType.DELETE, key={"code": "A"}),
+        ]
+
+        result = await service.apply_batch(uuid4(), "rooms", ops)
+
+        assert result.results[0].success
+        assert not result.results[1].success
+
+    @pytest.mark.asyncio
+    async def test_single_record_wrapper_raises_on_failure(self):
+        session = _session_returning([])
+        service = StagingService(session)
+
+        with pytest.raises(ValueError, match="not found"):
+            await service.delete_building(uuid4(), "B1")
@@ -0,0 +1,181 @@
+# backend/app/tests/unit/test_timetable_export.py
+"""
+Unit tests for the streaming CSV exporter and the split/merge PDF pipeline.
+"""
+
+import io
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi import HTTPException
+
+from app.services.export import pdf_generator
+from app.services.export.csv_exporter import CSVExporter
+from app.services.export.pdf_generator import PDFGenerator, split_timetable_rows
+
+
+def _rows(n, faculties=("Science", "Law", "Arts")):
+    return [
+        {
+            "date": "2025-01-10",
+            "start_time": "09:00:00",
+            "end_time": "11:00:00",
+            "course_code": f"C{i:04d}",
+            "course_title": f"Course {i}",
+            "faculty_name": faculties[i % len(faculties)],
+            "department_name": f"Dept {i % 2}",
+        }
+        for i in range(n)
+    ]
+
+
+def _fake_render(title, rows):
+    """Renders one page per row with reportlab instead of WeasyPrint."""
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for row in rows:
+        pdf.drawString(40, 800, f"{title}: {row['course_code']}")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+class TestCSVExporter:
+    def test_chunks_concatenate_to_full_export(self):
+        exporter = CSVExporter(fieldnames=["course_code", "date"], chunk_rows=7)
+        rows = _rows(50)
+
+        chunks = list(exporter.iter_export(rows))
+
+        assert len(chunks) == 8  # 50 rows in chunks of 7
+        text = b"".join(chunks).decode("utf-8")
+        assert text.splitlines()[0] == "course_code,date"
+        assert len(text.splitlines()) == 51
+        assert b"".join(chunks) == exporter.export(rows)
+
+    def test_empty_rows_still_yield_header(self):
+        chunks = list(CSVExporter(fieldnames=["a", "b"]).iter_export([]))
+        assert b"".join(chunks) == b"a,b\r\n"
+
+
+class TestPDFPartsPipeline:
+    def test_split_by_faculty_and_department(self):
+        rows = _rows(12)
+
+        by_faculty = split_timetable_rows(rows, "faculty")
+        by_department = split_timetable_rows(rows, "department")
+
+        assert [label for label, _ in by_faculty] == ["Arts", "Law", "Science"]
+        assert sum(len(part) for _, part in by_faculty) == 12
+        assert len(by_department) == 6
+
+    def test_parts_are_merged_in_order(self, monkeypatch):
+        monkeypatch.setattr(pdf_generator, "render_timetable_part", _fake_render)
+        pytest.importorskip("pypdf")
+        from pypdf import PdfReader
+
+        progress = []
+        output = io.BytesIO()
+        pages = PDFGenerator(title="T").generate_timetable_parts(
+            _rows(9),
+            output,
+            max_workers=1,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+        assert pages == 9
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+        merged = PdfReader(io.BytesIO(output.getvalue()), strict=True)
+        assert [page.extract_text().split(":")[0] for page in merged.pages] == [
+            "T - Arts"
+        ] * 3 + ["T - Law"] * 3 + ["T - Science"] * 3
+
+    def test_parts_are_written_as_they_are_merged(self, monkeypatch):
+        monkeypatch.setattr(pdf_generator, "render_timetable_part", _fake_render)
+        pytest.importorskip("pypdf")
+
+        output = io.BytesIO()
+        sizes = []
+        PDFGenerator(title="T").generate_timetable_parts(
+            _rows(9),
+            output,
+            max_workers=1,
+            progress_callback=lambda done, total: sizes.append(output.tell()),
+        )
+
+        assert 0 < sizes[0] < sizes[1] < sizes[2] < output.tell()
+
+    def test_pool_starts_inside_a_daemonic_worker(self, monkeypatch):
+        monkeypatch.setattr(pdf_generator, "render_timetable_part", _fake_render)
+        pytest.importorskip("pypdf")
+        billiard = pytest.importorskip("billiard")
+
+        # Stands in for a Celery prefork child, which is a daemonic process.
+        queue = billiard.Queue()
+        worker = billiard.Process(target=_export_in_worker, args=(queue,), daemon=True)
+        worker.start()
+        result = queue.get(timeout=60)
+        worker.join(timeout=10)
+
+        # No in-process fallback: the pool started and rendered every part.
+        assert result == (9, [(1, 3), (2, 3), (3, 3)], [])
+
+
+class _OwnerRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+class TestExportAccess:
+    @pytest.mark.asyncio
+    async def test_failed_export_is_visible_to_its_owner_only(self, monkeypatch):
+        from app.api.v1.routes import timetables
+
+        redis = _OwnerRedis()
+
+        async def get_cache_redis():
+            return redis
+
+        monkeypatch.setattr(timetables, "get_cache_redis", get_cache_redis)
+        failed = SimpleNamespace(
+            state="FAILURE",
+            info=RuntimeError("boom"),
+            result=RuntimeError("boom"),
+            successful=lambda: False,
+            failed=lambda: True,
+        )
+        monkeypatch.setattr(
+            timetables.celery_app, "AsyncResult", lambda task_id: failed
+        )
+        owner = SimpleNamespace(id=uuid4(), is_superuser=False)
+        other = SimpleNamespace(id=uuid4(), is_superuser=False)
+        await timetables._remember_export_owner("t1", owner)
+
+        response = await timetables.get_timetable_export_status("t1", user=owner)
+
+        assert response.data == {"task_id": "t1", "state": "FAILURE", "error": "boom"}
+        with pytest.raises(HTTPException) as denied:
+            await timetables.get_timetable_export_status("t1", user=other)
+        assert denied.value.status_code == 404
+
+
+def _export_in_worker(queue):
+    warnings = []
+    pdf_generator.logger.warning = warnings.append
+    progress = []
+    pages = PDFGenerator(title="T").generate_timetable_parts(
+        _rows(9),
+        io.BytesIO(),
+        max_workers=2,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+    queue.put((pages, progress, warnings))
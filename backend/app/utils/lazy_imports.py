@@ -0,0 +1,57 @@
+# app/utils/lazy_imports.py
+"""
+Deferred imports for heavy optional dependencies (pandas, ortools, weasyprint,
+reportlab, ...).
+
+`pd = lazy_import("pandas")` binds a placeholder module whose first attribute
+access performs the real import, so modules that only touch pandas inside a
+few functions no longer pay for it when the API or a solver-free worker starts.
+"""
+
+import importlib
+import sys
+from types import ModuleType
+from typing import Any
+
+# Modules that must not be imported when the API or a solver-free worker
+# starts; checked by the import-budget test.
+HEAVY_MODULES = (
+    "ortools",
+    "pygad",
+    "pandas",
+    "weasyprint",
+    "reportlab",
+)
+
+
+class LazyModule(ModuleType):
+    """Module placeholder that imports the real module on first use."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = name
+
+    def _load(self) -> ModuleType:
+        module = importlib.import_module(self.__dict__["_lazy_target"])
+        # Later lookups hit the copied attributes instead of __getattr__.
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Returns the module if it is already loaded, else a LazyModule for it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def loaded_heavy_modules() -> list:
+    """The HEAVY_MODULES that have been imported into this process."""
+    return [name for name in HEAVY_MODULES if name in sys.modules]
@@ -629,6 +629,11 @@ BEGIN
     VALUES (p_version_id, p_exam_id, p_edited_by, 'manual_move', p_new_values, p_old_values, p_reason, 'pending')
     RETURNING id INTO new_edit_id;
 
+    -- Keep the portal projections of a published version in step with the edit.
+    IF EXISTS (SELECT 1 FROM exam_system.schedule_projection_versions WHERE version_id = p_version_id) THEN
+        PERFORM exam_system.refresh_schedule_projections(p_version_id, ARRAY[p_exam_id]);
+    END IF;
+
     -- Optionally, return the newly created conflicts by this move
     -- (This would require calling a conflict detection function here)
 
@@ -1606,18 +1611,15 @@ ALTER FUNCTION exam_system.get_audit_history(p_page integer, p_page_size integer
 --
 
 CREATE FUNCTION exam_system.get_conflict_hotspots(p_session_id uuid) RETURNS jsonb
-    LANGUAGE plpgsql
+    LANGUAGE plpgsql STABLE
     AS $$
 DECLARE
     v_latest_version_id uuid;
-    v_latest_job_data jsonb;
-    v_conflict_item jsonb;
     v_assignments jsonb;
-    v_assignment jsonb;
     v_hotspots jsonb;
 BEGIN
-    -- Step 1: Get the latest published version and its job data
-    SELECT tv.id, tj.result_data INTO v_latest_version_id, v_latest_job_data
+    -- Step 1: Get the latest published version
+    SELECT tv.id INTO v_latest_version_id
     FROM exam_system.timetable_versions tv
     JOIN exam_system.timetable_jobs tj ON tv.job_id = tj.id
     WHERE tv.is_published = TRUE
@@ -1625,26 +1627,26 @@ BEGIN
     ORDER BY tv.created_at DESC
     LIMIT 1;
 
-    -- Clear old conflicts for this version to prevent duplicates
-    DELETE FROM exam_system.timetable_conflicts WHERE version_id = v_latest_version_id;
+    IF v_latest_version_id IS NULL THEN
+        RETURN '[]'::jsonb;
+    END IF;
 
-    -- Step 2: Parse conflicts from the JSON and insert them into the table
-    FOR v_conflict_item IN SELECT * FROM jsonb_array_elements(v_latest_job_data -> 'solution' -> 'conflicts')
-    LOOP
-        INSERT INTO exam_system.timetable_conflicts (version_id, type, severity, message, details, is_resolved)
-        VALUES (
-            v_latest_version_id,
-            v_conflict_item ->> 'type',
-            v_conflict_item ->> 'severity',
-            v_conflict_item ->> 'message',
-            v_conflict_item -> 'details',
-            FALSE
-        );
-    END LOOP;
+    -- Step 2: Serve the aggregates computed when the version's conflicts were materialized
+    SELECT vca.hotspots INTO v_hotspots
+    FROM exam_system.version_conflict_analytics vca
+    WHERE vca.version_id = v_latest_version_id;
+
+    IF FOUND THEN
+        RETURN COALESCE(v_hotspots, '[]'::jsonb);
+    END IF;
+
+    -- Step 3: Not materialized yet (published before materialization existed);
+    -- aggregate from the solution document without writing anything.
+    SELECT tj.result_data -> 'solution' -> 'assignments' INTO v_assignments
+    FROM exam_system.timetable_versions tv
+    JOIN exam_system.timetable_jobs tj ON tv.job_id = tj.id
+    WHERE tv.id = v_latest_version_id;
 
-    -- Step 3: Aggregate conflicts by time slot to find hotspots
-    v_assignments := v_latest_job_data -> 'solution' -> 'assignments';
-    
     SELECT jsonb_agg(hotspot)
     FROM (
         SELECT 
@@ -2134,6 +2136,8 @@ DECLARE
     v_role_specific_id UUID; -- Will hold either student_id or staff_id
     v_active_session_id UUID;
     v_latest_job_id UUID;
+    v_latest_version_id UUID;
+    v_projected BOOLEAN := FALSE;
     v_portal_payload JSONB;
 BEGIN
     -- Step 1: Find the currently active academic session.
@@ -2161,7 +2165,7 @@ BEGIN
     END IF;
 
     -- Step 3: Find the job ID associated with the latest published timetable version for the active session.
-    SELECT tv.job_id INTO v_latest_job_id
+    SELECT tv.id, tv.job_id INTO v_latest_version_id, v_latest_job_id
     FROM exam_system.timetable_versions tv
     JOIN exam_system.timetable_jobs tj ON tv.job_id = tj.id
     WHERE tj.session_id = v_active_session_id
@@ -2169,6 +2173,11 @@ BEGIN
       AND tj.status = 'completed'
     ORDER BY tv.created_at DESC
     LIMIT 1;
+
+    -- Published versions are served from the read projections built at publish time.
+    v_projected := v_latest_version_id IS NOT NULL AND EXISTS (
+        SELECT 1 FROM exam_system.schedule_projection_versions WHERE version_id = v_latest_version_id
+    );
     
     IF v_latest_job_id IS NULL THEN
         SELECT id INTO v_latest_job_id
@@ -2184,7 +2193,36 @@ BEGIN
     END IF;
 
     -- Step 4: Build the role-specific data payload. (No changes needed here as subqueries use the correct session ID)
-    IF v_user_role = 'student' THEN
+    IF v_user_role = 'student' AND v_projected THEN
+        SELECT jsonb_build_object(
+            'schedule', COALESCE((
+                SELECT jsonb_agg(ssp.assignment ORDER BY ssp.exam_date, ssp.start_time)
+                FROM exam_system.student_schedule_projections ssp
+                WHERE ssp.student_id = v_role_specific_id AND ssp.version_id = v_latest_version_id
+            ), '[]'::jsonb),
+            'conflict_reports', COALESCE((
+                SELECT jsonb_agg(cr.* ORDER BY cr.submitted_at DESC)
+                FROM exam_system.conflict_reports cr
+                WHERE cr.student_id = v_role_specific_id
+            ), '[]'::jsonb)
+        )
+        INTO v_portal_payload;
+
+    ELSIF v_user_role = 'staff' AND v_projected THEN
+        SELECT jsonb_build_object(
+            'instructor_schedule', COALESCE(jsonb_agg(sdp.assignment ORDER BY sdp.exam_date, sdp.start_time) FILTER (WHERE sdp.role = 'instructor'), '[]'::jsonb),
+            'invigilator_schedule', COALESCE(jsonb_agg(sdp.assignment ORDER BY sdp.exam_date, sdp.start_time) FILTER (WHERE sdp.role = 'invigilator'), '[]'::jsonb),
+            'assignment_change_requests', COALESCE((
+                SELECT jsonb_agg(acr.* ORDER BY acr.submitted_at DESC)
+                FROM exam_system.assignment_change_requests acr
+                WHERE acr.staff_id = v_role_specific_id
+            ), '[]'::jsonb)
+        )
+        INTO v_portal_payload
+        FROM exam_system.staff_duty_projections sdp
+        WHERE sdp.staff_id = v_role_specific_id AND sdp.version_id = v_latest_version_id;
+
+    ELSIF v_user_role = 'student' THEN
         WITH student_exams AS (
             SELECT e.id
             FROM exam_system.course_registrations cr
@@ -3129,11 +3167,51 @@ CREATE FUNCTION exam_system.get_student_schedule(p_student_id uuid, p_job_id uui
 DECLARE
     v_result_data jsonb;
     v_session_id uuid;
+    v_version_id uuid;
     v_student_courses uuid[];
     v_schedule jsonb;
     v_student_details jsonb;
 BEGIN
-    SELECT result_data, session_id INTO v_result_data, v_session_id
+    SELECT session_id INTO v_session_id
+    FROM exam_system.timetable_jobs
+    WHERE id = p_job_id AND status = 'completed';
+
+    -- Projected (published) versions of the job are read with a single index lookup.
+    SELECT spv.version_id INTO v_version_id
+    FROM exam_system.schedule_projection_versions spv
+    WHERE spv.job_id = p_job_id
+    ORDER BY spv.built_at DESC
+    LIMIT 1;
+
+    IF v_session_id IS NOT NULL AND v_version_id IS NOT NULL THEN
+        SELECT COALESCE(jsonb_agg(
+            jsonb_build_object(
+                'course_code', ssp.assignment ->> 'course_code',
+                'course_title', ssp.assignment ->> 'course_title',
+                'exam_date', ssp.assignment ->> 'date',
+                'start_time', ssp.assignment ->> 'start_time',
+                'end_time', ssp.assignment ->> 'end_time',
+                'duration_minutes', ssp.assignment -> 'duration_minutes',
+                'room_codes', ssp.assignment -> 'room_codes',
+                'building_name', (SELECT string_agg(DISTINCT r ->> 'building_name', ', ') FROM jsonb_array_elements(ssp.assignment -> 'rooms') as r)
+            ) ORDER BY (ssp.assignment ->> 'date'), (ssp.assignment ->> 'start_time')
+        ), '[]'::jsonb)
+        INTO v_schedule
+        FROM exam_system.student_schedule_projections ssp
+        WHERE ssp.student_id = p_student_id AND ssp.version_id = v_version_id;
+
+        SELECT jsonb_build_object(
+                'student_id', s.id,
+                'matric_number', s.matric_number,
+                'full_name', s.first_name || ' ' || s.last_name
+        ) INTO v_student_details
+        FROM exam_system.students s
+        WHERE s.id = p_student_id AND s.session_id = v_session_id;
+
+        RETURN v_student_details || jsonb_build_object('job_id', p_job_id, 'schedule', v_schedule);
+    END IF;
+
+    SELECT result_data INTO v_result_data
     FROM exam_system.timetable_jobs
     WHERE id = p_job_id AND status = 'completed';
 
@@ -3378,14 +3456,15 @@ ALTER FUNCTION exam_system.get_timetable_job_results(p_job_id uuid) OWNER TO pos
 --
 
 CREATE FUNCTION exam_system.get_top_bottlenecks(p_session_id uuid) RETURNS jsonb
-    LANGUAGE plpgsql
+    LANGUAGE plpgsql STABLE
     AS $$
 DECLARE
+    v_latest_version_id uuid;
     v_latest_job_data jsonb;
     v_bottlenecks jsonb;
 BEGIN
-    -- Step 1: Get the result_data from the latest published job
-    SELECT tj.result_data INTO v_latest_job_data
+    -- Step 1: Serve the cached aggregates of the latest published version
+    SELECT tv.id INTO v_latest_version_id
     FROM exam_system.timetable_versions tv
     JOIN exam_system.timetable_jobs tj ON tv.job_id = tj.id
     WHERE tv.is_published = TRUE
@@ -3393,6 +3472,20 @@ BEGIN
     ORDER BY tv.created_at DESC
     LIMIT 1;
 
+    SELECT vca.bottlenecks INTO v_bottlenecks
+    FROM exam_system.version_conflict_analytics vca
+    WHERE vca.version_id = v_latest_version_id;
+
+    IF FOUND THEN
+        RETURN COALESCE(v_bottlenecks, '[]'::jsonb);
+    END IF;
+
+    -- Not materialized yet: fall back to the result_data of that version's job
+    SELECT tj.result_data INTO v_latest_job_data
+    FROM exam_system.timetable_versions tv
+    JOIN exam_system.timetable_jobs tj ON tv.job_id = tj.id
+    WHERE tv.id = v_latest_version_id;
+
     -- Return early if no data is found
     IF v_latest_job_data IS NULL THEN
         RETURN '[]'::jsonb;
@@ -3866,6 +3959,116 @@ $$;
 
 ALTER FUNCTION exam_system.mark_notifications_as_read(p_notification_ids uuid[], p_admin_user_id uuid) OWNER TO postgres;
 
+--
+-- Name: materialize_timetable_conflicts(uuid); Type: FUNCTION; Schema: exam_system; Owner: postgres
+--
+
+CREATE FUNCTION exam_system.materialize_timetable_conflicts(p_version_id uuid) RETURNS jsonb
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    v_solution jsonb;
+    v_conflict_count integer;
+    v_hotspots jsonb;
+    v_bottlenecks jsonb;
+BEGIN
+    SELECT tj.result_data -> 'solution' INTO v_solution
+    FROM exam_system.timetable_versions tv
+    JOIN exam_system.timetable_jobs tj ON tv.job_id = tj.id
+    WHERE tv.id = p_version_id;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Timetable version % not found.', p_version_id;
+    END IF;
+
+    DELETE FROM exam_system.timetable_conflicts WHERE version_id = p_version_id;
+
+    -- Solution-level conflicts, one row each.
+    INSERT INTO exam_system.timetable_conflicts (version_id, type, severity, message, details, is_resolved, source)
+    SELECT
+        p_version_id,
+        COALESCE(c ->> 'type', 'unknown'),
+        COALESCE(c ->> 'severity', 'medium'),
+        COALESCE(c ->> 'message', ''),
+        c -> 'details',
+        FALSE,
+        'solution'
+    FROM jsonb_array_elements(COALESCE(v_solution -> 'conflicts', '[]'::jsonb)) AS c;
+
+    -- Conflicts attached to individual assignments, keyed by exam and slot.
+    INSERT INTO exam_system.timetable_conflicts (
+        version_id, type, severity, message, details, is_resolved,
+        source, exam_id, exam_date, start_time, item
+    )
+    SELECT
+        p_version_id,
+        COALESCE(c ->> 'type', 'unknown'),
+        COALESCE(c ->> 'severity', 'medium'),
+        COALESCE(c ->> 'message', ''),
+        c -> 'details',
+        FALSE,
+        'assignment',
+        a.key::uuid,
+        TO_DATE(a.value ->> 'date', 'YYYY-MM-DD'),
+        a.value ->> 'start_time',
+        COALESCE(a.value ->> 'course_code', a.value -> 'rooms' -> 0 ->> 'code', 'Unknown')
+    FROM jsonb_each(COALESCE(v_solution -> 'assignments', '{}'::jsonb)) AS a
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE WHEN jsonb_typeof(a.value -> 'conflicts') = 'array' THEN a.value -> 'conflicts' ELSE '[]'::jsonb END
+    ) AS c;
+
+    SELECT count(*) INTO v_conflict_count
+    FROM exam_system.timetable_conflicts WHERE version_id = p_version_id;
+
+    SELECT jsonb_agg(hotspot) INTO v_hotspots
+    FROM (
+        SELECT
+            TO_CHAR(tc.exam_date, 'Dy') || ' ' || tc.start_time AS timeslot,
+            COUNT(DISTINCT tc.exam_id) AS conflict_count
+        FROM exam_system.timetable_conflicts tc
+        WHERE tc.version_id = p_version_id AND tc.source = 'assignment'
+        GROUP BY timeslot
+        ORDER BY conflict_count DESC
+        LIMIT 5
+    ) AS hotspot;
+
+    SELECT jsonb_agg(bottleneck) INTO v_bottlenecks
+    FROM (
+        SELECT tc.item, tc.message AS reason, COUNT(*) AS issue_count
+        FROM exam_system.timetable_conflicts tc
+        WHERE tc.version_id = p_version_id AND tc.source = 'assignment'
+        GROUP BY tc.item, tc.message
+        ORDER BY issue_count DESC
+        LIMIT 5
+    ) AS bottleneck;
+
+    INSERT INTO exam_system.version_conflict_analytics (version_id, conflict_count, hotspots, bottlenecks, computed_at)
+    VALUES (p_version_id, v_conflict_count, COALESCE(v_hotspots, '[]'::jsonb), COALESCE(v_bottlenecks, '[]'::jsonb), NOW())
+    ON CONFLICT (version_id) DO UPDATE SET
+        conflict_count = EXCLUDED.conflict_count,
+        hotspots = EXCLUDED.hotspots,
+        bottlenecks = EXCLUDED.bottlenecks,
+        computed_at = EXCLUDED.computed_at;
+
+    RETURN jsonb_build_object(
+        'version_id', p_version_id,
+        'conflict_count', v_conflict_count,
+        'hotspots', COALESCE(v_hotspots, '[]'::jsonb),
+        'bottlenecks', COALESCE(v_bottlenecks, '[]'::jsonb)
+    );
+END;
+$$;
+
+
+ALTER FUNCTION exam_system.materialize_timetable_conflicts(p_version_id uuid) OWNER TO postgres;
+
+--
+-- Name: FUNCTION materialize_timetable_conflicts(p_version_id uuid); Type: COMMENT; Schema: exam_system; Owner: postgres
+--
+
+COMMENT ON FUNCTION exam_system.materialize_timetable_conflicts(p_version_id uuid) IS 'Rebuilds the timetable_conflicts rows and cached hotspot/bottleneck aggregates of a version from its job solution. Run at job completion and publication, never on read.';
+
+
 --
 -- Name: process_all_staged_data(uuid); Type: FUNCTION; Schema: exam_system; Owner: postgres
 --
@@ -4682,6 +4885,16 @@ BEGIN
     SET is_published = TRUE, updated_at = NOW()
     WHERE id = v_version_id;
 
+    -- Step 4b: Build the portal read projections for the published version and drop
+    -- those of the session's other versions.
+    DELETE FROM exam_system.schedule_projection_versions
+    WHERE session_id = v_session_id AND version_id <> v_version_id;
+
+    PERFORM exam_system.refresh_schedule_projections(v_version_id);
+
+    -- Step 4c: Materialize the version's conflicts and dashboard aggregates once.
+    PERFORM exam_system.materialize_timetable_conflicts(v_version_id);
+
     -- Step 5: Log this action in the audit trail for accountability.
     PERFORM exam_system.log_audit_activity(
         p_user_id := p_user_id,
@@ -4714,6 +4927,166 @@ $$;
 
 ALTER FUNCTION exam_system.publish_timetable_version(p_job_id uuid, p_user_id uuid) OWNER TO postgres;
 
+--
+-- Name: refresh_schedule_projections(uuid, uuid[]); Type: FUNCTION; Schema: exam_system; Owner: postgres
+--
+
+CREATE FUNCTION exam_system.refresh_schedule_projections(p_version_id uuid, p_exam_ids uuid[] DEFAULT NULL::uuid[]) RETURNS jsonb
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    v_job_id uuid;
+    v_session_id uuid;
+    v_assignments jsonb;
+    v_student_rows integer;
+    v_staff_rows integer;
+BEGIN
+    -- Builds the per-student and per-staff read projections for a version from its
+    -- job's solution. With p_exam_ids only those exams' rows are rebuilt, which is
+    -- what manual edits use; otherwise the whole version is rebuilt.
+    SELECT tv.job_id, tj.session_id, tj.result_data->'solution'->'assignments'
+    INTO v_job_id, v_session_id, v_assignments
+    FROM exam_system.timetable_versions tv
+    JOIN exam_system.timetable_jobs tj ON tv.job_id = tj.id
+    WHERE tv.id = p_version_id;
+
+    IF v_job_id IS NULL THEN
+        RAISE EXCEPTION 'Timetable version % not found.', p_version_id;
+    END IF;
+
+    INSERT INTO exam_system.schedule_projection_versions (version_id, job_id, session_id, built_at)
+    VALUES (p_version_id, v_job_id, v_session_id, NOW())
+    ON CONFLICT (version_id) DO UPDATE SET job_id = EXCLUDED.job_id, built_at = NOW();
+
+    DELETE FROM exam_system.student_schedule_projections
+    WHERE version_id = p_version_id AND (p_exam_ids IS NULL OR exam_id = ANY(p_exam_ids));
+
+    DELETE FROM exam_system.staff_duty_projections
+    WHERE version_id = p_version_id AND (p_exam_ids IS NULL OR exam_id = ANY(p_exam_ids));
+
+    -- Solution rows with the latest manual edit for each exam applied on top. An
+    -- edit carries the keys EditValidationService._overrides reads (exam_date,
+    -- time_slot_id, room_ids or room_id); it is expanded to the enriched keys the
+    -- portals read. Slot ids belong to the job, so a slot's day and start time are
+    -- taken from the solution rows already in it; rooms come from the rooms table.
+    CREATE TEMP TABLE tmp_projection_assignments ON COMMIT DROP AS
+    WITH slots AS (
+        SELECT DISTINCT ON (s.value->>'time_slot_id')
+            s.value->>'time_slot_id' AS time_slot_id,
+            s.value->'day_id' AS day_id,
+            s.value->'date' AS slot_date,
+            s.value->'time_slot_name' AS time_slot_name,
+            (s.value->>'start_time')::time AS start_time
+        FROM jsonb_each(COALESCE(v_assignments, '{}'::jsonb)) AS s
+        WHERE s.value->>'time_slot_id' IS NOT NULL AND s.value->>'start_time' IS NOT NULL
+    )
+    SELECT
+        a.key::uuid AS exam_id,
+        a.value || COALESCE(edit.overrides, '{}'::jsonb) AS assignment
+    FROM jsonb_each(COALESCE(v_assignments, '{}'::jsonb)) AS a
+    LEFT JOIN LATERAL (
+        SELECT te.new_values
+        FROM exam_system.timetable_edits te
+        WHERE te.version_id = p_version_id AND te.exam_id = a.key::uuid
+        ORDER BY te.created_at DESC
+        LIMIT 1
+    ) latest ON TRUE
+    LEFT JOIN slots slot ON slot.time_slot_id = latest.new_values->>'time_slot_id'
+    LEFT JOIN LATERAL (
+        SELECT
+            jsonb_agg(r.id::text ORDER BY picked.position) AS room_ids,
+            jsonb_agg(r.code ORDER BY picked.position) AS room_codes,
+            jsonb_agg(jsonb_build_object(
+                'id', r.id::text,
+                'code', r.code,
+                'normal_capacity', r.capacity,
+                'exam_capacity', COALESCE(r.exam_capacity, 0),
+                'has_computers', r.has_computers,
+                'building_name', COALESCE(b.name, 'N/A')
+            ) ORDER BY picked.position) AS rooms
+        FROM jsonb_array_elements_text(
+            CASE
+                WHEN jsonb_typeof(latest.new_values->'room_ids') = 'array'
+                    THEN latest.new_values->'room_ids'
+                WHEN latest.new_values->>'room_id' IS NOT NULL
+                    THEN jsonb_build_array(latest.new_values->'room_id')
+                ELSE '[]'::jsonb
+            END
+        ) WITH ORDINALITY AS picked(room_id, position)
+        JOIN exam_system.rooms r ON r.id::text = picked.room_id
+        LEFT JOIN exam_system.buildings b ON b.id = r.building_id
+    ) edited_rooms ON TRUE
+    CROSS JOIN LATERAL (
+        SELECT slot.start_time + make_interval(
+            mins => COALESCE((a.value->>'duration_minutes')::int, 180)
+        ) AS end_time
+    ) slot_end
+    LEFT JOIN LATERAL (
+        SELECT jsonb_strip_nulls(jsonb_build_object(
+            'date', COALESCE(NULLIF(latest.new_values->'exam_date', 'null'::jsonb), slot.slot_date),
+            'day_id', slot.day_id,
+            'time_slot_id', slot.time_slot_id,
+            'time_slot_name', slot.time_slot_name,
+            'start_time', slot.start_time::text,
+            'end_time', slot_end.end_time::text,
+            'time_slot_label', slot.start_time::text || ' - ' || slot_end.end_time::text,
+            'room_ids', edited_rooms.room_ids,
+            'room_codes', edited_rooms.room_codes,
+            'rooms', edited_rooms.rooms
+        )) AS overrides
+        WHERE latest.new_values IS NOT NULL
+    ) edit ON TRUE
+    WHERE p_exam_ids IS NULL OR a.key::uuid = ANY(p_exam_ids);
+
+    INSERT INTO exam_system.student_schedule_projections (
+        student_id, version_id, exam_id, session_id, exam_date, start_time, assignment
+    )
+    SELECT DISTINCT ON (cr.student_id, pa.exam_id)
+        cr.student_id, p_version_id, pa.exam_id, v_session_id,
+        (pa.assignment->>'date')::date, pa.assignment->>'start_time', pa.assignment
+    FROM tmp_projection_assignments pa
+    JOIN exam_system.exams e ON e.id = pa.exam_id
+    JOIN exam_system.course_registrations cr
+      ON cr.course_id = e.course_id AND cr.session_id = e.session_id;
+
+    INSERT INTO exam_system.staff_duty_projections (
+        staff_id, version_id, exam_id, role, session_id, exam_date, start_time, assignment
+    )
+    SELECT duty.staff_id, p_version_id, pa.exam_id, duty.role, v_session_id,
+           (pa.assignment->>'date')::date, pa.assignment->>'start_time', pa.assignment
+    FROM tmp_projection_assignments pa
+    CROSS JOIN LATERAL (
+        SELECT inst.value::uuid AS staff_id, 'instructor'::varchar AS role
+        FROM jsonb_array_elements_text(COALESCE(pa.assignment->'instructor_ids', '[]'::jsonb)) AS inst
+        UNION
+        SELECT (inv->>'id')::uuid, 'invigilator'::varchar
+        FROM jsonb_array_elements(COALESCE(pa.assignment->'invigilators', '[]'::jsonb)) AS inv
+    ) AS duty
+    ON CONFLICT DO NOTHING;
+
+    DROP TABLE tmp_projection_assignments;
+
+    SELECT count(*) INTO v_student_rows
+    FROM exam_system.student_schedule_projections WHERE version_id = p_version_id;
+    SELECT count(*) INTO v_staff_rows
+    FROM exam_system.staff_duty_projections WHERE version_id = p_version_id;
+
+    UPDATE exam_system.schedule_projection_versions
+    SET student_rows = v_student_rows, staff_rows = v_staff_rows
+    WHERE version_id = p_version_id;
+
+    RETURN jsonb_build_object(
+        'version_id', p_version_id,
+        'student_rows', v_student_rows,
+        'staff_rows', v_staff_rows,
+        'incremental', p_exam_ids IS NOT NULL
+    );
+END;
+$$;
+
+
+ALTER FUNCTION exam_system.refresh_schedule_projections(p_version_id uuid, p_exam_ids uuid[]) OWNER TO postgres;
+
 --
 -- Name: register_user(jsonb, uuid); Type: FUNCTION; Schema: exam_system; Owner: postgres
 --
@@ -5600,6 +5973,11 @@ BEGIN
         completed_at = NOW() AT TIME ZONE 'UTC',
         updated_at = NOW() AT TIME ZONE 'UTC'
     WHERE id = p_job_id;
+
+    -- Re-materialize conflicts of any version already created from this job.
+    PERFORM exam_system.materialize_timetable_conflicts(tv.id)
+    FROM exam_system.timetable_versions tv
+    WHERE tv.job_id = p_job_id;
 END;
 $$;
 
@@ -6722,6 +7100,22 @@ CREATE TABLE exam_system.rooms (
 
 ALTER TABLE exam_system.rooms OWNER TO postgres;
 
+--
+-- Name: schedule_projection_versions; Type: TABLE; Schema: exam_system; Owner: postgres
+--
+
+CREATE TABLE exam_system.schedule_projection_versions (
+    version_id uuid NOT NULL,
+    job_id uuid NOT NULL,
+    session_id uuid NOT NULL,
+    student_rows integer DEFAULT 0 NOT NULL,
+    staff_rows integer DEFAULT 0 NOT NULL,
+    built_at timestamp without time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE exam_system.schedule_projection_versions OWNER TO postgres;
+
 --
 -- Name: session_templates; Type: TABLE; Schema: exam_system; Owner: postgres
 --
@@ -6768,6 +7162,24 @@ CREATE TABLE exam_system.staff (
 
 ALTER TABLE exam_system.staff OWNER TO postgres;
 
+--
+-- Name: staff_duty_projections; Type: TABLE; Schema: exam_system; Owner: postgres
+--
+
+CREATE TABLE exam_system.staff_duty_projections (
+    staff_id uuid NOT NULL,
+    version_id uuid NOT NULL,
+    exam_id uuid NOT NULL,
+    role character varying(20) NOT NULL,
+    session_id uuid NOT NULL,
+    exam_date date,
+    start_time text,
+    assignment jsonb NOT NULL
+);
+
+
+ALTER TABLE exam_system.staff_duty_projections OWNER TO postgres;
+
 --
 -- Name: staff_unavailability; Type: TABLE; Schema: exam_system; Owner: postgres
 --
@@ -6800,6 +7212,23 @@ CREATE TABLE exam_system.student_enrollments (
 
 ALTER TABLE exam_system.student_enrollments OWNER TO postgres;
 
+--
+-- Name: student_schedule_projections; Type: TABLE; Schema: exam_system; Owner: postgres
+--
+
+CREATE TABLE exam_system.student_schedule_projections (
+    student_id uuid NOT NULL,
+    version_id uuid NOT NULL,
+    exam_id uuid NOT NULL,
+    session_id uuid NOT NULL,
+    exam_date date,
+    start_time text,
+    assignment jsonb NOT NULL
+);
+
+
+ALTER TABLE exam_system.student_schedule_projections OWNER TO postgres;
+
 --
 -- Name: students; Type: TABLE; Schema: exam_system; Owner: postgres
 --
@@ -6955,7 +7384,12 @@ CREATE TABLE exam_system.timetable_conflicts (
     message text NOT NULL,
     details jsonb,
     is_resolved boolean NOT NULL,
-    created_at timestamp with time zone DEFAULT now() NOT NULL
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    source character varying(20) DEFAULT 'solution'::character varying NOT NULL,
+    exam_id uuid,
+    exam_date date,
+    start_time text,
+    item text
 );
 
 
@@ -7173,6 +7607,21 @@ CREATE TABLE exam_system.users (
 
 ALTER TABLE exam_system.users OWNER TO postgres;
 
+--
+-- Name: version_conflict_analytics; Type: TABLE; Schema: exam_system; Owner: postgres
+--
+
+CREATE TABLE exam_system.version_conflict_analytics (
+    version_id uuid NOT NULL,
+    conflict_count integer DEFAULT 0 NOT NULL,
+    hotspots jsonb DEFAULT '[]'::jsonb NOT NULL,
+    bottlenecks jsonb DEFAULT '[]'::jsonb NOT NULL,
+    computed_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE exam_system.version_conflict_analytics OWNER TO postgres;
+
 --
 -- Name: version_dependencies; Type: TABLE; Schema: exam_system; Owner: postgres
 --
@@ -7486,6 +7935,14 @@ ALTER TABLE ONLY exam_system.rooms
     ADD CONSTRAINT rooms_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: schedule_projection_versions schedule_projection_versions_pkey; Type: CONSTRAINT; Schema: exam_system; Owner: postgres
+--
+
+ALTER TABLE ONLY exam_system.schedule_projection_versions
+    ADD CONSTRAINT schedule_projection_versions_pkey PRIMARY KEY (version_id);
+
+
 --
 -- Name: session_templates session_templates_pkey; Type: CONSTRAINT; Schema: exam_system; Owner: postgres
 --
@@ -7502,6 +7959,14 @@ ALTER TABLE ONLY exam_system.staff
     ADD CONSTRAINT staff_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: staff_duty_projections staff_duty_projections_pkey; Type: CONSTRAINT; Schema: exam_system; Owner: postgres
+--
+
+ALTER TABLE ONLY exam_system.staff_duty_projections
+    ADD CONSTRAINT staff_duty_projections_pkey PRIMARY KEY (staff_id, version_id, exam_id, role);
+
+
 --
 -- Name: staff_unavailability staff_unavailability_pkey; Type: CONSTRAINT; Schema: exam_system; Owner: postgres
 --
@@ -7542,6 +8007,14 @@ ALTER TABLE ONLY exam_system.student_enrollments
     ADD CONSTRAINT student_session_key UNIQUE (student_id, session_id);
 
 
+--
+-- Name: student_schedule_projections student_schedule_projections_pkey; Type: CONSTRAINT; Schema: exam_system; Owner: postgres
+--
+
+ALTER TABLE ONLY exam_system.student_schedule_projections
+    ADD CONSTRAINT student_schedule_projections_pkey PRIMARY KEY (student_id, version_id, exam_id);
+
+
 --
 -- Name: students students_pkey; Type: CONSTRAINT; Schema: exam_system; Owner: postgres
 --
@@ -7822,6 +8295,14 @@ ALTER TABLE ONLY exam_system.users
     ADD CONSTRAINT users_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: version_conflict_analytics version_conflict_analytics_pkey; Type: CONSTRAINT; Schema: exam_system; Owner: postgres
+--
+
+ALTER TABLE ONLY exam_system.version_conflict_analytics
+    ADD CONSTRAINT version_conflict_analytics_pkey PRIMARY KEY (version_id);
+
+
 --
 -- Name: version_dependencies version_dependencies_pkey; Type: CONSTRAINT; Schema: exam_system; Owner: postgres
 --
@@ -7880,6 +8361,34 @@ CREATE INDEX idx_academic_sessions_archived_at ON exam_system.academic_sessions
 CREATE INDEX idx_academic_sessions_template_id ON exam_system.academic_sessions USING btree (template_id);
 
 
+--
+-- Name: idx_course_registrations_course_session; Type: INDEX; Schema: exam_system; Owner: postgres
+--
+
+CREATE INDEX idx_course_registrations_course_session ON exam_system.course_registrations USING btree (course_id, session_id);
+
+
+--
+-- Name: idx_course_registrations_student_session; Type: INDEX; Schema: exam_system; Owner: postgres
+--
+
+CREATE INDEX idx_course_registrations_student_session ON exam_system.course_registrations USING btree (student_id, session_id);
+
+
+--
+-- Name: idx_schedule_projection_versions_job_id; Type: INDEX; Schema: exam_system; Owner: postgres
+--
+
+CREATE INDEX idx_schedule_projection_versions_job_id ON exam_system.schedule_projection_versions USING btree (job_id);
+
+
+--
+-- Name: idx_schedule_projection_versions_session_id; Type: INDEX; Schema: exam_system; Owner: postgres
+--
+
+CREATE INDEX idx_schedule_projection_versions_session_id ON exam_system.schedule_projection_versions USING btree (session_id);
+
+
 --
 -- Name: idx_session_templates_active; Type: INDEX; Schema: exam_system; Owner: postgres
 --
@@ -7894,6 +8403,20 @@ CREATE INDEX idx_session_templates_active ON exam_system.session_templates USING
 CREATE INDEX idx_session_templates_source_session_id ON exam_system.session_templates USING btree (source_session_id);
 
 
+--
+-- Name: idx_staff_duty_projections_version_exam; Type: INDEX; Schema: exam_system; Owner: postgres
+--
+
+CREATE INDEX idx_staff_duty_projections_version_exam ON exam_system.staff_duty_projections USING btree (version_id, exam_id);
+
+
+--
+-- Name: idx_student_schedule_projections_version_exam; Type: INDEX; Schema: exam_system; Owner: postgres
+--
+
+CREATE INDEX idx_student_schedule_projections_version_exam ON exam_system.student_schedule_projections USING btree (version_id, exam_id);
+
+
 --
 -- Name: idx_timetable_assignments_exam_id; Type: INDEX; Schema: exam_system; Owner: postgres
 --
@@ -7915,6 +8438,20 @@ CREATE INDEX idx_timetable_assignments_version_id ON exam_system.timetable_assig
 CREATE INDEX idx_timetable_conflicts_version_id ON exam_system.timetable_conflicts USING btree (version_id);
 
 
+--
+-- Name: idx_timetable_conflicts_version_source_slot; Type: INDEX; Schema: exam_system; Owner: postgres
+--
+
+CREATE INDEX idx_timetable_conflicts_version_source_slot ON exam_system.timetable_conflicts USING btree (version_id, source, exam_date, start_time);
+
+
+--
+-- Name: idx_timetable_edits_version_exam_created; Type: INDEX; Schema: exam_system; Owner: postgres
+--
+
+CREATE INDEX idx_timetable_edits_version_exam_created ON exam_system.timetable_edits USING btree (version_id, exam_id, created_at);
+
+
 --
 -- Name: idx_timetable_locks_scenario_active; Type: INDEX; Schema: exam_system; Owner: postgres
 --
@@ -8464,6 +9001,14 @@ ALTER TABLE ONLY exam_system.rooms
     ADD CONSTRAINT rooms_room_type_id_fkey FOREIGN KEY (room_type_id) REFERENCES exam_system.room_types(id);
 
 
+--
+-- Name: schedule_projection_versions schedule_projection_versions_version_id_fkey; Type: FK CONSTRAINT; Schema: exam_system; Owner: postgres
+--
+
+ALTER TABLE ONLY exam_system.schedule_projection_versions
+    ADD CONSTRAINT schedule_projection_versions_version_id_fkey FOREIGN KEY (version_id) REFERENCES exam_system.timetable_versions(id) ON DELETE CASCADE;
+
+
 --
 -- Name: session_templates session_templates_source_session_id_fkey; Type: FK CONSTRAINT; Schema: exam_system; Owner: postgres
 --
@@ -8480,6 +9025,14 @@ ALTER TABLE ONLY exam_system.staff
     ADD CONSTRAINT staff_department_id_fkey FOREIGN KEY (department_id) REFERENCES exam_system.departments(id);
 
 
+--
+-- Name: staff_duty_projections staff_duty_projections_version_id_fkey; Type: FK CONSTRAINT; Schema: exam_system; Owner: postgres
+--
+
+ALTER TABLE ONLY exam_system.staff_duty_projections
+    ADD CONSTRAINT staff_duty_projections_version_id_fkey FOREIGN KEY (version_id) REFERENCES exam_system.schedule_projection_versions(version_id) ON DELETE CASCADE;
+
+
 --
 -- Name: staff_unavailability staff_unavailability_session_id_fkey; Type: FK CONSTRAINT; Schema: exam_system; Owner: postgres
 --
@@ -8520,6 +9073,14 @@ ALTER TABLE ONLY exam_system.student_enrollments
     ADD CONSTRAINT student_enrollments_student_id_fkey FOREIGN KEY (student_id) REFERENCES exam_system.students(id);
 
 
+--
+-- Name: student_schedule_projections student_schedule_projections_version_id_fkey; Type: FK CONSTRAINT; Schema: exam_system; Owner: postgres
+--
+
+ALTER TABLE ONLY exam_system.student_schedule_projections
+    ADD CONSTRAINT student_schedule_projections_version_id_fkey FOREIGN KEY (version_id) REFERENCES exam_system.schedule_projection_versions(version_id) ON DELETE CASCADE;
+
+
 --
 -- Name: students students_programme_id_fkey; Type: FK CONSTRAINT; Schema: exam_system; Owner: postgres
 --
@@ -8768,6 +9329,14 @@ ALTER TABLE ONLY exam_system.user_notifications
     ADD CONSTRAINT user_notifications_user_id_fkey FOREIGN KEY (user_id) REFERENCES exam_system.users(id);
 
 
+--
+-- Name: version_conflict_analytics version_conflict_analytics_version_id_fkey; Type: FK CONSTRAINT; Schema: exam_system; Owner: postgres
+--
+
+ALTER TABLE ONLY exam_system.version_conflict_analytics
+    ADD CONSTRAINT version_conflict_analytics_version_id_fkey FOREIGN KEY (version_id) REFERENCES exam_system.timetable_versions(id) ON DELETE CASCADE;
+
+
 --
 -- Name: version_dependencies version_dependencies_depends_on_version_id_fkey; Type: FK CONSTRAINT; Schema: exam_system; Owner: postgres
 --
@@ -8,6 +8,9 @@ for exam timetabling, based on the research paper:
 "Genetic-based Constraint Programming for Resource Constrained Job Scheduling"
 """
 
+import importlib
+from typing import Any
+
 from .config import (
     SchedulingEngineConfig,
     SolverPhase,
@@ -16,14 +19,28 @@ from .config import (
     get_logger,
 )
 
-from .core import (
-    ExamSchedulingProblem,
-    TimetableSolution,
-    ConstraintRegistry,
-    SolutionMetrics,
-)
-from .cp_sat.model_builder import CPSATModelBuilder
-from .cp_sat.solver_manager import CPSATSolverManager
+# The solver stack (ortools, pygad, pandas) is only imported when one of these
+# names is first used, so processes that just need the lightweight parts of
+# the package - the API's edit validation, solver-free Celery workers - never
+# load it.
+_LAZY_EXPORTS = {
+    "ExamSchedulingProblem": ".core",
+    "TimetableSolution": ".core",
+    "ConstraintRegistry": ".core",
+    "SolutionMetrics": ".core",
+    "CPSATModelBuilder": ".cp_sat.model_builder",
+    "CPSATSolverManager": ".cp_sat.solver_manager",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __version__ = "1.0.0"
 __author__ = "Baze University Exam Scheduling System"
@@ -1,8 +1,11 @@
 # scheduling_engine/analysis/__init__.py
 
 from .pre_solve_analyzer import PreSolveAnalyzer, AnalysisReport
+from .infeasibility_explainer import InfeasibilityExplainer, InfeasibilityExplanation
 
 __all__ = [
     "PreSolveAnalyzer",
     "AnalysisReport",
+    "InfeasibilityExplainer",
+    "InfeasibilityExplanation",
 ]
@@ -0,0 +1,476 @@
+# scheduling_engine/analysis/infeasibility_explainer.py
+
+"""
+Infeasibility Explainer
+
+Explains why a Phase 1 model or a Phase 2 packing group came back INFEASIBLE.
+
+Every hard constraint family and every HITL lock in the failed model is
+guarded by an enforcement literal, the model is re-solved under those
+literals as assumptions, and CP-SAT's `SufficientAssumptionsForInfeasibility`
+gives a core that is then shrunk by deletion. The families in that core are
+then cut out into a much smaller subproblem in which each constraint carries
+its own literal, so the second core names the concrete exams, rooms, days
+and locks that cannot be satisfied together.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from ortools.sat.python import cp_model
+
+logger = logging.getLogger(__name__)
+
+# Plain-language names for the hard constraint families.
+FAMILY_DESCRIPTIONS: Dict[str, str] = {
+    "StartUniquenessConstraint": "each exam must start exactly once",
+    "StartFeasibilityConstraint": "each exam must finish on the day it starts",
+    "OccupancyDefinitionConstraint": "exam occupancy across consecutive slots",
+    "AggregateCapacityConstraint": "total seating capacity per timeslot",
+    "UnifiedStudentConflictConstraint": "students cannot sit two exams at once",
+    "RoomAssignmentConsistencyConstraint": "every exam must be given a room",
+    "RoomCapacityHardConstraint": "room capacity",
+    "RoomContinuityConstraint": "multi-slot exams keep their room",
+    "RoomSequentialUseConstraint": "rooms are used by one exam at a time",
+    "InvigilatorRequirementConstraint": "invigilators required per room",
+    "InvigilatorSinglePresenceConstraint": "invigilators can only be in one room",
+    "InvigilatorContinuityConstraint": "invigilators stay for multi-slot exams",
+}
+
+# Constraint kinds CP-SAT accepts enforcement literals on. exactly_one and
+# at_most_one are rewritten as linear constraints before guarding.
+_ENFORCEABLE_KINDS = {"bool_or", "bool_and", "linear"}
+_CARDINALITY_KINDS = {"exactly_one", "at_most_one"}
+
+
+@dataclass
+class InfeasibilityExplanation:
+    """Human-readable account of an infeasibility core."""
+
+    phase: str
+    explained: bool = False
+    minimal: bool = False
+    constraint_families: List[str] = field(default_factory=list)
+    locks: List[Dict[str, Any]] = field(default_factory=list)
+    exams: List[Dict[str, str]] = field(default_factory=list)
+    rooms: List[Dict[str, str]] = field(default_factory=list)
+    days: List[str] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+    core_size: int = 0
+    subproblem_constraints: int = 0
+    diagnosis_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the explanation to a JSON-serializable dictionary."""
+        return asdict(self)
+
+    def summary(self) -> str:
+        """One-paragraph summary suitable for a job error message."""
+        return " ".join(self.messages)
+
+
+class InfeasibilityExplainer:
+    """Finds and translates an assumption-based infeasibility core."""
+
+    def __init__(self, problem, time_limit_seconds: float = 20.0):
+        self.problem = problem
+        self.time_limit_seconds = time_limit_seconds
+        self._deadline = 0.0
+        self._minimal = False
+
+    def explain(
+        self,
+        model: cp_model.CpModel,
+        shared_vars,
+        constraint_ranges: Dict[str, Tuple[int, int]],
+        phase: str,
+        locks: Optional[List[Dict[str, Any]]] = None,
+    ) -> InfeasibilityExplanation:
+        """
+        Diagnoses an infeasible model.
+
+        Args:
+            model: The model that was reported INFEASIBLE. It is not modified.
+            shared_vars: The SharedVariables the model was built with.
+            constraint_ranges: Hard constraint family id -> (first, end)
+                constraint index range, as recorded by the constraint manager.
+            phase: Label of the solve being diagnosed, e.g. "phase1".
+            locks: HITL locks relevant to this model.
+        """
+        started = time.time()
+        self._deadline = started + self.time_limit_seconds
+        explanation = InfeasibilityExplanation(phase=phase)
+        locks = locks or []
+        logger.info(
+            f"Diagnosing infeasible {phase} model: {len(constraint_ranges)} hard "
+            f"families, {len(locks)} locks, {self.time_limit_seconds:.0f}s budget."
+        )
+
+        base = model.Proto()
+        var_keys = self._index_shared_variables(shared_vars)
+        key_to_index = {key: index for index, key in var_keys.items()}
+
+        # --- Stage 1: one literal per family and per lock on the full model ---
+        diag = self._copy_without_objective(base, range(len(base.constraints)))
+        # Locks pin their variables by domain, which no assumption can lift;
+        # the copy frees them and _add_lock re-imposes them under the literal.
+        pinned = self._pinned_by_lock(shared_vars, locks)
+        for indices in pinned.values():
+            for index in indices:
+                diag.Proto().variables[index].domain[:] = [0, 1]
+        family_literals: Dict[int, str] = {}
+        for family_id, (start, end) in constraint_ranges.items():
+            literal = self._new_literal(diag, f"diag_family_{family_id}")
+            guarded = sum(
+                self._guard(diag.Proto().constraints[i], literal)
+                for i in range(start, end)
+            )
+            if guarded:
+                family_literals[literal] = family_id
+
+        lock_literals: Dict[int, int] = {}
+        lock_constraints: Dict[int, List[int]] = {}
+        for lock_pos, lock in enumerate(locks):
+            literal = self._new_literal(diag, f"diag_lock_{lock_pos}")
+            lock_literals[literal] = lock_pos
+            lock_constraints[literal] = self._add_lock(
+                diag, lock, literal, key_to_index, pinned.get(lock.get("exam_id"))
+            )
+
+        assumptions = list(family_literals) + list(lock_literals)
+        core = self._find_core(diag, assumptions)
+        if core is None:
+            explanation.messages.append(
+                f"The {phase} model could not be proven infeasible within the "
+                f"{self.time_limit_seconds:.0f}s diagnosis budget."
+            )
+            explanation.diagnosis_seconds = time.time() - started
+            return explanation
+
+        core_families = [family_literals[l] for l in core if l in family_literals]
+        core_locks = [l for l in core if l in lock_literals]
+        explanation.constraint_families = core_families
+        explanation.locks = [
+            self._describe_lock(locks[lock_literals[l]]) for l in core_locks
+        ]
+
+        # --- Stage 2: per-constraint literals on the families in the core ---
+        kept = [
+            i
+            for family_id in core_families
+            for i in range(*constraint_ranges[family_id])
+        ]
+        for l in core_locks:
+            kept.extend(lock_constraints[l])
+        sub = self._copy_without_objective(diag.Proto(), sorted(set(kept)))
+        sub_proto = sub.Proto()
+        explanation.subproblem_constraints = len(sub_proto.constraints)
+
+        family_literal_set = set(family_literals)
+        constraint_literals: Dict[int, int] = {}
+        for pos, ct in enumerate(sub_proto.constraints):
+            # Drop the stage 1 family guard; the constraint gets its own.
+            if any(l in family_literal_set for l in ct.enforcement_literal):
+                kept_literals = [
+                    l for l in ct.enforcement_literal if l not in family_literal_set
+                ]
+                del ct.enforcement_literal[:]
+                ct.enforcement_literal.extend(kept_literals)
+                literal = self._new_literal(sub, f"diag_ct_{pos}")
+                if self._guard(ct, literal):
+                    constraint_literals[literal] = pos
+
+        sub_core = self._find_core(sub, list(constraint_literals) + core_locks)
+        involved: Set[int] = set()
+        if sub_core is not None:
+            explanation.core_size = len(sub_core)
+            explanation.minimal = self._minimal
+            for l in sub_core:
+                if l in constraint_literals:
+                    ct = sub_proto.constraints[constraint_literals[l]]
+                    involved.update(self._constraint_variables(ct))
+        else:
+            explanation.core_size = len(core)
+
+        self._translate(
+            explanation, involved, var_keys, core_locks, lock_literals, locks
+        )
+        explanation.explained = True
+        explanation.diagnosis_seconds = time.time() - started
+        logger.info(
+            f"Infeasibility diagnosis for {phase} finished in "
+            f"{explanation.diagnosis_seconds:.2f}s: {explanation.summary()}"
+        )
+        return explanation
+
+    # ------------------------------------------------------------------
+    # Core extraction
+    # ------------------------------------------------------------------
+
+    def _remaining(self) -> float:
+        return max(0.0, self._deadline - time.time())
+
+    def _solve(
+        self, model: cp_model.CpModel, assumptions: List[int]
+    ) -> Tuple[int, List[int]]:
+        proto = model.Proto()
+        proto.ClearField("assumptions")
+        proto.assumptions.extend(assumptions)
+        solver = cp_model.CpSolver()
+        solver.parameters.num_workers = 1
+        solver.parameters.max_time_in_seconds = max(self._remaining(), 0.1)
+        status = solver.Solve(model)
+        if status == cp_model.INFEASIBLE:
+            return status, list(solver.SufficientAssumptionsForInfeasibility())
+        return status, []
+
+    def _find_core(
+        self, model: cp_model.CpModel, assumptions: List[int]
+    ) -> Optional[List[int]]:
+        """Returns a deletion-minimised core, or None if none was found in time."""
+        self._minimal = False
+        status, core = self._solve(model, assumptions)
+        if status != cp_model.INFEASIBLE:
+            return None
+
+        i = 0
+        while i < len(core):
+            if self._remaining() <= 0:
+                return core
+            trial = core[:i] + core[i + 1 :]
+            status, trial_core = self._solve(model, trial)
+            if status == cp_model.INFEASIBLE:
+                trial_core_set = set(trial_core)
+                core = [l for l in trial if l in trial_core_set] or trial
+            elif status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                i += 1
+            else:
+                return core
+        self._minimal = True
+        return core
+
+    # ------------------------------------------------------------------
+    # Proto manipulation
+    # ------------------------------------------------------------------
+
+    # The diagnostic models are edited at the proto level only, so new
+    # literals are appended to the proto's variables directly.
+
+    @staticmethod
+    def _new_literal(model: cp_model.CpModel, name: str) -> int:
+        proto = model.Proto()
+        proto.variables.add(name=name, domain=[0, 1])
+        return len(proto.variables) - 1
+
+    @staticmethod
+    def _copy_without_objective(
+        proto, constraint_indices: Iterable[int]
+    ) -> cp_model.CpModel:
+        copy = cp_model.CpModel()
+        target = copy.Proto()
+        target.name = proto.name
+        target.variables.extend(proto.variables)
+        target.constraints.extend(proto.constraints[i] for i in constraint_indices)
+        return copy
+
+    @staticmethod
+    def _guard(ct, literal_index: int) -> bool:
+        """Adds an enforcement literal to a constraint where CP-SAT supports one."""
+        kind = ct.WhichOneof("constraint")
+        if kind in _CARDINALITY_KINDS:
+            refs = list(getattr(ct, kind).literals)
+            negated = sum(1 for ref in refs if ref < 0)
+            lower = 1 if kind == "exactly_one" else 0
+            ct.ClearField(kind)
+            for ref in refs:
+                ct.linear.vars.append(ref if ref >= 0 else -ref - 1)
+                ct.linear.coeffs.append(1 if ref >= 0 else -1)
+            ct.linear.domain.extend([lower - negated, 1 - negated])
+        elif kind not in _ENFORCEABLE_KINDS:
+            return False
+        ct.enforcement_literal.append(literal_index)
+        return True
+
+    def _add_lock(
+        self,
+        model: cp_model.CpModel,
+        lock: Dict[str, Any],
+        literal_index: int,
+        key_to_index: Dict[Tuple, int],
+        pinned: Optional[List[int]] = None,
+    ) -> List[int]:
+        """
+        Adds the guarded lock constraint and returns its constraint index.
+        The variables the encoder pinned for the lock are the ones it sets;
+        without any, the lock is read off the x (or y) variables.
+        """
+        exam_id, slot_id = lock.get("exam_id"), lock.get("time_slot_id")
+        fixed: List[Optional[int]] = list(pinned or [])
+        if not fixed:
+            fixed = [key_to_index.get(("x", exam_id, slot_id))]
+        if fixed[0] is None:
+            # Phase 2 models have no start variables; lock the rooms instead.
+            fixed = [
+                key_to_index.get(("y", exam_id, room_id, slot_id))
+                for room_id in lock.get("room_ids") or []
+            ]
+            if not fixed:
+                return []
+
+        proto = model.Proto()
+        ct = proto.constraints.add()
+        ct.enforcement_literal.append(literal_index)
+        if any(index is None for index in fixed):
+            # The locked placement has no variable at all: the lock alone is
+            # unsatisfiable, which an empty clause expresses.
+            ct.bool_or.SetInParent()
+        else:
+            ct.bool_and.literals.extend(fixed)
+        return [len(proto.constraints) - 1]
+
+    @staticmethod
+    def _constraint_variables(ct) -> Set[int]:
+        refs = list(ct.enforcement_literal)
+        kind = ct.WhichOneof("constraint")
+        if kind == "linear":
+            refs.extend(ct.linear.vars)
+        elif kind in ("bool_or", "bool_and", "exactly_one", "at_most_one"):
+            refs.extend(getattr(ct, kind).literals)
+        return {ref if ref >= 0 else -ref - 1 for ref in refs}
+
+    # ------------------------------------------------------------------
+    # Translation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _pinned_by_lock(
+        shared_vars, locks: List[Dict[str, Any]]
+    ) -> Dict[UUID, List[int]]:
+        """Exam id -> indices of the variables its lock pinned, for the given locks."""
+        locked_exams = {lock.get("exam_id") for lock in locks}
+        pinned: Dict[UUID, List[int]] = {}
+        for (exam_id, _), var in getattr(shared_vars, "locked_vars", {}).items():
+            if exam_id in locked_exams:
+                pinned.setdefault(exam_id, []).append(var.Index())
+        return pinned
+
+    @staticmethod
+    def _index_shared_variables(shared_vars) -> Dict[int, Tuple]:
+        keys: Dict[int, Tuple] = {}
+        for kind, attr in (
+            ("x", "x_vars"),
+            ("z", "z_vars"),
+            ("y", "y_vars"),
+            ("w", "w_vars"),
+        ):
+            for key, var in getattr(shared_vars, attr, {}).items():
+                keys[var.Index()] = (kind, *key)
+        return keys
+
+    def _exam_label(self, exam_id) -> str:
+        exam = self.problem.exams.get(exam_id)
+        return getattr(exam, "course_code", None) or str(exam_id)
+
+    def _room_label(self, room_id) -> str:
+        room = self.problem.rooms.get(room_id)
+        return room.code if room else str(room_id)
+
+    def _slot_label(self, slot_id) -> str:
+        slot = self.problem.timeslots.get(slot_id)
+        day = self.problem.get_day_for_timeslot(slot_id)
+        if not slot or not day:
+            return str(slot_id)
+        return f"{day.date.isoformat()} {slot.start_time.strftime('%H:%M')}"
+
+    def _describe_lock(self, lock: Dict[str, Any]) -> Dict[str, Any]:
+        exam_id, slot_id = lock.get("exam_id"), lock.get("time_slot_id")
+        room_ids = lock.get("room_ids") or []
+        return {
+            "exam_id": str(exam_id),
+            "exam": self._exam_label(exam_id),
+            "time_slot_id": str(slot_id),
+            "slot": self._slot_label(slot_id),
+            "rooms": [self._room_label(r) for r in room_ids],
+        }
+
+    def _translate(
+        self,
+        explanation: InfeasibilityExplanation,
+        involved: Set[int],
+        var_keys: Dict[int, Tuple],
+        core_locks: List[int],
+        lock_literals: Dict[int, int],
+        locks: List[Dict[str, Any]],
+    ) -> None:
+        exam_ids: Dict[UUID, None] = {}
+        room_ids: Dict[UUID, None] = {}
+        slot_ids: Dict[UUID, None] = {}
+        for index in sorted(involved):
+            key = var_keys.get(index)
+            if not key:
+                continue
+            kind = key[0]
+            if kind in ("x", "z"):
+                exam_ids[key[1]] = None
+                slot_ids[key[2]] = None
+            elif kind == "y":
+                exam_ids[key[1]] = None
+                room_ids[key[2]] = None
+                slot_ids[key[3]] = None
+            elif kind == "w":
+                room_ids[key[2]] = None
+                slot_ids[key[3]] = None
+        for l in core_locks:
+            lock = locks[lock_literals[l]]
+            exam_ids[lock.get("exam_id")] = None
+            slot_ids[lock.get("time_slot_id")] = None
+            for room_id in lock.get("room_ids") or []:
+                room_ids[room_id] = None
+
+        days: Dict[str, None] = {}
+        for slot_id in slot_ids:
+            day = self.problem.get_day_for_timeslot(slot_id)
+            if day:
+                days[day.date.isoformat()] = None
+
+        explanation.exams = [
+            {"id": str(e), "code": self._exam_label(e)} for e in exam_ids
+        ]
+        explanation.rooms = [
+            {"id": str(r), "code": self._room_label(r)} for r in room_ids
+        ]
+        explanation.days = sorted(days)
+
+        reasons = [
+            FAMILY_DESCRIPTIONS.get(f, f) for f in explanation.constraint_families
+        ]
+        if explanation.locks:
+            reasons.append(f"{len(explanation.locks)} locked assignment(s)")
+        if not reasons:
+            reasons.append("constraints that cannot be relaxed for diagnosis")
+        messages = [
+            f"The {explanation.phase} model is infeasible because these rules conflict: "
+            + "; ".join(reasons)
+            + "."
+        ]
+        if explanation.exams:
+            codes = ", ".join(e["code"] for e in explanation.exams[:20])
+            more = len(explanation.exams) - 20
+            messages.append(
+                f"Exams involved: {codes}" + (f" and {more} more." if more > 0 else ".")
+            )
+        if explanation.rooms:
+            messages.append(
+                "Rooms involved: "
+                + ", ".join(r["code"] for r in explanation.rooms)
+                + "."
+            )
+        if explanation.days:
+            messages.append("Days involved: " + ", ".join(explanation.days) + ".")
+        for lock in explanation.locks:
+            rooms = f" in {', '.join(lock['rooms'])}" if lock["rooms"] else ""
+            messages.append(f"Lock: {lock['exam']} fixed to {lock['slot']}{rooms}.")
+        explanation.messages = messages
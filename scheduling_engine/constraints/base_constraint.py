@@ -43,6 +43,10 @@ class CPSATBaseConstraint(ABC):
         self.z = shared_vars.z_vars
         # --- NEW: Simplified invigilator assignment model ---
         self.w = shared_vars.w_vars
+        # Exam-day start indicators, shared by all day-level constraints.
+        self.on_day = getattr(shared_vars, "on_day_vars", {})
+        # Room pattern choices of the pattern-based Phase 2 model.
+        self.patterns = getattr(shared_vars, "pattern_vars", {})
         # --- Deprecated ---
         # self.t = shared_vars.t_vars
         # self.a = shared_vars.a_vars
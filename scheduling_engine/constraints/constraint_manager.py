@@ -8,7 +8,7 @@ It now strictly separates non-configurable CORE constraints from DYNAMIC ones.
 """
 
 import logging
-from typing import Dict, Any, List, Set, cast
+from typing import Dict, Any, List, Set, Tuple, cast
 import time
 import traceback
 
@@ -26,6 +26,7 @@ from scheduling_engine.constraints.hard_constraints import (
     OccupancyDefinitionConstraint,
     RoomAssignmentConsistencyConstraint,
     RoomContinuityConstraint,
+    RoomPatternConstraint,
     InvigilatorRequirementConstraint,
     InvigilatorSinglePresenceConstraint,
     InvigilatorContinuityConstraint,
@@ -46,6 +47,8 @@ class CPSATConstraintManager:
         self._build_stats: Dict[str, Any] = {}
         self._build_errors: List[str] = []
         self._constraint_instances: Dict[str, Any] = {}
+        # Constraint id -> [first, end) range of proto constraint indices it added.
+        self._constraint_ranges: Dict[str, Tuple[int, int]] = {}
         logger.info("🎛️  Initialized DYNAMIC CPSATConstraintManager.")
 
     async def build_phase1_model(
@@ -72,10 +75,17 @@ class CPSATConstraintManager:
         """Builds the full Phase 2 (Packing) model."""
         logger.info("🏗️  Building Full Phase 2 (Packing) model constraints...")
         # Define which constraints are essential for packing and resource assignment
-        core_constraints = {
+        room_constraints = {
             RoomAssignmentConsistencyConstraint,
             RoomCapacityHardConstraint,
             RoomContinuityConstraint,
+        }
+        superseded: Set[type] = set()
+        if "room_patterns" in shared_variables.precomputed_data:
+            # Room patterns seat split exams exactly; the per-room Y rules
+            # (which count every student in every room) would forbid splits.
+            superseded, room_constraints = room_constraints, {RoomPatternConstraint}
+        core_constraints = room_constraints | {
             InvigilatorRequirementConstraint,
             InvigilatorSinglePresenceConstraint,
             InvigilatorContinuityConstraint,
@@ -83,18 +93,25 @@ class CPSATConstraintManager:
         logger.info(
             f"Phase 2 will use these CORE constraints: {[c.__name__ for c in core_constraints]}"
         )
-        return await self._build_model(model, shared_variables, core_constraints)
+        return await self._build_model(
+            model, shared_variables, core_constraints, superseded
+        )
 
     async def _build_model(
         self,
         model,
         shared_variables: SharedVariables,
         core_classes: Set[type],
+        superseded: Set[type] = frozenset(),
     ) -> Dict[str, Any]:
-        """Generic model builder that separates core from dynamic constraints for a given phase."""
+        """
+        Generic model builder that separates core from dynamic constraints for a given phase.
+        Dynamic constraints implemented by a `superseded` class are skipped.
+        """
         build_start_time = time.time()
         self._build_errors = []
         self._constraint_instances = {}
+        self._constraint_ranges = {}
         total_constraints_added = 0
         successful_modules = 0
 
@@ -129,7 +146,10 @@ class CPSATConstraintManager:
         # Constraints will self-disable if their required variables (x, y, w) are not present for the current phase.
         active_definitions = self.registry.get_active_constraint_classes()
         dynamic_definitions = [
-            d for d in active_definitions if d.constraint_class not in core_classes
+            d
+            for d in active_definitions
+            if d.constraint_class not in core_classes
+            and d.constraint_class not in superseded
         ]
         logger.info(
             f"Applying {len(dynamic_definitions)} DYNAMIC (configurable) constraints..."
@@ -187,6 +207,7 @@ class CPSATConstraintManager:
             model=model,
         )
         self._constraint_instances[definition.id] = instance
+        first_constraint = len(model.Proto().constraints)
         instance.initialize_variables()
         # --- START OF FIX ---
         # Await the add_constraints method if it's a coroutine
@@ -197,6 +218,10 @@ class CPSATConstraintManager:
         else:
             instance.add_constraints()
         # --- END OF FIX ---
+        self._constraint_ranges[definition.id] = (
+            first_constraint,
+            len(model.Proto().constraints),
+        )
         stats = instance.get_statistics()
         count = stats.get("constraint_count", 0)
         if count > 0:
@@ -211,6 +236,15 @@ class CPSATConstraintManager:
         """Return comprehensive build statistics."""
         return self._build_stats.copy()
 
+    def get_hard_constraint_ranges(self) -> Dict[str, Tuple[int, int]]:
+        """Returns the proto constraint index range added by each hard constraint."""
+        return {
+            constraint_id: self._constraint_ranges[constraint_id]
+            for constraint_id, instance in self._constraint_instances.items()
+            if instance.definition.constraint_type == ConstraintType.HARD
+            and constraint_id in self._constraint_ranges
+        }
+
     def get_constraint_instances(self) -> list:
         """Returns the list of instantiated constraint objects."""
         return list(self._constraint_instances.values())
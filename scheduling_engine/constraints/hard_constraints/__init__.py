@@ -14,6 +14,7 @@ from .unified_student_conflict import UnifiedStudentConflictConstraint
 from .room_capacity_hard import RoomCapacityHardConstraint
 from .aggregate_capacity import AggregateCapacityConstraint
 from .room_continuity import RoomContinuityConstraint
+from .room_pattern import RoomPatternConstraint
 from .start_feasibility import StartFeasibilityConstraint
 
 # --- MODIFICATION START ---
@@ -33,6 +34,7 @@ __all__ = [
     "RoomCapacityHardConstraint",
     "AggregateCapacityConstraint",
     "RoomContinuityConstraint",
+    "RoomPatternConstraint",
     "StartFeasibilityConstraint",
     "InvigilatorRequirementConstraint",
     "InvigilatorSinglePresenceConstraint",
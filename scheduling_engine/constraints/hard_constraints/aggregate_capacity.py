@@ -1,5 +1,6 @@
 # scheduling_engine/constraints/hard_constraints/aggregate_capacity.py
 from scheduling_engine.constraints.base_constraint import CPSATBaseConstraint
+from scheduling_engine.core.lock_reduction import LockReduction
 import logging
 from backend.app.utils.celery_task_utils import task_progress_tracker
 
@@ -28,6 +29,8 @@ class AggregateCapacityConstraint(CPSATBaseConstraint):
         For each time slot, ensure:
         1. The total number of exams scheduled does not exceed the total number of available rooms.
         2. The total student demand does not exceed the total available room capacity.
+        Rooms and seats taken by locked exams are reserved up front, so only the
+        free exams' occupancy appears in the sums.
         """
         constraints_added = 0
         if not self.z:
@@ -40,6 +43,10 @@ class AggregateCapacityConstraint(CPSATBaseConstraint):
             room.exam_capacity for room in self.problem.rooms.values()
         )
         total_num_rooms = len(self.problem.rooms)
+        # A decomposed Phase 1 solves each exam group against its share only.
+        limits = getattr(self.problem, "aggregate_capacity_limits", None)
+        if limits:
+            total_num_rooms, total_room_capacity = limits
 
         if total_num_rooms == 0 or total_room_capacity == 0:
             logger.error(
@@ -50,12 +57,29 @@ class AggregateCapacityConstraint(CPSATBaseConstraint):
         logger.info(
             f"{self.constraint_id}: Applying global limits per slot: Total Capacity={total_room_capacity}, Total Rooms={total_num_rooms}."
         )
+        reduction = self.precomputed_data.get("lock_reduction") or LockReduction()
+        free_exams = {
+            exam_id: exam
+            for exam_id, exam in self.problem.exams.items()
+            if not reduction.is_locked(exam_id)
+        }
 
         for slot_id in self.problem.timeslots:
+            rooms_left = total_num_rooms - reduction.reserved_rooms.get(slot_id, 0)
+            seats_left = total_room_capacity - reduction.reserved_seats.get(slot_id, 0)
+            if rooms_left < 0 or seats_left < 0:
+                logger.error(
+                    f"{self.constraint_id}: Locked exams alone exceed the rooms or "
+                    f"seats of slot {slot_id}."
+                )
+                self.model.AddBoolOr([])  # The locks cannot all hold.
+                constraints_added += 1
+                continue
+
             # Get all occupancy variables (z_vars) for the current slot
             occupancy_vars_in_slot = [
                 self.z.get((exam_id, slot_id))
-                for exam_id in self.problem.exams
+                for exam_id in free_exams
                 if self.z.get((exam_id, slot_id)) is not None
             ]
 
@@ -63,7 +87,7 @@ class AggregateCapacityConstraint(CPSATBaseConstraint):
             # **SURE-FIRE CONSTRAINT 1 (Phase 1):**
             # The number of exams active in a slot cannot exceed the number of available rooms.
             if occupancy_vars_in_slot:
-                self.model.Add(sum(occupancy_vars_in_slot) <= total_num_rooms)
+                self.model.Add(sum(occupancy_vars_in_slot) <= rooms_left)
                 constraints_added += 1
             # --- END OF FIX ---
 
@@ -71,11 +95,11 @@ class AggregateCapacityConstraint(CPSATBaseConstraint):
             # Total student demand in a slot must not exceed total capacity.
             student_demand_in_slot = [
                 self.z.get((exam_id, slot_id)) * exam.expected_students
-                for exam_id, exam in self.problem.exams.items()
+                for exam_id, exam in free_exams.items()
                 if self.z.get((exam_id, slot_id)) is not None
             ]
             if student_demand_in_slot:
-                self.model.Add(sum(student_demand_in_slot) <= total_room_capacity)
+                self.model.Add(sum(student_demand_in_slot) <= seats_left)
                 constraints_added += 1
 
         self.constraint_count = constraints_added
@@ -5,7 +5,18 @@ REVISED Foundational Constraint - InvigilatorRequirementConstraint
 This constraint now serves a dual purpose:
 1. HARD Constraint: Ensures the MINIMUM number of invigilators is met for all exams in a room.
 2. SOFT Penalty: Penalizes assigning MORE invigilators than are required, promoting efficiency.
+
+Only (room, slot) pairs that carry room (y) or invigilator (w) variables are
+visited, and the requirement ceil(students / spi) is expressed linearly: since
+expected_students is a constant, a room that can only hold one exam needs
+ceil(students / spi) * y invigilators, and a shared room needs
+spi * assigned >= sum(students * y). No AddDivisionEquality is used.
+
+In the pattern-based Phase 2 model a room holds only the seats the chosen
+pattern puts there, so the (pattern, seats) terms of
+precomputed_data["seat_terms_by_room_slot"] replace (y, students).
 """
+from collections import defaultdict
 from scheduling_engine.constraints.base_constraint import CPSATBaseConstraint
 from scheduling_engine.core.constraint_types import ConstraintDefinition
 import logging
@@ -15,6 +26,14 @@ from backend.app.utils.celery_task_utils import task_progress_tracker
 logger = logging.getLogger(__name__)
 
 
+def index_keys_by_room_slot(variables):
+    """Groups (entity, room, slot) variable keys by their (room, slot) pair."""
+    index = defaultdict(list)
+    for key in variables:
+        index[(key[1], key[2])].append(key)
+    return index
+
+
 class InvigilatorRequirementConstraint(CPSATBaseConstraint):
     """
     Ensures invigilator requirements are met and penalizes over-assignment.
@@ -53,60 +72,86 @@ class InvigilatorRequirementConstraint(CPSATBaseConstraint):
                 f"{self.constraint_id}: max_students_per_invigilator is invalid, using default of 50."
             )
 
-        all_slots = {key[2] for key in self.y.keys()}
-
-        for slot_id in all_slots:
-            for room_id, room in self.problem.rooms.items():
-
-                # --- Sum of Assigned Invigilators ---
-                assigned_invigilators_sum = sum(
-                    self.w[w_key]
-                    for inv_id in self.problem.invigilators
-                    if (w_key := (inv_id, room_id, slot_id)) in self.w
-                )
-
-                # --- Calculation of Required Invigilators ---
-                total_students_in_room_var = self.model.NewIntVar(
-                    0, room.exam_capacity, f"total_students_{room_id}_{slot_id}"
-                )
-                student_load_terms = [
-                    exam.expected_students * self.y[y_key]
-                    for exam_id, exam in self.problem.exams.items()
-                    if (y_key := (exam_id, room_id, slot_id)) in self.y
+        y_by_room_slot = self.precomputed_data.get(
+            "y_keys_by_room_slot"
+        ) or index_keys_by_room_slot(self.y)
+        w_by_room_slot = self.precomputed_data.get(
+            "w_keys_by_room_slot"
+        ) or index_keys_by_room_slot(self.w)
+
+        exams = self.problem.exams
+        invigilators = self.problem.invigilators
+        max_invigilators = len(invigilators)
+        required_by_exam = {
+            exam_id: math.ceil(exam.expected_students / spi)
+            for exam_id, exam in exams.items()
+        }
+        y_slots = {slot_id for (_, slot_id) in y_by_room_slot}
+        seat_terms = self.precomputed_data.get("seat_terms_by_room_slot")
+
+        for room_slot in y_by_room_slot.keys() | w_by_room_slot.keys():
+            room_id, slot_id = room_slot
+            room = self.problem.rooms.get(room_id)
+            if room is None or slot_id not in y_slots:
+                continue
+
+            assigned = [
+                self.w[key]
+                for key in w_by_room_slot.get(room_slot, ())
+                if key[0] in invigilators
+            ]
+            if seat_terms is not None:
+                candidates = [
+                    (pattern_var, seats, math.ceil(seats / spi))
+                    for pattern_var, seats in seat_terms.get(room_slot, ())
                 ]
-                if student_load_terms:
-                    self.model.Add(
-                        total_students_in_room_var == sum(student_load_terms)
+            else:
+                candidates = [
+                    (
+                        self.y[key],
+                        exams[key[0]].expected_students,
+                        required_by_exam[key[0]],
                     )
-                else:
-                    self.model.Add(total_students_in_room_var == 0)
+                    for key in y_by_room_slot.get(room_slot, ())
+                    if key[0] in exams
+                ]
 
-                # Integer division equivalent to ceil(total_students / spi)
-                required_invigilators_var = self.model.NewIntVar(
-                    0, len(self.problem.invigilators), f"req_inv_{room_id}_{slot_id}"
-                )
-                self.model.AddDivisionEquality(
-                    required_invigilators_var, total_students_in_room_var + spi - 1, spi
+            if not candidates:
+                # Nothing can sit here, so every invigilator placed is surplus.
+                self.penalty_terms.extend(
+                    (self.surplus_penalty_weight, w_var) for w_var in assigned
                 )
+                continue
 
-                # --- HARD CONSTRAINT: Meet the Minimum Requirement ---
-                self.model.Add(assigned_invigilators_sum >= required_invigilators_var)
-                constraints_added += 1
+            assigned_sum = sum(assigned)
+            seat_limit = self.problem.get_room_seat_limit(room_id)
+            surplus_var = self.model.NewIntVar(
+                0, max_invigilators, f"surplus_inv_{room_id}_{slot_id}"
+            )
 
+            if len(candidates) == 1:
+                y_var, students, required = candidates[0]
+                if students > seat_limit:
+                    self.model.Add(y_var == 0)
+                # --- HARD CONSTRAINT: Meet the Minimum Requirement ---
+                self.model.Add(assigned_sum >= required * y_var)
                 # --- SOFT CONSTRAINT: Penalize Surplus ---
-                surplus_var = self.model.NewIntVar(
-                    0,
-                    len(self.problem.invigilators),
-                    f"surplus_inv_{room_id}_{slot_id}",
-                )
-
-                # surplus_var >= assigned_invigilators_sum - required_invigilators_var
+                self.model.Add(surplus_var >= assigned_sum - required * y_var)
+            else:
+                load = sum(students * y_var for y_var, students, _ in candidates)
+                max_load = sum(students for _, students, _ in candidates)
+                if max_load > seat_limit:
+                    self.model.Add(load <= seat_limit)
+                # --- HARD CONSTRAINT: assigned >= ceil(load / spi) ---
+                self.model.Add(spi * assigned_sum >= load)
+                # --- SOFT CONSTRAINT: surplus >= assigned - ceil(load / spi) ---
+                # For integer surplus this is exactly the ceiling, scaled by spi.
                 self.model.Add(
-                    surplus_var >= assigned_invigilators_sum - required_invigilators_var
+                    spi * surplus_var >= spi * assigned_sum - load - (spi - 1)
                 )
 
-                self.surplus_invigilator_vars.append(surplus_var)
-                constraints_added += 1
+            self.surplus_invigilator_vars.append(surplus_var)
+            constraints_added += 2
 
         # Add penalty terms to the main objective function
         if self.surplus_invigilator_vars:
@@ -0,0 +1,70 @@
+# scheduling_engine/constraints/hard_constraints/room_pattern.py
+"""
+RoomPatternConstraint - room assignment for the pattern-based Phase 2 model.
+
+Replaces RoomAssignmentConsistency, RoomCapacityHard and RoomContinuity when
+the encoder offers room patterns: every exam uses exactly one of its patterns,
+a room-assignment variable is true iff the chosen pattern contains the room
+(in every slot the exam occupies, which also keeps the rooms continuous), and
+the seats the chosen patterns take in a room never exceed its seat limit: the
+exam capacity, or for an overbookable room the exam capacity plus the
+problem's overbook rate, with the overflow priced by OverbookingPenalty. A
+room filled by a split exam can therefore only be shared if it overbooks.
+"""
+
+import logging
+from collections import defaultdict
+
+from scheduling_engine.constraints.base_constraint import CPSATBaseConstraint
+
+logger = logging.getLogger(__name__)
+
+
+class RoomPatternConstraint(CPSATBaseConstraint):
+    """H3/H8/H9 for the pattern model: one pattern per exam, seats per room."""
+
+    dependencies = []
+
+    def initialize_variables(self):
+        """No local variables needed."""
+        pass
+
+    async def add_constraints(self):
+        constraints_added = 0
+        patterns = self.precomputed_data.get("room_patterns", {})
+        pattern_vars = self.patterns
+
+        vars_by_exam = defaultdict(list)
+        rooms_of_y = defaultdict(list)
+        for (exam_id, index), pattern_var in pattern_vars.items():
+            vars_by_exam[exam_id].append(pattern_var)
+            for room_id in patterns[exam_id][index].rooms:
+                rooms_of_y[(exam_id, room_id)].append(pattern_var)
+
+        for exam_id in patterns:
+            # An exam without patterns makes the model infeasible, which is
+            # what prompts the pool to grow.
+            self.model.AddExactlyOne(vars_by_exam.get(exam_id, []))
+            constraints_added += 1
+
+        for (exam_id, room_id, slot_id), y_var in self.y.items():
+            self.model.Add(y_var == sum(rooms_of_y[(exam_id, room_id)]))
+            constraints_added += 1
+
+        seat_terms = self.precomputed_data.get("seat_terms_by_room_slot", {})
+        for (room_id, slot_id), terms in seat_terms.items():
+            if room_id not in self._rooms:
+                continue
+            limit = self.problem.get_room_seat_limit(room_id)
+            if sum(seats for _, seats in terms) <= limit:
+                continue
+            self.model.Add(
+                sum(seats * pattern_var for pattern_var, seats in terms) <= limit
+            )
+            constraints_added += 1
+
+        self.constraint_count = constraints_added
+        logger.info(
+            f"{self.constraint_id}: Added {constraints_added} room pattern constraints "
+            f"for {len(pattern_vars)} patterns over {len(patterns)} exams."
+        )
@@ -64,13 +64,12 @@ class DailyWorkloadBalanceConstraint(CPSATBaseConstraint):
             return
 
         # Link daily_exam_count_vars to the sum of exams scheduled on each day
-        for day_key, slot_ids in day_slot_groupings.items():
+        for day_key in day_slot_groupings:
             if day_key in self.daily_exam_count_vars:
                 daily_exam_terms = [
-                    self.x[key]
+                    self.on_day[key]
                     for exam_id in self._exams
-                    for slot_id in slot_ids
-                    if (key := (exam_id, slot_id)) in self.x
+                    if (key := (exam_id, day_key)) in self.on_day
                 ]
                 if daily_exam_terms:
                     self.model.Add(
@@ -56,16 +56,15 @@ class MaxExamsPerStudentPerDayConstraint(CPSATBaseConstraint):
             if len(exam_ids) <= max_exams_per_day:
                 continue
 
-            for day_id, slot_ids in day_slot_groupings.items():
-                # Collect all potential start variables for this student on this day
-                student_exam_starts_this_day = [
-                    self.x[key]
+            for day_id in day_slot_groupings:
+                # Collect the day indicators of this student's exams
+                student_exams_this_day = [
+                    self.on_day[key]
                     for exam_id in exam_ids
-                    for slot_id in slot_ids
-                    if (key := (exam_id, slot_id)) in self.x
+                    if (key := (exam_id, day_id)) in self.on_day
                 ]
 
-                if len(student_exam_starts_this_day) > max_exams_per_day:
+                if len(student_exams_this_day) > max_exams_per_day:
                     # This variable will represent the number of exams scheduled above the limit
                     excess_var = self.model.NewIntVar(
                         0, len(exam_ids), f"excess_exams_{student_id}_{day_id}"
@@ -76,7 +75,7 @@ class MaxExamsPerStudentPerDayConstraint(CPSATBaseConstraint):
                     # The solver, trying to minimize the objective, will push this value down to 0 if possible.
                     # excess_var >= sum(starts) - max_exams_per_day
                     self.model.Add(
-                        sum(student_exam_starts_this_day) - max_exams_per_day
+                        sum(student_exams_this_day) - max_exams_per_day
                         <= excess_var
                     )
                     constraints_added += 1
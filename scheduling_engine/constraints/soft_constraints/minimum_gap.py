@@ -1,17 +1,23 @@
 # scheduling_engine/constraints/soft_constraints/minimum_gap.py
 """
-MinimumGapConstraint - S8 Implementation (PARAMETERIZED & FIXED)
+MinimumGapConstraint - S8 Implementation (PARAMETERIZED & AGGREGATED)
 
 This soft constraint penalizes instances where there is less than a minimum
 gap (in slots) between consecutive exams for the same student on the same day.
 This allows the solver to schedule back-to-back exams if necessary to find a
 feasible solution, but it will be penalized.
+
+The penalty is encoded over the exam-pair conflict graph rather than per
+student: every student sharing an exam pair sees the same (exam A, exam B,
+slot offset) pattern, so one violation indicator is created per
+(exam pair, offset) and weighted by the number of shared students.
 """
 
 from scheduling_engine.constraints.base_constraint import CPSATBaseConstraint
 from scheduling_engine.core.constraint_types import ConstraintDefinition
 import logging
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import combinations
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +39,12 @@ class MinimumGapConstraint(CPSATBaseConstraint):
         self.violation_vars = []
 
     async def add_constraints(self):
-        """Add minimum gap penalty constraints between student exams."""
+        """Add one gap penalty per (exam pair, slot offset), weighted by shared students."""
         constraints_added = 0
 
-        student_exams = self._get_student_exam_mappings()
-        if not student_exams:
-            logger.info(f"{self.constraint_id}: No student-exam mappings available.")
+        shared_counts = self._get_shared_student_counts()
+        if not shared_counts:
+            logger.info(f"{self.constraint_id}: No exam pairs share students.")
             self.constraint_count = 0
             return
 
@@ -58,74 +64,78 @@ class MinimumGapConstraint(CPSATBaseConstraint):
             )
             return
 
-        exam_durations = {
-            exam_id: self.problem.get_exam_duration_in_slots(exam_id)
-            for exam_id in self.problem.exams
+        # exam_id -> day_id -> {index within day: x var}
+        slot_positions = {
+            slot_id: (day_id, idx)
+            for day_id, slot_ids in day_slot_groupings.items()
+            for idx, slot_id in enumerate(slot_ids)
         }
-
-        for student_id, exam_ids in student_exams.items():
-            if len(exam_ids) <= 1:
+        starts_by_exam_day = defaultdict(dict)
+        for (exam_id, slot_id), var in self.x.items():
+            position = slot_positions.get(slot_id)
+            if position is not None:
+                day_id, idx = position
+                starts_by_exam_day[exam_id].setdefault(day_id, {})[idx] = var
+
+        # Matches the objective builder, which truncates each weight to int.
+        base_weight = int(self.penalty_weight)
+
+        for (e1_id, e2_id), shared in shared_counts.items():
+            days1 = starts_by_exam_day.get(e1_id)
+            days2 = starts_by_exam_day.get(e2_id)
+            if not days1 or not days2:
                 continue
 
-            exam_list = list(exam_ids)
-            for day_id, slot_ids in day_slot_groupings.items():
-                day_slots = {slot_id: i for i, slot_id in enumerate(slot_ids)}
-
-                for i in range(len(exam_list)):
-                    for j in range(i + 1, len(exam_list)):
-                        e1_id, e2_id = exam_list[i], exam_list[j]
-                        dur1, dur2 = exam_durations.get(e1_id, 1), exam_durations.get(
-                            e2_id, 1
-                        )
-
-                        for s1_id in slot_ids:
-                            if (e1_id, s1_id) not in self.x:
-                                continue
-                            for s2_id in slot_ids:
-                                if (e2_id, s2_id) not in self.x:
-                                    continue
-
-                                idx1, idx2 = day_slots[s1_id], day_slots[s2_id]
-                                var1, var2 = (
-                                    self.x[(e1_id, s1_id)],
-                                    self.x[(e2_id, s2_id)],
-                                )
-
-                                # Check for a violation in both directions
-                                is_violation = False
-                                if idx1 < idx2 and idx1 + dur1 + min_gap_slots > idx2:
-                                    is_violation = True
-                                elif idx2 < idx1 and idx2 + dur2 + min_gap_slots > idx1:
-                                    is_violation = True
-
-                                if is_violation:
-                                    # This pair of assignments violates the gap. Create a
-                                    # violation variable that is true iff both are scheduled.
-                                    violation_var = self.model.NewBoolVar(
-                                        f"gap_viol_{student_id}_{e1_id}_{e2_id}"
-                                    )
-                                    # A violation occurs if var1 AND var2 are true.
-                                    self.model.AddBoolAnd([var1, var2]).OnlyEnforceIf(
-                                        violation_var
-                                    )
-                                    self.model.Add(
-                                        sum([var1, var2]) <= 1
-                                    ).OnlyEnforceIf(violation_var.Not())
-
-                                    self.violation_vars.append(violation_var)
-                                    constraints_added += 2
-
-        # Add all violation variables to the list of terms to be minimized.
-        if self.violation_vars:
-            self.penalty_terms.extend(
-                (self.penalty_weight, var) for var in self.violation_vars
-            )
+            dur1 = self.problem.get_exam_duration_in_slots(e1_id)
+            dur2 = self.problem.get_exam_duration_in_slots(e2_id)
+
+            # offset (idx2 - idx1) -> start pairs that realise it on some day
+            offset_pairs = defaultdict(list)
+            for day_id, starts1 in days1.items():
+                starts2 = days2.get(day_id)
+                if not starts2:
+                    continue
+                for idx1, var1 in starts1.items():
+                    for idx2, var2 in starts2.items():
+                        offset = idx2 - idx1
+                        if 0 < offset < dur1 + min_gap_slots or (
+                            0 < -offset < dur2 + min_gap_slots
+                        ):
+                            offset_pairs[offset].append((var1, var2))
+
+            for offset, start_pairs in offset_pairs.items():
+                violation_var = self.model.NewBoolVar(
+                    f"gap_viol_{e1_id}_{e2_id}_{offset}"
+                )
+                # The indicator only needs forcing up: the objective pushes it
+                # back to zero whenever no start pair realises this offset.
+                for var1, var2 in start_pairs:
+                    self.model.AddBoolOr([var1.Not(), var2.Not(), violation_var])
+                    constraints_added += 1
+
+                self.violation_vars.append(violation_var)
+                self.penalty_terms.append((base_weight * shared, violation_var))
 
         self.constraint_count = constraints_added
         logger.info(
-            f"{self.constraint_id}: Added {constraints_added} minimum gap penalty constraints."
+            f"{self.constraint_id}: Added {len(self.violation_vars)} gap indicators "
+            f"over {len(shared_counts)} exam pairs ({constraints_added} clauses)."
         )
 
+    def _get_shared_student_counts(self):
+        """Count the students shared by each exam pair (the conflict graph edges)."""
+        student_exams = self.precomputed_data.get("student_exams")
+        if not student_exams:
+            student_exams = self._get_student_exam_mappings()
+
+        shared_counts = Counter()
+        for exam_ids in student_exams.values():
+            if len(exam_ids) <= 1:
+                continue
+            for pair in combinations(sorted(set(exam_ids), key=str), 2):
+                shared_counts[pair] += 1
+        return shared_counts
+
     def _get_student_exam_mappings(self):
         """Helper to get student-exam mappings."""
         student_exams = defaultdict(list)
@@ -48,11 +48,19 @@ class OverbookingPenaltyConstraint(CPSATBaseConstraint):
             room = self._rooms[room_id]
             capacity = getattr(room, "exam_capacity", room.capacity)
 
-            seated_terms = [
-                exam.expected_students * self.y[key]
-                for exam_id, exam in self._exams.items()
-                if (key := (exam_id, room_id, slot_id)) in self.y
-            ]
+            seat_terms = self.precomputed_data.get("seat_terms_by_room_slot")
+            if seat_terms is not None:
+                # Room patterns seat only part of a split exam in each room.
+                seated_terms = [
+                    seats * pattern_var
+                    for pattern_var, seats in seat_terms.get((room_id, slot_id), ())
+                ]
+            else:
+                seated_terms = [
+                    exam.expected_students * self.y[key]
+                    for exam_id, exam in self._exams.items()
+                    if (key := (exam_id, room_id, slot_id)) in self.y
+                ]
 
             if seated_terms:
                 total_seated_var = self.model.NewIntVar(
@@ -0,0 +1,179 @@
+# scheduling_engine/core/decomposition.py
+
+"""
+Exam partitioning for a decomposed Phase 1 solve.
+
+Two exams are coupled when they share students: the student-conflict, gap and
+per-day constraints only ever relate such pairs. Apart from that, Phase 1
+exams interact only through the room count and seat capacity of each slot
+(and the day-level workload balance). When faculties share almost no students
+the exam graph splits into components that can be timetabled independently,
+each against its share of the per-slot capacity.
+
+`max_cut_students` loosens "independent": couplings carrying at most that many
+shared students may be cut. Cutting every coupling up to a weight threshold is
+single-linkage clustering, i.e. it cuts the maximum spanning forest of the
+exam graph at its weakest links. Cut pairs are reconciled afterwards by a
+coordinating repair solve over the full model.
+"""
+
+import copy
+import logging
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from .problem_model import ExamSchedulingProblem
+
+logger = logging.getLogger(__name__)
+
+ExamPair = Tuple[UUID, UUID]
+
+
+@dataclass
+class ExamPartition:
+    """Disjoint groups of exams, plus the student couplings running between them."""
+
+    parts: List[List[UUID]] = field(default_factory=list)
+    cut_edges: Dict[ExamPair, int] = field(default_factory=dict)
+
+    @property
+    def is_trivial(self) -> bool:
+        return len(self.parts) < 2
+
+    def part_of(self) -> Dict[UUID, int]:
+        return {exam_id: i for i, part in enumerate(self.parts) for exam_id in part}
+
+    def get_statistics(self) -> Dict[str, int]:
+        return {
+            "parts": len(self.parts),
+            "largest_part": max((len(p) for p in self.parts), default=0),
+            "cut_edges": len(self.cut_edges),
+            "cut_students": sum(self.cut_edges.values()),
+        }
+
+
+def exam_coupling(problem: "ExamSchedulingProblem") -> Dict[ExamPair, int]:
+    """Number of shared students for every pair of exams that shares any."""
+    exams_by_student: Dict[UUID, List[UUID]] = defaultdict(list)
+    for exam_id, exam in problem.exams.items():
+        for student_id in exam.students:
+            exams_by_student[student_id].append(exam_id)
+
+    coupling: Dict[ExamPair, int] = defaultdict(int)
+    for exam_ids in exams_by_student.values():
+        ordered = sorted(exam_ids, key=str)
+        for i, first in enumerate(ordered):
+            for second in ordered[i + 1 :]:
+                coupling[(first, second)] += 1
+    return dict(coupling)
+
+
+def _clusters(exam_ids: Iterable[UUID], edges: Iterable[ExamPair]) -> List[List[UUID]]:
+    parent: Dict[UUID, UUID] = {exam_id: exam_id for exam_id in exam_ids}
+
+    def find(node: UUID) -> UUID:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for first, second in edges:
+        root_a, root_b = find(first), find(second)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    members: Dict[UUID, List[UUID]] = defaultdict(list)
+    for exam_id in parent:
+        members[find(exam_id)].append(exam_id)
+    return list(members.values())
+
+
+def partition_exams(
+    problem: "ExamSchedulingProblem",
+    max_parts: int,
+    max_cut_students: int = 0,
+) -> ExamPartition:
+    """
+    Splits the exams into at most `max_parts` groups along weak couplings.
+
+    Clusters are packed largest-first into the group with the fewest exams,
+    so many small components still yield a few balanced parts.
+    """
+    coupling = exam_coupling(problem)
+    kept = [pair for pair, shared in coupling.items() if shared > max_cut_students]
+    clusters = sorted(
+        _clusters(problem.exams, kept), key=lambda c: (-len(c), str(min(c, key=str)))
+    )
+
+    bins: List[List[UUID]] = [[] for _ in range(max(1, min(max_parts, len(clusters))))]
+    for cluster in clusters:
+        min(bins, key=len).extend(cluster)
+    parts = [sorted(part, key=str) for part in bins if part]
+
+    partition = ExamPartition(parts=parts)
+    part_of = partition.part_of()
+    partition.cut_edges = {
+        pair: shared
+        for pair, shared in coupling.items()
+        if part_of[pair[0]] != part_of[pair[1]]
+    }
+    logger.info(f"Exam partition: {partition.get_statistics()}")
+    return partition
+
+
+def capacity_shares(
+    problem: "ExamSchedulingProblem", parts: List[List[UUID]]
+) -> List[Tuple[int, int]]:
+    """
+    Per-part (rooms, seats) limits for each slot, proportional to demand.
+
+    Room share follows exam-slots, seat share follows student-slots. Shares
+    are rounded up and always fit the part's largest exam: a part starved by
+    rounding may be unable to prove its own infeasibility (a pigeonhole), while
+    a slot the merged shares over-commit is simply freed for the repair solve.
+    """
+    total_rooms = len(problem.rooms)
+    total_seats = sum(room.exam_capacity for room in problem.rooms.values())
+
+    def demand(exam_ids: Iterable[UUID]) -> Tuple[int, int]:
+        slots = students = 0
+        for exam_id in exam_ids:
+            duration = problem.get_exam_duration_in_slots(exam_id)
+            slots += duration
+            students += duration * problem.exams[exam_id].expected_students
+        return slots, students
+
+    total_slots, total_students = demand(problem.exams)
+    shares = []
+    for part in parts:
+        slots, students = demand(part)
+        rooms = math.ceil(total_rooms * slots / max(1, total_slots))
+        seats = math.ceil(total_seats * students / max(1, total_students))
+        largest = max(problem.exams[e].expected_students for e in part)
+        shares.append((max(1, rooms), max(largest, seats)))
+    return shares
+
+
+def problem_view(
+    problem: "ExamSchedulingProblem",
+    exam_ids: Iterable[UUID],
+    capacity_limits: Optional[Tuple[int, int]] = None,
+) -> "ExamSchedulingProblem":
+    """
+    A shallow copy of the problem restricted to `exam_ids`.
+
+    Rooms, slots and students are shared with the original; only the exam
+    map, the locks and the aggregate per-slot capacity are narrowed.
+    """
+    keep: Set[UUID] = set(exam_ids)
+    view = copy.copy(problem)
+    view.exams = {
+        exam_id: exam for exam_id, exam in problem.exams.items() if exam_id in keep
+    }
+    view.locks = [lock for lock in problem.locks if lock.get("exam_id") in keep]
+    view.aggregate_capacity_limits = capacity_limits
+    return view
@@ -0,0 +1,134 @@
+# scheduling_engine/core/lock_reduction.py
+
+"""
+Lock-driven reduction of the decision space, computed before encoding.
+
+A HITL lock pins an exam to a start slot and optionally to rooms and
+invigilators. Instead of creating every candidate variable for a locked exam
+and letting presolve discover that all but one are fixed, the encoder reads a
+LockReduction: locked exams get only their locked start (and rooms, and
+invigilator posts) as variables pinned to 1, the per-slot room count and seats
+they consume are reserved up front, and free exams lose every start that would
+overlap a locked exam sharing a 'normal' registration with them.
+
+Locks whose start slot cannot hold the exam are ignored with a warning, as are
+locks for exams outside the problem.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Set, Tuple
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from .problem_model import ExamSchedulingProblem
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LockReduction:
+    """What the locks fix, and the capacity and starts that leaves to the rest."""
+
+    fixed_starts: Dict[UUID, UUID] = field(default_factory=dict)
+    fixed_rooms: Dict[UUID, List[UUID]] = field(default_factory=dict)
+    fixed_invigilators: Dict[UUID, List[UUID]] = field(default_factory=dict)
+    # slot -> rooms / seats taken by locked exams occupying it
+    reserved_rooms: Dict[UUID, int] = field(default_factory=dict)
+    reserved_seats: Dict[UUID, int] = field(default_factory=dict)
+    # (room, slot) -> seats taken by exams locked into that room alone
+    room_seats_used: Dict[Tuple[UUID, UUID], int] = field(default_factory=dict)
+    # (exam, start) pairs of free exams that would clash with a locked exam
+    blocked_starts: Set[Tuple[UUID, UUID]] = field(default_factory=set)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.fixed_starts
+
+    def is_locked(self, exam_id: UUID) -> bool:
+        return exam_id in self.fixed_starts
+
+    def get_statistics(self) -> Dict[str, int]:
+        return {
+            "locked_exams": len(self.fixed_starts),
+            "locked_room_assignments": sum(map(len, self.fixed_rooms.values())),
+            "locked_invigilator_posts": sum(map(len, self.fixed_invigilators.values())),
+            "blocked_starts": len(self.blocked_starts),
+        }
+
+
+def _valid_locks(problem: "ExamSchedulingProblem") -> List[Dict[str, Any]]:
+    valid = []
+    for lock in getattr(problem, "locks", None) or []:
+        exam_id, slot_id = lock.get("exam_id"), lock.get("time_slot_id")
+        if exam_id not in problem.exams:
+            continue
+        if not problem.is_start_feasible(exam_id, slot_id):
+            logger.warning(
+                f"Ignoring lock of exam {exam_id} to slot {slot_id}: the exam "
+                "cannot start there."
+            )
+            continue
+        valid.append(lock)
+    return valid
+
+
+def reduce_locks(
+    problem: "ExamSchedulingProblem", include_starts: bool = True
+) -> LockReduction:
+    """
+    Derives the fixed assignments and their side effects from the locks.
+    `include_starts=False` skips the blocked starts, which Phase 2 never reads.
+    """
+    reduction = LockReduction()
+    reserved_rooms: Dict[UUID, int] = defaultdict(int)
+    reserved_seats: Dict[UUID, int] = defaultdict(int)
+    room_seats_used: Dict[Tuple[UUID, UUID], int] = defaultdict(int)
+    # student -> slots occupied by locked exams they sit as 'normal'
+    student_busy: Dict[UUID, Set[UUID]] = defaultdict(set)
+
+    for lock in _valid_locks(problem):
+        exam_id, slot_id = lock["exam_id"], lock["time_slot_id"]
+        exam = problem.exams[exam_id]
+        rooms = [r for r in lock.get("room_ids") or [] if r in problem.rooms]
+        invigilators = [
+            i for i in lock.get("invigilator_ids") or [] if i in problem.invigilators
+        ]
+        reduction.fixed_starts[exam_id] = slot_id
+        if rooms:
+            reduction.fixed_rooms[exam_id] = rooms
+        if invigilators:
+            reduction.fixed_invigilators[exam_id] = invigilators
+
+        occupied = problem.get_occupancy_slots(exam_id, slot_id)
+        for occupied_slot in occupied:
+            reserved_rooms[occupied_slot] += max(1, len(rooms))
+            reserved_seats[occupied_slot] += exam.expected_students
+            if len(rooms) == 1:
+                room_seats_used[(rooms[0], occupied_slot)] += exam.expected_students
+        for student_id, registration in exam.students.items():
+            if registration == "normal":
+                student_busy[student_id].update(occupied)
+
+    reduction.reserved_rooms = dict(reserved_rooms)
+    reduction.reserved_seats = dict(reserved_seats)
+    reduction.room_seats_used = dict(room_seats_used)
+
+    if include_starts and student_busy:
+        for exam_id, exam in problem.exams.items():
+            if exam_id in reduction.fixed_starts:
+                continue
+            busy: Set[UUID] = set()
+            for student_id, registration in exam.students.items():
+                if registration == "normal":
+                    busy |= student_busy.get(student_id, set())
+            if not busy:
+                continue
+            for slot_id in problem.timeslots:
+                if busy.intersection(problem.get_occupancy_slots(exam_id, slot_id)):
+                    reduction.blocked_starts.add((exam_id, slot_id))
+
+    if not reduction.is_empty:
+        logger.info(f"Lock reduction: {reduction.get_statistics()}")
+    return reduction
@@ -12,6 +12,7 @@ import logging
 from collections import defaultdict
 import uuid
 
+import numpy as np
 
 from scheduling_engine.core.constraint_registry import ConstraintRegistry
 from scheduling_engine.core.constraint_types import (
@@ -27,6 +28,9 @@ if TYPE_CHECKING:
     from backend.app.services.scheduling.data_preparation_service import (
         ProblemModelCompatibleDataset,
     )
+    from backend.app.services.scheduling.columnar_dataset_loader import (
+        ColumnarSchedulingDataset,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -531,6 +535,36 @@ class ExamSchedulingProblem:
         self.allow_back_to_back_exams = False
         self.require_same_day_practicals = True
         self.subproblem_time_limit_seconds: float = 30.0
+        # Explain INFEASIBLE results with an assumption-based core (off by default).
+        self.diagnose_infeasibility: bool = False
+        self.diagnosis_time_limit_seconds: float = 20.0
+        # Race this many CP-SAT configurations on Phase 1 (0/1 = single solve).
+        self.solver_race_size: int = 0
+        # JSON file of race winners per session fingerprint (None = not kept).
+        self.solver_portfolio_store: Optional[str] = None
+        # Tuned parameter profiles per size tier (see cp_sat/tuning.py).
+        self.solver_tuned_profiles: Optional[str] = None
+        # Directory to export anonymized models to for offline tuning.
+        self.tuning_export_dir: Optional[str] = None
+        # Solve Phase 1 per weakly coupled exam group, then repair the merge.
+        self.phase1_decomposition: bool = False
+        # Student couplings of at most this weight may be cut between groups.
+        self.decomposition_max_cut_students: int = 0
+        self.decomposition_repair_time_limit_seconds: float = 30.0
+        # (rooms, seats) per slot for AggregateCapacityConstraint; None = all rooms.
+        self.aggregate_capacity_limits: Optional[Tuple[int, int]] = None
+        # Keep this many built Phase 1 models for weight-only reruns, per process
+        # and, with a directory, in a store shared by all workers.
+        self.model_cache_size: int = 0
+        self.model_cache_dir: Optional[str] = None
+        # Phase 2 rooms: "assignment" (Y per exam, room, slot) or "patterns"
+        # (one room pattern per exam, see core/room_patterns.py).
+        self.phase2_room_model: str = "assignment"
+        self.room_patterns_per_exam: int = 8
+        self.room_pattern_growth_rounds: int = 2
+        # One wall-clock deadline for the whole solve, shared out across the
+        # stages (see cp_sat/time_budget.py); 0 keeps the per-stage limits.
+        self.solver_deadline_seconds: float = 0.0
 
         # Configuration parameters
         self.min_gap_slots = 1
@@ -759,6 +793,256 @@ class ExamSchedulingProblem:
             logger.error(f"📍 Stack trace: {traceback.format_exc()}")
             raise
 
+    async def load_from_columnar(self, dataset: "ColumnarSchedulingDataset") -> None:
+        """
+        Loads the problem from a ColumnarSchedulingDataset without building the
+        intermediate dict tree. Mirrors load_from_backend phase by phase and
+        applies the same normalisation as ExactDataMapper.
+        """
+        logger.info("=== PROBLEM MODEL COLUMNAR LOADING START ===")
+        logger.info(
+            f"📦 DATASET INFO: {dataset.exam_count} exams, "
+            f"{len(dataset.students.get('id', []))} students, "
+            f"{len(dataset.rooms.get('id', []))} rooms, "
+            f"{dataset.registration_count} registrations"
+        )
+
+        try:
+            logger.info("📋 PHASE 1: Loading entities from columns...")
+            entities_loaded = self._load_entities_from_columns(dataset)
+
+            logger.info("📋 PHASE 2: Loading HITL data and constraints...")
+            self.locks = dataset.locks
+            self._parse_constraint_definitions(dataset.constraints)
+            self.constraint_registry.load_definitions(
+                self.constraint_definitions, self.module_map
+            )
+            logger.info(
+                f"✅ Loaded {len(self.locks)} locks and {len(self.constraint_definitions)} constraint definitions."
+            )
+
+            logger.info("📋 PHASE 3: Validating relationships...")
+            self._validate_dataset_relationships(dataset, entities_loaded)
+            self._log_exam_student_statistics()
+            self._log_registration_statistics()
+
+            logger.info("📋 PHASE 4a: Building course-student mappings...")
+            self._build_course_student_mappings()
+
+            logger.info("📋 PHASE 5: Configuring days and timeslots from dataset...")
+            self._configure_days_and_timeslots(dataset)
+            self._activate_constraints_from_config()
+
+            logger.info("📋 PHASE 6: Final validation...")
+            validation_result = self.validate_problem_data()
+            if not validation_result.get("valid", False):
+                logger.error(
+                    f"🔴 VALIDATION FAILED: {validation_result.get('errors', [])}"
+                )
+                raise ValueError(
+                    f"Problem data validation failed: {validation_result.get('errors')}"
+                )
+
+            logger.info("✅ Problem model columnar loading completed successfully")
+
+        except Exception as e:
+            logger.error(f"❌ Problem model columnar loading failed: {e}")
+            logger.error(f"📍 Stack trace: {traceback.format_exc()}")
+            raise
+
+    def _load_entities_from_columns(
+        self, dataset: "ColumnarSchedulingDataset"
+    ) -> Dict[str, int]:
+        """Builds entities from column buffers, grouping registrations by exam."""
+        exams = dataset.exams
+        n_exams = len(exams["id"])
+
+        # Group registrations by exam with one stable sort instead of a dict per exam.
+        exam_idx = np.asarray(dataset.registrations.get("exam_idx", []), dtype=np.int64)
+        order = np.argsort(exam_idx, kind="stable")
+        bounds = np.concatenate(
+            ([0], np.cumsum(np.bincount(exam_idx, minlength=n_exams)))
+        ).tolist()
+        student_ids = [
+            self._ensure_uuid(sid) for sid in dataset.registration_students
+        ]
+        sorted_students = np.asarray(
+            dataset.registrations.get("student_code", []), dtype=np.int64
+        )[order].tolist()
+        sorted_types = np.asarray(
+            dataset.registrations.get("type_code", []), dtype=np.int64
+        )[order].tolist()
+        reg_types = dataset.registration_types
+
+        instructors_by_exam = self._group_side_table(dataset.exam_instructors)
+        departments_by_exam = self._group_side_table(dataset.exam_departments)
+        faculties_by_exam = self._group_side_table(dataset.exam_faculties)
+
+        entities_loaded = {"exams": 0, "rooms": 0, "students": 0, "invigilators": 0}
+        durations = exams["duration_minutes"].tolist()
+        expected = exams["expected_students"].tolist()
+        practical = exams["is_practical"].tolist()
+        morning = exams["morning_only"].tolist()
+        all_instructors: Dict[Any, Dict[str, Any]] = {}
+
+        for i in range(n_exams):
+            start, end = bounds[i], bounds[i + 1]
+            if start == end:
+                logger.warning(
+                    f"👻 PHANTOM EXAM: {exams['id'][i]} - {exams['course_code'][i]}"
+                )
+                continue
+            try:
+                students = {
+                    student_ids[code]: reg_types[tcode]
+                    for code, tcode in zip(
+                        sorted_students[start:end], sorted_types[start:end]
+                    )
+                }
+                exam = Exam(
+                    id=self._ensure_uuid(exams["id"][i]),
+                    course_id=self._ensure_uuid(exams["course_id"][i]),
+                    duration_minutes=durations[i],
+                    expected_students=max(expected[i], len(students)),
+                    is_practical=bool(practical[i]),
+                    morning_only=bool(morning[i]),
+                )
+                exam.set_students(students)
+                exam.course_code = exams["course_code"][i]
+                exam.course_title = exams["course_title"][i]
+
+                instructors = instructors_by_exam.get(i, [])
+                if instructors:
+                    exam.instructors = instructors
+                    exam.instructor_ids = {
+                        self._ensure_uuid(inst["id"]) for inst in instructors
+                    }
+                    for inst in instructors:
+                        all_instructors.setdefault(inst["id"], inst)
+                departments = departments_by_exam.get(i, [])
+                if departments:
+                    exam.departments = departments
+                    exam.department_ids = {
+                        self._ensure_uuid(d["id"]) for d in departments
+                    }
+                faculties = faculties_by_exam.get(i, [])
+                if faculties:
+                    exam.faculties = faculties
+                    exam.faculty_ids = {self._ensure_uuid(f["id"]) for f in faculties}
+
+                self.add_exam(exam)
+                entities_loaded["exams"] += 1
+            except Exception as e:
+                logger.error(f"Error loading exam {exams['id'][i]}: {e}")
+
+        if entities_loaded["exams"] == 0 and n_exams > 0:
+            raise ValueError(
+                "No valid exams found after phantom filtering! All exams lack student registrations."
+            )
+
+        for student_id, department in zip(
+            dataset.students["id"], dataset.students["department"]
+        ):
+            self.add_student(
+                Student(id=self._ensure_uuid(student_id), department=department)
+            )
+            entities_loaded["students"] += 1
+
+        departments_by_room = self._group_side_table(dataset.room_departments)
+        rooms = dataset.rooms
+        for i, room_id in enumerate(rooms["id"]):
+            try:
+                room = Room.from_backend_data(
+                    {
+                        "id": room_id,
+                        "code": rooms["code"][i],
+                        "capacity": int(rooms["capacity"][i]),
+                        "exam_capacity": int(rooms["exam_capacity"][i]),
+                        "overbookable": bool(rooms["overbookable"][i]),
+                        "has_computers": bool(rooms["has_computers"][i]),
+                        "building_name": rooms["building_name"][i],
+                        "building_faculty_id": rooms["building_faculty_id"][i],
+                        "adjacent_seat_pairs": rooms["adjacent_seat_pairs"][i],
+                        "departments": departments_by_room.get(i, []),
+                    }
+                )
+                self.add_room(room)
+                entities_loaded["rooms"] += 1
+            except Exception as e:
+                logger.error(f"Error loading room {room_id}: {e}")
+
+        staff = dataset.invigilators
+        unavailability_by_staff = self._group_side_table(dataset.staff_unavailability)
+        for i, staff_id in enumerate(staff["id"]):
+            try:
+                full_name = f"{staff['first_name'][i] or ''} {staff['last_name'][i] or ''}"
+                invigilator = Invigilator(
+                    id=self._ensure_uuid(staff_id),
+                    name=full_name.strip()
+                    or f"Staff {staff['staff_number'][i] or 'Unknown'}",
+                    email=staff["email"][i],
+                    department=staff["department"][i],
+                    department_id=(
+                        self._ensure_uuid(staff["department_id"][i])
+                        if staff["department_id"][i]
+                        else None
+                    ),
+                    can_invigilate=bool(staff["can_invigilate"][i]),
+                    max_concurrent_exams=int(staff["max_concurrent_exams"][i]),
+                    max_students_per_exam=int(staff["max_students_per_exam"][i]),
+                    staff_number=staff["staff_number"][i],
+                    staff_type=staff["staff_type"][i],
+                    max_daily_sessions=int(staff["max_daily_sessions"][i]),
+                    max_consecutive_sessions=int(
+                        staff["max_consecutive_sessions"][i]
+                    ),
+                    availability=self._availability_from_rows(
+                        unavailability_by_staff.get(i, [])
+                    ),
+                )
+                self.add_invigilator(invigilator)
+                entities_loaded["invigilators"] += 1
+            except Exception as e:
+                logger.error(f"Error loading invigilator {staff_id}: {e}")
+
+        for inst in all_instructors.values():
+            full_name = f"{inst.get('first_name') or ''} {inst.get('last_name') or ''}"
+            self.add_instructor(
+                Instructor(
+                    id=self._ensure_uuid(inst["id"]),
+                    name=full_name.strip() or "Unknown Instructor",
+                    email=inst.get("email"),
+                    department=inst.get("department"),
+                )
+            )
+
+        logger.info(f"Entities loaded: {entities_loaded}")
+        return entities_loaded
+
+    @staticmethod
+    def _group_side_table(table: Dict[str, Any]) -> Dict[int, List[Dict[str, Any]]]:
+        """Turns an owner-indexed side table into {owner_idx: [row dicts]}."""
+        grouped: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        if not table:
+            return grouped
+        columns = [name for name in table if name != "owner_idx"]
+        for row_idx, owner in enumerate(np.asarray(table["owner_idx"]).tolist()):
+            grouped[owner].append({name: table[name][row_idx] for name in columns})
+        return grouped
+
+    @staticmethod
+    def _availability_from_rows(rows: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """
+        Builds {date: [unavailable periods]} from staff_unavailability rows,
+        whose periods are comma-separated, in the jsonb dataset's shape.
+        """
+        availability: Dict[str, set] = defaultdict(set)
+        for row in rows:
+            availability[row["date"]].update(
+                period for period in (row["periods"] or "").split(",") if period
+            )
+        return {day: sorted(periods) for day, periods in availability.items()}
+
     def _activate_constraints_from_config(self) -> None:
         """
         Activates all constraints that are marked as 'enabled' in the loaded
@@ -1075,6 +1359,16 @@ class ExamSchedulingProblem:
         occupied_slot_ids = day_slot_ids[start_index : start_index + duration_in_slots]
         return occupied_slot_ids
 
+    def get_room_seat_limit(self, room_id: UUID) -> int:
+        """
+        Seats a room may hold in one slot: its exam capacity, plus up to
+        `overbook_rate` of it more when the room is overbookable.
+        """
+        room = self.rooms[room_id]
+        if not room.overbookable:
+            return room.exam_capacity
+        return room.exam_capacity + math.floor(room.exam_capacity * self.overbook_rate)
+
     def is_invigilator_available(self, invigilator_id: UUID, slot_id: UUID) -> bool:
         """
         Checks if an invigilator is available for a given timeslot.
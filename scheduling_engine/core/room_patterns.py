@@ -0,0 +1,269 @@
+# scheduling_engine/core/room_patterns.py
+
+"""
+Room patterns for the pattern-based Phase 2 formulation.
+
+A pattern is a set of rooms that together seat an exam, with the seats each
+room takes. Instead of deciding every (exam, room, slot) Boolean separately,
+the pattern model picks exactly one pattern per exam, which makes splitting a
+large exam over several rooms a single decision with an exact seat count per
+room.
+
+Patterns are the minimal covers of the exam by the rooms open to it: removing
+any room leaves the exam short of seats. They are ranked by the number of
+buildings used, then waste, then room count, and only covers whose waste is
+within `waste_ratio * students` of the best cover are kept. Ties between rooms
+of equal capacity are broken per exam so that exams competing for identical
+rooms are offered different ones.
+
+Each group is also offered a first-fit packing, in which exams take disjoint
+rooms largest first. The pool grows on demand: when no combination of the offered patterns fits,
+`grow()` widens the waste bound, the number of patterns per exam and the
+search budget, column-generation style, and the model is rebuilt.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Tuple
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from .problem_model import ExamSchedulingProblem
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RoomPattern:
+    """Rooms seating one exam, largest first, with the seats each one takes."""
+
+    rooms: Tuple[UUID, ...]
+    seats: Tuple[int, ...]
+    waste: int
+    buildings: int
+
+    def allocations(self) -> Dict[UUID, int]:
+        return dict(zip(self.rooms, self.seats))
+
+
+def fill_rooms(
+    problem: "ExamSchedulingProblem", students: int, rooms: List[UUID]
+) -> Tuple[int, ...]:
+    """
+    Seats per room when filling the rooms largest first; the last room takes
+    the remainder. This matches SolutionExtractor.calculate_room_allocations.
+    """
+    remaining = students
+    seats = []
+    for position, room_id in enumerate(rooms):
+        if position == len(rooms) - 1:
+            seats.append(remaining)
+        else:
+            seated = min(remaining, problem.rooms[room_id].exam_capacity)
+            seats.append(seated)
+            remaining -= seated
+    return tuple(seats)
+
+
+def make_pattern(
+    problem: "ExamSchedulingProblem", students: int, rooms: List[UUID]
+) -> RoomPattern:
+    ordered = sorted(rooms, key=lambda r: -problem.rooms[r].exam_capacity)
+    capacity = sum(problem.rooms[r].exam_capacity for r in ordered)
+    return RoomPattern(
+        rooms=tuple(ordered),
+        seats=fill_rooms(problem, students, ordered),
+        waste=max(0, capacity - students),
+        buildings=len({_building(problem, r) for r in ordered}),
+    )
+
+
+def _building(problem: "ExamSchedulingProblem", room_id: UUID) -> str:
+    return problem.rooms[room_id].building_name or str(room_id)
+
+
+def minimal_covers(
+    capacities: List[Tuple[UUID, int]],
+    students: int,
+    max_rooms: int,
+    node_budget: int,
+) -> List[List[UUID]]:
+    """
+    Minimal room sets seating `students`, from rooms sorted by non-increasing
+    capacity. A branch stops as soon as it covers the exam, which makes every
+    cover minimal; the search stops after `node_budget` branches.
+    """
+    suffix_best: List[List[int]] = []
+    # suffix_best[i][k]: seats of the k largest rooms from position i on.
+    for i in range(len(capacities)):
+        best = [0]
+        for _, capacity in capacities[i : i + max_rooms]:
+            best.append(best[-1] + capacity)
+        suffix_best.append(best)
+
+    covers: List[List[UUID]] = []
+    nodes = 0
+
+    def search(start: int, chosen: List[UUID], seated: int) -> None:
+        nonlocal nodes
+        for i in range(start, len(capacities)):
+            if nodes >= node_budget:
+                return
+            left = max_rooms - len(chosen)
+            reach = suffix_best[i][min(left, len(suffix_best[i]) - 1)]
+            if seated + reach < students:
+                return  # rooms only get smaller from here
+            nodes += 1
+            room_id, capacity = capacities[i]
+            if seated + capacity >= students:
+                covers.append(chosen + [room_id])
+            elif left > 1:
+                search(i + 1, chosen + [room_id], seated + capacity)
+
+    if students <= 0:
+        return [[room_id] for room_id, _ in capacities]
+    search(0, [], 0)
+    return covers
+
+
+@dataclass
+class RoomPatternPool:
+    """Patterns per exam, generated lazily and widened by `grow()`."""
+
+    problem: "ExamSchedulingProblem"
+    patterns_per_exam: int = 8
+    waste_ratio: float = 0.25
+    extra_rooms: int = 1
+    node_budget: int = 2000
+    level: int = 0
+    _cache: Dict[Tuple[UUID, FrozenSet[UUID]], List[RoomPattern]] = field(
+        default_factory=dict, repr=False
+    )
+
+    def grow(self) -> None:
+        """Offers more and looser patterns from now on."""
+        self.level += 1
+        self._cache.clear()
+        logger.info(
+            f"Room pattern pool grown to level {self.level}: up to "
+            f"{self._limit()} patterns per exam, waste within "
+            f"{self._waste_ratio():.0%} of the best cover."
+        )
+
+    def _limit(self) -> int:
+        return self.patterns_per_exam * 2**self.level
+
+    def _waste_ratio(self) -> float:
+        return self.waste_ratio * 2**self.level
+
+    def patterns_for(
+        self, exam_id: UUID, excluded_rooms: FrozenSet[UUID] = frozenset()
+    ) -> List[RoomPattern]:
+        key = (exam_id, excluded_rooms)
+        if key not in self._cache:
+            self._cache[key] = self._generate(exam_id, excluded_rooms)
+        return self._cache[key]
+
+    def _generate(
+        self, exam_id: UUID, excluded_rooms: FrozenSet[UUID]
+    ) -> List[RoomPattern]:
+        problem = self.problem
+        students = problem.exams[exam_id].expected_students
+        capacities = sorted(
+            (
+                (room_id, room.exam_capacity)
+                for room_id, room in problem.rooms.items()
+                if room_id not in excluded_rooms and room.exam_capacity > 0
+            ),
+            key=lambda rc: (-rc[1], hash((exam_id, rc[0]))),
+        )
+        if not capacities:
+            return []
+
+        # Fewest rooms that could seat the exam, plus some slack.
+        needed, seated = 0, 0
+        for _, capacity in capacities:
+            if seated >= students:
+                break
+            needed, seated = needed + 1, seated + capacity
+        if seated < students:
+            return []
+        max_rooms = max(1, needed) + self.extra_rooms + self.level
+        budget = self.node_budget * (self.level + 1)
+
+        # Same-building covers first, so the shared budget cannot crowd them out.
+        by_building: Dict[str, List[Tuple[UUID, int]]] = {}
+        for room_id, capacity in capacities:
+            by_building.setdefault(_building(problem, room_id), []).append(
+                (room_id, capacity)
+            )
+        capacity_of = dict(capacities)
+        covers: Dict[FrozenSet[UUID], int] = {}
+        for group in [*by_building.values(), capacities]:
+            if sum(c for _, c in group) < students:
+                continue
+            for rooms in minimal_covers(group, students, max_rooms, budget):
+                covers[frozenset(rooms)] = sum(capacity_of[r] for r in rooms)
+
+        if not covers:
+            return []
+        bound = min(covers.values()) + self._waste_ratio() * max(students, 1)
+        ranked = sorted(
+            (
+                make_pattern(problem, students, list(rooms))
+                for rooms, capacity in covers.items()
+                if capacity <= bound
+            ),
+            key=lambda p: (p.buildings, p.waste, len(p.rooms)),
+        )
+        # Take the best covers of each building in turn, so that a single
+        # building's rooms cannot fill the whole limit.
+        by_site: Dict[FrozenSet[str], List[RoomPattern]] = {}
+        for pattern in ranked:
+            site = frozenset(_building(problem, r) for r in pattern.rooms)
+            by_site.setdefault(site, []).append(pattern)
+        spread: List[RoomPattern] = []
+        for depth in range(max(map(len, by_site.values()))):
+            spread.extend(
+                group[depth] for group in by_site.values() if depth < len(group)
+            )
+        return sorted(spread[: self._limit()], key=ranked.index)
+
+    def first_fit(
+        self, excluded_rooms: Dict[UUID, FrozenSet[UUID]]
+    ) -> Dict[UUID, RoomPattern]:
+        """
+        A starting packing of the given exams: largest first, each exam takes
+        the best cover of the rooms no earlier exam uses. Offering it alongside
+        the ranked patterns seeds the pool with at least one joint fit whenever
+        the exams can be seated without sharing rooms.
+        """
+        exams = self.problem.exams
+        taken: FrozenSet[UUID] = frozenset()
+        packing: Dict[UUID, RoomPattern] = {}
+        for exam_id in sorted(
+            excluded_rooms, key=lambda e: -exams[e].expected_students
+        ):
+            patterns = self._generate(exam_id, excluded_rooms[exam_id] | taken)
+            if patterns:
+                packing[exam_id] = patterns[0]
+                taken |= frozenset(patterns[0].rooms)
+        return packing
+
+    def get_statistics(self) -> Dict[str, int]:
+        counts = [len(patterns) for patterns in self._cache.values()]
+        return {
+            "level": self.level,
+            "exams": len(counts),
+            "patterns": sum(counts),
+            "largest_pool": max(counts, default=0),
+        }
+
+
+def locked_pattern(
+    problem: "ExamSchedulingProblem", exam_id: UUID, rooms: List[UUID]
+) -> Optional[RoomPattern]:
+    """The single pattern a room lock leaves an exam."""
+    if not rooms:
+        return None
+    return make_pattern(problem, problem.exams[exam_id].expected_students, rooms)
@@ -339,7 +339,7 @@ class TimetableSolution:
 
         for room_id, total_students in room_student_count.items():
             room = self.problem.rooms.get(room_id)
-            if room and total_students > room.exam_capacity:
+            if room and total_students > self.problem.get_room_seat_limit(room_id):
                 conflicts.append(
                     ConflictReport(
                         conflict_id=uuid4(),
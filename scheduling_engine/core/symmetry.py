@@ -0,0 +1,113 @@
+# scheduling_engine/core/symmetry.py
+
+"""
+Symmetry detection for the Phase 2 packing model.
+
+Rooms that agree on every attribute the packing constraints read (capacities,
+building, computers, overbooking) are interchangeable, as are invigilators with
+the same availability and staffing limits. Swapping two members of a class
+maps any packing onto another packing with the same objective, so the encoder
+may order the members of each class without losing optimal solutions.
+
+Rooms and invigilators named by a lock are never grouped: a lock pins a
+concrete ID, which a permutation would break.
+"""
+
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, List, Set
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from .problem_model import ExamSchedulingProblem, Invigilator, Room
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SymmetryClasses:
+    """Equivalence classes of interchangeable rooms and invigilators."""
+
+    rooms: List[List[UUID]] = field(default_factory=list)
+    invigilators: List[List[UUID]] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.rooms and not self.invigilators
+
+    def get_statistics(self) -> Dict[str, int]:
+        return {
+            "room_classes": len(self.rooms),
+            "symmetric_rooms": sum(len(c) for c in self.rooms),
+            "invigilator_classes": len(self.invigilators),
+            "symmetric_invigilators": sum(len(c) for c in self.invigilators),
+        }
+
+
+def _frozen(value: Any) -> str:
+    """A stable, hashable rendering of nested availability/department data."""
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def room_signature(room: "Room") -> Hashable:
+    """Every room attribute a Phase 2 constraint can observe."""
+    return (
+        room.exam_capacity,
+        room.capacity,
+        room.has_computers,
+        room.building_name,
+        room.building_faculty_id,
+        room.overbookable,
+        _frozen(room.departments),
+        tuple(sorted(room.adjacent_seat_pairs)),
+    )
+
+
+def invigilator_signature(invigilator: "Invigilator") -> Hashable:
+    """Availability, department preference and staffing limits."""
+    return (
+        invigilator.can_invigilate,
+        _frozen(invigilator.availability),
+        invigilator.department,
+        invigilator.department_id,
+        invigilator.max_concurrent_exams,
+        invigilator.max_students_per_exam,
+        invigilator.max_daily_sessions,
+        invigilator.max_consecutive_sessions,
+        invigilator.staff_type,
+    )
+
+
+def locked_resource_ids(locks: Iterable[Dict[str, Any]]) -> Set[UUID]:
+    """Rooms and invigilators pinned by any lock."""
+    pinned: Set[UUID] = set()
+    for lock in locks:
+        pinned.update(lock.get("room_ids") or ())
+        pinned.update(lock.get("invigilator_ids") or ())
+    return pinned
+
+
+def _group(
+    entities: Dict[UUID, Any],
+    signature: Callable[[Any], Hashable],
+    excluded: Set[UUID],
+) -> List[List[UUID]]:
+    classes: Dict[Hashable, List[UUID]] = defaultdict(list)
+    for entity_id, entity in entities.items():
+        if entity_id not in excluded:
+            classes[signature(entity)].append(entity_id)
+    # Sorted members give every caller the same order within a class.
+    return [sorted(ids, key=str) for ids in classes.values() if len(ids) > 1]
+
+
+def detect_symmetry(problem: "ExamSchedulingProblem") -> SymmetryClasses:
+    """Groups the problem's rooms and invigilators into interchangeable classes."""
+    pinned = locked_resource_ids(getattr(problem, "locks", None) or [])
+    symmetry = SymmetryClasses(
+        rooms=_group(problem.rooms, room_signature, pinned),
+        invigilators=_group(problem.invigilators, invigilator_signature, pinned),
+    )
+    logger.info(f"Symmetry detection: {symmetry.get_statistics()}")
+    return symmetry
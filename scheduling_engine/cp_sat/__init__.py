@@ -5,10 +5,28 @@ CP-SAT (Constraint Programming with SAT) module initialization.
 Implements the constraint programming phase of the scheduling engine.
 """
 
-from .model_builder import CPSATModelBuilder
-from .constraint_encoder import ConstraintEncoder
-from .solver_manager import CPSATSolverManager
-from .solution_extractor import SolutionExtractor
+import importlib
+from typing import Any
+
+# Resolved on first use so that importing a light submodule (for example the
+# portfolio racer in a freshly spawned process) does not pull in the whole
+# model-building stack.
+_LAZY_EXPORTS = {
+    "CPSATModelBuilder": ".model_builder",
+    "ConstraintEncoder": ".constraint_encoder",
+    "CPSATSolverManager": ".solver_manager",
+    "SolutionExtractor": ".solution_extractor",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "CPSATModelBuilder",
@@ -5,8 +5,8 @@ from typing import TYPE_CHECKING
 from datetime import date, timedelta
 from types import MappingProxyType
 from ortools.sat.python import cp_model
-from dataclasses import dataclass
-from typing import Dict, Set, Any, List, Optional, Union, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Set, Any, List, Optional, Union, Tuple, FrozenSet
 import logging
 import math
 import uuid
@@ -16,6 +16,9 @@ import time
 
 from scheduling_engine.data_flow_tracker import track_data_flow
 from scheduling_engine.genetic_algorithm import GAProcessor, GAInput, GAResult
+from scheduling_engine.core.symmetry import SymmetryClasses, detect_symmetry
+from scheduling_engine.core.lock_reduction import LockReduction
+from scheduling_engine.core.room_patterns import RoomPatternPool, locked_pattern
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +41,9 @@ class VariableCreationStats:
     # u_vars_created: int = 0
     unused_seats_vars_created: int = 0
     daily_exam_count_vars_created: int = 0
+    on_day_vars_created: int = 0
+    pattern_vars_created: int = 0
+    fixed_by_locks: int = 0
     creation_time: float = 0.0
 
 
@@ -54,6 +60,9 @@ class VariableFactory:
         self.model = model
         self.problem = problem
         self.variable_cache = {}
+        # (exam_id, n) -> the n-th variable pinned for that exam's lock.
+        self.locked_vars: Dict[Tuple[UUID, int], Any] = {}
+        self._locked_counts: Dict[UUID, int] = defaultdict(int)
         self.stats = VariableCreationStats()
         self.creation_start_time = time.time()
         logger.info("VariableFactory initialized.")
@@ -93,6 +102,14 @@ class VariableFactory:
 
     # --- END OF NEW LOGIC ---
 
+    def get_on_day_var(self, exam_id: UUID, day_key: str):
+        """Create the Boolean 'exam starts on this day' indicator."""
+        key = f"on_day_{exam_id}_{day_key}"
+        if key not in self.variable_cache:
+            self.variable_cache[key] = self.model.NewBoolVar(key)
+            self.stats.on_day_vars_created += 1
+        return self.variable_cache[key]
+
     def get_unused_seats_var(self, room_id: UUID, slot_id: UUID, room_capacity: int):
         """Create IntVar for unused seats in a room during a timeslot."""
         key = f"unused_seats_{room_id}_{slot_id}"
@@ -109,6 +126,26 @@ class VariableFactory:
             self.stats.daily_exam_count_vars_created += 1
         return self.variable_cache[key]
 
+    def get_pattern_var(self, exam_id: UUID, index: int):
+        """Create the Boolean 'exam uses its index-th room pattern'."""
+        key = f"pattern_{exam_id}_{index}"
+        if key not in self.variable_cache:
+            self.variable_cache[key] = self.model.NewBoolVar(key)
+            self.stats.pattern_vars_created += 1
+        return self.variable_cache[key]
+
+    def fix(self, var, exam_id: UUID, value: int = 1):
+        """
+        Pins a variable to a constant by collapsing its domain; no constraint.
+        The variable is remembered under the locked exam, so that diagnosis
+        can free it again and attribute it to the lock.
+        """
+        self.model.Proto().variables[var.Index()].domain[:] = [value, value]
+        self.locked_vars[(exam_id, self._locked_counts[exam_id])] = var
+        self._locked_counts[exam_id] += 1
+        self.stats.fixed_by_locks += 1
+        return var
+
     def get_creation_stats(self) -> VariableCreationStats:
         self.stats.creation_time = time.time() - self.creation_start_time
         return self.stats
@@ -122,6 +159,8 @@ class VariableFactory:
             + stats.w_vars_created
             + stats.unused_seats_vars_created
             + stats.daily_exam_count_vars_created
+            + stats.on_day_vars_created
+            + stats.pattern_vars_created
         )
         logger.info("=== FINAL VARIABLE CREATION STATISTICS ===")
         logger.info(f"Created {total_vars} variables in {stats.creation_time:.2f}s.")
@@ -129,6 +168,9 @@ class VariableFactory:
         logger.info(f"  Y (Room Assign): {stats.y_vars_created}")
         logger.info(f"  Z (Occupancy): {stats.z_vars_created}")
         logger.info(f"  W (Invig-in-Room): {stats.w_vars_created}")
+        logger.info(f"  On-day indicators: {stats.on_day_vars_created}")
+        logger.info(f"  Room patterns: {stats.pattern_vars_created}")
+        logger.info(f"  Fixed by locks: {stats.fixed_by_locks}")
         logger.info(
             f"  Auxiliary: {stats.unused_seats_vars_created + stats.daily_exam_count_vars_created}"
         )
@@ -149,6 +191,15 @@ class SharedVariables:
     daily_exam_count_vars: MappingProxyType
     variable_creation_stats: VariableCreationStats
     precomputed_data: Dict[str, Any]
+    # (exam_id, day_key) -> Bool, true iff the exam starts on that day. Keyed
+    # like precomputed_data["day_slot_groupings"]; Phase 1 only.
+    on_day_vars: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    # (exam_id, index) -> Bool, true iff the exam uses that room pattern, i.e.
+    # precomputed_data["room_patterns"][exam_id][index]; pattern Phase 2 only.
+    pattern_vars: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    # (exam_id, n) -> Bool pinned to 1 by that exam's HITL lock; see
+    # VariableFactory.fix.
+    locked_vars: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
 
 
 class ConstraintEncoder:
@@ -156,14 +207,34 @@ class ConstraintEncoder:
     MODIFIED ConstraintEncoder for two-phase decomposition with heuristics.
     """
 
-    def __init__(self, problem, model, use_ga_filter: bool = True):
+    def __init__(
+        self,
+        problem,
+        model,
+        use_ga_filter: bool = True,
+        break_symmetry: bool = True,
+        candidate_starts: Optional[Set[Tuple[UUID, UUID]]] = None,
+        lock_reduction: Optional[LockReduction] = None,
+        room_patterns: Optional[RoomPatternPool] = None,
+        ga_time_limit: Optional[float] = None,
+    ):
         self.problem = problem
         self.model = model
         self.factory: Optional[VariableFactory] = None
         self.use_ga_filter = use_ga_filter
+        self.break_symmetry = break_symmetry
         self.encoding_stats = defaultdict(float)
         self.ga_result: Optional[GAResult] = None
         self.promising_x_vars: Optional[Set] = None
+        # Fixed start candidates (e.g. from an already filtered full model)
+        # replace the GA pre-filter.
+        self.candidate_starts = candidate_starts
+        self.lock_reduction = lock_reduction or LockReduction()
+        # Phase 2 chooses one room pattern per exam instead of free Y variables.
+        self.room_patterns = room_patterns
+        self.pattern_choices: Dict[UUID, List] = {}
+        # Wall-clock cap on the GA pre-filter, set from the job time budget.
+        self.ga_time_limit = ga_time_limit
 
     @track_data_flow("encode_phase1", include_stats=True)
     def encode_phase1(self) -> SharedVariables:
@@ -172,7 +243,14 @@ class ConstraintEncoder:
         logger.info("Starting Phase 1 constraint encoding (Timetabling)...")
         self.initialize_factory()
 
-        if self.use_ga_filter:
+        use_filter = self.use_ga_filter
+        if self.candidate_starts is not None:
+            logger.info(
+                f"Using {len(self.candidate_starts)} given start candidates; skipping GA."
+            )
+            self.promising_x_vars = set(self.candidate_starts)
+            use_filter = True
+        elif self.use_ga_filter:
             logger.info("Genetic Algorithm pre-filter is enabled. Running GA...")
             self.ga_result = self._run_ga_pre_filter()
             if self.ga_result:
@@ -185,12 +263,18 @@ class ConstraintEncoder:
                     "GA pre-filter failed to produce results. Proceeding without filtering."
                 )
 
-        variables = self._create_phase1_variables(use_filter=self.use_ga_filter)
-        if self.factory:
-            self.factory.log_statistics()
+        variables = self._create_phase1_variables(use_filter=use_filter)
 
         logger.info("Pre-computing day and slot groupings for constraint efficiency.")
-        precomputed_data = {"day_slot_groupings": self.build_day_slot_groupings()}
+        precomputed_data = {
+            "day_slot_groupings": self.build_day_slot_groupings(),
+            "lock_reduction": self.lock_reduction,
+        }
+        on_day_vars = self._create_on_day_variables(
+            variables["x"], precomputed_data["day_slot_groupings"]
+        )
+        if self.factory:
+            self.factory.log_statistics()
 
         if not self.factory:
             raise RuntimeError("VariableFactory not initialized post-encoding.")
@@ -204,6 +288,8 @@ class ConstraintEncoder:
             daily_exam_count_vars=MappingProxyType({}),
             variable_creation_stats=self.factory.get_creation_stats(),
             precomputed_data=precomputed_data,
+            on_day_vars=MappingProxyType(on_day_vars),
+            locked_vars=MappingProxyType(self.factory.locked_vars),
         )
         self.encoding_stats["phase1_total_time"] = time.time() - encoding_start_time
         logger.info(
@@ -229,7 +315,21 @@ class ConstraintEncoder:
         precomputed_data = {
             "day_slot_groupings": self.build_day_slot_groupings(),
             "phase1_results": phase1_results,  # Pass results for continuity constraints
+            "lock_reduction": self.lock_reduction,
+            **self.build_room_slot_indexes(variables),
         }
+        if self.room_patterns is not None:
+            precomputed_data["room_patterns"] = self.pattern_choices
+            precomputed_data["seat_terms_by_room_slot"] = self.build_seat_terms(
+                variables, phase1_results
+            )
+        if self.break_symmetry:
+            symmetry = detect_symmetry(self.problem)
+            if self.room_patterns is not None:
+                # Pools are per exam, so swapping two rooms can leave them.
+                symmetry = SymmetryClasses(invigilators=symmetry.invigilators)
+            precomputed_data["symmetry_classes"] = symmetry
+            self._add_symmetry_breaking(variables, symmetry)
 
         shared_vars = SharedVariables(
             x_vars=MappingProxyType({}),
@@ -240,6 +340,8 @@ class ConstraintEncoder:
             daily_exam_count_vars=MappingProxyType({}),
             variable_creation_stats=self.factory.get_creation_stats(),
             precomputed_data=precomputed_data,
+            pattern_vars=MappingProxyType(variables["patterns"]),
+            locked_vars=MappingProxyType(self.factory.locked_vars),
         )
         self.encoding_stats["phase2_full_time"] = time.time() - encoding_start_time
         logger.info(
@@ -271,6 +373,15 @@ class ConstraintEncoder:
                         exam_id, occ_slot_id
                     )
 
+        # Locked exams keep a single start, pinned to 1 along with its occupancy.
+        for exam_id, start_slot_id in self.lock_reduction.fixed_starts.items():
+            if (exam_id, start_slot_id) in variables["x"]:
+                self.factory.fix(variables["x"][(exam_id, start_slot_id)], exam_id)
+                for occ_slot_id in self.problem.get_occupancy_slots(
+                    exam_id, start_slot_id
+                ):
+                    self.factory.fix(variables["z"][(exam_id, occ_slot_id)], exam_id)
+
         logger.info(
             f"Initial creation: {len(variables['x'])} X-vars, {len(variables['z'])} Z-vars."
         )
@@ -291,6 +402,8 @@ class ConstraintEncoder:
 
             for slot_id in all_possible_slots:
                 for exam_id in exam_ids:
+                    if self.lock_reduction.is_locked(exam_id):
+                        continue  # occupies exactly its locked slots
                     if (exam_id, slot_id) not in variables["z"]:
                         variables["z"][(exam_id, slot_id)] = self.factory.get_z_var(
                             exam_id, slot_id
@@ -305,6 +418,43 @@ class ConstraintEncoder:
             logger.info("Safety net did not need to add any new Z-variables.")
         return variables
 
+    def _create_on_day_variables(
+        self, x_vars: Dict, day_slot_groupings: Dict[str, List[UUID]]
+    ) -> Dict[Tuple[UUID, str], Any]:
+        """
+        Defines one on_day[exam, day] indicator as the sum of the exam's starts
+        on that day, so day-level constraints share a single expression instead
+        of re-expanding the start sums for every student or day.
+        """
+        if not self.factory:
+            raise RuntimeError("Factory not initialized")
+
+        day_of_slot = {
+            slot_id: day_key
+            for day_key, slot_ids in day_slot_groupings.items()
+            for slot_id in slot_ids
+        }
+        starts_by_exam_day = defaultdict(list)
+        for (exam_id, slot_id), x_var in x_vars.items():
+            day_key = day_of_slot.get(slot_id)
+            if day_key is not None:
+                starts_by_exam_day[(exam_id, day_key)].append(x_var)
+
+        on_day_vars = {}
+        for (exam_id, day_key), starts in starts_by_exam_day.items():
+            if len(starts) == 1:
+                # A single candidate start already is the day indicator.
+                on_day_vars[(exam_id, day_key)] = starts[0]
+                continue
+            on_day = self.factory.get_on_day_var(exam_id, day_key)
+            self.model.Add(on_day == sum(starts))
+            on_day_vars[(exam_id, day_key)] = on_day
+
+        logger.info(
+            f"Created {len(on_day_vars)} exam-day indicators for day-level constraints."
+        )
+        return on_day_vars
+
     def _create_full_phase2_variables(self, phase1_results: Dict) -> Dict[str, Dict]:
         """
         FIXED: Creates Y and W variables for an entire exam group based on a shared start time.
@@ -313,7 +463,12 @@ class ConstraintEncoder:
         if not self.factory:
             raise RuntimeError("Factory not initialized")
 
-        variables: Dict[str, Dict] = {"y": {}, "w": {}, "unused_seats": {}}
+        variables: Dict[str, Dict] = {
+            "y": {},
+            "w": {},
+            "unused_seats": {},
+            "patterns": {},
+        }
         logger.info(
             "Creating variables for a start-time group based on Phase 1 results..."
         )
@@ -334,13 +489,32 @@ class ConstraintEncoder:
         )
 
         # Create Y-variables for each exam in the group for each of its occupied slots
-        for exam in exams_in_group:
-            start_slot_id = phase1_results[exam.id][0]
-            occupied_slots = self.problem.get_occupancy_slots(exam.id, start_slot_id)
-            for slot_id in occupied_slots:
-                for room_id in self.problem.rooms:
-                    y_key = (exam.id, room_id, slot_id)
-                    variables["y"][y_key] = self.factory.get_y_var(*y_key)
+        reduction = self.lock_reduction
+        if self.room_patterns is not None:
+            self.pattern_choices = self._create_pattern_variables(
+                variables, exams_in_group, phase1_results
+            )
+        else:
+            for exam in exams_in_group:
+                start_slot_id = phase1_results[exam.id][0]
+                occupied_slots = self.problem.get_occupancy_slots(
+                    exam.id, start_slot_id
+                )
+                locked_rooms = (
+                    reduction.fixed_rooms.get(exam.id)
+                    if reduction.fixed_starts.get(exam.id) == start_slot_id
+                    else None
+                )
+                for slot_id in occupied_slots:
+                    for room_id in locked_rooms or self.problem.rooms:
+                        if not locked_rooms and self._room_taken_by_locks(
+                            room_id, slot_id
+                        ):
+                            continue
+                        y_key = (exam.id, room_id, slot_id)
+                        variables["y"][y_key] = self.factory.get_y_var(*y_key)
+                        if locked_rooms:
+                            self.factory.fix(variables["y"][y_key], exam.id)
 
         # Create W-variables and auxiliary variables for every occupied slot in the group
         for slot_id in all_occupied_slots:
@@ -356,15 +530,158 @@ class ConstraintEncoder:
                     if self.problem.is_invigilator_available(inv_id, slot_id):
                         w_key = (inv_id, room_id, slot_id)
                         variables["w"][w_key] = self.factory.get_w_var(*w_key)
+
+        # Locked invigilators are posted to their exam's room when it has just one.
+        for exam in exams_in_group:
+            rooms = reduction.fixed_rooms.get(exam.id) or []
+            if len(rooms) != 1 or (
+                reduction.fixed_starts.get(exam.id) != phase1_results[exam.id][0]
+            ):
+                continue
+            for inv_id in reduction.fixed_invigilators.get(exam.id, []):
+                for slot_id in self.problem.get_occupancy_slots(
+                    exam.id, phase1_results[exam.id][0]
+                ):
+                    w_var = variables["w"].get((inv_id, rooms[0], slot_id))
+                    if w_var is not None:
+                        self.factory.fix(w_var, exam.id)
         return variables
 
+    def _create_pattern_variables(
+        self, variables: Dict[str, Dict], exams_in_group: List, phase1_results: Dict
+    ) -> Dict[UUID, List]:
+        """
+        One Boolean per room pattern offered to each exam, and Y variables only
+        for the rooms those patterns use. A room lock leaves a single, fixed
+        pattern; rooms filled by locked exams are not offered to the others.
+        """
+        assert self.factory and self.room_patterns is not None
+        reduction = self.lock_reduction
+        locked: Dict[UUID, List[UUID]] = {}
+        excluded: Dict[UUID, FrozenSet[UUID]] = {}
+        for exam in exams_in_group:
+            start_slot_id = phase1_results[exam.id][0]
+            if reduction.fixed_starts.get(exam.id) == start_slot_id and (
+                rooms := reduction.fixed_rooms.get(exam.id)
+            ):
+                locked[exam.id] = rooms
+                continue
+            occupied_slots = self.problem.get_occupancy_slots(exam.id, start_slot_id)
+            excluded[exam.id] = frozenset(
+                room_id
+                for room_id in self.problem.rooms
+                for slot_id in occupied_slots
+                if self._room_taken_by_locks(room_id, slot_id)
+            )
+        first_fit = self.room_patterns.first_fit(excluded)
+
+        choices: Dict[UUID, List] = {}
+        for exam in exams_in_group:
+            occupied_slots = self.problem.get_occupancy_slots(
+                exam.id, phase1_results[exam.id][0]
+            )
+            locked_rooms = locked.get(exam.id)
+            if locked_rooms:
+                patterns = [locked_pattern(self.problem, exam.id, locked_rooms)]
+            else:
+                patterns = self.room_patterns.patterns_for(exam.id, excluded[exam.id])
+                seed = first_fit.get(exam.id)
+                if seed is not None and seed not in patterns:
+                    patterns = [*patterns, seed]
+            if not patterns:
+                logger.warning(
+                    f"No room pattern seats exam {exam.id} "
+                    f"({exam.expected_students} students)."
+                )
+            choices[exam.id] = patterns
+            for index, pattern in enumerate(patterns):
+                pattern_var = self.factory.get_pattern_var(exam.id, index)
+                variables["patterns"][(exam.id, index)] = pattern_var
+                if locked_rooms:
+                    self.factory.fix(pattern_var, exam.id)
+                for room_id in pattern.rooms:
+                    for slot_id in occupied_slots:
+                        y_key = (exam.id, room_id, slot_id)
+                        variables["y"][y_key] = self.factory.get_y_var(*y_key)
+        return choices
+
+    def build_seat_terms(
+        self, variables: Dict[str, Dict], phase1_results: Dict
+    ) -> Dict[Tuple[UUID, UUID], List[Tuple[Any, int]]]:
+        """(room, slot) -> (pattern var, seats it takes there) for every pattern."""
+        terms: Dict[Tuple[UUID, UUID], List[Tuple[Any, int]]] = defaultdict(list)
+        for (exam_id, index), pattern_var in variables["patterns"].items():
+            pattern = self.pattern_choices[exam_id][index]
+            occupied_slots = self.problem.get_occupancy_slots(
+                exam_id, phase1_results[exam_id][0]
+            )
+            for room_id, seats in zip(pattern.rooms, pattern.seats):
+                for slot_id in occupied_slots:
+                    terms[(room_id, slot_id)].append((pattern_var, seats))
+        return dict(terms)
+
+    def _room_taken_by_locks(self, room_id: UUID, slot_id: UUID) -> bool:
+        """True if exams locked into the room already fill every seat."""
+        used = self.lock_reduction.room_seats_used.get((room_id, slot_id), 0)
+        room = self.problem.rooms[room_id]
+        return used > 0 and used >= room.exam_capacity and not room.overbookable
+
+    def _add_symmetry_breaking(
+        self, variables: Dict[str, Dict], symmetry: SymmetryClasses
+    ) -> int:
+        """
+        Orders the members of each interchangeable room and invigilator class.
+
+        Rooms in a class are ordered by non-increasing weighted occupancy and
+        invigilators by non-increasing number of posts. Any packing can be
+        permuted within the classes to satisfy both orderings without changing
+        its objective, so only equivalent permutations are cut off.
+        """
+        occupancy_by_room: Dict[UUID, List] = defaultdict(list)
+        footprint_by_room: Dict[UUID, Set] = defaultdict(set)
+        for (exam_id, room_id, slot_id), y_var in variables["y"].items():
+            exam = self.problem.exams[exam_id]
+            # +1 so that empty rooms sort last even for zero-student exams.
+            occupancy_by_room[room_id].append((exam.expected_students + 1) * y_var)
+            footprint_by_room[room_id].add((exam_id, slot_id))
+
+        posts_by_invigilator: Dict[UUID, List] = defaultdict(list)
+        footprint_by_invigilator: Dict[UUID, Set] = defaultdict(set)
+        for (inv_id, room_id, slot_id), w_var in variables["w"].items():
+            posts_by_invigilator[inv_id].append(w_var)
+            footprint_by_invigilator[inv_id].add((room_id, slot_id))
+            footprint_by_room[room_id].add((inv_id, slot_id))
+
+        constraints_added = 0
+        for members, terms, footprints in (
+            (symmetry.rooms, occupancy_by_room, footprint_by_room),
+            (symmetry.invigilators, posts_by_invigilator, footprint_by_invigilator),
+        ):
+            for problem_class in members:
+                # Members are only swappable if they carry the same variables.
+                by_footprint = defaultdict(list)
+                for entity_id in problem_class:
+                    if terms.get(entity_id):
+                        by_footprint[frozenset(footprints[entity_id])].append(entity_id)
+                for ordered in by_footprint.values():
+                    for first, second in zip(ordered, ordered[1:]):
+                        self.model.Add(sum(terms[first]) >= sum(terms[second]))
+                        constraints_added += 1
+
+        self.encoding_stats["symmetry_breaking_constraints"] = constraints_added
+        logger.info(
+            f"Added {constraints_added} symmetry-breaking constraints "
+            f"({symmetry.get_statistics()})."
+        )
+        return constraints_added
+
     def _get_candidate_starts(self, use_filter: bool) -> Set[Tuple[UUID, UUID]]:
         """Determines the set of (exam, slot) start variables to create."""
         if use_filter and self.promising_x_vars:
             logger.info(
                 f"GA FILTER ENABLED: Planning variables based on {len(self.promising_x_vars)} promising starts."
             )
-            return self.promising_x_vars
+            return self._reduce_by_locks(self.promising_x_vars)
         else:
             all_starts = {
                 (eid, sid)
@@ -375,7 +692,31 @@ class ConstraintEncoder:
             logger.info(
                 f"GA FILTER DISABLED: Planning for all {len(all_starts)} feasible starts."
             )
-            return all_starts
+            return self._reduce_by_locks(all_starts)
+
+    def _reduce_by_locks(
+        self, starts: Set[Tuple[UUID, UUID]]
+    ) -> Set[Tuple[UUID, UUID]]:
+        """
+        Locked exams keep only their locked start; free exams lose the starts
+        that clash with a locked exam, unless that would leave them none (the
+        solver then reports the infeasibility, naming the locks).
+        """
+        reduction = self.lock_reduction
+        if reduction.is_empty:
+            return starts
+        by_exam: Dict[UUID, Set[Tuple[UUID, UUID]]] = defaultdict(set)
+        for key in starts:
+            if not reduction.is_locked(key[0]):
+                by_exam[key[0]].add(key)
+        reduced = set(reduction.fixed_starts.items())
+        for keys in by_exam.values():
+            kept = keys - reduction.blocked_starts
+            reduced |= kept or keys
+        logger.info(
+            f"Lock reduction kept {len(reduced)} of {len(starts)} candidate starts."
+        )
+        return reduced
 
     def _run_ga_pre_filter(self) -> Optional[GAResult]:
         try:
@@ -411,6 +752,7 @@ class ConstraintEncoder:
                     "mut_indpb": 0.05,
                     "tournsize": 3,
                     "top_n_pct": 0.2,
+                    "time_limit_seconds": self.ga_time_limit,
                     "max_exams_per_day": self.problem.max_exams_per_day,
                     "slot_duration_minutes": self.problem.base_slot_duration_minutes,
                     "slot_to_day_map": {
@@ -446,6 +788,18 @@ class ConstraintEncoder:
             problem=self.problem,
         )
 
+    def build_room_slot_indexes(
+        self, variables: Dict[str, Dict]
+    ) -> Dict[str, Dict[Tuple[UUID, UUID], List[Tuple]]]:
+        """Groups Y and W variable keys by (room, slot) for sparse constraints."""
+        indexes: Dict[str, Dict[Tuple[UUID, UUID], List[Tuple]]] = {}
+        for name in ("y", "w"):
+            index = defaultdict(list)
+            for key in variables[name]:
+                index[(key[1], key[2])].append(key)
+            indexes[f"{name}_keys_by_room_slot"] = dict(index)
+        return indexes
+
     def build_day_slot_groupings(self) -> Dict[str, List[UUID]]:
         logger.info("Building day-to-slot-ID groupings...")
         day_slot_groupings = {}
@@ -0,0 +1,244 @@
+# scheduling_engine/cp_sat/decomposed_phase1.py
+
+"""
+Decomposed Phase 1: timetable weakly coupled exam groups in parallel.
+
+Each part of an ExamPartition gets its own Phase 1 model over a view of the
+problem holding only its exams and its share of the per-slot capacity. The
+part models are solved concurrently in threads (CP-SAT releases the GIL) with
+the cores split between them. Their starts are then merged into the full
+Phase 1 model: exams whose part failed, that sit in a slot the merged shares
+over-commit, or that share a day with a cut coupling are freed, every other
+exam is fixed, and a short coordinating repair solve finishes the timetable.
+If the repair cannot complete the fixed merge, the full model is solved with
+the merge as a hint instead.
+"""
+
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from ortools.sat import sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+from scheduling_engine.core.decomposition import (
+    ExamPartition,
+    capacity_shares,
+    problem_view,
+)
+from scheduling_engine.cp_sat.model_builder import CPSATModelBuilder
+
+logger = logging.getLogger(__name__)
+
+SOLVED = (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+@dataclass
+class PartOutcome:
+    index: int
+    exams: int
+    status: int
+    wall_time: float
+    starts: Dict[UUID, UUID] = field(default_factory=dict)
+
+
+@dataclass
+class DecomposedResult:
+    """Outcome of a decomposed solve; `solver` holds values for the full model."""
+
+    status: int
+    solver: Any
+    parts: List[PartOutcome]
+    freed_exams: int
+    mode: str
+    wall_time: float
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "status": cp_model.CpSolver().StatusName(self.status),
+            "mode": self.mode,
+            "parts": [
+                {
+                    "exams": p.exams,
+                    "status": cp_model.CpSolver().StatusName(p.status),
+                    "wall_time": round(p.wall_time, 3),
+                }
+                for p in self.parts
+            ],
+            "freed_exams": self.freed_exams,
+            "wall_time": round(self.wall_time, 3),
+        }
+
+
+def _solve(
+    model, parameters, time_limit: float, num_workers: int
+) -> Tuple[cp_model.CpSolver, int]:
+    solver = cp_model.CpSolver()
+    solver.parameters.CopyFrom(parameters)
+    solver.parameters.max_time_in_seconds = max(0.1, time_limit)
+    solver.parameters.num_workers = num_workers
+    solver.parameters.log_search_progress = False
+    return solver, int(solver.Solve(model))
+
+
+def _freed_exams(
+    problem,
+    partition: ExamPartition,
+    starts: Dict[UUID, UUID],
+) -> Set[UUID]:
+    """Exams the merged part solutions cannot simply keep."""
+    freed = {exam_id for exam_id in problem.exams if exam_id not in starts}
+
+    total_rooms = len(problem.rooms)
+    total_seats = sum(room.exam_capacity for room in problem.rooms.values())
+    by_slot: Dict[UUID, List[UUID]] = defaultdict(list)
+    for exam_id, start_slot_id in starts.items():
+        for slot_id in problem.get_occupancy_slots(exam_id, start_slot_id):
+            by_slot[slot_id].append(exam_id)
+    for exam_ids in by_slot.values():
+        seats = sum(problem.exams[e].expected_students for e in exam_ids)
+        if len(exam_ids) > total_rooms or seats > total_seats:
+            freed.update(exam_ids)
+
+    day_of = {
+        slot.id: day_id
+        for day_id, day in problem.days.items()
+        for slot in day.timeslots
+    }
+    for first, second in partition.cut_edges:
+        if first in starts and second in starts:
+            if day_of.get(starts[first]) == day_of.get(starts[second]):
+                freed.update((first, second))
+    return freed
+
+
+async def solve_phase1_decomposed(
+    problem,
+    model: cp_model.CpModel,
+    shared_vars,
+    partition: ExamPartition,
+    parameters: sat_parameters_pb2.SatParameters,
+    time_limit: float,
+    num_workers: int = 0,
+    hints: Optional[Dict[UUID, UUID]] = None,
+    repair_time_limit: float = 30.0,
+) -> DecomposedResult:
+    """Solves `model` (the full Phase 1 model) part by part, then repairs it."""
+    started = time.monotonic()
+
+    def time_left() -> float:
+        return max(0.0, time_limit - (time.monotonic() - started))
+
+    candidates: Set[Tuple[UUID, UUID]] = set(shared_vars.x_vars)
+    shares = capacity_shares(problem, partition.parts)
+
+    part_models = []
+    for part, limits in zip(partition.parts, shares):
+        members = set(part)
+        builder = CPSATModelBuilder(problem=problem_view(problem, part, limits))
+        part_model, part_vars = await builder.build_phase1(
+            candidate_starts={key for key in candidates if key[0] in members}
+        )
+        for exam_id, slot_id in (hints or {}).items():
+            if (hint_var := part_vars.x_vars.get((exam_id, slot_id))) is not None:
+                part_model.AddHint(hint_var, 1)
+        part_models.append((part_model, part_vars))
+
+    repair_budget = min(repair_time_limit, time_limit / 4)
+    part_budget = min(time_left(), max(1.0, time_left() - repair_budget))
+    workers = max(1, (num_workers or os.cpu_count() or 1) // len(part_models))
+    logger.info(
+        f"Solving {len(part_models)} Phase 1 parts in parallel "
+        f"({workers} workers each, {part_budget:.1f}s)..."
+    )
+    with ThreadPoolExecutor(max_workers=len(part_models)) as pool:
+        solved = list(
+            pool.map(
+                lambda m: _solve(m[0], parameters, part_budget, workers), part_models
+            )
+        )
+
+    outcomes: List[PartOutcome] = []
+    starts: Dict[UUID, UUID] = {}
+    for index, ((_, part_vars), (solver, status)) in enumerate(
+        zip(part_models, solved)
+    ):
+        outcome = PartOutcome(
+            index=index,
+            exams=len(partition.parts[index]),
+            status=status,
+            wall_time=solver.WallTime(),
+        )
+        if outcome.status in SOLVED:
+            outcome.starts = {
+                exam_id: slot_id
+                for (exam_id, slot_id), var in part_vars.x_vars.items()
+                if solver.BooleanValue(var)
+            }
+            starts.update(outcome.starts)
+        logger.info(
+            f"Phase 1 part {index}: {outcome.exams} exams, {solver.StatusName()} "
+            f"in {outcome.wall_time:.2f}s"
+        )
+        outcomes.append(outcome)
+
+    freed = _freed_exams(problem, partition, starts)
+    repair = model.Clone()
+    repair.ClearHints()
+    for exam_id, slot_id in starts.items():
+        var = repair.GetBoolVarFromProtoIndex(
+            shared_vars.x_vars[(exam_id, slot_id)].Index()
+        )
+        if exam_id in freed:
+            repair.AddHint(var, 1)
+        else:
+            repair.Add(var == 1)
+    # Hold the repair budget back for the fallback when there is time for both.
+    left = time_left()
+    can_fall_back = len(freed) < len(problem.exams)
+    remaining = (
+        left - repair_budget if can_fall_back and left >= 2 * repair_budget else left
+    )
+    logger.info(
+        f"Repairing the merged timetable: {len(freed)} of {len(problem.exams)} "
+        f"exams free, {remaining:.1f}s."
+    )
+    solver, status = _solve(repair, parameters, remaining, num_workers)
+    mode = "repair"
+
+    if status not in SOLVED and can_fall_back:
+        logger.warning(
+            f"Repair of the merged timetable ended {solver.StatusName()}; "
+            "solving the full model from the merge instead."
+        )
+        fallback = model.Clone()
+        fallback.ClearHints()
+        for exam_id, slot_id in starts.items():
+            fallback.AddHint(
+                fallback.GetBoolVarFromProtoIndex(
+                    shared_vars.x_vars[(exam_id, slot_id)].Index()
+                ),
+                1,
+            )
+        remaining = time_left()
+        solver, status = _solve(fallback, parameters, remaining, num_workers)
+        mode = "full"
+    elif status == cp_model.OPTIMAL and can_fall_back:
+        # Optimal only relative to the exams fixed from the parts.
+        status = cp_model.FEASIBLE
+
+    result = DecomposedResult(
+        status=status,
+        solver=solver,
+        parts=outcomes,
+        freed_exams=len(freed),
+        mode=mode,
+        wall_time=time.monotonic() - started,
+    )
+    logger.info(f"Decomposed Phase 1 finished: {result.get_statistics()}")
+    return result
@@ -15,6 +15,19 @@ from scheduling_engine.data_flow_tracker import track_data_flow
 from scheduling_engine.cp_sat.constraint_encoder import ConstraintEncoder
 from scheduling_engine.constraints.constraint_manager import CPSATConstraintManager
 from scheduling_engine.core.constraint_types import ConstraintType
+from scheduling_engine.core.lock_reduction import reduce_locks
+from scheduling_engine.core.room_patterns import RoomPatternPool
+from scheduling_engine.cp_sat.model_cache import (
+    CachedModel,
+    ObjectiveComponent,
+    get_cached_model,
+    reweighted_model,
+    set_objective,
+    slot_aliases,
+    soft_weights,
+    store_model,
+    structure_key,
+)
 
 # --- START OF MODIFICATION ---
 from backend.app.utils.celery_task_utils import task_progress_tracker
@@ -38,7 +51,17 @@ class CPSATModelBuilder:
         self.model = cp_model.CpModel()
         self.shared_variables: Optional["SharedVariables"] = None
         self.encoder: Optional[ConstraintEncoder] = None
+        self.constraint_manager: Optional[CPSATConstraintManager] = None
         self.build_duration = 0.0
+        # Soft constraint id -> its penalty terms, as placed in the objective.
+        self.objective_components: Dict[str, ObjectiveComponent] = {}
+        # Structure key of a cacheable Phase 1 build, and whether it was reused.
+        self.cache_key: Optional[str] = None
+        self.cache_aliases: Dict[str, str] = {}
+        self.reused_cached_model = False
+        self.cache_dir: Optional[str] = getattr(problem, "model_cache_dir", None)
+        # Wall-clock cap on the Phase 1 GA pre-filter (from the job time budget).
+        self.ga_time_limit: Optional[float] = None
         # --- START OF MODIFICATION ---
         self.task_context: Optional[Any] = None
         # --- END OF MODIFICATION ---
@@ -51,19 +74,44 @@ class CPSATModelBuilder:
         phase="building_phase_1_model",
         message="Building timetabling model...",
     )
-    async def build_phase1(self) -> Tuple[cp_model.CpModel, "SharedVariables"]:
-        """Builds the Phase 1 (Timetabling) model."""
+    async def build_phase1(
+        self, candidate_starts: Optional[set] = None
+    ) -> Tuple[cp_model.CpModel, "SharedVariables"]:
+        """
+        Builds the Phase 1 (Timetabling) model. `candidate_starts` restricts the
+        start variables to the given (exam, slot) pairs instead of running the GA.
+
+        With `model_cache_size` set, a build whose structure matches a cached
+        one reuses it with only the objective reweighted (see model_cache.py).
+        """
         build_start_time = time.time()
         try:
             logger.info("========================================")
             logger.info("===   STARTING PHASE 1 MODEL BUILD   ===")
             logger.info("========================================")
             self._validate_problem_data()
+            cache_size = int(getattr(self.problem, "model_cache_size", 0) or 0)
+            if cache_size > 0 and candidate_starts is None:
+                self.cache_key = structure_key(self.problem, "phase1")
+                self.cache_aliases = slot_aliases(self.problem)
+                if self._reuse_cached_model():
+                    self.build_duration = time.time() - build_start_time
+                    logger.info(
+                        f"Phase 1 model reused from cache after {self.build_duration:.2f}s"
+                    )
+                    return self.model, self.shared_variables  # type: ignore
+
             self.model = cp_model.CpModel()  # Reset model
             logger.info("Model object reset.")
 
             logger.info("Step 1: Encoding variables for Phase 1...")
-            self.encoder = ConstraintEncoder(problem=self.problem, model=self.model)
+            self.encoder = ConstraintEncoder(
+                problem=self.problem,
+                model=self.model,
+                candidate_starts=candidate_starts,
+                lock_reduction=reduce_locks(self.problem),
+                ga_time_limit=self.ga_time_limit,
+            )
             self.shared_variables = self.encoder.encode_phase1()
             logger.info("Variable encoding for Phase 1 complete.")
 
@@ -99,6 +147,7 @@ class CPSATModelBuilder:
 
             logger.info("Step 2: Building constraints for Phase 1...")
             constraint_manager = CPSATConstraintManager(problem=self.problem)
+            self.constraint_manager = constraint_manager
             # --- START OF FIX ---
             await constraint_manager.build_phase1_model(
                 self.model, self.shared_variables
@@ -109,6 +158,20 @@ class CPSATModelBuilder:
             logger.info("Step 3: Adding objective function...")
             self._add_objective_function(constraint_manager)
 
+            if self.cache_key:
+                store_model(
+                    self.cache_key,
+                    CachedModel(
+                        model=self.model.Clone(),
+                        shared_vars=self.shared_variables,
+                        components=self.objective_components,
+                        constraint_manager=constraint_manager,
+                        aliases=self.cache_aliases,
+                    ),
+                    cache_size,
+                    self.cache_dir,
+                )
+
             self.build_duration = time.time() - build_start_time
             logger.info(f"Phase 1 model build SUCCESS after {self.build_duration:.2f}s")
             return self.model, self.shared_variables
@@ -125,9 +188,12 @@ class CPSATModelBuilder:
         message="Building room and invigilator model...",
     )
     async def build_phase2_full_model(
-        self, phase1_results: Dict
+        self, phase1_results: Dict, room_patterns: Optional[RoomPatternPool] = None
     ) -> Tuple[cp_model.CpModel, "SharedVariables"]:
-        """Builds the full Phase 2 (Packing) model based on Phase 1 results."""
+        """
+        Builds the full Phase 2 (Packing) model based on Phase 1 results. With
+        `room_patterns`, each exam picks one of its room patterns instead.
+        """
         build_start_time = time.time()
         try:
             logger.info("========================================")
@@ -137,12 +203,18 @@ class CPSATModelBuilder:
             logger.info("Model object reset.")
 
             logger.info("Step 1: Encoding variables for Phase 2...")
-            self.encoder = ConstraintEncoder(problem=self.problem, model=self.model)
+            self.encoder = ConstraintEncoder(
+                problem=self.problem,
+                model=self.model,
+                lock_reduction=reduce_locks(self.problem, include_starts=False),
+                room_patterns=room_patterns,
+            )
             self.shared_variables = self.encoder.encode_phase2_full(phase1_results)
             logger.info("Variable encoding for Phase 2 complete.")
 
             logger.info("Step 2: Building constraints for Phase 2...")
             constraint_manager = CPSATConstraintManager(problem=self.problem)
+            self.constraint_manager = constraint_manager
             # --- START OF FIX ---
             await constraint_manager.build_phase2_model(
                 self.model, self.shared_variables
@@ -163,18 +235,46 @@ class CPSATModelBuilder:
             logger.critical(f"Full Phase 2 model building FAILED: {e}", exc_info=True)
             raise RuntimeError(f"Full Phase 2 model building failed: {e}") from e
 
+    def _reuse_cached_model(self) -> bool:
+        """Adopts the cached build for `self.cache_key`, reweighted, if any."""
+        cached = (
+            get_cached_model(self.cache_key, self.cache_dir, self.cache_aliases)
+            if self.cache_key
+            else None
+        )
+        if cached is None:
+            return False
+        self.model, hints = reweighted_model(cached, soft_weights(self.problem))
+        self.shared_variables = cached.shared_vars
+        self.objective_components = cached.components
+        self.constraint_manager = cached.constraint_manager
+        self.reused_cached_model = True
+        logger.info(
+            f"Reusing cached Phase 1 model {self.cache_key[:12]} "
+            f"with {hints} hints from its last solution."
+        )
+        return True
+
     def _add_objective_function(self, constraint_manager: CPSATConstraintManager):
-        """Adds minimization objective from soft constraint penalty terms."""
-        all_penalty_terms = []
+        """
+        Adds minimization objective from soft constraint penalty terms, kept per
+        constraint in `objective_components` so it can be reweighted later.
+        """
+        self.objective_components = {}
         for instance in constraint_manager.get_constraint_instances():
             if instance.definition.constraint_type == ConstraintType.SOFT:
-                all_penalty_terms.extend(instance.get_penalty_terms())
+                terms = instance.get_penalty_terms()
+                if terms:
+                    self.objective_components[instance.constraint_id] = (
+                        ObjectiveComponent.from_terms(
+                            instance.constraint_id, instance.definition.weight, terms
+                        )
+                    )
 
-        if all_penalty_terms:
-            objective_expr = sum(int(weight) * var for weight, var in all_penalty_terms)
-            self.model.Minimize(objective_expr)
+        if self.objective_components:
+            term_count = set_objective(self.model, self.objective_components)
             logger.info(
-                f"Objective function set with {len(all_penalty_terms)} penalty terms from soft constraints."
+                f"Objective function set with {term_count} penalty terms from soft constraints."
             )
         else:
             logger.info(
@@ -0,0 +1,604 @@
+# scheduling_engine/cp_sat/model_cache.py
+
+"""
+Per-process cache of built Phase 1 models, for reruns that only change weights.
+
+Admins often rerun a session with nothing changed but soft-constraint weights.
+Every variable and constraint of such a rerun is identical to the previous
+build, so the builder keeps each soft constraint's penalty terms as a separate
+ObjectiveComponent and stores the built model under a structure key: a digest
+of the dataset, the locks, the build-relevant problem settings and the active
+constraint definitions with their weights left out. A later build with the
+same key clones the cached model, rewrites only its objective from the new
+weights and hints the previous run's timetable, skipping the GA and the
+encoding altogether.
+
+Day and timeslot IDs are generated afresh on every load of a dataset, so the
+key and the stored variable maps refer to days by date and to timeslots by
+date, start and end time (see slot_aliases); a cached build is re-keyed to the
+current load's IDs when it is reused.
+
+Coefficients are rescaled by new_weight / old_weight, which reproduces a fresh
+build exactly for integral weights. A weight moving to or from zero cannot be
+rescaled and is part of the structure key, so it rebuilds.
+
+Solver workers recycle their process after every job, so a per-process cache
+alone would never be hit. With a directory configured, every build is also
+written there under its structure key: the serialized model proto, and as
+JSON the variable indices of its SharedVariables and objective components,
+the proto ranges of its hard constraints and, once solved, its timetable. Any worker
+sharing the directory loads it back; the in-process LRU stays in front of it.
+The directory keeps the `cache_size` most recently used builds.
+"""
+
+import dataclasses
+import hashlib
+import logging
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from ortools.sat.python import cp_model
+
+from scheduling_engine.core.constraint_types import ConstraintType
+
+logger = logging.getLogger(__name__)
+
+# Problem settings that only steer the solve, never the model.
+_SOLVE_ONLY_PREFIXES = (
+    "solver_",
+    "diagnos",
+    "decomposition_",
+    "tuning_",
+    "model_cache_",
+)
+_SOLVE_ONLY_SETTINGS = {"phase1_decomposition", "subproblem_time_limit_seconds"}
+
+
+@dataclass
+class ObjectiveComponent:
+    """One soft constraint's penalty terms, as built with `weight`."""
+
+    constraint_id: str
+    weight: float
+    term_weights: List[float] = field(default_factory=list)
+    variables: List[Any] = field(default_factory=list)
+
+    @classmethod
+    def from_terms(
+        cls, constraint_id: str, weight: float, terms: Iterable[Tuple[float, Any]]
+    ) -> "ObjectiveComponent":
+        component = cls(constraint_id=constraint_id, weight=float(weight))
+        for term_weight, var in terms:
+            component.term_weights.append(float(term_weight))
+            component.variables.append(var)
+        return component
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def coefficients(self, weight: Optional[float] = None) -> List[int]:
+        """Objective coefficients under `weight` (the build weight by default)."""
+        if weight is None or weight == self.weight or not self.weight:
+            return [int(w) for w in self.term_weights]
+        scale = weight / self.weight
+        # Rounded first so that e.g. 3 * (7 / 3) does not truncate to 6.
+        return [int(round(w * scale, 6)) for w in self.term_weights]
+
+    def expression(self, weight: Optional[float] = None) -> cp_model.LinearExpr:
+        return cp_model.LinearExpr.WeightedSum(
+            self.variables, self.coefficients(weight)
+        )
+
+
+def set_objective(
+    model: cp_model.CpModel,
+    components: Dict[str, ObjectiveComponent],
+    weights: Optional[Dict[str, float]] = None,
+) -> int:
+    """Replaces the model's objective; returns the number of penalty terms."""
+    weights = weights or {}
+    model.Minimize(
+        sum(
+            component.expression(weights.get(constraint_id))
+            for constraint_id, component in components.items()
+        )
+    )
+    return sum(map(len, components.values()))
+
+
+def soft_weights(problem) -> Dict[str, float]:
+    """Current weight of every active soft constraint."""
+    return {
+        definition.id: float(definition.weight)
+        for definition in problem.constraint_registry.get_active_constraint_classes()
+        if definition.constraint_type == ConstraintType.SOFT
+    }
+
+
+def slot_aliases(problem) -> Dict[str, str]:
+    """
+    Stable names for the problem's days and timeslots, keyed by their IDs.
+
+    Day and timeslot IDs are generated afresh every time a dataset is loaded,
+    so the cache refers to a day by its date and to a timeslot by its date,
+    start and end time instead.
+    """
+    aliases: Dict[str, str] = {}
+    for day in problem.days.values():
+        aliases[str(day.id)] = f"day:{day.date}"
+        for slot in day.timeslots:
+            aliases[str(slot.id)] = f"slot:{day.date}T{slot.start_time}-{slot.end_time}"
+    return aliases
+
+
+def _canonical(value: Any, aliases: Dict[str, str]) -> Any:
+    """A deterministic, hashable-by-repr form of entity data."""
+    if isinstance(value, UUID):
+        return aliases.get(str(value), str(value))
+    if isinstance(value, str):
+        return aliases.get(value, value)
+    if isinstance(value, (date, datetime, time)):
+        return str(value)
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return sorted(
+            (str(_canonical(k, aliases)), _canonical(v, aliases))
+            for k, v in value.items()
+        )
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v, aliases) for v in value), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v, aliases) for v in value]
+    if dataclasses.is_dataclass(value):
+        return _canonical(vars(value), aliases)
+    if hasattr(value, "name") and hasattr(value, "value"):  # enums
+        return str(value.value)
+    return repr(value)
+
+
+def structure_key(problem, phase: str = "phase1") -> str:
+    """Digest of everything the build reads except the soft-constraint weights."""
+    aliases = slot_aliases(problem)
+    settings = {
+        name: value
+        for name, value in vars(problem).items()
+        if isinstance(value, (bool, int, float, str))
+        and not name.startswith(_SOLVE_ONLY_PREFIXES)
+        and name not in _SOLVE_ONLY_SETTINGS
+    }
+    definitions = []
+    for definition in problem.constraint_registry.get_active_constraint_classes():
+        described = {
+            "id": definition.id,
+            "type": definition.constraint_type.value,
+            "parameters": [(p.key, p.value) for p in definition.parameters],
+            "scope": definition.scope,
+        }
+        if definition.constraint_type == ConstraintType.SOFT:
+            described["zero_weight"] = not definition.weight
+        else:
+            described["weight"] = definition.weight
+        definitions.append(described)
+
+    digest = hashlib.sha256()
+    for part in (
+        phase,
+        problem.session_id,
+        settings,
+        problem.days,
+        problem.exams,
+        problem.rooms,
+        getattr(problem, "invigilators", {}),
+        getattr(problem, "locks", []),
+        sorted(definitions, key=lambda d: d["id"]),
+    ):
+        digest.update(repr(_canonical(part, aliases)).encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedModel:
+    """A built model, its variables and objective, and the last timetable for it."""
+
+    model: cp_model.CpModel
+    shared_vars: Any
+    components: Dict[str, ObjectiveComponent]
+    constraint_manager: Any = None
+    solution: Dict[UUID, UUID] = field(default_factory=dict)
+    # slot_aliases() of the problem the IDs in shared_vars and solution belong to.
+    aliases: Dict[str, str] = field(default_factory=dict)
+
+
+class StoredConstraintRanges:
+    """Stands in for the constraint manager of a build loaded from disk."""
+
+    def __init__(self, hard_constraint_ranges: Dict[str, Tuple[int, int]]):
+        self._ranges = dict(hard_constraint_ranges)
+
+    def get_hard_constraint_ranges(self) -> Dict[str, Tuple[int, int]]:
+        return dict(self._ranges)
+
+
+# structure key -> cached build, least recently used first
+_models: "OrderedDict[str, CachedModel]" = OrderedDict()
+
+_MODEL_SUFFIX = ".model"
+_INDEX_SUFFIX = ".index"
+_SOLUTION_SUFFIX = ".solution"
+_FORMAT = 2
+
+
+def get_cached_model(
+    key: str,
+    directory: Optional[str] = None,
+    aliases: Optional[Dict[str, str]] = None,
+) -> Optional[CachedModel]:
+    """
+    The cached build for `key`, with its day and timeslot IDs translated to
+    those named in `aliases` (the current problem's slot_aliases()).
+    """
+    cached = _models.get(key)
+    if cached is not None:
+        _models.move_to_end(key)
+        if directory:
+            _touch(_path(directory, key, _MODEL_SUFFIX))
+        try:
+            return _rebind(cached, aliases)
+        except KeyError as e:
+            logger.warning(f"Cached model {key[:12]} names an unknown slot {e}.")
+            return None
+    if not directory:
+        return None
+    cached = _load(directory, key, aliases or {})
+    if cached is not None:
+        _models[key] = cached
+    return cached
+
+
+def store_model(
+    key: str, entry: CachedModel, cache_size: int, directory: Optional[str] = None
+) -> None:
+    _models[key] = entry
+    _models.move_to_end(key)
+    while len(_models) > cache_size:
+        _models.popitem(last=False)
+    if directory:
+        try:
+            proto, index = _serialize(entry)
+            # The index is written last: a build counts as stored once it exists.
+            _write(_path(directory, key, _MODEL_SUFFIX), proto)
+            _write(_path(directory, key, _INDEX_SUFFIX), index)
+            _evict(directory, cache_size)
+        except Exception as e:
+            logger.warning(f"Could not store Phase 1 model {key[:12]}: {e}")
+
+
+def remember_solution(
+    key: Optional[str],
+    starts: Dict[UUID, UUID],
+    directory: Optional[str] = None,
+    aliases: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Records a solved timetable to hint the next reweighted run of `key`.
+    `aliases` are the slot_aliases() of the problem `starts` was solved for.
+    """
+    if not key:
+        return
+    aliases = aliases or {}
+    cached = _models.get(key)
+    if cached is not None:
+        try:
+            cached.solution = _rekey(starts, aliases, cached.aliases)
+        except KeyError:
+            cached.solution = {}
+    path = _path(directory, key, _SOLUTION_SUFFIX) if directory else None
+    if path and os.path.exists(_path(directory, key, _INDEX_SUFFIX)):
+        try:
+            _write(path, _dump_json(_encode(dict(starts), aliases)))
+        except Exception as e:
+            logger.warning(f"Could not store the solution of model {key[:12]}: {e}")
+
+
+def clear_model_cache(directory: Optional[str] = None) -> None:
+    _models.clear()
+    if directory and os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith((_MODEL_SUFFIX, _INDEX_SUFFIX, _SOLUTION_SUFFIX)):
+                os.remove(os.path.join(directory, name))
+
+
+# --- Slot-independent keys ---
+
+
+def _encode(value: Any, aliases: Dict[str, str]) -> Any:
+    """
+    A JSON form of a map key or value in which day and timeslot IDs are
+    replaced by their aliases. Tuples, dicts and UUIDs are tagged so that
+    _decode can restore them.
+    """
+    if isinstance(value, UUID):
+        alias = aliases.get(str(value))
+        return {"slot": alias} if alias else {"uuid": str(value)}
+    if isinstance(value, str) and value in aliases:
+        return {"slot_str": aliases[value]}
+    if isinstance(value, tuple):
+        return {"tuple": [_encode(v, aliases) for v in value]}
+    if isinstance(value, dict):
+        return {
+            "items": [
+                [_encode(k, aliases), _encode(v, aliases)] for k, v in value.items()
+            ]
+        }
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    raise TypeError(f"Cannot store a {type(value).__name__} in the model cache")
+
+
+def _decode(value: Any, ids: Dict[str, str]) -> Any:
+    """Inverse of _encode; `ids` maps aliases to the current problem's IDs."""
+    if not isinstance(value, dict):
+        return value
+    if "slot" in value:
+        return UUID(ids[value["slot"]])
+    if "slot_str" in value:
+        return ids[value["slot_str"]]
+    if "uuid" in value:
+        return UUID(value["uuid"])
+    if "tuple" in value:
+        return tuple(_decode(v, ids) for v in value["tuple"])
+    return {_decode(k, ids): _decode(v, ids) for k, v in value["items"]}
+
+
+def _rekey(
+    mapping: Dict[Any, Any], source: Dict[str, str], target: Dict[str, str]
+) -> Dict[Any, Any]:
+    """
+    `mapping` with the day and timeslot IDs behind `source`, in its keys and
+    values, replaced by those behind `target`.
+    """
+    if source == target:
+        return dict(mapping)
+    ids = {alias: id_ for id_, alias in target.items()}
+
+    def move(value: Any) -> Any:
+        if isinstance(value, (UUID, str, tuple)):
+            return _decode(_encode(value, source), ids)
+        return value
+
+    return {move(k): move(v) for k, v in mapping.items()}
+
+
+def _rebind(entry: CachedModel, aliases: Optional[Dict[str, str]]) -> CachedModel:
+    """`entry` with its day and timeslot IDs replaced by those of `aliases`."""
+    if aliases is None or aliases == entry.aliases:
+        return entry
+    shared = {}
+    for f in dataclasses.fields(entry.shared_vars):
+        value = getattr(entry.shared_vars, f.name)
+        if isinstance(value, MappingProxyType):
+            shared[f.name] = MappingProxyType(_rekey(value, entry.aliases, aliases))
+    # The constraints are not run again on a reused build, so the data
+    # precomputed for them is not carried over to the new IDs.
+    shared_vars = dataclasses.replace(entry.shared_vars, precomputed_data={}, **shared)
+    return dataclasses.replace(
+        entry,
+        shared_vars=shared_vars,
+        solution=_rekey(entry.solution, entry.aliases, aliases),
+        aliases=dict(aliases),
+    )
+
+
+# --- Shared store ---
+#
+# A build is stored as its serialized model proto (.model), a JSON index of
+# its variable maps, objective components and hard constraint ranges (.index)
+# and, once solved, its timetable as JSON (.solution). Nothing read back from
+# the directory is unpickled or executed.
+
+
+def _path(directory: str, key: str, suffix: str) -> str:
+    return os.path.join(directory, key + suffix)
+
+
+def _touch(path: str) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _write(path: str, data: bytes) -> None:
+    """Writes atomically, so that a concurrent reader sees all or nothing."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _dump_json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _evict(directory: str, cache_size: int) -> None:
+    models = sorted(
+        (
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.endswith(_MODEL_SUFFIX)
+        ),
+        key=os.path.getmtime,
+    )
+    for path in models[: max(0, len(models) - cache_size)]:
+        stem = path[: -len(_MODEL_SUFFIX)]
+        for stale in (path, stem + _INDEX_SUFFIX, stem + _SOLUTION_SUFFIX):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+
+def _serialize(entry: CachedModel) -> Tuple[bytes, bytes]:
+    """The model proto, and the JSON index of everything else by proto index."""
+    proto = entry.model.Proto().SerializeToString()
+    variable_maps = {}
+    for f in dataclasses.fields(entry.shared_vars):
+        value = getattr(entry.shared_vars, f.name)
+        if isinstance(value, MappingProxyType):
+            variable_maps[f.name] = [
+                [_encode(k, entry.aliases), v.Index()] for k, v in value.items()
+            ]
+    ranges = (
+        entry.constraint_manager.get_hard_constraint_ranges()
+        if entry.constraint_manager is not None
+        else {}
+    )
+    index = {
+        "format": _FORMAT,
+        "proto_sha256": hashlib.sha256(proto).hexdigest(),
+        "variable_maps": variable_maps,
+        "variable_creation_stats": dataclasses.asdict(
+            entry.shared_vars.variable_creation_stats
+        ),
+        "components": [
+            [
+                c.constraint_id,
+                c.weight,
+                c.term_weights,
+                [v.Index() for v in c.variables],
+            ]
+            for c in entry.components.values()
+        ],
+        "hard_constraint_ranges": {
+            name: list(bounds) for name, bounds in ranges.items()
+        },
+    }
+    return proto, _dump_json(index)
+
+
+def _load(directory: str, key: str, aliases: Dict[str, str]) -> Optional[CachedModel]:
+    """Loads the build stored under `key`, bound to the IDs behind `aliases`."""
+    from scheduling_engine.cp_sat.constraint_encoder import (
+        SharedVariables,
+        VariableCreationStats,
+    )
+
+    path = _path(directory, key, _MODEL_SUFFIX)
+    try:
+        with open(_path(directory, key, _INDEX_SUFFIX), "rb") as f:
+            index = json.load(f)
+        with open(path, "rb") as f:
+            proto = f.read()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cached model {key[:12]}: {e}")
+        return None
+    if not isinstance(index, dict) or index.get("format") != _FORMAT:
+        return None
+    if index.get("proto_sha256") != hashlib.sha256(proto).hexdigest():
+        logger.warning(f"Ignoring cached model {key[:12]}: index and model differ.")
+        return None
+
+    try:
+        ids = {alias: id_ for id_, alias in aliases.items()}
+        model = cp_model.CpModel()
+        model.Proto().ParseFromString(proto)
+        model.rebuild_var_and_constant_map()
+        shared: Dict[str, Any] = {
+            name: MappingProxyType(
+                {_decode(k, ids): _variable(model, i) for k, i in items}
+            )
+            for name, items in index["variable_maps"].items()
+        }
+        components = {
+            constraint_id: ObjectiveComponent(
+                constraint_id=constraint_id,
+                weight=float(weight),
+                term_weights=[float(w) for w in term_weights],
+                variables=[_variable(model, i) for i in indices],
+            )
+            for constraint_id, weight, term_weights, indices in index["components"]
+        }
+        shared_vars = SharedVariables(
+            variable_creation_stats=VariableCreationStats(
+                **index["variable_creation_stats"]
+            ),
+            precomputed_data={},
+            **shared,
+        )
+        ranges = {
+            name: (int(low), int(high))
+            for name, (low, high) in index["hard_constraint_ranges"].items()
+        }
+    except Exception as e:
+        logger.warning(f"Ignoring malformed cached model {key[:12]}: {e}")
+        return None
+
+    solution: Dict[Any, Any] = {}
+    try:
+        with open(_path(directory, key, _SOLUTION_SUFFIX), "rb") as f:
+            solution = _decode(json.load(f), ids)
+        if not isinstance(solution, dict):
+            solution = {}
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable solution of model {key[:12]}: {e}")
+    _touch(path)
+    logger.info(f"Loaded Phase 1 model {key[:12]} from the shared model cache.")
+    return CachedModel(
+        model=model,
+        shared_vars=shared_vars,
+        components=components,
+        constraint_manager=StoredConstraintRanges(ranges),
+        solution=solution,
+        aliases=dict(aliases),
+    )
+
+
+def _variable(model: cp_model.CpModel, index: int) -> Any:
+    """The variable at a proto index; negative indices are negated literals."""
+    if index < 0:
+        return model.GetBoolVarFromProtoIndex(-index - 1).Not()
+    return model.GetIntVarFromProtoIndex(index)
+
+
+def reweighted_model(
+    entry: CachedModel, weights: Dict[str, float]
+) -> Tuple[cp_model.CpModel, int]:
+    """
+    A copy of the cached model with its objective rewritten for `weights` and
+    the previous timetable as a hint. Returns the model and the hint count.
+    """
+    model = entry.model.Clone()
+    model.ClearHints()
+    changed = {
+        constraint_id: (component.weight, weights[constraint_id])
+        for constraint_id, component in entry.components.items()
+        if constraint_id in weights and weights[constraint_id] != component.weight
+    }
+    set_objective(model, entry.components, weights)
+    if changed:
+        logger.info(f"Reweighted objective components (old, new): {changed}")
+
+    hints = 0
+    x_vars = entry.shared_vars.x_vars
+    for exam_id, slot_id in entry.solution.items():
+        if (var := x_vars.get((exam_id, slot_id))) is not None:
+            model.AddHint(var, 1)
+            hints += 1
+    return model, hints
@@ -0,0 +1,501 @@
+# scheduling_engine/cp_sat/portfolio.py
+
+"""
+Parallel portfolio racing for CP-SAT models.
+
+A race runs K solvers on the same serialized CpModelProto, each with its own
+parameter set and seed. Every improving incumbent is published to a shared
+IncumbentBoard; at each restart boundary a racer picks up the best published
+incumbent as a solution hint, so good solutions found by one configuration
+seed the others. Rounds double in length, keeping restarts cheap early on
+without starving long proofs.
+
+The race stops at the first proven optimum (or proof of infeasibility) or when
+the deadline is reached. The configuration that produced the final answer is
+recorded in a PortfolioStore keyed by a coarse session fingerprint, so later
+jobs on similar sessions race it first - or use it directly when racing is
+off.
+
+Racers are separate processes where possible. Inside a daemonic Celery
+worker, where child processes cannot be started, they fall back to threads,
+which still run in parallel because CP-SAT releases the GIL while solving.
+"""
+
+import json
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ortools.sat import sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+logger = logging.getLogger(__name__)
+
+_SatParameters = sat_parameters_pb2.SatParameters
+FINAL_STATUSES = (cp_model.OPTIMAL, cp_model.INFEASIBLE, cp_model.MODEL_INVALID)
+
+
+@dataclass(frozen=True)
+class PortfolioConfig:
+    """A named set of SatParameters overrides."""
+
+    name: str
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+    def apply(self, params: _SatParameters) -> None:
+        for key, value in self.parameters.items():
+            setattr(params, key, value)
+
+
+DEFAULT_CONFIG = PortfolioConfig(
+    "default",
+    {
+        "cp_model_probing_level": 2,
+        "search_branching": _SatParameters.PORTFOLIO_SEARCH,
+        "linearization_level": 2,
+        "use_lns": True,
+    },
+)
+
+PORTFOLIO: List[PortfolioConfig] = [
+    DEFAULT_CONFIG,
+    PortfolioConfig(
+        "quick_restart",
+        {
+            "cp_model_probing_level": 1,
+            "search_branching": _SatParameters.PORTFOLIO_WITH_QUICK_RESTART_SEARCH,
+            "linearization_level": 1,
+            "use_lns": True,
+        },
+    ),
+    PortfolioConfig(
+        "core_bound",
+        {
+            "cp_model_probing_level": 2,
+            "optimize_with_core": True,
+            "linearization_level": 1,
+        },
+    ),
+    PortfolioConfig(
+        "no_lp",
+        {
+            "cp_model_probing_level": 1,
+            "search_branching": _SatParameters.PORTFOLIO_SEARCH,
+            "linearization_level": 0,
+            "use_lns": True,
+        },
+    ),
+    PortfolioConfig(
+        "lb_tree",
+        {
+            "cp_model_probing_level": 2,
+            "optimize_with_lb_tree_search": True,
+            "linearization_level": 2,
+        },
+    ),
+    PortfolioConfig(
+        "pseudo_cost",
+        {
+            "cp_model_probing_level": 0,
+            "search_branching": _SatParameters.PSEUDO_COST_SEARCH,
+            "linearization_level": 1,
+            "use_lns": True,
+        },
+    ),
+]
+
+CONFIGS_BY_NAME: Dict[str, PortfolioConfig] = {c.name: c for c in PORTFOLIO}
+
+
+def race_lineup(size: int, preferred: Optional[str] = None) -> List[PortfolioConfig]:
+    """
+    `size` configurations with the preferred one (if known) first. Beyond the
+    portfolio's length configurations repeat; racers differ by seed anyway.
+    """
+    lineup = list(PORTFOLIO)
+    if preferred in CONFIGS_BY_NAME:
+        lineup.remove(CONFIGS_BY_NAME[preferred])
+        lineup.insert(0, CONFIGS_BY_NAME[preferred])
+    return [lineup[i % len(lineup)] for i in range(max(1, size))]
+
+
+class IncumbentBoard:
+    """
+    Shared best-known solution, readable and writable from every racer.
+
+    Objectives are stored in minimisation form. `version` increases with each
+    accepted incumbent so racers only rebuild their hint when it changed.
+    """
+
+    def __init__(self, ctx, num_vars: int, sense: int = 1):
+        self.sense = sense
+        self._lock = ctx.Lock()
+        self._objective = ctx.Value("d", math.inf, lock=False)
+        self._version = ctx.Value("q", 0, lock=False)
+        self._owner = ctx.Value("i", -1, lock=False)
+        self._values = ctx.Array("q", max(1, num_vars), lock=False)
+        self._num_vars = num_vars
+
+    def improves(self, objective: float) -> bool:
+        return self.sense * objective < self._objective.value
+
+    def publish(self, owner: int, objective: float, values: Sequence[int]) -> bool:
+        with self._lock:
+            if not self.improves(objective):
+                return False
+            self._values[: self._num_vars] = values
+            self._objective.value = self.sense * objective
+            self._owner.value = owner
+            self._version.value += 1
+            return True
+
+    def read(self, newer_than: int = 0) -> Optional[Dict[str, Any]]:
+        """The current incumbent, or None if nothing newer was published."""
+        with self._lock:
+            version = self._version.value
+            if version <= newer_than:
+                return None
+            return {
+                "version": version,
+                "objective": self.sense * self._objective.value,
+                "owner": self._owner.value,
+                "values": list(self._values[: self._num_vars]),
+            }
+
+
+class _IncumbentPublisher(cp_model.CpSolverSolutionCallback):
+    """Publishes improving solutions and aborts the round once the race is over."""
+
+    def __init__(self, index: int, board: IncumbentBoard, stop):
+        super().__init__()
+        self.index = index
+        self.board = board
+        self.stop = stop
+        self.solutions = 0
+        self.published = 0
+
+    def OnSolutionCallback(self):
+        self.solutions += 1
+        objective = self.ObjectiveValue()
+        if self.board.improves(objective) and self.board.publish(
+            self.index, objective, self.response_proto.solution
+        ):
+            self.published += 1
+        if self.stop.is_set():
+            self.StopSearch()
+
+
+def _run_racer(
+    index: int,
+    proto_bytes: bytes,
+    config: PortfolioConfig,
+    seed: int,
+    num_workers: int,
+    time_limit: float,
+    first_round_seconds: float,
+    board: IncumbentBoard,
+    stop,
+    reports,
+    active_solvers: Optional[Dict[int, cp_model.CpSolver]] = None,
+) -> None:
+    """Solve in rounds of doubling length, re-hinting from the board between rounds."""
+    started = time.monotonic()
+    model = cp_model.CpModel()
+    model.Proto().ParseFromString(proto_bytes)
+    hint = model.Proto().solution_hint
+    publisher = _IncumbentPublisher(index, board, stop)
+    status = cp_model.UNKNOWN
+    seen_version = rounds = hinted_rounds = 0
+    round_seconds = first_round_seconds
+
+    while not stop.is_set():
+        remaining = time_limit - (time.monotonic() - started)
+        if remaining <= 0.01:
+            break
+        incumbent = board.read(newer_than=seen_version)
+        if incumbent:
+            seen_version = incumbent["version"]
+            hint.Clear()
+            hint.vars.extend(range(len(incumbent["values"])))
+            hint.values.extend(incumbent["values"])
+            hinted_rounds += 1
+
+        solver = cp_model.CpSolver()
+        config.apply(solver.parameters)
+        solver.parameters.random_seed = seed + rounds
+        solver.parameters.num_workers = num_workers
+        solver.parameters.max_time_in_seconds = min(round_seconds, remaining)
+        if active_solvers is not None:
+            active_solvers[index] = solver
+        status = solver.Solve(model, publisher)
+        rounds += 1
+        if status in FINAL_STATUSES:
+            stop.set()
+            break
+        round_seconds *= 2
+
+    reports.put(
+        {
+            "index": index,
+            "config": config.name,
+            "status": int(status),
+            "rounds": rounds,
+            "hinted_rounds": hinted_rounds,
+            "solutions": publisher.solutions,
+            "published": publisher.published,
+            "wall_time": time.monotonic() - started,
+        }
+    )
+
+
+@dataclass
+class RaceResult:
+    """
+    Outcome of a race. Exposes the CpSolver accessors the solution extractor
+    uses, reading values from the winning incumbent.
+    """
+
+    status: int
+    objective: Optional[float]
+    values: List[int]
+    winner: Optional[str]
+    wall_time: float
+    prover: Optional[str] = None
+    reports: List[Dict[str, Any]] = field(default_factory=list)
+    mode: str = "processes"
+
+    def Value(self, var) -> int:
+        return self.values[var.Index()]
+
+    def BooleanValue(self, var) -> bool:
+        return bool(self.Value(var))
+
+    def ObjectiveValue(self) -> float:
+        return self.objective if self.objective is not None else math.nan
+
+    def WallTime(self) -> float:
+        return self.wall_time
+
+    def StatusName(self, status: Optional[int] = None) -> str:
+        return cp_model.CpSolver().StatusName(self.status if status is None else status)
+
+
+def race_portfolio(
+    model: cp_model.CpModel,
+    configs: Sequence[PortfolioConfig],
+    time_limit: float,
+    total_workers: int = 0,
+    seed: int = 0,
+    first_round_seconds: Optional[float] = None,
+    use_processes: bool = True,
+    poll_interval: float = 0.05,
+    stop_grace_seconds: float = 5.0,
+    on_improvement: Optional[Callable[[float, str], None]] = None,
+) -> RaceResult:
+    """Races `configs` on `model` until an optimum is proven or `time_limit` passes."""
+    if not configs:
+        raise ValueError("A race needs at least one configuration.")
+    started = time.monotonic()
+    proto = model.Proto()
+    proto_bytes = proto.SerializeToString()
+    num_vars = len(proto.variables)
+    sense = -1 if proto.objective.scaling_factor < 0 else 1
+    per_racer = max(1, (total_workers or os.cpu_count() or 1) // len(configs))
+    first_round = first_round_seconds or max(1.0, time_limit / 16)
+
+    ctx = multiprocessing.get_context("spawn")
+    board = IncumbentBoard(ctx, num_vars, sense)
+    stop = ctx.Event()
+    reports = ctx.Queue()
+
+    # Solvers currently running in thread racers, so they can be interrupted.
+    active_solvers: Dict[int, cp_model.CpSolver] = {}
+
+    def racer_args(index: int, config: PortfolioConfig, in_thread: bool = False):
+        return (
+            index,
+            proto_bytes,
+            config,
+            seed + 1000 * index,
+            per_racer,
+            time_limit,
+            first_round,
+            board,
+            stop,
+            reports,
+            active_solvers if in_thread else None,
+        )
+
+    mode = "processes" if use_processes else "threads"
+    racers: List[Any] = []
+    if use_processes:
+        try:
+            for index, config in enumerate(configs):
+                process = ctx.Process(
+                    target=_run_racer, args=racer_args(index, config), daemon=True
+                )
+                process.start()
+                racers.append(process)
+        except (RuntimeError, AssertionError, OSError) as e:
+            logger.warning(f"Racer processes unavailable ({e}); racing in threads.")
+            stop.set()
+            for process in racers:
+                process.join()
+            stop.clear()
+            racers, mode = [], "threads"
+    if not racers:
+        for index, config in enumerate(configs):
+            thread = threading.Thread(
+                target=_run_racer,
+                args=racer_args(index, config, in_thread=True),
+                daemon=True,
+            )
+            thread.start()
+            racers.append(thread)
+
+    logger.info(
+        f"Racing {len(configs)} configurations in {mode} "
+        f"({per_racer} search workers each, {time_limit:.0f}s limit): "
+        f"{[c.name for c in configs]}"
+    )
+
+    collected: List[Dict[str, Any]] = []
+    seen_version = 0
+    deadline = started + time_limit
+    stopped_at: Optional[float] = None
+    while len(collected) < len(configs):
+        try:
+            collected.append(reports.get(timeout=poll_interval))
+            if collected[-1]["status"] in FINAL_STATUSES:
+                stop.set()
+        except queue.Empty:
+            pass
+        incumbent = board.read(newer_than=seen_version)
+        if incumbent:
+            seen_version = incumbent["version"]
+            if on_improvement:
+                on_improvement(incumbent["objective"], configs[incumbent["owner"]].name)
+        now = time.monotonic()
+        if now > deadline:
+            stop.set()
+        if stop.is_set():
+            stopped_at = stopped_at or now
+            # Thread racers can be interrupted mid-round; processes are
+            # terminated below if they do not reach a boundary in time.
+            for solver in list(active_solvers.values()):
+                solver.StopSearch()
+            if now - stopped_at > stop_grace_seconds:
+                logger.warning("Some racers did not stop in time; abandoning them.")
+                break
+
+    for racer in racers:
+        racer.join(timeout=1.0)
+        if isinstance(racer, multiprocessing.process.BaseProcess) and racer.is_alive():
+            racer.terminate()
+
+    return _race_outcome(configs, board, collected, time.monotonic() - started, mode)
+
+
+def _race_outcome(configs, board, reports, wall_time, mode) -> RaceResult:
+    incumbent = board.read()
+    finished = [r for r in reports if r["status"] in FINAL_STATUSES]
+    prover = None
+    if finished:
+        decisive = min(finished, key=lambda r: r["wall_time"])
+        status, winner = decisive["status"], decisive["config"]
+        prover = winner
+        if status == cp_model.OPTIMAL and incumbent:
+            # Whoever held the best incumbent may have been another racer.
+            winner = configs[incumbent["owner"]].name
+    elif incumbent:
+        status, winner = cp_model.FEASIBLE, configs[incumbent["owner"]].name
+    else:
+        status, winner = cp_model.UNKNOWN, None
+
+    result = RaceResult(
+        status=status,
+        objective=incumbent["objective"] if incumbent else None,
+        values=incumbent["values"] if incumbent else [],
+        winner=winner,
+        wall_time=wall_time,
+        prover=prover,
+        reports=sorted(reports, key=lambda r: r["index"]),
+        mode=mode,
+    )
+    logger.info(
+        f"Race finished: {result.StatusName()} objective={result.objective} "
+        f"winner={winner} in {wall_time:.2f}s"
+    )
+    return result
+
+
+def session_fingerprint(problem, phase: str) -> str:
+    """A coarse size signature; sessions in the same buckets share a preferred config."""
+
+    def bucket(count: int) -> int:
+        return int(math.log2(count)) if count > 0 else -1
+
+    students = getattr(problem, "students", None) or {}
+    sizes = {
+        "e": len(problem.exams),
+        "s": len(students),
+        "r": len(problem.rooms),
+        "t": len(problem.timeslots),
+        "i": len(getattr(problem, "invigilators", None) or {}),
+    }
+    return phase + ":" + "-".join(f"{k}{bucket(n)}" for k, n in sizes.items())
+
+
+class PortfolioStore:
+    """
+    Winning configurations per session fingerprint, persisted as JSON.
+
+    Writes replace the file atomically; concurrent jobs may occasionally drop
+    one another's update, which only costs a vote.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable portfolio store {self.path}: {e}")
+            return {}
+
+    def preferred(self, fingerprint: str) -> Optional[str]:
+        wins = self._load().get(fingerprint, {}).get("wins", {})
+        known = {name: n for name, n in wins.items() if name in CONFIGS_BY_NAME}
+        if not known:
+            return None
+        return max(known, key=lambda name: known[name])
+
+    def record(self, fingerprint: str, config_name: str, **details: Any) -> None:
+        data = self._load()
+        entry = data.setdefault(fingerprint, {"wins": {}})
+        entry["wins"][config_name] = entry["wins"].get(config_name, 0) + 1
+        entry["last"] = {
+            "config": config_name,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            **details,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, default=str)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not record race winner in {self.path}: {e}")
@@ -8,13 +8,13 @@ each timeslot, solving a small, independent packing problem (Phase 2).
 
 import asyncio
 import logging
-from typing import Optional, Dict, Any, Tuple, cast
+import os
+from typing import Optional, Dict, Any, List, Tuple, cast
 from datetime import date, datetime
 from collections import defaultdict
 from uuid import UUID
 
 from ortools.sat.python import cp_model
-from ortools.sat import sat_parameters_pb2
 
 from scheduling_engine.core.solution import (
     SolutionStatus,
@@ -25,7 +25,36 @@ from scheduling_engine.core.solution import (
 from scheduling_engine.cp_sat.solution_extractor import SolutionExtractor
 from scheduling_engine.data_flow_tracker import track_data_flow
 from scheduling_engine.cp_sat.model_builder import CPSATModelBuilder
+from scheduling_engine.cp_sat.portfolio import (
+    CONFIGS_BY_NAME,
+    DEFAULT_CONFIG,
+    PortfolioConfig,
+    PortfolioStore,
+    RaceResult,
+    race_lineup,
+    race_portfolio,
+    session_fingerprint,
+)
+from scheduling_engine.cp_sat.model_cache import remember_solution
+from scheduling_engine.cp_sat.tuning import export_model, load_tuned_profile, size_tier
+from scheduling_engine.cp_sat.time_budget import (
+    PHASE1_BUILD,
+    PHASE1_SOLVE,
+    TimeBudget,
+    phase2_stage,
+    plan_groups,
+)
+from scheduling_engine.cp_sat.decomposed_phase1 import (
+    DecomposedResult,
+    solve_phase1_decomposed,
+)
+from scheduling_engine.core.decomposition import ExamPartition, partition_exams
+from scheduling_engine.core.room_patterns import RoomPatternPool
 from scheduling_engine.constraints.constraint_manager import CPSATConstraintManager
+from scheduling_engine.analysis.infeasibility_explainer import (
+    InfeasibilityExplainer,
+    InfeasibilityExplanation,
+)
 
 from backend.app.utils.celery_task_utils import task_progress_tracker
 from scheduling_engine.genetic_algorithm.ga_processor import GAResult
@@ -45,6 +74,7 @@ class CeleryProgressCallback(cp_model.CpSolverSolutionCallback):
         loop: asyncio.AbstractEventLoop,
         phase_name: str,
         progress_window: tuple[int, int],
+        time_budget: Optional[TimeBudget] = None,
     ):
         """
         Initializes the callback.
@@ -54,12 +84,14 @@ class CeleryProgressCallback(cp_model.CpSolverSolutionCallback):
             loop: The asyncio event loop from the Celery task's thread.
             phase_name: The name of the current solving phase.
             progress_window: The (start, end) progress percentage for this phase.
+            time_budget: The job time budget; the search stops at its deadline.
         """
         super().__init__()
         self.task_context = task_context
         self.loop = loop
         self.phase_name = phase_name
         self.start_progress, self.end_progress = progress_window
+        self.time_budget = time_budget
         self.solution_count = 0
         self.last_objective = float("inf")
         self.start_time = datetime.now()
@@ -69,6 +101,13 @@ class CeleryProgressCallback(cp_model.CpSolverSolutionCallback):
 
     def OnSolutionCallback(self):
         """Called by the solver each time a new, better solution is found."""
+        if self.time_budget and self.time_budget.expired():
+            logger.warning(
+                f"[{self.phase_name.upper()}] Job deadline reached; "
+                "stopping with the best solution found."
+            )
+            self.StopSearch()
+            return
         if not self.task_context or not hasattr(self.task_context, "update_progress"):
             return
 
@@ -111,6 +150,23 @@ class CPSATSolverManager:
         self.solver = cp_model.CpSolver()
         self.ga_result: Optional[GAResult] = None
         self.task_context: Optional[Any] = None
+        self.diagnose_infeasibility = bool(
+            getattr(problem, "diagnose_infeasibility", False)
+        )
+        self.infeasibility_explanations: List[InfeasibilityExplanation] = []
+        self.race_size = int(getattr(problem, "solver_race_size", 0) or 0)
+        store_path = getattr(problem, "solver_portfolio_store", None)
+        self.portfolio_store = PortfolioStore(store_path) if store_path else None
+        self.race_result: Optional[RaceResult] = None
+        self.tuned_profile = load_tuned_profile(
+            getattr(problem, "solver_tuned_profiles", None), problem
+        )
+        self.tuning_export_dir = getattr(problem, "tuning_export_dir", None)
+        self.decomposition_result: Optional[DecomposedResult] = None
+        # Set per solve when the problem has a job deadline.
+        self.time_budget: Optional[TimeBudget] = None
+        # Whether Phase 1 reused a cached build (see model_cache.py).
+        self.phase1_model_reused = False
 
         self.loop: Optional[asyncio.AbstractEventLoop] = None
         logger.info("Initialized CPSATSolverManager for Two-Phase Decomposition.")
@@ -123,23 +179,45 @@ class CPSATSolverManager:
         logger.info("===   STARTING TWO-PHASE DECOMPOSED SOLVE   ===")
         logger.info("=============================================")
 
+        deadline = float(getattr(self.problem, "solver_deadline_seconds", 0) or 0)
+        budget = self.time_budget = (
+            TimeBudget.for_problem(self.problem, deadline) if deadline > 0 else None
+        )
+
         # --- PHASE 1: Timetabling (Assign Exams to Slots) ---
         logger.info("\n--- STARTING PHASE 1: TIMETABLING ---")
         builder = CPSATModelBuilder(problem=self.problem)
         builder.task_context = self.task_context
         if builder.encoder and builder.encoder.ga_result:
             self.ga_result = builder.encoder.ga_result
+        if budget:
+            builder.ga_time_limit = budget.start(PHASE1_BUILD)
         phase1_model, phase1_vars = await builder.build_phase1()
+        self.phase1_model_reused = builder.reused_cached_model
+        if budget:
+            budget.finish(PHASE1_BUILD)
 
         status, exam_slot_map = await self._solve_phase1(phase1_model, phase1_vars)
         if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             logger.error("Phase 1 FAILED. Aborting.")
+            if status == cp_model.INFEASIBLE:
+                self._explain_infeasibility(
+                    builder, phase1_model, phase1_vars, "phase1", self.problem.locks
+                )
             final_solution = TimetableSolution(self.problem)
             final_solution.status = SolutionStatus.INFEASIBLE
+            if budget:
+                budget.log_report()
             return cast(int, status), final_solution
         logger.info(
             f"Phase 1 successful. Found start times for {len(exam_slot_map)} exams."
         )
+        remember_solution(
+            builder.cache_key,
+            {exam_id: slot_id for exam_id, (slot_id, _) in exam_slot_map.items()},
+            builder.cache_dir,
+            builder.cache_aliases,
+        )
 
         # --- START OF FIX: Group exams by START TIME for Phase 2 subproblems ---
         logger.info("\n--- STARTING PHASE 2: GROUP-BY-START-TIME PACKING ---")
@@ -153,10 +231,12 @@ class CPSATSolverManager:
 
         all_phase2_statuses = []
         total_groups = len(exams_by_start_slot)
+        groups = list(exams_by_start_slot.items())
+        if budget:
+            # Smallest groups first, so that their spare time goes to the largest.
+            groups = plan_groups(budget, self.problem, dict(exams_by_start_slot))
 
-        for i, (start_slot_id, exam_ids_in_group) in enumerate(
-            exams_by_start_slot.items()
-        ):
+        for i, (start_slot_id, exam_ids_in_group) in enumerate(groups):
             logger.info(
                 f"\n--- Solving packing for Start-Time Group {i+1}/{total_groups} (Slot: {start_slot_id}) ---"
             )
@@ -166,16 +246,12 @@ class CPSATSolverManager:
                 exam_id: exam_slot_map[exam_id] for exam_id in exam_ids_in_group
             }
 
-            # Build a new model for this specific group of exams
-            phase2_builder = CPSATModelBuilder(problem=self.problem)
-            phase2_builder.task_context = self.task_context
-            phase2_model, phase2_vars = await phase2_builder.build_phase2_full_model(
-                group_phase1_results
+            # Build and solve a new model for this specific group of exams
+            phase2_builder, phase2_model, phase2_vars, phase2_status = (
+                await self._pack_group(
+                    group_phase1_results, phase2_stage(start_slot_id)
+                )
             )
-
-            # Solve this single group's packing subproblem
-            self.model = phase2_model
-            phase2_status = await self._solve_phase2_full(phase2_model, phase2_vars)
             all_phase2_statuses.append(phase2_status)
 
             if phase2_status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
@@ -189,6 +265,20 @@ class CPSATSolverManager:
                 logger.error(
                     f"Phase 2 FAILED for start-group {start_slot_id}. Assignments for these exams will be incomplete."
                 )
+                if phase2_status == cp_model.INFEASIBLE:
+                    group_locks = [
+                        lock
+                        for lock in self.problem.locks
+                        if lock.get("exam_id") in group_phase1_results
+                        and lock.get("time_slot_id") == start_slot_id
+                    ]
+                    self._explain_infeasibility(
+                        phase2_builder,
+                        phase2_model,
+                        phase2_vars,
+                        f"phase2 group {start_slot_id}",
+                        group_locks,
+                    )
 
         # --- END OF FIX ---
 
@@ -211,6 +301,8 @@ class CPSATSolverManager:
             f"Final solution status determined as: {final_solution.status.value}"
         )
         final_solution.log_detected_conflicts()
+        if budget:
+            budget.log_report()
         logger.info("\n✅ Two-phase decomposition solve complete.")
         return cast(int, final_status), final_solution
 
@@ -225,7 +317,23 @@ class CPSATSolverManager:
     ) -> Tuple[int, Dict[UUID, Tuple[UUID, date]]]:
         """Solves the Phase 1 model and extracts the exam-to-slot mapping."""
         logger.info("--- Calling CP-SAT solver for Phase 1 ---")
-        self._configure_solver_parameters()
+        fingerprint = session_fingerprint(self.problem, "phase1")
+        preferred = (
+            self.portfolio_store.preferred(fingerprint)
+            if self.portfolio_store
+            else None
+        )
+        time_limit = (
+            self.time_budget.start(PHASE1_SOLVE)
+            if self.time_budget
+            else getattr(self.problem, "solver_time_limit_seconds", 300.0)
+        )
+        self._configure_solver_parameters(
+            time_limit_override=self._tuned_time_limit(
+                "phase1_time_limit_seconds", time_limit
+            ),
+            config=CONFIGS_BY_NAME.get(preferred) or self._tuned_config("phase1"),
+        )
         self.model = model  # Set the current model for the solver manager
 
         if self.ga_result and self.ga_result.search_hints:
@@ -242,40 +350,125 @@ class CPSATSolverManager:
                     hints_applied += 1
             logger.info(f"Successfully applied {hints_applied} hints to the model.")
 
-        assert self.loop
-        progress_callback = CeleryProgressCallback(
-            task_context=self.task_context,
-            loop=self.loop,
-            phase_name="solving_phase_1",
-            progress_window=(35, 55),
-        )
         assert self.model
-        status = cast(int, self.solver.Solve(self.model, progress_callback))
-        status_name = self.solver.StatusName()
+        self._export_for_tuning(self.model, "phase1")
+        solver: Any = self.solver
+        partition = self._phase1_partition()
+        if partition is not None:
+            self.decomposition_result = await solve_phase1_decomposed(
+                self.problem,
+                self.model,
+                shared_vars,
+                partition,
+                parameters=self.solver.parameters,
+                time_limit=self.solver.parameters.max_time_in_seconds,
+                num_workers=getattr(self.problem, "solver_num_workers", 0),
+                hints=self.ga_result.search_hints if self.ga_result else None,
+                repair_time_limit=getattr(
+                    self.problem, "decomposition_repair_time_limit_seconds", 30.0
+                ),
+            )
+            solver = self.decomposition_result.solver
+            status = self.decomposition_result.status
+        elif self.race_size > 1:
+            solver = self._race_model(self.model, fingerprint, preferred)
+            status = solver.status
+        else:
+            assert self.loop
+            progress_callback = CeleryProgressCallback(
+                task_context=self.task_context,
+                loop=self.loop,
+                phase_name="solving_phase_1",
+                progress_window=(35, 55),
+                time_budget=self.time_budget,
+            )
+            status = cast(int, self.solver.Solve(self.model, progress_callback))
+        status_name = solver.StatusName()
+        if self.time_budget:
+            self.time_budget.finish(PHASE1_SOLVE, status_name)
         logger.info(f"Phase 1 solver finished with status: {status_name}")
-        logger.info(f"  - Objective value: {self.solver.ObjectiveValue()}")
-        logger.info(f"  - Wall time: {self.solver.WallTime()}s")
+        logger.info(f"  - Objective value: {solver.ObjectiveValue()}")
+        logger.info(f"  - Wall time: {solver.WallTime()}s")
 
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             logger.info("Extracting Phase 1 solution (exam-to-slot map)...")
-            extractor = SolutionExtractor(self.problem, shared_vars, self.solver)
+            extractor = SolutionExtractor(self.problem, shared_vars, solver)
             return status, extractor.extract_phase1_solution()
 
         logger.warning("Phase 1 solution could not be found.")
         return status, {}
 
+    async def _pack_group(
+        self, group_phase1_results: Dict, stage: str
+    ) -> Tuple[CPSATModelBuilder, cp_model.CpModel, Any, int]:
+        """
+        Builds and solves one start-time group's packing model. With the pattern
+        room model, an INFEASIBLE result grows the group's room patterns and
+        retries; the Y-variable model is the last resort. Under a job time
+        budget, all attempts share the group's allotment.
+        """
+        budget = self.time_budget
+        if budget:
+            budget.start(stage)
+        attempts: List[Optional[RoomPatternPool]] = [None]
+        if getattr(self.problem, "phase2_room_model", "assignment") == "patterns":
+            pool = RoomPatternPool(
+                self.problem,
+                patterns_per_exam=getattr(self.problem, "room_patterns_per_exam", 8),
+            )
+            rounds = int(getattr(self.problem, "room_pattern_growth_rounds", 2))
+            attempts = [pool] * (rounds + 1) + attempts
+
+        for attempt, patterns in enumerate(attempts):
+            builder = CPSATModelBuilder(problem=self.problem)
+            builder.task_context = self.task_context
+            model, shared_vars = await builder.build_phase2_full_model(
+                group_phase1_results, room_patterns=patterns
+            )
+            self.model = model
+            status = await self._solve_phase2_full(
+                model,
+                shared_vars,
+                time_limit=budget.stage_remaining(stage) if budget else None,
+            )
+            if status != cp_model.INFEASIBLE or attempt == len(attempts) - 1:
+                break
+            if budget and budget.stage_remaining(stage) <= 0:
+                logger.warning("Group time allotment used up; not retrying.")
+                break
+            if attempts[attempt + 1] is not None:
+                logger.info("No combination of room patterns fits; growing the pool.")
+                patterns.grow()  # type: ignore[union-attr]
+            else:
+                logger.warning(
+                    "Room patterns found no packing; falling back to the "
+                    "room-assignment model."
+                )
+        if budget:
+            budget.finish(stage, self.solver.StatusName(status))
+        return builder, model, shared_vars, status
+
     @task_progress_tracker(
         start_progress=65,
         end_progress=80,
         phase="solving_phase_2",
         message="Assigning rooms and invigilators...",
     )
-    async def _solve_phase2_full(self, model, shared_vars) -> int:
+    async def _solve_phase2_full(
+        self, model, shared_vars, time_limit: Optional[float] = None
+    ) -> int:
         """Solves a Phase 2 packing model (now for a single slot)."""
         logger.info("--- Calling CP-SAT solver for a Phase 2 subproblem ---")
         # Use a shorter time limit for subproblems
-        time_limit = getattr(self.problem, "subproblem_time_limit_seconds", 60.0)
-        self._configure_solver_parameters(time_limit_override=time_limit)
+        if time_limit is None:
+            time_limit = getattr(self.problem, "subproblem_time_limit_seconds", 60.0)
+        time_limit = self._tuned_time_limit(
+            "subproblem_time_limit_seconds", time_limit
+        )
+        self._configure_solver_parameters(
+            time_limit_override=time_limit, config=self._tuned_config("phase2")
+        )
+        self._export_for_tuning(model, "phase2")
 
         assert self.loop
         progress_callback = CeleryProgressCallback(
@@ -283,6 +476,7 @@ class CPSATSolverManager:
             loop=self.loop,
             phase_name="solving_phase_2",
             progress_window=(65, 80),
+            time_budget=self.time_budget,
         )
         status = cast(int, self.solver.Solve(model, progress_callback))
         status_name = self.solver.StatusName()
@@ -291,6 +485,108 @@ class CPSATSolverManager:
         logger.info(f"  - Wall time: {self.solver.WallTime()}s")
         return status
 
+    def _race_model(
+        self, model, fingerprint: str, preferred: Optional[str]
+    ) -> RaceResult:
+        """Races the portfolio on `model` and records the winning configuration."""
+        lineup = race_lineup(self.race_size, preferred)
+
+        def report(objective: float, config_name: str) -> None:
+            logger.info(
+                f"[RACE] {config_name} improved the incumbent to {objective:,.0f}"
+            )
+
+        result = race_portfolio(
+            model,
+            lineup,
+            time_limit=self.solver.parameters.max_time_in_seconds,
+            total_workers=int(getattr(self.problem, "solver_num_workers", 0) or 0),
+            on_improvement=report,
+        )
+        self.race_result = result
+        if self.portfolio_store and result.winner:
+            self.portfolio_store.record(
+                fingerprint,
+                result.winner,
+                status=result.StatusName(),
+                objective=result.objective,
+                prover=result.prover,
+                wall_time=round(result.wall_time, 2),
+            )
+        return result
+
+    def _phase1_partition(self) -> Optional[ExamPartition]:
+        """The exam partition to decompose Phase 1 by, if enabled and useful."""
+        if not getattr(self.problem, "phase1_decomposition", False):
+            return None
+        partition = partition_exams(
+            self.problem,
+            max_parts=max(
+                2, getattr(self.problem, "solver_num_workers", 0) or os.cpu_count() or 2
+            ),
+            max_cut_students=getattr(
+                self.problem, "decomposition_max_cut_students", 0
+            ),
+        )
+        if partition.is_trivial:
+            logger.info("Exams form a single coupled group; solving Phase 1 whole.")
+            return None
+        return partition
+
+    def _tuned_config(self, phase: str) -> Optional[PortfolioConfig]:
+        return self.tuned_profile.config_for(phase) if self.tuned_profile else None
+
+    def _tuned_time_limit(self, key: str, configured: float) -> float:
+        """The configured limit, capped by what tuning showed the tier needs."""
+        tuned = getattr(self.tuned_profile, key, None) if self.tuned_profile else None
+        return min(float(configured), float(tuned)) if tuned else float(configured)
+
+    def _export_for_tuning(self, model, phase: str) -> None:
+        """Saves an anonymized copy of the model for the offline tuner."""
+        if not self.tuning_export_dir:
+            return
+        try:
+            path = export_model(
+                model, self.tuning_export_dir, size_tier(self.problem), phase
+            )
+            logger.info(f"Exported {phase} model for tuning to {path}")
+        except OSError as e:
+            logger.warning(f"Could not export {phase} model for tuning: {e}")
+
+    def _explain_infeasibility(
+        self,
+        builder: CPSATModelBuilder,
+        model: cp_model.CpModel,
+        shared_vars,
+        phase: str,
+        locks: List[Dict[str, Any]],
+    ) -> Optional[InfeasibilityExplanation]:
+        """Runs the optional core-based diagnosis on an INFEASIBLE model."""
+        if not self.diagnose_infeasibility or not builder.constraint_manager:
+            return None
+        logger.info(f"Running infeasibility diagnosis for {phase}...")
+        time_limit = getattr(self.problem, "diagnosis_time_limit_seconds", 20.0)
+        if self.time_budget:
+            time_limit = min(time_limit, self.time_budget.remaining())
+        try:
+            explainer = InfeasibilityExplainer(
+                self.problem, time_limit_seconds=time_limit
+            )
+            explanation = explainer.explain(
+                model,
+                shared_vars,
+                builder.constraint_manager.get_hard_constraint_ranges(),
+                phase,
+                locks,
+            )
+        except Exception as e:
+            logger.error(
+                f"Infeasibility diagnosis for {phase} failed: {e}", exc_info=True
+            )
+            return None
+        self.infeasibility_explanations.append(explanation)
+        return explanation
+
     def _populate_solution_from_phase1(
         self, exam_slot_map: Dict, solution: TimetableSolution
     ) -> None:
@@ -307,16 +603,24 @@ class CPSATSolverManager:
         logger.info(f"Populated {len(exam_slot_map)} time assignments.")
 
     def _configure_solver_parameters(
-        self, time_limit_override: Optional[float] = None, log_progress: bool = True
+        self,
+        time_limit_override: Optional[float] = None,
+        log_progress: bool = True,
+        config: Optional[PortfolioConfig] = None,
     ) -> None:
-        """Configures solver parameters."""
+        """Configures solver parameters from a portfolio configuration."""
         logger.info("Configuring solver parameters...")
         params = self.solver.parameters
+        # The solver is reused across phases; start each from the defaults so
+        # fields set by an earlier config do not carry over.
+        params.Clear()
         params.enumerate_all_solutions = False
         params.log_search_progress = log_progress
 
-        time_limit = time_limit_override or getattr(
-            self.problem, "solver_time_limit_seconds", 300.0
+        time_limit = (
+            time_limit_override
+            if time_limit_override is not None
+            else getattr(self.problem, "solver_time_limit_seconds", 300.0)
         )
         params.max_time_in_seconds = float(time_limit)
 
@@ -327,12 +631,13 @@ class CPSATSolverManager:
             logger.info("solver_num_workers not set, allowing OR-Tools to auto-detect.")
 
         params.cp_model_presolve = True
-        params.cp_model_probing_level = 2
-        params.search_branching = sat_parameters_pb2.SatParameters.PORTFOLIO_SEARCH
-        params.linearization_level = 2
-        params.use_lns = True
+        config = config or DEFAULT_CONFIG
+        config.apply(params)
+        if num_workers > 0 and params.num_workers > num_workers:
+            # A tuned worker count never exceeds the cores free on this worker.
+            params.num_workers = int(num_workers)
 
         if log_progress:
             logger.info(
-                f"Solver configured: TimeLimit={params.max_time_in_seconds}s, Workers={params.num_workers}, LogProgress={log_progress}"
+                f"Solver configured: Config={config.name}, TimeLimit={params.max_time_in_seconds}s, Workers={params.num_workers}, LogProgress={log_progress}"
             )
@@ -0,0 +1,225 @@
+# scheduling_engine/cp_sat/time_budget.py
+
+"""
+One wall-clock deadline per job, shared out across the solve stages.
+
+Without it every stage has its own limit: the GA runs its generations, Phase 1
+gets `solver_time_limit_seconds` and each start-time group of Phase 2 gets
+`subproblem_time_limit_seconds`, so a session with many groups takes however
+long the groups add up to.
+
+A TimeBudget plans the stages up front from size estimates: a fixed share for
+building Phase 1 (GA included), the solve time split between Phase 1 and
+Phase 2 by their estimated variable counts, and a reserve for extracting and
+saving the result. Once Phase 1 has fixed the start times, the Phase 2 stage
+is split into one stage per group, weighted by that group's size.
+
+Allotments are made when a stage starts, from the time actually left: a stage
+gets the remaining time in proportion of its planned time to that of all
+stages still pending. A stage that finishes early therefore leaves its spare
+time to the rest, most of it going to the largest of them, and groups are run
+smallest first so that the spare time flows to the hardest. CP-SAT stops at
+its allotment (or the deadline) with its best incumbent.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+PHASE1_BUILD = "phase1_build"
+PHASE1_SOLVE = "phase1_solve"
+PHASE2 = "phase2"
+RESERVE = "reserve"
+
+# Shares of the deadline planned for building Phase 1 and kept in reserve.
+BUILD_SHARE = 0.10
+RESERVE_SHARE = 0.05
+# Bounds on Phase 1's share of the solve time, whatever the size estimates say.
+PHASE1_SHARE_BOUNDS = (0.4, 0.8)
+
+
+@dataclass
+class StageTiming:
+    """Planned, allotted and actual seconds of one stage."""
+
+    planned: float
+    allotted: Optional[float] = None
+    actual: Optional[float] = None
+    status: Optional[str] = None
+    started_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "planned_seconds": round(self.planned, 2),
+            "allotted_seconds": (
+                None if self.allotted is None else round(self.allotted, 2)
+            ),
+            "actual_seconds": None if self.actual is None else round(self.actual, 2),
+            "status": self.status,
+        }
+
+
+def phase1_size(problem) -> int:
+    """Estimated Phase 1 start variables."""
+    return len(problem.exams) * len(problem.timeslots)
+
+
+def phase2_size(problem) -> int:
+    """Estimated Phase 2 room and invigilator variables over all groups."""
+    rooms = len(problem.rooms)
+    groups = min(len(problem.exams), len(problem.timeslots))
+    return len(problem.exams) * rooms + groups * len(problem.invigilators) * rooms
+
+
+def group_size(problem, exam_ids: Sequence, start_slot_id) -> int:
+    """Estimated room and invigilator variables of one Phase 2 group."""
+    occupied = max(
+        (
+            len(problem.get_occupancy_slots(exam_id, start_slot_id))
+            for exam_id in exam_ids
+        ),
+        default=1,
+    )
+    return (len(exam_ids) + len(problem.invigilators)) * len(problem.rooms) * occupied
+
+
+class TimeBudget:
+    """A job deadline, allotted to stages as they start."""
+
+    def __init__(
+        self,
+        deadline_seconds: float,
+        plan: Dict[str, float],
+        clock: Callable[[], float] = time.monotonic,
+        min_stage_seconds: float = 1.0,
+    ):
+        self.deadline_seconds = float(deadline_seconds)
+        self.clock = clock
+        self.min_stage_seconds = min_stage_seconds
+        self.started_at = clock()
+        self.stages: Dict[str, StageTiming] = {
+            name: StageTiming(planned=planned) for name, planned in plan.items()
+        }
+
+    @classmethod
+    def for_problem(cls, problem, deadline_seconds: float, **kwargs) -> "TimeBudget":
+        """Plans the stages of `problem` within `deadline_seconds`."""
+        deadline = float(deadline_seconds)
+        solve = deadline * (1 - BUILD_SHARE - RESERVE_SHARE)
+        phase1, phase2 = phase1_size(problem), phase2_size(problem)
+        low, high = PHASE1_SHARE_BOUNDS
+        share = min(high, max(low, phase1 / max(1, phase1 + phase2)))
+        budget = cls(
+            deadline,
+            {
+                PHASE1_BUILD: deadline * BUILD_SHARE,
+                PHASE1_SOLVE: solve * share,
+                PHASE2: solve * (1 - share),
+                RESERVE: deadline * RESERVE_SHARE,
+            },
+            **kwargs,
+        )
+        logger.info(
+            f"Time budget of {deadline:.0f}s planned: "
+            + ", ".join(f"{n}={s.planned:.1f}s" for n, s in budget.stages.items())
+        )
+        return budget
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started_at
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline_seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def split(self, stage: str, weights: Dict[str, float]) -> List[str]:
+        """
+        Replaces the pending `stage` by sub-stages sharing its planned time by
+        weight. Returns the sub-stage names smallest first, the order to run
+        them in so that spare time reaches the largest.
+        """
+        parent = self.stages.pop(stage, None)
+        planned = parent.planned if parent else 0.0
+        total = sum(weights.values())
+        ordered = sorted(weights, key=lambda name: weights[name])
+        reserve = self.stages.pop(RESERVE, None)
+        for name in ordered:
+            share = weights[name] / total if total > 0 else 1 / len(weights)
+            self.stages[name] = StageTiming(planned=planned * share)
+        if reserve is not None:
+            self.stages[RESERVE] = reserve
+        return ordered
+
+    def start(self, stage: str) -> float:
+        """Starts `stage` and returns its allotment in seconds."""
+        timing = self.stages.setdefault(stage, StageTiming(planned=0.0))
+        # Every stage not yet started, this one and the reserve included.
+        pending = sum(s.planned for s in self.stages.values() if s.started_at is None)
+        remaining = self.remaining()
+        share = timing.planned / pending if pending > 0 else 1.0
+        allotted = min(remaining, max(self.min_stage_seconds, remaining * share))
+        timing.allotted = allotted
+        timing.started_at = self.clock()
+        logger.info(
+            f"Time budget: {stage} allotted {allotted:.1f}s "
+            f"(planned {timing.planned:.1f}s, {remaining:.1f}s left)."
+        )
+        return allotted
+
+    def stage_remaining(self, stage: str) -> float:
+        """What is left of a started stage's allotment."""
+        timing = self.stages[stage]
+        if timing.allotted is None or timing.started_at is None:
+            return 0.0
+        spent = self.clock() - timing.started_at
+        return max(0.0, min(timing.allotted - spent, self.remaining()))
+
+    def finish(self, stage: str, status: Optional[str] = None) -> None:
+        timing = self.stages.get(stage)
+        if timing is None or timing.started_at is None:
+            return
+        timing.actual = self.clock() - timing.started_at
+        timing.status = status
+
+    def report(self) -> Dict[str, Any]:
+        """Planned versus actual seconds per stage."""
+        return {
+            "deadline_seconds": self.deadline_seconds,
+            "elapsed_seconds": round(self.elapsed(), 2),
+            "stages": {name: s.to_dict() for name, s in self.stages.items()},
+        }
+
+    def log_report(self) -> None:
+        logger.info(
+            f"Time budget report ({self.elapsed():.1f}s of {self.deadline_seconds:.0f}s):"
+        )
+        for name, timing in self.stages.items():
+            actual = "-" if timing.actual is None else f"{timing.actual:.1f}s"
+            logger.info(
+                f"  {name}: planned {timing.planned:.1f}s, actual {actual}"
+                + (f" ({timing.status})" if timing.status else "")
+            )
+
+
+def phase2_stage(start_slot_id) -> str:
+    return f"{PHASE2}:{start_slot_id}"
+
+
+def plan_groups(
+    budget: TimeBudget, problem, groups: Dict[Any, List]
+) -> List[Tuple[Any, List]]:
+    """Splits the Phase 2 stage over the start-time groups; returns run order."""
+    order = budget.split(
+        PHASE2,
+        {
+            phase2_stage(slot_id): group_size(problem, exam_ids, slot_id)
+            for slot_id, exam_ids in groups.items()
+        },
+    )
+    by_stage = {phase2_stage(slot_id): slot_id for slot_id in groups}
+    return [(by_stage[name], groups[by_stage[name]]) for name in order]
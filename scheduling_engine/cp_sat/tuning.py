@@ -0,0 +1,402 @@
+# scheduling_engine/cp_sat/tuning.py
+
+"""
+Offline CP-SAT parameter tuning over recorded instances.
+
+Jobs can export their Phase 1 and Phase 2 models as anonymized CpModelProto
+files (names stripped, file names carry only the size tier and phase). The
+tuner runs successive halving over a parameter space on those files using
+local cores: every candidate is run on every instance of a tier with a small
+time budget, the best third survive to a rung with three times the budget,
+and so on until one candidate is left.
+
+The result is a JSON file with one profile per size tier: the winning
+parameters for each phase, plus time limits derived from how long the winner
+actually needed. CPSATSolverManager loads the profile matching the problem's
+tier at solve time.
+
+    python -m scheduling_engine.cp_sat.tuning INSTANCE_DIR --output profiles.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from ortools.sat import cp_model_pb2, sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+from scheduling_engine.cp_sat.portfolio import DEFAULT_CONFIG, PortfolioConfig
+
+logger = logging.getLogger(__name__)
+
+_SatParameters = sat_parameters_pb2.SatParameters
+
+PHASES = ("phase1", "phase2")
+
+# Upper bound on exam count for each tier; the last tier is open-ended.
+SIZE_TIERS: Tuple[Tuple[str, Optional[int]], ...] = (
+    ("small", 100),
+    ("medium", 500),
+    ("large", 2000),
+    ("xlarge", None),
+)
+
+SEARCH_SPACE: Dict[str, List[Any]] = {
+    "num_workers": [1, 2, 4, 8],
+    "linearization_level": [0, 1, 2],
+    "symmetry_level": [0, 1, 2, 3, 4],
+    "cp_model_probing_level": [0, 1, 2],
+    "use_lns": [True, False],
+    "search_branching": [
+        _SatParameters.AUTOMATIC_SEARCH,
+        _SatParameters.PORTFOLIO_SEARCH,
+        _SatParameters.PORTFOLIO_WITH_QUICK_RESTART_SEARCH,
+    ],
+}
+
+# A derived time limit is this multiple of the slowest (p95) instance's need.
+TIME_LIMIT_SAFETY_FACTOR = 1.5
+
+
+def size_tier(problem) -> str:
+    exams = len(problem.exams)
+    for name, upper in SIZE_TIERS:
+        if upper is None or exams < upper:
+            return name
+    return SIZE_TIERS[-1][0]
+
+
+# --- Export -----------------------------------------------------------------
+
+
+def anonymize(proto: cp_model_pb2.CpModelProto) -> cp_model_pb2.CpModelProto:
+    """A copy with every name removed; variable names embed entity IDs."""
+    anonymous = cp_model_pb2.CpModelProto()
+    anonymous.CopyFrom(proto)
+    anonymous.name = ""
+    for variable in anonymous.variables:
+        variable.name = ""
+    for constraint in anonymous.constraints:
+        constraint.name = ""
+    return anonymous
+
+
+def export_model(model: cp_model.CpModel, directory, tier: str, phase: str) -> Path:
+    """Writes the anonymized model as `<tier>__<phase>__<random>.pb`."""
+    path = Path(directory) / f"{tier}__{phase}__{uuid4().hex[:12]}.pb"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(anonymize(model.Proto()).SerializeToString())
+    return path
+
+
+def load_instances(directory) -> Dict[Tuple[str, str], List[Path]]:
+    """Exported instance files grouped by (tier, phase)."""
+    groups: Dict[Tuple[str, str], List[Path]] = defaultdict(list)
+    for path in sorted(Path(directory).glob("*.pb")):
+        parts = path.stem.split("__")
+        if len(parts) == 3 and parts[1] in PHASES:
+            groups[(parts[0], parts[1])].append(path)
+    return dict(groups)
+
+
+# --- Evaluation ---------------------------------------------------------------
+
+
+class _TimeToBest(cp_model.CpSolverSolutionCallback):
+    def __init__(self):
+        super().__init__()
+        self.time_to_best = None
+
+    def OnSolutionCallback(self):
+        self.time_to_best = self.WallTime()
+
+
+def evaluate(path, parameters: Dict[str, Any], budget: float) -> Dict[str, Any]:
+    """Solves one instance with one candidate. Top-level so pools can pickle it."""
+    model = cp_model.CpModel()
+    model.Proto().ParseFromString(Path(path).read_bytes())
+    solver = cp_model.CpSolver()
+    PortfolioConfig("candidate", parameters).apply(solver.parameters)
+    solver.parameters.max_time_in_seconds = budget
+    callback = _TimeToBest()
+    status = solver.Solve(model, callback)
+    solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        "status": int(status),
+        "objective": solver.ObjectiveValue() if solved else None,
+        "sense": -1 if model.Proto().objective.scaling_factor < 0 else 1,
+        "wall_time": solver.WallTime(),
+        "time_to_best": callback.time_to_best,
+    }
+
+
+def score_results(
+    results: Dict[Tuple[int, int], Dict[str, Any]],
+    candidates: Sequence[int],
+    instances: Sequence[int],
+    budget: float,
+) -> Dict[int, float]:
+    """
+    Mean over instances of (relative gap to the best objective any candidate
+    reached) + (fraction of the budget used before the search finished).
+    Lower is better; a candidate that found nothing scores 2 on that instance.
+    """
+    scores: Dict[int, float] = {}
+    for c in candidates:
+        total = 0.0
+        for i in instances:
+            result = results[(c, i)]
+            finished = result["status"] in (cp_model.OPTIMAL, cp_model.INFEASIBLE)
+            time_used = min(1.0, result["wall_time"] / budget) if finished else 1.0
+            if result["status"] == cp_model.INFEASIBLE:
+                total += time_used
+                continue
+            if result["objective"] is None:
+                total += 2.0
+                continue
+            sense = result["sense"]
+            best = min(
+                sense * results[(other, i)]["objective"]
+                for other in candidates
+                if results[(other, i)]["objective"] is not None
+            )
+            gap = (sense * result["objective"] - best) / max(1.0, abs(best))
+            total += min(1.0, gap) + time_used
+        scores[c] = total / max(1, len(instances))
+    return scores
+
+
+def sample_candidates(
+    count: int, rng: random.Random, max_workers: int
+) -> List[Dict[str, Any]]:
+    """The current default first, then distinct random points of SEARCH_SPACE."""
+    worker_choices = [n for n in SEARCH_SPACE["num_workers"] if n <= max_workers]
+    default = dict(DEFAULT_CONFIG.parameters, num_workers=max(worker_choices or [1]))
+    candidates = [default]
+    seen = {json.dumps(default, sort_keys=True)}
+    attempts = 0
+    while len(candidates) < count and attempts < count * 50:
+        attempts += 1
+        candidate = {
+            key: rng.choice((worker_choices or [1]) if key == "num_workers" else values)
+            for key, values in SEARCH_SPACE.items()
+        }
+        signature = json.dumps(candidate, sort_keys=True)
+        if signature not in seen:
+            seen.add(signature)
+            candidates.append(candidate)
+    return candidates
+
+
+@dataclass
+class TuningOutcome:
+    parameters: Dict[str, Any]
+    score: float
+    time_needed: List[float] = field(default_factory=list)
+    rungs: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def successive_halving(
+    instances: Sequence[Path],
+    candidates: Sequence[Dict[str, Any]],
+    min_budget: float = 5.0,
+    eta: int = 3,
+    max_rungs: int = 4,
+    cores: Optional[int] = None,
+) -> TuningOutcome:
+    """Keeps the best 1/eta of the candidates per rung, multiplying the budget by eta."""
+    cores = cores or os.cpu_count() or 1
+    survivors = list(range(len(candidates)))
+    budget = min_budget
+    rungs: List[Dict[str, Any]] = []
+    results: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    scores: Dict[int, float] = {}
+
+    for rung in range(max_rungs):
+        widest = max(candidates[c].get("num_workers", 1) or 1 for c in survivors)
+        jobs = [(c, i) for c in survivors for i in range(len(instances))]
+        results = _run_jobs(jobs, instances, candidates, budget, cores // widest)
+        scores = score_results(results, survivors, range(len(instances)), budget)
+        survivors.sort(key=lambda c: scores[c])
+        rungs.append(
+            {
+                "rung": rung,
+                "budget": budget,
+                "candidates": len(survivors),
+                "best_score": scores[survivors[0]],
+            }
+        )
+        logger.info(
+            f"Rung {rung}: {len(survivors)} candidates at {budget:.1f}s, "
+            f"best score {scores[survivors[0]]:.3f}"
+        )
+        if len(survivors) == 1:
+            break
+        survivors = survivors[: max(1, len(survivors) // eta)]
+        budget *= eta
+
+    winner = survivors[0]
+    time_needed = []
+    for i in range(len(instances)):
+        result = results[(winner, i)]
+        if result["status"] in (cp_model.OPTIMAL, cp_model.INFEASIBLE):
+            time_needed.append(result["wall_time"])
+        elif result["time_to_best"] is not None:
+            time_needed.append(result["time_to_best"])
+        else:
+            time_needed.append(rungs[-1]["budget"])
+    return TuningOutcome(
+        parameters=dict(candidates[winner]),
+        score=scores[winner],
+        time_needed=time_needed,
+        rungs=rungs,
+    )
+
+
+def _run_jobs(jobs, instances, candidates, budget, parallel):
+    """Evaluates jobs on local cores, falling back to in-process evaluation."""
+    args = [(str(instances[i]), candidates[c], budget) for c, i in jobs]
+    if parallel > 1 and len(jobs) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(parallel, len(jobs))) as pool:
+                outputs = list(pool.map(evaluate, *zip(*args)))
+            return dict(zip(jobs, outputs))
+        except (RuntimeError, AssertionError, OSError) as e:
+            logger.warning(f"Process pool unavailable ({e}); evaluating in-process.")
+    return {job: evaluate(*arg) for job, arg in zip(jobs, args)}
+
+
+def _time_limit(time_needed: Sequence[float]) -> Optional[float]:
+    if not time_needed:
+        return None
+    ordered = sorted(time_needed)
+    p95 = ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+    return float(math.ceil(max(1.0, TIME_LIMIT_SAFETY_FACTOR * p95)))
+
+
+def tune(
+    instance_dir,
+    candidates: int = 27,
+    min_budget: float = 5.0,
+    eta: int = 3,
+    max_rungs: int = 4,
+    cores: Optional[int] = None,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """Tunes every (tier, phase) found in `instance_dir`; returns the profiles."""
+    cores = cores or os.cpu_count() or 1
+    rng = random.Random(seed)
+    pool = sample_candidates(candidates, rng, max_workers=cores)
+    profiles: Dict[str, Dict[str, Any]] = {}
+    for (tier, phase), paths in sorted(load_instances(instance_dir).items()):
+        logger.info(f"Tuning {tier}/{phase} on {len(paths)} instances...")
+        started = time.monotonic()
+        outcome = successive_halving(paths, pool, min_budget, eta, max_rungs, cores)
+        profile = profiles.setdefault(tier, {})
+        profile[phase] = {
+            "parameters": outcome.parameters,
+            "score": round(outcome.score, 4),
+            "instances": len(paths),
+            "rungs": outcome.rungs,
+            "tuning_seconds": round(time.monotonic() - started, 1),
+        }
+        limit_key = (
+            "phase1_time_limit_seconds"
+            if phase == "phase1"
+            else "subproblem_time_limit_seconds"
+        )
+        profile[limit_key] = _time_limit(outcome.time_needed)
+        profile["tuned_at"] = datetime.now(timezone.utc).isoformat()
+    return profiles
+
+
+# --- Selection at solve time ---------------------------------------------------
+
+
+@dataclass
+class TunedProfile:
+    tier: str
+    phase_configs: Dict[str, PortfolioConfig] = field(default_factory=dict)
+    phase1_time_limit_seconds: Optional[float] = None
+    subproblem_time_limit_seconds: Optional[float] = None
+
+    def config_for(self, phase: str) -> Optional[PortfolioConfig]:
+        return self.phase_configs.get(phase)
+
+
+def load_tuned_profile(path, problem) -> Optional[TunedProfile]:
+    """The profile for the problem's size tier, or None if there is none."""
+    if not path:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            profiles = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable tuned profiles {path}: {e}")
+        return None
+
+    tier = size_tier(problem)
+    entry = profiles.get(tier)
+    if not entry:
+        return None
+    valid_fields = set(_SatParameters.DESCRIPTOR.fields_by_name)
+    configs = {}
+    for phase in PHASES:
+        parameters = (entry.get(phase) or {}).get("parameters") or {}
+        parameters = {k: v for k, v in parameters.items() if k in valid_fields}
+        if parameters:
+            configs[phase] = PortfolioConfig(f"tuned_{tier}_{phase}", parameters)
+    profile = TunedProfile(
+        tier=tier,
+        phase_configs=configs,
+        phase1_time_limit_seconds=entry.get("phase1_time_limit_seconds"),
+        subproblem_time_limit_seconds=entry.get("subproblem_time_limit_seconds"),
+    )
+    logger.info(f"Using tuned solver profile for tier '{tier}' from {path}.")
+    return profile
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Tune CP-SAT parameters on exported scheduling models."
+    )
+    parser.add_argument("instances", help="Directory of exported *.pb models.")
+    parser.add_argument("--output", default="solver_profiles.json")
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--min-budget", type=float, default=5.0)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--max-rungs", type=int, default=4)
+    parser.add_argument("--cores", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    profiles = tune(
+        args.instances,
+        candidates=args.candidates,
+        min_budget=args.min_budget,
+        eta=args.eta,
+        max_rungs=args.max_rungs,
+        cores=args.cores,
+        seed=args.seed,
+    )
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, indent=2)
+    logger.info(f"Wrote profiles for {sorted(profiles)} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -197,6 +197,18 @@ class GAProcessor:
                 offspring, ga_instance, self.problem_spec
             )
 
+        # A job time budget bounds the evolution by wall clock as well.
+        time_limit = self.ga_params.get("time_limit_seconds")
+
+        def generation_func_wrapper(ga_instance):
+            if time_limit is not None and time.time() - start_time >= time_limit:
+                logger.info(
+                    f"GA time limit of {time_limit:.1f}s reached after "
+                    f"{ga_instance.generations_completed} generations."
+                )
+                return "stop"
+            return None
+
         # --- Step 3: Configure and run the PyGAD instance ---
         logger.info("Step 3: Configuring PyGAD instance...")
         ga_instance = pygad.GA(
@@ -211,6 +223,7 @@ class GAProcessor:
             mutation_probability=mut_prob,
             allow_duplicate_genes=True,
             stop_criteria=[f"saturate_{int(generations * 0.2)}"],
+            on_generation=generation_func_wrapper,
         )
 
         logger.info(
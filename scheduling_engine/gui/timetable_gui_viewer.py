@@ -30,7 +30,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import json
 from datetime import datetime, date, time
-from typing import Dict, List, Set, Optional, Any, TYPE_CHECKING
+from typing import Dict, List, Set, Optional, Any, Tuple, TYPE_CHECKING
 from uuid import UUID
 from collections import defaultdict, Counter
 import logging
@@ -42,6 +42,12 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Calendar canvas geometry, in pixels.
+CALENDAR_CELL_WIDTH = 150
+CALENDAR_CELL_HEIGHT = 80
+CALENDAR_HEADER_WIDTH = 80
+CALENDAR_HEADER_HEIGHT = 40
+
 
 class TimetableGUIViewer:
     """
@@ -428,16 +434,9 @@ class TimetableGUIViewer:
         """Populate the list with students."""
         for student_id, student in self.problem.students.items():
             # Calculate exam count for this student
-            exam_count = 0
-            for assignment in self.solution.assignments.values():
-                if assignment.is_complete():
-                    exam = self.problem.exams.get(assignment.exam_id)
-                    if exam:
-                        student_exams = self.get_students_for_exam_enhanced(
-                            assignment.exam_id
-                        )
-                        if student_id in student_exams:
-                            exam_count += 1
+            exam_count = len(
+                self.processed_data["exams_by_student"].get(student_id, ())
+            )
 
             # Get student details
             department = getattr(student, "department", "Unknown")
@@ -455,10 +454,7 @@ class TimetableGUIViewer:
         """Populate the list with rooms."""
         for room_id, room in self.problem.rooms.items():
             # Calculate exam count for this room
-            exam_count = 0
-            for assignment in self.solution.assignments.values():
-                if assignment.is_complete() and room_id in assignment.room_ids:
-                    exam_count += 1
+            exam_count = len(self.processed_data["exams_by_room"].get(room_id, ()))
 
             self.entity_tree.insert(
                 "",
@@ -478,9 +474,10 @@ class TimetableGUIViewer:
 
         # In populate_invigilator_list method, add proper counting:
         for invigilator_id, invigilator in invigilators.items():
-            # Calculate exam count for this invigilator using our new method
-            inv_assigns = self.get_invigilator_assignments(invigilator_id)
-            exam_count = len(inv_assigns)
+            # Calculate exam count for this invigilator
+            exam_count = len(
+                self.processed_data["exams_by_invigilator"].get(invigilator_id, ())
+            )
 
             invigilator_name = getattr(
                 invigilator, "name", f"Invigilator {str(invigilator_id)[:8]}..."
@@ -609,107 +606,59 @@ class TimetableGUIViewer:
     def get_entity_schedule_data(
         self, entity_id: UUID, view_type: str
     ) -> List[Dict[str, Any]]:
-        schedule_data = []
-
-        for assignment in self.solution.assignments.values():
-            if not assignment.is_complete():
-                continue
-
-            include_assignment = False
-
-            if view_type == "student":
-                # Check if student is enrolled in this exam
-                student_exams = self.get_students_for_exam_enhanced(assignment.exam_id)
-                include_assignment = entity_id in student_exams
-            elif view_type == "room":
-                # Check if room is assigned to this exam
-                include_assignment = entity_id in assignment.room_ids
-            elif view_type == "invigilator":
-                # Check if invigilator is assigned to this exam
-                include_assignment = entity_id in assignment.invigilator_ids
-
-            if include_assignment:
-                exam = self.problem.exams.get(assignment.exam_id)
-                assert assignment.time_slot_id
-                timeslot = self.problem.timeslots.get(assignment.time_slot_id)
+        """Chronological schedule rows for a student, room or invigilator."""
+        index_name = {
+            "student": "exams_by_student",
+            "room": "exams_by_room",
+            "invigilator": "exams_by_invigilator",
+        }.get(view_type)
+        if index_name is None or not self.processed_data:
+            return []
+
+        rows = self.processed_data["schedule_rows"]
+        return [
+            rows[exam_id]
+            for exam_id in self.processed_data[index_name].get(entity_id, ())
+            if exam_id in rows
+        ]
 
-                if exam and timeslot:
-                    # Get room information
-                    room_info = []
-                    for room_id in assignment.room_ids:
-                        room = self.problem.rooms.get(room_id)
-                        if room:
-                            allocation = assignment.room_allocations.get(room_id, 0)
-                            room_info.append(
-                                {
-                                    "code": room.code,
-                                    "allocation": allocation,
-                                    "capacity": room.capacity,
-                                }
-                            )
-
-                    schedule_data.append(
-                        {
-                            "exam_id": assignment.exam_id,
-                            "course_id": exam.course_id,
-                            "date": assignment.assigned_date,
-                            "timeslot": timeslot,
-                            "rooms": room_info,
-                            "duration": exam.duration_minutes,
-                            "expected_students": exam.expected_students,
-                            "is_practical": exam.is_practical,
-                        }
-                    )
+    def build_schedule_row(self, assignment, exam, timeslot) -> Dict[str, Any]:
+        """Build the display row shared by every schedule an exam appears in."""
+        # Get room information
+        room_info = []
+        for room_id in assignment.room_ids:
+            room = self.problem.rooms.get(room_id)
+            if room:
+                allocation = assignment.room_allocations.get(room_id, 0)
+                room_info.append(
+                    {
+                        "code": room.code,
+                        "allocation": allocation,
+                        "capacity": room.capacity,
+                    }
+                )
 
-            # Sort by date and time
-            schedule_data.sort(key=lambda x: (x["date"], x["timeslot"].start_time))
-        return schedule_data
+        return {
+            "exam_id": assignment.exam_id,
+            "course_id": exam.course_id,
+            "date": assignment.assigned_date,
+            "timeslot": timeslot,
+            "rooms": room_info,
+            "duration": exam.duration_minutes,
+            "expected_students": exam.expected_students,
+            "is_practical": exam.is_practical,
+        }
 
     def get_invigilator_assignments(
         self, invigilator_id: Optional[UUID] = None
     ) -> List[Dict[str, Any]]:
         """Get assignments for a specific invigilator or all invigilators if None"""
-        assignments = []
-        for assignment in self.solution.assignments.values():
-            if assignment.is_complete():
-                if (
-                    invigilator_id is None
-                    or invigilator_id in assignment.invigilator_ids
-                ):
-                    exam = self.problem.exams.get(assignment.exam_id)
-                    assert assignment.time_slot_id
-                    timeslot = self.problem.timeslots.get(assignment.time_slot_id)
-                    if exam and timeslot:
-                        # Get room information in the expected format
-                        room_info = []
-                        for room_id in assignment.room_ids:
-                            room = self.problem.rooms.get(room_id)
-                            if room:
-                                allocation = assignment.room_allocations.get(room_id, 0)
-                                room_info.append(
-                                    {
-                                        "code": room.code,
-                                        "allocation": allocation,
-                                        "capacity": room.capacity,
-                                    }
-                                )
-
-                        assignments.append(
-                            {
-                                "exam_id": assignment.exam_id,
-                                "course_id": exam.course_id,  # Added missing field
-                                "date": assignment.assigned_date,
-                                "timeslot": timeslot,
-                                "rooms": room_info,  # Properly formatted room data
-                                "duration": exam.duration_minutes,  # Added missing field
-                                "expected_students": exam.expected_students,  # Added missing field
-                                "is_practical": exam.is_practical,  # Added missing field
-                            }
-                        )
-
-        # Sort by date and time
-        assignments.sort(key=lambda x: (x["date"], x["timeslot"].start_time))
-        return assignments
+        if invigilator_id is not None:
+            return self.get_entity_schedule_data(invigilator_id, "invigilator")
+        if not self.processed_data:
+            return []
+        # Rows are stored in date and start time order.
+        return list(self.processed_data["schedule_rows"].values())
 
     def create_entity_schedule_grid(
         self, schedule_data: List[Dict[str, Any]], entity_name: str
@@ -834,8 +783,9 @@ class TimetableGUIViewer:
             students.update(course_students)
 
         # Method 3: Problem-level method
-        exam_students = self.problem.get_students_for_exam(exam_id)
-        students.update(exam_students)
+        get_students_for_exam = getattr(self.problem, "get_students_for_exam", None)
+        if get_students_for_exam:
+            students.update(get_students_for_exam(exam_id))
 
         # Method 4: Registration data lookup
         if hasattr(self.problem, "course_students") and exam:
@@ -961,19 +911,19 @@ class TimetableGUIViewer:
         self.create_legend(calendar_frame)
 
     def create_timetable_display(self, parent):
-        """Create the main timetable grid display."""
-        # Create scrollable frame for the timetable
-        canvas = tk.Canvas(parent, bg="white")
-        scrollbar_v = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
-        scrollbar_h = ttk.Scrollbar(parent, orient="horizontal", command=canvas.xview)
-        self.timetable_frame = ttk.Frame(canvas)
-
-        # Configure scrolling
-        self.timetable_frame.bind(
-            "<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        """
+        Create the main timetable grid display.
+
+        The grid is drawn on a canvas and virtualized: only the cells inside
+        the viewport are drawn, and they are redrawn on scroll and resize.
+        """
+        canvas = tk.Canvas(parent, bg="white", highlightthickness=0)
+        scrollbar_v = ttk.Scrollbar(
+            parent, orient="vertical", command=self.scroll_calendar_y
+        )
+        scrollbar_h = ttk.Scrollbar(
+            parent, orient="horizontal", command=self.scroll_calendar_x
         )
-
-        canvas.create_window((0, 0), window=self.timetable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar_v.set, xscrollcommand=scrollbar_h.set)
 
         # Grid the components
@@ -981,244 +931,227 @@ class TimetableGUIViewer:
         scrollbar_v.grid(row=1, column=1, sticky=("ns"))
         scrollbar_h.grid(row=2, column=0, sticky=("we"))
 
+        canvas.bind("<Configure>", lambda e: self.render_visible_cells())
+        canvas.bind("<Button-1>", self.on_calendar_click)
+        canvas.bind(
+            "<MouseWheel>",
+            lambda e: self.scroll_calendar_y("scroll", -1 * (e.delta // 120), "units"),
+        )
+
         # Store canvas reference for updates
         self.timetable_canvas = canvas
 
         self.populate_timetable_grid()
 
-    def populate_timetable_grid(self):
-        """Populate the timetable grid with exam data."""
-        # Clear existing widgets
-        for widget in self.timetable_frame.winfo_children():
-            widget.destroy()
+    def scroll_calendar_x(self, *args):
+        self.timetable_canvas.xview(*args)
+        self.render_visible_cells()
+
+    def scroll_calendar_y(self, *args):
+        self.timetable_canvas.yview(*args)
+        self.render_visible_cells()
 
+    def populate_timetable_grid(self):
+        """Size the calendar canvas for the current data and draw the viewport."""
         if not self.processed_data:
             return
 
-        # Create headers
-        self.create_timetable_headers()
-
-        # Create time slot rows
-        self.create_timetable_content()
+        dates = self.processed_data["calendar_dates"]
+        templates = self.processed_data["calendar_templates"]
+        self.timetable_canvas.configure(
+            scrollregion=(
+                0,
+                0,
+                CALENDAR_HEADER_WIDTH + len(dates) * CALENDAR_CELL_WIDTH,
+                CALENDAR_HEADER_HEIGHT + len(templates) * CALENDAR_CELL_HEIGHT,
+            ),
+            xscrollincrement=CALENDAR_CELL_WIDTH // 4,
+            yscrollincrement=CALENDAR_CELL_HEIGHT // 4,
+        )
+        self.render_visible_cells()
 
         logger.debug("🗓️ Timetable grid populated")
 
-    def create_timetable_headers(self):
-        # Top-left corner
-        header = tk.Frame(
-            self.timetable_frame, relief="raised", borderwidth=1, bg="lightgray"
+    @staticmethod
+    def visible_cell_range(
+        x0: float, y0: float, width: int, height: int, n_rows: int, n_cols: int
+    ) -> Tuple[range, range]:
+        """Rows and columns of the calendar intersecting the viewport."""
+        first_col = max(0, int((x0 - CALENDAR_HEADER_WIDTH) // CALENDAR_CELL_WIDTH))
+        last_col = min(
+            n_cols, int((x0 + width - CALENDAR_HEADER_WIDTH) // CALENDAR_CELL_WIDTH) + 1
         )
-        header.grid(row=0, column=0, sticky="nsew", padx=1, pady=1)
-        tk.Label(
-            header, text="Time \\ Date", font=("Arial", 9, "bold"), bg="lightgray"
-        ).pack(expand=True)
-
-        # Unique sorted dates - using safe date formatting
-        dates = sorted(
-            {
-                self.safe_parse_date(assignment.assigned_date)
-                for assignment in self.solution.assignments.values()
-                if assignment.assigned_date is not None
-            }
+        first_row = max(0, int((y0 - CALENDAR_HEADER_HEIGHT) // CALENDAR_CELL_HEIGHT))
+        last_row = min(
+            n_rows,
+            int((y0 + height - CALENDAR_HEADER_HEIGHT) // CALENDAR_CELL_HEIGHT) + 1,
+        )
+        return range(first_row, max(first_row, last_row)), range(
+            first_col, max(first_col, last_col)
         )
 
-        self.date_columns = {}
-        for col, dt in enumerate(dates, start=1):
-            cell = tk.Frame(
-                self.timetable_frame, relief="raised", borderwidth=1, bg="lightgray"
-            )
-            cell.grid(row=0, column=col, sticky="nsew", padx=1, pady=1)
-            tk.Label(
-                cell,
-                text=self.safe_format_date(dt, "%a\n%b %d"),
-                font=("Arial", 9, "bold"),
-                bg="lightgray",
-            ).pack(expand=True)
-            self.date_columns[dt] = col
-
-    def safe_parse_date(self, date_input):
-        """Safely parse date input to date object"""
-        if isinstance(date_input, date):
-            return date_input
-        elif isinstance(date_input, str):
-            try:
-                return datetime.strptime(date_input, "%Y-%m-%d").date()
-            except ValueError:
-                try:
-                    return datetime.fromisoformat(date_input).date()
-                except:
-                    return date_input  # return as-is if parsing fails
-        return date_input
+    def render_visible_cells(self):
+        """Redraw the cells, and the pinned headers, inside the viewport."""
+        if not self.processed_data or not hasattr(self, "timetable_canvas"):
+            return
 
-    def create_timetable_content(self):
-        # Unique time‐templates sorted by start_time
-        templates = {
-            (ts.start_time, ts.end_time) for ts in self.problem.timeslots.values()
-        }
-        sorted_templates = sorted(templates, key=lambda t: t[0])
-
-        # Build a lookup: (date, (start,end)) -> list of assignments
-        # create_timetable_content
-        slot_map = defaultdict(list)
-        for assign in self.solution.assignments.values():
-            if assign.is_complete() and assign.time_slot_id is not None:
-                ts = self.problem.timeslots[assign.time_slot_id]
-                slot_map[(assign.assigned_date, (ts.start_time, ts.end_time))].append(
-                    assign
-                )
+        canvas = self.timetable_canvas
+        canvas.delete("calendar")
+        dates = self.processed_data["calendar_dates"]
+        templates = self.processed_data["calendar_templates"]
+        x0, y0 = canvas.canvasx(0), canvas.canvasy(0)
+        rows, cols = self.visible_cell_range(
+            x0,
+            y0,
+            canvas.winfo_width(),
+            canvas.winfo_height(),
+            len(templates),
+            len(dates),
+        )
 
-        # Populate rows for each time template
-        for row, (start, end) in enumerate(sorted_templates, start=1):
-            # Time‐template header
-            time_cell = tk.Frame(
-                self.timetable_frame, relief="raised", borderwidth=1, bg="#f0f0f0"
+        for row in rows:
+            for col in cols:
+                self.draw_calendar_cell(row, col, dates[col], templates[row])
+
+        # Headers are drawn last so they stay on top of the scrolled cells.
+        for col in cols:
+            x = CALENDAR_HEADER_WIDTH + col * CALENDAR_CELL_WIDTH
+            canvas.create_rectangle(
+                x,
+                y0,
+                x + CALENDAR_CELL_WIDTH,
+                y0 + CALENDAR_HEADER_HEIGHT,
+                fill="lightgray",
+                tags="calendar",
             )
-            time_cell.grid(row=row, column=0, sticky="nsew", padx=1, pady=1)
-            tk.Label(
-                time_cell,
+            canvas.create_text(
+                x + CALENDAR_CELL_WIDTH / 2,
+                y0 + CALENDAR_HEADER_HEIGHT / 2,
+                text=self.safe_format_date(dates[col], "%a\n%b %d"),
+                font=("Arial", 9, "bold"),
+                justify="center",
+                tags="calendar",
+            )
+        for row in rows:
+            y = CALENDAR_HEADER_HEIGHT + row * CALENDAR_CELL_HEIGHT
+            start, end = templates[row]
+            canvas.create_rectangle(
+                x0,
+                y,
+                x0 + CALENDAR_HEADER_WIDTH,
+                y + CALENDAR_CELL_HEIGHT,
+                fill="#f0f0f0",
+                tags="calendar",
+            )
+            canvas.create_text(
+                x0 + CALENDAR_HEADER_WIDTH / 2,
+                y + CALENDAR_CELL_HEIGHT / 2,
                 text=f"{start.strftime('%H:%M')}\n{end.strftime('%H:%M')}",
                 font=("Arial", 8),
-                bg="#f0f0f0",
-            ).pack(expand=True)
-
-            # One cell per date
-            for dt, col in self.date_columns.items():
-                cell = tk.Frame(
-                    self.timetable_frame, relief="raised", borderwidth=1, bg="white"
-                )
-                cell.grid(row=row, column=col, sticky="nsew", padx=1, pady=1)
-
-                assigns = slot_map.get((dt, (start, end)), [])
-                if not assigns:
-                    tk.Label(cell, text="", bg="white", width=15, height=4).pack(
-                        expand=True
-                    )
-                elif len(assigns) == 1:
-                    self.create_single_exam_display(cell, assigns[0])
-                else:
-                    self.create_multiple_exams_display(cell, assigns)
-
-                # Bind click events to view details
-                self.make_cell_interactive(cell, assigns, dt, None)
-
-    def create_timetable_cell(
-        self, row: int, col: int, date_obj: date, time_slot_id: UUID
-    ):
-        """Create a single timetable cell with exam information."""
-        cell_frame = tk.Frame(
-            self.timetable_frame, relief="raised", borderwidth=1, bg="white"
+                justify="center",
+                tags="calendar",
+            )
+        canvas.create_rectangle(
+            x0,
+            y0,
+            x0 + CALENDAR_HEADER_WIDTH,
+            y0 + CALENDAR_HEADER_HEIGHT,
+            fill="lightgray",
+            tags="calendar",
+        )
+        canvas.create_text(
+            x0 + CALENDAR_HEADER_WIDTH / 2,
+            y0 + CALENDAR_HEADER_HEIGHT / 2,
+            text="Time \\ Date",
+            font=("Arial", 9, "bold"),
+            tags="calendar",
         )
-        cell_frame.grid(row=row, column=col, sticky=("nsew"), padx=1, pady=1)
 
-        # Find exams for this date/time combination
-        cell_exams = []
-        for assignment in self.solution.assignments.values():
-            if (
-                assignment.is_complete()
-                and assignment.assigned_date == date_obj
-                and assignment.time_slot_id == time_slot_id
-            ):
-                cell_exams.append(assignment)
+    def draw_calendar_cell(self, row: int, col: int, date_obj, template):
+        """Draw one date x time template cell on the calendar canvas."""
+        canvas = self.timetable_canvas
+        x = CALENDAR_HEADER_WIDTH + col * CALENDAR_CELL_WIDTH
+        y = CALENDAR_HEADER_HEIGHT + row * CALENDAR_CELL_HEIGHT
+        assigns = self.processed_data["calendar_cells"].get((date_obj, template), [])
 
-        if not cell_exams:
-            # Empty cell
-            tk.Label(cell_frame, text="", bg="white", width=15, height=4).pack(
-                expand=True, fill="both"
+        exam = self.problem.exams.get(assigns[0].exam_id) if len(assigns) == 1 else None
+        if exam:
+            color = self.processed_data["exam_colors"].get(exam.id, "#0078D4")
+            room_codes = [
+                self.problem.rooms[room_id].code
+                for room_id in assigns[0].room_ids
+                if room_id in self.problem.rooms
+            ]
+            room_text = f"Room: {', '.join(room_codes[:2])}"
+            if len(room_codes) > 2:
+                room_text += f" +{len(room_codes)-2}"
+            text = (
+                f"Exam {str(exam.id)[:8]}...\n{room_text}\n👥 {exam.expected_students}"
             )
-            return
-
-        # Create exam display in cell
-        self.populate_exam_cell(cell_frame, cell_exams, date_obj, time_slot_id)
-
-    def populate_exam_cell(self, cell_frame, assignments, date_obj, time_slot_id):
-        """Populate a cell with exam information."""
-        if len(assignments) == 1:
-            # Single exam
-            self.create_single_exam_display(cell_frame, assignments[0])
+            fg = "white"
+        elif assigns:
+            color = "#FFE0B2"
+            text = f"{len(assigns)} exams\n(click for details)"
+            fg = "black"
         else:
-            # Multiple exams - create compact display
-            self.create_multiple_exams_display(cell_frame, assignments)
-
-        # Make cell clickable for details
-        self.make_cell_interactive(cell_frame, assignments, date_obj, time_slot_id)
-
-    def create_single_exam_display(self, parent, assignment):
-        """Create display for a single exam in a cell."""
-        exam = self.problem.exams.get(assignment.exam_id)
-        if not exam:
-            return
-
-        # Get course info (you might need to extend this based on your data model)
-        course_info = f"Exam {str(exam.id)[:8]}..."
-
-        # Get color based on department or course
-        color = self.get_exam_color(exam)
-
-        # Create colored background
-        parent.configure(bg=color)
-
-        # Exam info
-        exam_label = tk.Label(
-            parent,
-            text=course_info,
-            font=("Arial", 8, "bold"),
-            bg=color,
-            fg="white",
-            wraplength=120,
+            color, text, fg = "white", "", "black"
+
+        canvas.create_rectangle(
+            x + 1,
+            y + 1,
+            x + CALENDAR_CELL_WIDTH - 1,
+            y + CALENDAR_CELL_HEIGHT - 1,
+            fill=color,
+            outline="#cccccc",
+            tags="calendar",
         )
-        exam_label.pack(expand=True, fill="both", padx=2, pady=2)
-
-        # Room info
-        if assignment.room_ids:
-            room_codes = []
-            for room_id in assignment.room_ids:
-                room = self.problem.rooms.get(room_id)
-                if room:
-                    room_codes.append(room.code)
-
-            room_text = f"Room: {', '.join(room_codes[:2])}"
-            if len(assignment.room_ids) > 2:
-                room_text += f" +{len(assignment.room_ids)-2}"
-
-            room_label = tk.Label(
-                parent, text=room_text, font=("Arial", 7), bg=color, fg="white"
+        if text:
+            canvas.create_text(
+                x + CALENDAR_CELL_WIDTH / 2,
+                y + CALENDAR_CELL_HEIGHT / 2,
+                text=text,
+                font=("Arial", 8),
+                fill=fg,
+                width=CALENDAR_CELL_WIDTH - 8,
+                justify="center",
+                tags="calendar",
             )
-            room_label.pack(padx=2)
 
-        # Students count
-        student_count = exam.expected_students
-        student_label = tk.Label(
-            parent, text=f"👥 {student_count}", font=("Arial", 7), bg=color, fg="white"
+    def on_calendar_click(self, event):
+        """Show the details of the exams in the clicked calendar cell."""
+        if event.x < CALENDAR_HEADER_WIDTH or event.y < CALENDAR_HEADER_HEIGHT:
+            return
+        canvas = self.timetable_canvas
+        col = int(
+            (canvas.canvasx(event.x) - CALENDAR_HEADER_WIDTH) // CALENDAR_CELL_WIDTH
         )
-        student_label.pack(padx=2)
-
-    def create_multiple_exams_display(self, parent, assignments):
-        """Create compact display for multiple exams in a cell."""
-        # Use a neutral color for multiple exams
-        parent.configure(bg="#FFE0B2")
-
-        info_text = f"{len(assignments)} exams\n(click for details)"
-        label = tk.Label(
-            parent, text=info_text, font=("Arial", 8), bg="#FFE0B2", fg="black"
+        row = int(
+            (canvas.canvasy(event.y) - CALENDAR_HEADER_HEIGHT) // CALENDAR_CELL_HEIGHT
         )
-        label.pack(expand=True)
-
-    def make_cell_interactive(self, cell_frame, assignments, date_obj, time_slot_id):
-        """Make a cell interactive with click events."""
-
-        def on_click(event):
-            self.show_cell_details(assignments, date_obj, time_slot_id)
-
-        # Bind click event to the frame and its children
-        def bind_click(widget):
-            widget.bind("<Button-1>", on_click)
-            widget.bind("<Enter>", lambda e: widget.configure(cursor="hand2"))
-            widget.bind("<Leave>", lambda e: widget.configure(cursor=""))
+        dates = self.processed_data["calendar_dates"]
+        templates = self.processed_data["calendar_templates"]
+        if not (0 <= row < len(templates) and 0 <= col < len(dates)):
+            return
 
-            for child in widget.winfo_children():
-                bind_click(child)
+        assigns = self.processed_data["calendar_cells"].get(
+            (dates[col], templates[row]), []
+        )
+        if assigns:
+            self.show_cell_details(assigns, dates[col], assigns[0].time_slot_id)
 
-        bind_click(cell_frame)
+    def safe_parse_date(self, date_input):
+        """Safely parse date input to date object"""
+        if isinstance(date_input, date):
+            return date_input
+        elif isinstance(date_input, str):
+            try:
+                return datetime.strptime(date_input, "%Y-%m-%d").date()
+            except ValueError:
+                try:
+                    return datetime.fromisoformat(date_input).date()
+                except:
+                    return date_input  # return as-is if parsing fails
+        return date_input
 
     def show_cell_details(self, assignments, date_obj, time_slot_id):
         """Show detailed information for a clicked cell."""
@@ -2335,47 +2268,99 @@ class TimetableGUIViewer:
         version_label.pack(side="right")
 
     def process_solution_data(self):
-        """Process solution data for efficient GUI display."""
+        """
+        Process solution data for efficient GUI display.
+
+        Besides the per-date/time/room groupings this builds, in one pass over
+        the complete assignments in chronological order, the student, room and
+        invigilator -> exam indexes and the (date, time template) cell map, so
+        that individual schedules and calendar cells are plain lookups.
+        """
         logger.info("📊 Processing solution data for GUI display...")
 
         self.processed_data = {
             "assignments_by_date": defaultdict(list),
             "assignments_by_time": defaultdict(list),
             "assignments_by_room": defaultdict(list),
+            "exams_by_student": defaultdict(list),
+            "exams_by_room": defaultdict(list),
+            "exams_by_invigilator": defaultdict(list),
+            "schedule_rows": {},
+            "calendar_cells": defaultdict(list),
             "exam_colors": {},
             "room_usage": defaultdict(int),
             "time_usage": defaultdict(int),
         }
 
+        complete = []
+        for assignment in self.solution.assignments.values():
+            if not assignment.is_complete():
+                continue
+            timeslot = self.problem.timeslots.get(assignment.time_slot_id)
+            if timeslot is not None:
+                complete.append((assignment, timeslot))
+        complete.sort(
+            key=lambda item: (
+                self.safe_parse_date(item[0].assigned_date),
+                item[1].start_time,
+            )
+        )
+
         # Process assignments
-        for exam_id, assignment in self.solution.assignments.items():
-            if assignment.is_complete():
-                # Group by date
-                self.processed_data["assignments_by_date"][
-                    assignment.assigned_date
-                ].append(assignment)
+        for assignment, timeslot in complete:
+            exam_id = assignment.exam_id
 
-                # Group by time
-                self.processed_data["assignments_by_time"][
-                    assignment.time_slot_id
-                ].append(assignment)
+            # Group by date
+            self.processed_data["assignments_by_date"][assignment.assigned_date].append(
+                assignment
+            )
 
-                # Group by room
-                for room_id in assignment.room_ids:
-                    self.processed_data["assignments_by_room"][room_id].append(
-                        assignment
-                    )
-                    self.processed_data["room_usage"][room_id] += 1
+            # Group by time
+            self.processed_data["assignments_by_time"][assignment.time_slot_id].append(
+                assignment
+            )
+
+            # Group by room
+            for room_id in assignment.room_ids:
+                self.processed_data["assignments_by_room"][room_id].append(assignment)
+                self.processed_data["exams_by_room"][room_id].append(exam_id)
+                self.processed_data["room_usage"][room_id] += 1
+
+            # Track time usage
+            self.processed_data["time_usage"][assignment.time_slot_id] += 1
 
-                # Track time usage
-                self.processed_data["time_usage"][assignment.time_slot_id] += 1
+            # Calendar cell for the date and time template
+            self.processed_data["calendar_cells"][
+                (
+                    self.safe_parse_date(assignment.assigned_date),
+                    (timeslot.start_time, timeslot.end_time),
+                )
+            ].append(assignment)
+
+            for invigilator_id in assignment.invigilator_ids:
+                self.processed_data["exams_by_invigilator"][invigilator_id].append(
+                    exam_id
+                )
+
+            exam = self.problem.exams.get(exam_id)
+            if exam:
+                for student_id in self.get_students_for_exam_enhanced(exam_id):
+                    self.processed_data["exams_by_student"][student_id].append(exam_id)
+
+                self.processed_data["schedule_rows"][exam_id] = self.build_schedule_row(
+                    assignment, exam, timeslot
+                )
 
                 # Generate color for exam
-                exam = self.problem.exams.get(exam_id)
-                if exam:
-                    self.processed_data["exam_colors"][exam_id] = self.get_exam_color(
-                        exam
-                    )
+                self.processed_data["exam_colors"][exam_id] = self.get_exam_color(exam)
+
+        self.processed_data["calendar_dates"] = sorted(
+            {key[0] for key in self.processed_data["calendar_cells"]}
+        )
+        self.processed_data["calendar_templates"] = sorted(
+            {(ts.start_time, ts.end_time) for ts in self.problem.timeslots.values()},
+            key=lambda t: t[0],
+        )
 
         logger.info("✅ Solution data processing complete")
 
@@ -2384,7 +2369,7 @@ class TimetableGUIViewer:
         logger.info("🔄 Refreshing GUI display...")
 
         # Update calendar if it exists
-        if hasattr(self, "timetable_frame"):
+        if hasattr(self, "timetable_canvas"):
             self.populate_timetable_grid()
 
         # Update exam list if it exists
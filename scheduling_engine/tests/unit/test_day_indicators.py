@@ -0,0 +1,248 @@
+# scheduling_engine/tests/unit/test_day_indicators.py
+
+"""
+Tests for the shared on_day[exam, day] indicators built by the encoder.
+
+The indicators are defined once as the sum of an exam's starts on a day;
+day-level constraints state their limits over them instead of re-expanding
+the start sums for every student or day. These tests check the indicators
+track the starts, that the constraints using them score timetables exactly
+like the per-start formulation, and that the proto gets smaller.
+"""
+
+import asyncio
+import random
+from datetime import date, time, timedelta
+from uuid import uuid4
+
+import pytest
+from ortools.sat.python import cp_model
+
+from scheduling_engine.constraints.soft_constraints.daily_workload_balance import (
+    DailyWorkloadBalanceConstraint,
+)
+from scheduling_engine.constraints.soft_constraints.max_exams_per_student_per_day import (
+    MaxExamsPerStudentPerDayConstraint,
+)
+from scheduling_engine.core.constraint_types import (
+    ConstraintCategory,
+    ConstraintDefinition,
+    ConstraintType,
+    ParameterDefinition,
+)
+from scheduling_engine.core.problem_model import (
+    Day,
+    Exam,
+    ExamSchedulingProblem,
+    Timeslot,
+)
+from scheduling_engine.cp_sat.constraint_encoder import ConstraintEncoder
+
+
+def _build_problem(seed, n_days=3, slots_per_day=3, n_exams=6, n_students=20):
+    rng = random.Random(seed)
+    start = date(2025, 1, 6)
+    problem = ExamSchedulingProblem(
+        session_id=uuid4(), exam_period_start=start, exam_period_end=start
+    )
+    for d in range(n_days):
+        day = Day(id=uuid4(), date=start + timedelta(days=d))
+        for s in range(slots_per_day):
+            day.timeslots.append(
+                Timeslot(
+                    id=uuid4(),
+                    parent_day_id=day.id,
+                    name=f"S{s}",
+                    start_time=time(8 + 3 * s),
+                    end_time=time(11 + 3 * s),
+                    duration_minutes=180,
+                )
+            )
+        problem.days[day.id] = day
+    problem.base_slot_duration_minutes = 180
+
+    exams = [
+        Exam(id=uuid4(), course_id=uuid4(), duration_minutes=180, expected_students=0)
+        for _ in range(n_exams)
+    ]
+    for exam in exams:
+        problem.exams[exam.id] = exam
+    for _ in range(n_students):
+        student_id = uuid4()
+        for exam in rng.sample(exams, rng.randint(2, 4)):
+            exam.add_student(student_id)
+    return problem
+
+
+def _definition(constraint_id, weight=5, **parameters):
+    return ConstraintDefinition(
+        id=constraint_id,
+        name=constraint_id,
+        description="",
+        constraint_type=ConstraintType.SOFT,
+        category=ConstraintCategory.STUDENT_CONSTRAINTS,
+        weight=weight,
+        parameters=[
+            ParameterDefinition(key=key, type="int", value=value, default=value)
+            for key, value in parameters.items()
+        ],
+    )
+
+
+def _encode(problem, assignment=None):
+    """Phase 1 variables with exactly one start per exam, optionally fixed."""
+    model = cp_model.CpModel()
+    shared_vars = ConstraintEncoder(problem, model, use_ga_filter=False).encode_phase1()
+    for exam_id in problem.exams:
+        starts = [v for (e, _), v in shared_vars.x_vars.items() if e == exam_id]
+        model.AddExactlyOne(starts)
+        if assignment:
+            model.Add(shared_vars.x_vars[(exam_id, assignment[exam_id])] == 1)
+    return model, shared_vars
+
+
+def _random_assignment(problem, shared_vars, rng):
+    return {
+        exam_id: rng.choice([s for (e, s) in shared_vars.x_vars if e == exam_id])
+        for exam_id in problem.exams
+    }
+
+
+def _per_start_excess_terms(problem, model, shared_vars, weight, max_per_day):
+    """The previous encoding: sum every start of the student's exams per day."""
+    terms = []
+    student_exams = {}
+    for exam_id, exam in problem.exams.items():
+        for student_id in exam.students:
+            student_exams.setdefault(student_id, []).append(exam_id)
+    groupings = shared_vars.precomputed_data["day_slot_groupings"]
+    for exam_ids in student_exams.values():
+        if len(exam_ids) <= max_per_day:
+            continue
+        for slot_ids in groupings.values():
+            starts = [
+                shared_vars.x_vars[key]
+                for exam_id in exam_ids
+                for slot_id in slot_ids
+                if (key := (exam_id, slot_id)) in shared_vars.x_vars
+            ]
+            if len(starts) > max_per_day:
+                excess = model.NewIntVar(0, len(exam_ids), "")
+                model.Add(sum(starts) - max_per_day <= excess)
+                terms.append((weight, excess))
+    return terms
+
+
+def _linear_nonzeros(model, first_constraint=0):
+    return sum(len(c.linear.vars) for c in model.Proto().constraints[first_constraint:])
+
+
+def _solve(model, terms=()):
+    if terms:
+        model.Minimize(sum(int(w) * v for w, v in terms))
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    status = solver.Solve(model)
+    assert status == cp_model.OPTIMAL
+    return solver
+
+
+class TestOnDayIndicators:
+    def test_indicator_is_set_exactly_on_the_start_day(self):
+        problem = _build_problem(1)
+        rng = random.Random(1)
+        model, shared_vars = _encode(problem)
+        assignment = _random_assignment(problem, shared_vars, rng)
+        model, shared_vars = _encode(problem, assignment)
+
+        solver = _solve(model)
+
+        day_of_slot = {
+            slot_id: day_key
+            for day_key, slot_ids in shared_vars.precomputed_data[
+                "day_slot_groupings"
+            ].items()
+            for slot_id in slot_ids
+        }
+        assert shared_vars.on_day_vars
+        for (exam_id, day_key), indicator in shared_vars.on_day_vars.items():
+            expected = day_of_slot[assignment[exam_id]] == day_key
+            assert solver.Value(indicator) == expected
+
+    def test_one_indicator_per_exam_day(self):
+        problem = _build_problem(2)
+        _, shared_vars = _encode(problem)
+
+        assert len(shared_vars.on_day_vars) == len(problem.exams) * len(problem.days)
+        stats = shared_vars.variable_creation_stats
+        assert stats.on_day_vars_created == len(shared_vars.on_day_vars)
+
+
+class TestDayLevelConstraints:
+    @pytest.mark.parametrize("seed", range(4))
+    @pytest.mark.parametrize("max_per_day", [1, 2])
+    def test_max_exams_per_day_scores_like_per_start_sums(self, seed, max_per_day):
+        problem = _build_problem(seed)
+        definition = _definition("MAX_EXAMS_PER_DAY", max_exams_per_day=max_per_day)
+        rng = random.Random(100 + seed)
+        _, shared_vars = _encode(problem)
+
+        for _ in range(5):
+            assignment = _random_assignment(problem, shared_vars, rng)
+
+            model, shared = _encode(problem, assignment)
+            constraint = MaxExamsPerStudentPerDayConstraint(
+                definition, problem, shared, model
+            )
+            constraint.initialize_variables()
+            asyncio.run(constraint.add_constraints())
+            shared_score = _solve(model, constraint.get_penalty_terms())
+
+            model, shared = _encode(problem, assignment)
+            terms = _per_start_excess_terms(
+                problem, model, shared, definition.weight, max_per_day
+            )
+            per_start_score = _solve(model, terms)
+
+            assert shared_score.ObjectiveValue() == per_start_score.ObjectiveValue()
+
+    def test_max_exams_per_day_needs_far_fewer_nonzeros(self):
+        problem = _build_problem(5, n_students=200)
+        definition = _definition("MAX_EXAMS_PER_DAY", max_exams_per_day=1)
+
+        model, shared = _encode(problem)
+        baseline = len(model.Proto().constraints)
+        constraint = MaxExamsPerStudentPerDayConstraint(
+            definition, problem, shared, model
+        )
+        constraint.initialize_variables()
+        asyncio.run(constraint.add_constraints())
+        # Charge the shared version for defining the indicators as well.
+        indicator_nonzeros = len(shared.x_vars) + len(shared.on_day_vars)
+        shared_nonzeros = _linear_nonzeros(model, baseline) + indicator_nonzeros
+
+        model, shared = _encode(problem)
+        baseline = len(model.Proto().constraints)
+        _per_start_excess_terms(problem, model, shared, definition.weight, 1)
+        per_start_nonzeros = _linear_nonzeros(model, baseline)
+
+        assert shared_nonzeros * 2 < per_start_nonzeros
+
+    def test_daily_workload_counts_exams_per_day(self):
+        problem = _build_problem(3)
+        rng = random.Random(3)
+        _, shared_vars = _encode(problem)
+        assignment = _random_assignment(problem, shared_vars, rng)
+
+        model, shared = _encode(problem, assignment)
+        constraint = DailyWorkloadBalanceConstraint(
+            _definition("DAILY_WORKLOAD_BALANCE"), problem, shared, model
+        )
+        constraint.initialize_variables()
+        asyncio.run(constraint.add_constraints())
+        solver = _solve(model, constraint.get_penalty_terms())
+
+        for day_key, slot_ids in shared.precomputed_data["day_slot_groupings"].items():
+            expected = sum(1 for s in assignment.values() if s in slot_ids)
+            count = constraint.daily_exam_count_vars[day_key]
+            assert solver.Value(count) == expected
@@ -0,0 +1,181 @@
+# scheduling_engine/tests/unit/test_infeasibility_explainer.py
+
+"""
+Tests for the assumption-based InfeasibilityExplainer.
+"""
+
+import asyncio
+from datetime import date, time
+from types import MappingProxyType, SimpleNamespace
+from uuid import uuid4
+
+from ortools.sat.python import cp_model
+
+from scheduling_engine.analysis.infeasibility_explainer import InfeasibilityExplainer
+from scheduling_engine.core.problem_model import (
+    Day,
+    Exam,
+    ExamSchedulingProblem,
+    Room,
+    Timeslot,
+)
+from scheduling_engine.cp_sat.model_builder import CPSATModelBuilder
+
+
+def _problem(n_slots):
+    day_date = date(2025, 1, 6)
+    problem = ExamSchedulingProblem(
+        session_id=uuid4(), exam_period_start=day_date, exam_period_end=day_date
+    )
+    day = Day(id=uuid4(), date=day_date)
+    for s in range(n_slots):
+        day.timeslots.append(
+            Timeslot(
+                id=uuid4(),
+                parent_day_id=day.id,
+                name=f"S{s}",
+                start_time=time(9 + 3 * s),
+                end_time=time(12 + 3 * s),
+                duration_minutes=180,
+            )
+        )
+    problem.days[day.id] = day
+    shared_student = uuid4()
+    for code in ("CSC101", "MTH201", "PHY301"):
+        exam = Exam(
+            id=uuid4(), course_id=uuid4(), duration_minutes=180, expected_students=1
+        )
+        exam.course_code = code
+        if code != "PHY301":
+            exam.add_student(shared_student)
+        problem.exams[exam.id] = exam
+    return problem
+
+
+def _timetabling_model(problem):
+    """A Phase 1 style model with three hard families and their index ranges."""
+    model = cp_model.CpModel()
+    x = {
+        (exam_id, slot_id): model.NewBoolVar(f"x_{exam_id}_{slot_id}")
+        for exam_id in problem.exams
+        for slot_id in problem.timeslots
+    }
+    ranges = {}
+
+    start = len(model.Proto().constraints)
+    for exam_id in problem.exams:
+        model.AddExactlyOne(x[(exam_id, s)] for s in problem.timeslots)
+    ranges["StartUniquenessConstraint"] = (start, len(model.Proto().constraints))
+
+    start = len(model.Proto().constraints)
+    sharing = [e for e, exam in problem.exams.items() if exam.students]
+    for slot_id in problem.timeslots:
+        model.Add(sum(x[(e, slot_id)] for e in sharing) <= 1)
+    ranges["UnifiedStudentConflictConstraint"] = (
+        start,
+        len(model.Proto().constraints),
+    )
+
+    start = len(model.Proto().constraints)
+    for slot_id in problem.timeslots:
+        model.Add(sum(x[(e, slot_id)] for e in problem.exams) <= 3)
+    ranges["AggregateCapacityConstraint"] = (start, len(model.Proto().constraints))
+
+    shared_vars = SimpleNamespace(
+        x_vars=MappingProxyType(x),
+        z_vars=MappingProxyType({}),
+        y_vars=MappingProxyType({}),
+        w_vars=MappingProxyType({}),
+    )
+    return model, shared_vars, ranges
+
+
+class TestInfeasibilityExplainer:
+    def test_student_overlap_core_names_the_clashing_exams(self):
+        problem = _problem(n_slots=1)
+        model, shared_vars, ranges = _timetabling_model(problem)
+
+        explanation = InfeasibilityExplainer(problem, time_limit_seconds=10).explain(
+            model, shared_vars, ranges, "phase1"
+        )
+
+        assert explanation.explained
+        assert explanation.minimal
+        assert sorted(explanation.constraint_families) == [
+            "StartUniquenessConstraint",
+            "UnifiedStudentConflictConstraint",
+        ]
+        assert {e["code"] for e in explanation.exams} == {"CSC101", "MTH201"}
+        assert explanation.days == ["2025-01-06"]
+        assert explanation.subproblem_constraints < len(model.Proto().constraints)
+
+    def test_conflicting_locks_are_reported(self):
+        problem = _problem(n_slots=2)
+        model, shared_vars, ranges = _timetabling_model(problem)
+        first_slot = next(iter(problem.timeslots))
+        locks = [
+            {"exam_id": exam_id, "time_slot_id": first_slot, "room_ids": []}
+            for exam_id in problem.exams
+        ]
+
+        explanation = InfeasibilityExplainer(problem, time_limit_seconds=10).explain(
+            model, shared_vars, ranges, "phase1", locks=locks
+        )
+
+        assert explanation.explained
+        assert explanation.constraint_families == ["UnifiedStudentConflictConstraint"]
+        assert {lock["exam"] for lock in explanation.locks} == {"CSC101", "MTH201"}
+        assert any(
+            "Lock: CSC101 fixed to 2025-01-06 09:00" in m for m in explanation.messages
+        )
+
+    def test_locks_pinned_by_the_builder_are_named(self):
+        problem = _problem(n_slots=2)
+        for code in ("R1", "R2"):
+            room = Room(id=uuid4(), code=code, capacity=10, exam_capacity=10)
+            problem.rooms[room.id] = room
+        first_slot = next(iter(problem.timeslots))
+        sharing = [e for e, exam in problem.exams.items() if exam.students]
+        problem.locks = [
+            {"exam_id": exam_id, "time_slot_id": first_slot, "room_ids": []}
+            for exam_id in sharing
+        ]
+        builder = CPSATModelBuilder(problem=problem)
+        candidates = {
+            (exam_id, slot_id)
+            for exam_id in problem.exams
+            for slot_id in problem.timeslots
+        }
+        model, shared_vars = asyncio.run(
+            builder.build_phase1(candidate_starts=candidates)
+        )
+        # Each lock pins its start and the slot that start occupies.
+        assert {exam_id for exam_id, _ in shared_vars.locked_vars} == set(sharing)
+
+        explanation = InfeasibilityExplainer(problem, time_limit_seconds=10).explain(
+            model,
+            shared_vars,
+            builder.constraint_manager.get_hard_constraint_ranges(),
+            "phase1",
+            locks=problem.locks,
+        )
+
+        assert explanation.explained
+        assert "UnifiedStudentConflictConstraint" in explanation.constraint_families
+        assert {lock["exam"] for lock in explanation.locks} == {"CSC101", "MTH201"}
+        # The diagnosis works on a copy; the locks stay pinned in the model.
+        assert all(
+            list(model.Proto().variables[var.Index()].domain) == [1, 1]
+            for var in shared_vars.locked_vars.values()
+        )
+
+    def test_feasible_model_is_not_explained(self):
+        problem = _problem(n_slots=2)
+        model, shared_vars, ranges = _timetabling_model(problem)
+
+        explanation = InfeasibilityExplainer(problem, time_limit_seconds=5).explain(
+            model, shared_vars, ranges, "phase1"
+        )
+
+        assert not explanation.explained
+        assert model.Proto().assumptions == []
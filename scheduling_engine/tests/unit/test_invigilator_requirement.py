@@ -0,0 +1,270 @@
+# scheduling_engine/tests/unit/test_invigilator_requirement.py
+
+"""
+Tests for the sparse InvigilatorRequirementConstraint encoding.
+
+The constraint only visits (room, slot) pairs that carry variables and
+expresses ceil(students / spi) linearly; these tests check it accepts and
+scores every assignment exactly like the original dense encoding built on
+AddDivisionEquality.
+"""
+
+import asyncio
+import itertools
+import random
+from datetime import date, time
+from types import MappingProxyType, SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from ortools.sat.python import cp_model
+
+from scheduling_engine.constraints.hard_constraints.invigilator_requirement import (
+    InvigilatorRequirementConstraint,
+)
+from scheduling_engine.core.constraint_types import (
+    ConstraintCategory,
+    ConstraintDefinition,
+    ConstraintType,
+)
+from scheduling_engine.core.problem_model import (
+    Day,
+    Exam,
+    ExamSchedulingProblem,
+    Invigilator,
+    Room,
+    Timeslot,
+)
+
+SPI = 30
+
+
+def _build_problem(seed, n_rooms=3, n_slots=2, n_exams=4, n_invigilators=4):
+    rng = random.Random(seed)
+    start = date(2025, 1, 6)
+    problem = ExamSchedulingProblem(
+        session_id=uuid4(), exam_period_start=start, exam_period_end=start
+    )
+    day = Day(id=uuid4(), date=start)
+    for s in range(n_slots):
+        day.timeslots.append(
+            Timeslot(
+                id=uuid4(),
+                parent_day_id=day.id,
+                name=f"S{s}",
+                start_time=time(8 + 2 * s),
+                end_time=time(10 + 2 * s),
+                duration_minutes=120,
+            )
+        )
+    problem.days[day.id] = day
+    problem.max_students_per_invigilator = SPI
+
+    for r in range(n_rooms):
+        capacity = rng.choice([60, 80, 100])
+        room = Room(id=uuid4(), code=f"R{r}", capacity=capacity, exam_capacity=capacity)
+        problem.rooms[room.id] = room
+    for _ in range(n_exams):
+        exam = Exam(
+            id=uuid4(),
+            course_id=uuid4(),
+            duration_minutes=120,
+            expected_students=rng.randint(5, 60),
+        )
+        problem.exams[exam.id] = exam
+    for i in range(n_invigilators):
+        invigilator = Invigilator(id=uuid4(), name=f"I{i}")
+        problem.invigilators[invigilator.id] = invigilator
+    return problem, rng
+
+
+def _definition():
+    return ConstraintDefinition(
+        id="INVIGILATOR_REQUIREMENT",
+        name="Invigilator Requirement",
+        description="",
+        constraint_type=ConstraintType.HARD,
+        category=ConstraintCategory.RESOURCE_CONSTRAINTS,
+    )
+
+
+def _variable_keys(problem, rng, y_density=0.6, w_density=0.8):
+    """A sparse, reproducible set of Y and W keys."""
+    slot_ids = list(problem.timeslots)
+    y_keys = [
+        (exam_id, room_id, slot_id)
+        for exam_id in problem.exams
+        for room_id in problem.rooms
+        for slot_id in slot_ids
+        if rng.random() < y_density
+    ]
+    w_keys = [
+        (inv_id, room_id, slot_id)
+        for inv_id in problem.invigilators
+        for room_id in problem.rooms
+        for slot_id in slot_ids
+        if rng.random() < w_density
+    ]
+    return y_keys, w_keys
+
+
+def _model(problem, y_keys, w_keys, assignment=None, staff_every_slot=False):
+    """Y/W variables with each exam placed once and each invigilator once per slot."""
+    model = cp_model.CpModel()
+    y = {key: model.NewBoolVar(f"y_{i}") for i, key in enumerate(y_keys)}
+    w = {key: model.NewBoolVar(f"w_{i}") for i, key in enumerate(w_keys)}
+    for exam_id in problem.exams:
+        exam_vars = [var for key, var in y.items() if key[0] == exam_id]
+        if exam_vars:
+            model.AddExactlyOne(exam_vars)
+    for inv_id in problem.invigilators:
+        for slot_id in problem.timeslots:
+            posts = [w[k] for k in w if k[0] == inv_id and k[2] == slot_id]
+            if staff_every_slot and posts:
+                model.AddExactlyOne(posts)
+            else:
+                model.AddAtMostOne(posts)
+    if assignment:
+        for key, value in assignment.items():
+            model.Add((y | w)[key] == value)
+    shared_vars = SimpleNamespace(
+        x_vars=MappingProxyType({}),
+        y_vars=MappingProxyType(y),
+        z_vars=MappingProxyType({}),
+        w_vars=MappingProxyType(w),
+        precomputed_data={},
+    )
+    return model, shared_vars
+
+
+def _dense_terms(problem, model, y, w):
+    """The previous encoding: every slot x room, with AddDivisionEquality."""
+    spi = problem.max_students_per_invigilator
+    terms = []
+    for slot_id in {key[2] for key in y}:
+        for room_id, room in problem.rooms.items():
+            assigned = sum(
+                w[key]
+                for inv_id in problem.invigilators
+                if (key := (inv_id, room_id, slot_id)) in w
+            )
+            total = model.NewIntVar(0, room.exam_capacity, "")
+            load = [
+                exam.expected_students * y[key]
+                for exam_id, exam in problem.exams.items()
+                if (key := (exam_id, room_id, slot_id)) in y
+            ]
+            model.Add(total == (sum(load) if load else 0))
+            required = model.NewIntVar(0, len(problem.invigilators), "")
+            model.AddDivisionEquality(required, total + spi - 1, spi)
+            model.Add(assigned >= required)
+            surplus = model.NewIntVar(0, len(problem.invigilators), "")
+            model.Add(surplus >= assigned - required)
+            terms.append((1000, surplus))
+    return terms
+
+
+def _solve(model, terms):
+    model.Minimize(sum(weight * var for weight, var in terms))
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    status = solver.Solve(model)
+    if status == cp_model.INFEASIBLE:
+        return None
+    assert status == cp_model.OPTIMAL
+    return solver.ObjectiveValue()
+
+
+def _sparse_objective(problem, y_keys, w_keys, assignment=None, **kwargs):
+    model, shared_vars = _model(problem, y_keys, w_keys, assignment, **kwargs)
+    constraint = InvigilatorRequirementConstraint(
+        _definition(), problem, shared_vars, model
+    )
+    constraint.initialize_variables()
+    asyncio.run(constraint.add_constraints())
+    return _solve(model, constraint.get_penalty_terms()), model, constraint
+
+
+def _dense_objective(problem, y_keys, w_keys, assignment=None, **kwargs):
+    model, shared_vars = _model(problem, y_keys, w_keys, assignment, **kwargs)
+    terms = _dense_terms(problem, model, shared_vars.y_vars, shared_vars.w_vars)
+    return _solve(model, terms), model
+
+
+class TestSparseInvigilatorRequirement:
+    @pytest.mark.parametrize("seed", range(6))
+    @pytest.mark.parametrize("staff_every_slot", [False, True])
+    def test_optimal_objective_matches(self, seed, staff_every_slot):
+        problem, rng = _build_problem(seed)
+        y_keys, w_keys = _variable_keys(problem, rng)
+
+        sparse, _, _ = _sparse_objective(
+            problem, y_keys, w_keys, staff_every_slot=staff_every_slot
+        )
+        dense, _ = _dense_objective(
+            problem, y_keys, w_keys, staff_every_slot=staff_every_slot
+        )
+
+        assert sparse == dense
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_every_placement_is_judged_identically(self, seed):
+        problem, rng = _build_problem(seed, n_exams=3, n_invigilators=8)
+        y_keys, w_keys = _variable_keys(problem, rng, y_density=0.5)
+        choices = [
+            [key for key in y_keys if key[0] == exam_id]
+            for exam_id in {key[0] for key in y_keys}
+        ]
+        outcomes = set()
+
+        for placed in itertools.product(*choices):
+            assignment = {key: int(key in placed) for key in y_keys}
+            sparse, _, _ = _sparse_objective(problem, y_keys, w_keys, assignment)
+            dense, _ = _dense_objective(problem, y_keys, w_keys, assignment)
+            assert sparse == dense
+            outcomes.add(sparse is None)
+
+            # Also post invigilators at random: at most one room per slot each.
+            for inv_id in problem.invigilators:
+                for slot_id in problem.timeslots:
+                    posts = [k for k in w_keys if k[0] == inv_id and k[2] == slot_id]
+                    chosen = rng.choice(posts) if posts else None
+                    for key in posts:
+                        assignment[key] = int(key == chosen)
+            sparse, _, _ = _sparse_objective(problem, y_keys, w_keys, assignment)
+            dense, _ = _dense_objective(problem, y_keys, w_keys, assignment)
+            assert sparse == dense
+
+        assert False in outcomes  # at least one placement was feasible
+
+    def test_shared_room_requires_ceiling_of_combined_load(self):
+        problem, _ = _build_problem(0, n_rooms=1, n_slots=1, n_exams=2)
+        room_id = next(iter(problem.rooms))
+        slot_id = next(iter(problem.timeslots))
+        problem.rooms[room_id].exam_capacity = 100
+        for exam, students in zip(problem.exams.values(), (20, 25)):
+            exam.expected_students = students
+        y_keys = [(exam_id, room_id, slot_id) for exam_id in problem.exams]
+        w_keys = [(inv_id, room_id, slot_id) for inv_id in problem.invigilators]
+
+        def with_invigilators(n):
+            assignment = {key: 1 for key in y_keys}
+            assignment.update({key: int(i < n) for i, key in enumerate(w_keys)})
+            return _sparse_objective(problem, y_keys, w_keys, assignment)[0]
+
+        # 45 students at 30 per invigilator need two, not one per exam.
+        assert with_invigilators(1) is None
+        assert with_invigilators(2) == 0
+        assert with_invigilators(3) == 1000
+
+    def test_encoding_is_sparse_and_division_free(self):
+        problem, rng = _build_problem(3, n_rooms=6, n_slots=3)
+        y_keys, w_keys = _variable_keys(problem, rng, y_density=0.2, w_density=0.1)
+
+        _, model, constraint = _sparse_objective(problem, y_keys, w_keys)
+
+        kinds = {c.WhichOneof("constraint") for c in model.Proto().constraints}
+        assert "int_div" not in kinds
+        assert len(constraint.surplus_invigilator_vars) == len(
+            {key[1:] for key in y_keys}
+        )
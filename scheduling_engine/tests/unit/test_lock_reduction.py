@@ -0,0 +1,224 @@
+# scheduling_engine/tests/unit/test_lock_reduction.py
+
+"""
+Tests for the lock-driven reduction applied before encoding.
+
+Locked exams must keep exactly their locked start (and rooms, and invigilator
+posts) as pinned variables, neighbours sharing students must lose the clashing
+starts, and the capacity the locks consume must be reserved. Solving the
+reduced model has to honour every lock.
+"""
+
+import asyncio
+import random
+from datetime import date, time, timedelta
+from uuid import uuid4
+
+from ortools.sat.python import cp_model
+
+from scheduling_engine.core.lock_reduction import reduce_locks
+from scheduling_engine.core.problem_model import (
+    Day,
+    Exam,
+    ExamSchedulingProblem,
+    Invigilator,
+    Room,
+    Timeslot,
+)
+from scheduling_engine.cp_sat.model_builder import CPSATModelBuilder
+
+
+def _build_problem(seed=0, n_exams=16, n_students=60, days=3):
+    rng = random.Random(seed)
+    start = date(2025, 1, 6)
+    problem = ExamSchedulingProblem(
+        session_id=uuid4(),
+        exam_period_start=start,
+        exam_period_end=start + timedelta(days=days - 1),
+    )
+    for d in range(days):
+        day = Day(id=uuid4(), date=start + timedelta(days=d))
+        for s in range(3):
+            day.timeslots.append(
+                Timeslot(
+                    id=uuid4(),
+                    parent_day_id=day.id,
+                    name=f"S{s}",
+                    start_time=time(8 + 3 * s),
+                    end_time=time(11 + 3 * s),
+                    duration_minutes=180,
+                )
+            )
+        problem.days[day.id] = day
+    problem.base_slot_duration_minutes = 180
+    for r in range(3):
+        room = Room(id=uuid4(), code=f"R{r}", capacity=80, exam_capacity=80)
+        problem.rooms[room.id] = room
+    for i in range(4):
+        invigilator = Invigilator(id=uuid4(), name=f"I{i}")
+        problem.invigilators[invigilator.id] = invigilator
+
+    exams = []
+    for _ in range(n_exams):
+        exam = Exam(
+            id=uuid4(), course_id=uuid4(), duration_minutes=180, expected_students=0
+        )
+        problem.exams[exam.id] = exam
+        exams.append(exam)
+    for _ in range(n_students):
+        student_id = uuid4()
+        for exam in rng.sample(exams, 3):
+            exam.add_student(student_id, "normal")
+    for exam in exams:
+        exam.expected_students = len(exam.students)
+    return problem, exams
+
+
+def _slots(problem):
+    return [slot.id for day in problem.days.values() for slot in day.timeslots]
+
+
+def _lock(exam, slot_id, rooms=(), invigilators=()):
+    return {
+        "exam_id": exam.id,
+        "time_slot_id": slot_id,
+        "room_ids": list(rooms),
+        "invigilator_ids": list(invigilators),
+    }
+
+
+def _phase1(problem):
+    builder = CPSATModelBuilder(problem=problem)
+    candidates = {
+        (exam_id, slot_id)
+        for exam_id in problem.exams
+        for slot_id in problem.timeslots
+        if problem.is_start_feasible(exam_id, slot_id)
+    }
+    return asyncio.run(builder.build_phase1(candidate_starts=candidates))
+
+
+def _is_fixed_to_one(model, var):
+    return list(model.Proto().variables[var.Index()].domain) == [1, 1]
+
+
+def _solve(model):
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    status = solver.Solve(model)
+    return solver, status
+
+
+class TestReduction:
+    def test_locks_reserve_capacity_and_block_clashing_starts(self):
+        problem, exams = _build_problem()
+        slots = _slots(problem)
+        locked = exams[0]
+        neighbour = next(e for e in exams[2:] if set(e.students) & set(locked.students))
+        stranger = Exam(
+            id=uuid4(), course_id=uuid4(), duration_minutes=180, expected_students=5
+        )
+        problem.exams[stranger.id] = stranger
+        problem.locks = [
+            _lock(locked, slots[4], rooms=[next(iter(problem.rooms))]),
+            # The last slot of a day cannot hold a two-slot exam.
+            {"exam_id": exams[1].id, "time_slot_id": slots[2], "room_ids": []},
+        ]
+        exams[1].duration_minutes = 360
+
+        reduction = reduce_locks(problem)
+
+        assert reduction.fixed_starts == {locked.id: slots[4]}
+        assert reduction.reserved_rooms == {slots[4]: 1}
+        assert reduction.reserved_seats == {slots[4]: locked.expected_students}
+        assert (neighbour.id, slots[4]) in reduction.blocked_starts
+        assert (neighbour.id, slots[3]) not in reduction.blocked_starts
+        assert not any(key[0] == stranger.id for key in reduction.blocked_starts)
+
+    def test_carryover_registrations_do_not_block(self):
+        problem, exams = _build_problem()
+        slots = _slots(problem)
+        student_id = uuid4()
+        exams[0].add_student(student_id, "normal")
+        lonely = Exam(
+            id=uuid4(), course_id=uuid4(), duration_minutes=180, expected_students=1
+        )
+        lonely.add_student(student_id, "carryover")
+        problem.exams[lonely.id] = lonely
+        problem.locks = [_lock(exams[0], slots[0])]
+
+        reduction = reduce_locks(problem)
+
+        assert not any(key[0] == lonely.id for key in reduction.blocked_starts)
+
+
+class TestPhase1:
+    def test_locked_exams_keep_one_pinned_start(self):
+        problem, exams = _build_problem()
+        unlocked_model, unlocked_vars = _phase1(problem)
+        # Lock three quarters of the exams wherever an unlocked solve put them.
+        solver, status = _solve(unlocked_model)
+        assert status == cp_model.OPTIMAL
+        placed = {
+            exam_id: slot_id
+            for (exam_id, slot_id), var in unlocked_vars.x_vars.items()
+            if solver.BooleanValue(var)
+        }
+        locked = exams[:12]
+        problem.locks = [_lock(e, placed[e.id]) for e in locked]
+
+        model, shared_vars = _phase1(problem)
+
+        for exam in locked:
+            keys = [k for k in shared_vars.x_vars if k[0] == exam.id]
+            assert keys == [(exam.id, placed[exam.id])]
+            assert _is_fixed_to_one(model, shared_vars.x_vars[keys[0]])
+        assert len(shared_vars.x_vars) < len(unlocked_vars.x_vars) / 2
+        assert len(model.Proto().variables) < len(unlocked_model.Proto().variables)
+
+        solver, status = _solve(model)
+        assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        starts = {
+            exam_id: slot_id
+            for (exam_id, slot_id), var in shared_vars.x_vars.items()
+            if solver.BooleanValue(var)
+        }
+        assert all(starts[e.id] == placed[e.id] for e in locked)
+        assert set(starts) == set(problem.exams)
+
+    def test_locks_over_slot_capacity_are_infeasible(self):
+        problem, exams = _build_problem(n_students=0)
+        slot_id = _slots(problem)[0]
+        problem.locks = [_lock(e, slot_id) for e in exams[:4]]  # three rooms
+
+        model, _ = _phase1(problem)
+
+        assert _solve(model)[1] == cp_model.INFEASIBLE
+
+
+class TestPhase2:
+    def test_locked_rooms_and_invigilators_are_pinned(self):
+        problem, exams = _build_problem()
+        slot_id = _slots(problem)[0]
+        room_id = next(iter(problem.rooms))
+        invigilator_id = next(iter(problem.invigilators))
+        locked, free = exams[0], exams[1]
+        problem.rooms[room_id].exam_capacity = locked.expected_students
+        problem.locks = [_lock(locked, slot_id, [room_id], [invigilator_id])]
+        day = next(iter(problem.days.values())).date
+
+        builder = CPSATModelBuilder(problem=problem)
+        model, shared_vars = asyncio.run(
+            builder.build_phase2_full_model(
+                {locked.id: (slot_id, day), free.id: (slot_id, day)}
+            )
+        )
+
+        locked_keys = [k for k in shared_vars.y_vars if k[0] == locked.id]
+        assert locked_keys == [(locked.id, room_id, slot_id)]
+        assert _is_fixed_to_one(model, shared_vars.y_vars[locked_keys[0]])
+        # The locked exam fills its room, so the free exam is not offered it.
+        assert (free.id, room_id, slot_id) not in shared_vars.y_vars
+        assert _is_fixed_to_one(
+            model, shared_vars.w_vars[(invigilator_id, room_id, slot_id)]
+        )
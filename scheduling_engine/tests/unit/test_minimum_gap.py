@@ -0,0 +1,211 @@
+# scheduling_engine/tests/unit/test_minimum_gap.py
+
+"""
+Tests for the aggregated MinimumGapConstraint encoding.
+
+The constraint builds one violation indicator per (exam pair, slot offset)
+weighted by shared students; these tests check it scores every timetable
+exactly like the original per-student encoding on small instances.
+"""
+
+import asyncio
+import random
+from datetime import date, time, timedelta
+from types import MappingProxyType, SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from ortools.sat.python import cp_model
+
+from scheduling_engine.constraints.soft_constraints.minimum_gap import (
+    MinimumGapConstraint,
+)
+from scheduling_engine.core.constraint_types import (
+    ConstraintCategory,
+    ConstraintDefinition,
+    ConstraintType,
+    ParameterDefinition,
+)
+from scheduling_engine.core.problem_model import (
+    Day,
+    Exam,
+    ExamSchedulingProblem,
+    Timeslot,
+)
+
+
+def _build_problem(seed, n_days=2, slots_per_day=4, n_exams=5, n_students=12):
+    rng = random.Random(seed)
+    start = date(2025, 1, 6)
+    problem = ExamSchedulingProblem(
+        session_id=uuid4(), exam_period_start=start, exam_period_end=start
+    )
+    for d in range(n_days):
+        day = Day(id=uuid4(), date=start + timedelta(days=d))
+        for s in range(slots_per_day):
+            day.timeslots.append(
+                Timeslot(
+                    id=uuid4(),
+                    parent_day_id=day.id,
+                    name=f"S{s}",
+                    start_time=time(8 + 2 * s),
+                    end_time=time(10 + 2 * s),
+                    duration_minutes=120,
+                )
+            )
+        problem.days[day.id] = day
+    problem.base_slot_duration_minutes = 120
+
+    exams = [
+        Exam(
+            id=uuid4(),
+            course_id=uuid4(),
+            duration_minutes=rng.choice([120, 120, 240]),
+            expected_students=0,
+        )
+        for _ in range(n_exams)
+    ]
+    for exam in exams:
+        problem.exams[exam.id] = exam
+    for _ in range(n_students):
+        student_id = uuid4()
+        for exam in rng.sample(exams, rng.randint(1, 3)):
+            exam.add_student(student_id)
+    return problem
+
+
+def _definition(weight=3, min_gap_slots=1):
+    return ConstraintDefinition(
+        id="MINIMUM_GAP",
+        name="Minimum Gap",
+        description="",
+        constraint_type=ConstraintType.SOFT,
+        category=ConstraintCategory.STUDENT_CONSTRAINTS,
+        weight=weight,
+        parameters=[
+            ParameterDefinition(
+                key="min_gap_slots", type="int", value=min_gap_slots, default=1
+            )
+        ],
+    )
+
+
+def _model_with_starts(problem, assignment=None):
+    """Start variables with exactly one start per exam, optionally fixed."""
+    model = cp_model.CpModel()
+    x = {}
+    for exam_id in problem.exams:
+        for slot_id in problem.timeslots:
+            x[(exam_id, slot_id)] = model.NewBoolVar(f"x_{exam_id}_{slot_id}")
+        model.AddExactlyOne(x[(exam_id, s)] for s in problem.timeslots)
+        if assignment:
+            model.Add(x[(exam_id, assignment[exam_id])] == 1)
+    day_slot_groupings = {
+        str(day_id): [ts.id for ts in day.timeslots]
+        for day_id, day in problem.days.items()
+    }
+    shared_vars = SimpleNamespace(
+        x_vars=MappingProxyType(x),
+        y_vars=MappingProxyType({}),
+        z_vars=MappingProxyType({}),
+        w_vars=MappingProxyType({}),
+        precomputed_data={"day_slot_groupings": day_slot_groupings},
+    )
+    return model, shared_vars
+
+
+def _per_student_terms(problem, model, x, day_slot_groupings, weight, min_gap):
+    """The previous encoding: one indicator per student, exam pair and slot pair."""
+    student_exams = {}
+    for exam_id, exam in problem.exams.items():
+        for student_id in exam.students:
+            student_exams.setdefault(student_id, []).append(exam_id)
+
+    terms = []
+    for exam_list in student_exams.values():
+        for i in range(len(exam_list)):
+            for j in range(i + 1, len(exam_list)):
+                e1, e2 = exam_list[i], exam_list[j]
+                dur1 = problem.get_exam_duration_in_slots(e1)
+                dur2 = problem.get_exam_duration_in_slots(e2)
+                for slot_ids in day_slot_groupings.values():
+                    for idx1, s1 in enumerate(slot_ids):
+                        for idx2, s2 in enumerate(slot_ids):
+                            if (idx1 < idx2 and idx1 + dur1 + min_gap > idx2) or (
+                                idx2 < idx1 and idx2 + dur2 + min_gap > idx1
+                            ):
+                                v = model.NewBoolVar("")
+                                model.AddBoolAnd([x[(e1, s1)], x[(e2, s2)]]).OnlyEnforceIf(v)
+                                model.Add(x[(e1, s1)] + x[(e2, s2)] <= 1).OnlyEnforceIf(
+                                    v.Not()
+                                )
+                                terms.append((weight, v))
+    return terms
+
+
+def _solve(model, terms):
+    model.Minimize(sum(int(w) * v for w, v in terms))
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    status = solver.Solve(model)
+    assert status == cp_model.OPTIMAL
+    return solver.ObjectiveValue()
+
+
+def _aggregated_objective(problem, definition, assignment=None):
+    model, shared_vars = _model_with_starts(problem, assignment)
+    constraint = MinimumGapConstraint(definition, problem, shared_vars, model)
+    constraint.initialize_variables()
+    asyncio.run(constraint.add_constraints())
+    return _solve(model, constraint.get_penalty_terms()), constraint
+
+
+def _per_student_objective(problem, definition, assignment=None):
+    model, shared_vars = _model_with_starts(problem, assignment)
+    terms = _per_student_terms(
+        problem,
+        model,
+        shared_vars.x_vars,
+        shared_vars.precomputed_data["day_slot_groupings"],
+        definition.weight,
+        definition.get_parameter_value("min_gap_slots"),
+    )
+    return _solve(model, terms), terms
+
+
+class TestMinimumGapAggregation:
+    @pytest.mark.parametrize("seed", range(4))
+    @pytest.mark.parametrize("min_gap_slots", [0, 1, 2])
+    def test_fixed_timetables_score_identically(self, seed, min_gap_slots):
+        problem = _build_problem(seed)
+        definition = _definition(min_gap_slots=min_gap_slots)
+        rng = random.Random(1000 + seed)
+        slot_ids = list(problem.timeslots)
+
+        for _ in range(5):
+            assignment = {exam_id: rng.choice(slot_ids) for exam_id in problem.exams}
+            aggregated, _ = _aggregated_objective(problem, definition, assignment)
+            per_student, _ = _per_student_objective(problem, definition, assignment)
+            assert aggregated == per_student
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_optimal_objective_matches(self, seed):
+        problem = _build_problem(seed, n_days=1, slots_per_day=5)
+        definition = _definition(weight=2, min_gap_slots=2)
+
+        aggregated, _ = _aggregated_objective(problem, definition)
+        per_student, _ = _per_student_objective(problem, definition)
+
+        assert aggregated == per_student
+
+    def test_term_count_is_independent_of_student_count(self):
+        problem = _build_problem(7, n_students=60)
+        definition = _definition()
+
+        _, constraint = _aggregated_objective(problem, definition)
+        _, per_student_terms = _per_student_objective(problem, definition)
+
+        exam_pairs = len(problem.exams) * (len(problem.exams) - 1) // 2
+        offsets = 2 * 3  # |offset| < max duration (2) + min gap (1)
+        assert len(constraint.get_penalty_terms()) <= exam_pairs * offsets
+        assert len(constraint.get_penalty_terms()) < len(per_student_terms)
@@ -0,0 +1,449 @@
+# scheduling_engine/tests/unit/test_model_cache.py
+
+"""
+Tests for reusing a built Phase 1 model across weight-only reruns.
+
+A rerun with the same data and constraints but different soft-constraint
+weights must reuse the cached model, with an objective identical to what a
+fresh build under the new weights would produce; any structural change must
+rebuild.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+from uuid import UUID
+
+from ortools.sat.python import cp_model
+
+from scheduling_engine.core.constraint_types import (
+    ConstraintCategory,
+    ConstraintDefinition,
+    ConstraintType,
+    ParameterDefinition,
+)
+from scheduling_engine.core.problem_model import (
+    Day,
+    Exam,
+    ExamSchedulingProblem,
+    Room,
+    Timeslot,
+)
+from scheduling_engine.cp_sat.model_builder import CPSATModelBuilder
+from scheduling_engine.cp_sat.model_cache import (
+    ObjectiveComponent,
+    clear_model_cache,
+    get_cached_model,
+    remember_solution,
+    slot_aliases,
+    structure_key,
+)
+from scheduling_engine.cp_sat.solver_manager import CPSATSolverManager
+
+
+def _uuid(rng):
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _definition(weight, min_gap_slots=1):
+    return ConstraintDefinition(
+        id="MINIMUM_GAP",
+        name="Minimum Gap",
+        description="",
+        constraint_type=ConstraintType.SOFT,
+        category=ConstraintCategory.STUDENT_CONSTRAINTS,
+        weight=weight,
+        parameters=[
+            ParameterDefinition(
+                key="min_gap_slots", type="int", value=min_gap_slots, default=1
+            )
+        ],
+    )
+
+
+def _build_problem(weight=3, min_gap_slots=1, seed=0, cache_size=2):
+    """The same session on every call with the same seed, as a rerun reloads it."""
+    rng = random.Random(seed)
+    start = date(2025, 1, 6)
+    problem = ExamSchedulingProblem(
+        session_id=_uuid(rng), exam_period_start=start, exam_period_end=start
+    )
+    for d in range(2):
+        day = Day(id=_uuid(rng), date=start + timedelta(days=d))
+        for s in range(3):
+            day.timeslots.append(
+                Timeslot(
+                    id=_uuid(rng),
+                    parent_day_id=day.id,
+                    name=f"S{s}",
+                    start_time=time(8 + 3 * s),
+                    end_time=time(11 + 3 * s),
+                    duration_minutes=180,
+                )
+            )
+        problem.days[day.id] = day
+    problem.base_slot_duration_minutes = 180
+    for r in range(2):
+        room = Room(id=_uuid(rng), code=f"R{r}", capacity=60, exam_capacity=60)
+        problem.rooms[room.id] = room
+
+    exams = []
+    for _ in range(6):
+        exam = Exam(
+            id=_uuid(rng),
+            course_id=_uuid(rng),
+            duration_minutes=180,
+            expected_students=0,
+        )
+        problem.exams[exam.id] = exam
+        exams.append(exam)
+    for _ in range(20):
+        student_id = _uuid(rng)
+        for exam in rng.sample(exams, 2):
+            exam.add_student(student_id, "normal")
+    for exam in exams:
+        exam.expected_students = len(exam.students)
+
+    definition = _definition(weight, min_gap_slots)
+    problem.constraint_definitions = [definition]
+    problem.constraint_registry.load_definitions([definition], problem.module_map)
+    problem.constraint_registry.activate(definition.id)
+    problem.model_cache_size = cache_size
+    return problem
+
+
+def _dataset(weight, seed=0):
+    """A backend dataset; every load of it gets fresh day and timeslot IDs."""
+    rng = random.Random(seed)
+    students = [_uuid(rng) for _ in range(20)]
+    exams = []
+    for i in range(6):
+        registrations = {s: "normal" for s in rng.sample(students, 6)}
+        exams.append(
+            {
+                "id": _uuid(rng),
+                "course_id": _uuid(rng),
+                "course_code": f"C{i}",
+                "course_title": f"Course {i}",
+                "duration_minutes": 180,
+                "expected_students": len(registrations),
+                "is_practical": False,
+                "morning_only": False,
+                "students": registrations,
+                "departments": [],
+                "department_ids": [],
+            }
+        )
+    rooms = [
+        {
+            "id": _uuid(rng),
+            "code": f"R{r}",
+            "capacity": 60,
+            "exam_capacity": 60,
+            "overbookable": False,
+            "has_computers": False,
+            "building_name": "Main",
+            "building_faculty_id": None,
+            "adjacent_seat_pairs": [],
+        }
+        for r in range(2)
+    ]
+    days = [
+        {
+            "exam_date": f"2025-01-0{6 + d}",
+            "time_periods": [
+                {
+                    "id": str(_uuid(rng)),
+                    "period_name": f"S{s}",
+                    "start_time": f"{8 + 3 * s:02d}:00:00",
+                    "end_time": f"{11 + 3 * s:02d}:00:00",
+                }
+                for s in range(3)
+            ],
+        }
+        for d in range(2)
+    ]
+    rule = {
+        "id": str(_uuid(rng)),
+        "code": "MINIMUM_GAP",
+        "type": "soft",
+        "weight": weight,
+        "custom_parameters": {"min_gap_slots": 1},
+    }
+    return SimpleNamespace(
+        session_id=_uuid(rng),
+        exams=exams,
+        students=[{"id": s, "department": "Computing"} for s in students],
+        rooms=rooms,
+        invigilators=[],
+        instructors=[],
+        locks=[],
+        constraints={"system_configuration_id": str(_uuid(rng)), "rules": [rule]},
+        days=days,
+        slot_generation_mode="fixed",
+    )
+
+
+def _load_problem(weight, cache_dir=None):
+    dataset = _dataset(weight)
+    problem = ExamSchedulingProblem(
+        session_id=dataset.session_id,
+        exam_period_start=date(2025, 1, 6),
+        exam_period_end=date(2025, 1, 7),
+    )
+    asyncio.run(problem.load_from_backend(dataset))
+    problem.model_cache_size = 2
+    problem.model_cache_dir = cache_dir
+    return problem
+
+
+def _build(problem):
+    builder = CPSATModelBuilder(problem=problem)
+    model, shared_vars = asyncio.run(builder.build_phase1())
+    return builder, model, shared_vars
+
+
+def _solve_job(weight, cache_dir):
+    """One solver job as the scheduling task runs it, in a fresh process."""
+    problem = _build_problem(weight=weight)
+    problem.model_cache_dir = cache_dir
+    problem.solver_num_workers = 1
+    manager = CPSATSolverManager(problem=problem)
+    asyncio.run(manager.solve())
+    return os.getpid(), manager.phase1_model_reused
+
+
+def _objective(model):
+    objective = model.Proto().objective
+    return dict(zip(objective.vars, objective.coeffs))
+
+
+class TestObjectiveComponent:
+    def test_coefficients_scale_with_the_weight(self):
+        model = cp_model.CpModel()
+        a, b = model.NewBoolVar("a"), model.NewBoolVar("b")
+        component = ObjectiveComponent.from_terms("GAP", 3.0, [(3.0, a), (6.0, b)])
+
+        assert component.coefficients() == [3, 6]
+        assert component.coefficients(7.0) == [7, 14]
+        assert component.coefficients(1.5) == [1, 3]
+
+
+class TestModelCache:
+    def setup_method(self):
+        clear_model_cache()
+
+    def teardown_method(self):
+        clear_model_cache()
+
+    def test_weight_only_rerun_reuses_the_model(self):
+        first, first_model, first_vars = _build(_build_problem(weight=3))
+        second, second_model, second_vars = _build(_build_problem(weight=6))
+
+        assert not first.reused_cached_model
+        assert second.reused_cached_model
+        assert second.cache_key == first.cache_key
+        assert second_vars is first_vars
+        assert len(second_model.Proto().variables) == len(first_model.Proto().variables)
+        assert len(second_model.Proto().constraints) == len(
+            first_model.Proto().constraints
+        )
+        before, after = _objective(first_model), _objective(second_model)
+        assert before and after == {v: 2 * c for v, c in before.items()}
+
+    def test_reweighted_objective_matches_a_fresh_build(self):
+        _build(_build_problem(weight=3))
+        _, reused_model, _ = _build(_build_problem(weight=5))
+        clear_model_cache()
+        _, fresh_model, _ = _build(_build_problem(weight=5))
+
+        assert Counter(_objective(reused_model).values()) == Counter(
+            _objective(fresh_model).values()
+        )
+
+    def test_structural_changes_rebuild(self):
+        base = _build_problem()
+        changed_parameter = _build_problem(min_gap_slots=2)
+        zero_weight = _build_problem(weight=0)
+        moved_exam = _build_problem()
+        next(iter(moved_exam.exams.values())).duration_minutes = 360
+
+        key = structure_key(base)
+        assert structure_key(_build_problem(weight=9)) == key
+        assert structure_key(changed_parameter) != key
+        assert structure_key(zero_weight) != key
+        assert structure_key(moved_exam) != key
+
+    def test_previous_solution_is_hinted(self):
+        first, model, shared_vars = _build(_build_problem(weight=3))
+        solver = cp_model.CpSolver()
+        solver.parameters.num_workers = 1
+        assert solver.Solve(model) == cp_model.OPTIMAL
+        starts = {
+            exam_id: slot_id
+            for (exam_id, slot_id), var in shared_vars.x_vars.items()
+            if solver.BooleanValue(var)
+        }
+        remember_solution(first.cache_key, starts)
+
+        _, reused_model, _ = _build(_build_problem(weight=4))
+
+        hint = reused_model.Proto().solution_hint
+        assert sorted(hint.vars) == sorted(
+            shared_vars.x_vars[key].Index() for key in starts.items()
+        )
+        assert set(hint.values) == {1}
+        assert solver.Solve(reused_model) == cp_model.OPTIMAL
+
+    def test_disabled_cache_always_builds(self):
+        _build(_build_problem(cache_size=0))
+        builder, _, _ = _build(_build_problem(cache_size=0))
+
+        assert not builder.reused_cached_model
+        assert builder.cache_key is None
+
+
+class TestSharedModelStore:
+    def setup_method(self):
+        clear_model_cache()
+
+    def teardown_method(self):
+        clear_model_cache()
+
+    def test_build_is_loaded_back_from_the_directory(self, tmp_path):
+        first_problem = _build_problem(weight=3)
+        first_problem.model_cache_dir = str(tmp_path)
+        first, first_model, _ = _build(first_problem)
+        remember_solution(first.cache_key, {"exam": "slot"}, str(tmp_path))
+        clear_model_cache()  # as in a recycled worker
+
+        loaded = get_cached_model(
+            first.cache_key, str(tmp_path), slot_aliases(first_problem)
+        )
+        second_problem = _build_problem(weight=6)
+        second_problem.model_cache_dir = str(tmp_path)
+        second, second_model, second_vars = _build(second_problem)
+
+        assert loaded is not None and loaded.solution == {"exam": "slot"}
+        assert second.reused_cached_model
+        assert set(second_vars.x_vars) == set(first.shared_variables.x_vars)
+        before, after = _objective(first_model), _objective(second_model)
+        assert before and after == {v: 2 * c for v, c in before.items()}
+        assert second.constraint_manager.get_hard_constraint_ranges() == (
+            first.constraint_manager.get_hard_constraint_ranges()
+        )
+
+    def test_directory_keeps_the_most_recent_builds(self, tmp_path):
+        for min_gap_slots in (1, 2, 3):
+            problem = _build_problem(min_gap_slots=min_gap_slots, cache_size=2)
+            problem.model_cache_dir = str(tmp_path)
+            _build(problem)
+
+        assert len(list(tmp_path.glob("*.model"))) == 2
+
+    def test_jobs_in_recycled_workers_share_the_cache(self, tmp_path):
+        # Solver workers run one job per child process (--max-tasks-per-child=1).
+        with ProcessPoolExecutor(
+            max_workers=1,
+            max_tasks_per_child=1,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            first_pid, first_reused = pool.submit(_solve_job, 3, str(tmp_path)).result()
+            second_pid, second_reused = pool.submit(
+                _solve_job, 6, str(tmp_path)
+            ).result()
+
+        assert first_pid != second_pid
+        assert not first_reused
+        assert second_reused
+        assert list(tmp_path.glob("*.solution"))
+
+    def test_build_files_are_proto_and_json(self, tmp_path):
+        problem = _build_problem()
+        problem.model_cache_dir = str(tmp_path)
+        builder, model, _ = _build(problem)
+        remember_solution(
+            builder.cache_key,
+            {exam_id: next(iter(problem.timeslots)) for exam_id in problem.exams},
+            str(tmp_path),
+            builder.cache_aliases,
+        )
+
+        stored = cp_model.CpModel()
+        stored.Proto().ParseFromString(
+            (tmp_path / f"{builder.cache_key}.model").read_bytes()
+        )
+        index = json.loads((tmp_path / f"{builder.cache_key}.index").read_text())
+        solution = json.loads((tmp_path / f"{builder.cache_key}.solution").read_text())
+
+        assert len(stored.Proto().variables) == len(model.Proto().variables)
+        assert set(index["variable_maps"]["x_vars"][0][0]) == {"tuple"}
+        assert len(solution["items"]) == len(problem.exams)
+
+    def test_tampered_build_is_ignored(self, tmp_path):
+        problem = _build_problem()
+        problem.model_cache_dir = str(tmp_path)
+        builder, _, _ = _build(problem)
+        (tmp_path / f"{builder.cache_key}.model").write_bytes(b"not a model")
+        clear_model_cache()
+
+        rebuilt, _, _ = _build(_build_problem(weight=6))
+
+        assert not rebuilt.reused_cached_model
+
+
+class TestReloadedDataset:
+    """Reruns reload the dataset, which gives days and timeslots new IDs."""
+
+    def setup_method(self):
+        clear_model_cache()
+
+    def teardown_method(self):
+        clear_model_cache()
+
+    def test_reloaded_dataset_hits_the_cache(self):
+        first_problem, second_problem = _load_problem(3), _load_problem(6)
+        first, first_model, _ = _build(first_problem)
+        second, second_model, second_vars = _build(second_problem)
+
+        assert set(first_problem.timeslots).isdisjoint(second_problem.timeslots)
+        assert second.cache_key == first.cache_key
+        assert second.reused_cached_model
+        assert {slot for _, slot in second_vars.x_vars} <= set(second_problem.timeslots)
+        before, after = _objective(first_model), _objective(second_model)
+        assert before and after == {v: 2 * c for v, c in before.items()}
+
+    def test_reloaded_dataset_hits_the_shared_directory(self, tmp_path):
+        first_problem = _load_problem(3, str(tmp_path))
+        first, _, first_vars = _build(first_problem)
+        slot_id = next(iter(first_problem.timeslots))
+        remember_solution(
+            first.cache_key,
+            {exam_id: slot_id for exam_id in first_problem.exams},
+            str(tmp_path),
+            first.cache_aliases,
+        )
+        clear_model_cache()  # as in a recycled worker
+
+        second_problem = _load_problem(6, str(tmp_path))
+        second, model, second_vars = _build(second_problem)
+
+        assert second.reused_cached_model
+        alias = first.cache_aliases[str(slot_id)]
+        (same_slot,) = [
+            UUID(id_) for id_, other in second.cache_aliases.items() if other == alias
+        ]
+        expected = {(exam_id, same_slot) for exam_id in second_problem.exams}
+        hinted = {
+            key
+            for key, var in second_vars.x_vars.items()
+            if var.Index() in model.Proto().solution_hint.vars
+        }
+        assert hinted and hinted == expected & set(second_vars.x_vars)
+        assert len(second_vars.x_vars) == len(first_vars.x_vars)
@@ -0,0 +1,269 @@
+# scheduling_engine/tests/unit/test_phase1_decomposition.py
+
+"""
+Tests for the decomposed Phase 1 solve.
+
+A session of independent faculties splits into one part per faculty; a few
+cross-faculty students either merge faculties or, when cuttable, become cut
+couplings that the repair solve must respect. The merged timetable has to
+satisfy the full Phase 1 model's student-conflict and capacity constraints.
+"""
+
+import asyncio
+import random
+import threading
+from collections import defaultdict
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from ortools.sat.python import cp_model
+
+from scheduling_engine.core.decomposition import (
+    ExamPartition,
+    capacity_shares,
+    partition_exams,
+    problem_view,
+)
+from scheduling_engine.core.problem_model import (
+    Day,
+    Exam,
+    ExamSchedulingProblem,
+    Room,
+    Timeslot,
+)
+from scheduling_engine.cp_sat import decomposed_phase1
+from scheduling_engine.cp_sat.decomposed_phase1 import (
+    _freed_exams,
+    solve_phase1_decomposed,
+)
+from scheduling_engine.cp_sat.model_builder import CPSATModelBuilder
+
+
+def _build_session(
+    seed=0, faculties=3, exams_per_faculty=8, students_per_faculty=40, days=3
+):
+    rng = random.Random(seed)
+    start = date(2025, 1, 6)
+    problem = ExamSchedulingProblem(
+        session_id=uuid4(),
+        exam_period_start=start,
+        exam_period_end=start + timedelta(days=days - 1),
+    )
+    for d in range(days):
+        day = Day(id=uuid4(), date=start + timedelta(days=d))
+        for s in range(3):
+            day.timeslots.append(
+                Timeslot(
+                    id=uuid4(),
+                    parent_day_id=day.id,
+                    name=f"S{s}",
+                    start_time=time(8 + 3 * s),
+                    end_time=time(11 + 3 * s),
+                    duration_minutes=180,
+                )
+            )
+        problem.days[day.id] = day
+    problem.base_slot_duration_minutes = 180
+    for r in range(4):
+        room = Room(id=uuid4(), code=f"R{r}", capacity=60, exam_capacity=60)
+        problem.rooms[room.id] = room
+
+    faculty_exams = []
+    for _ in range(faculties):
+        exams = []
+        for _ in range(exams_per_faculty):
+            exam = Exam(
+                id=uuid4(),
+                course_id=uuid4(),
+                duration_minutes=180,
+                expected_students=0,
+            )
+            problem.exams[exam.id] = exam
+            exams.append(exam)
+        for _ in range(students_per_faculty):
+            student_id = uuid4()
+            for exam in rng.sample(exams, 4):
+                exam.add_student(student_id, "normal")
+        for exam in exams:
+            exam.expected_students = len(exam.students)
+        faculty_exams.append(exams)
+    return problem, faculty_exams
+
+
+def _add_cross_student(faculty_exams, first, second):
+    student_id = uuid4()
+    faculty_exams[first][0].add_student(student_id, "normal")
+    faculty_exams[second][0].add_student(student_id, "normal")
+    return faculty_exams[first][0].id, faculty_exams[second][0].id
+
+
+def _full_model(problem):
+    candidates = {
+        (exam_id, slot_id)
+        for exam_id in problem.exams
+        for slot_id in problem.timeslots
+        if problem.is_start_feasible(exam_id, slot_id)
+    }
+    builder = CPSATModelBuilder(problem=problem)
+    return asyncio.run(builder.build_phase1(candidate_starts=candidates))
+
+
+def _solve_decomposed(problem, partition, time_limit=30):
+    model, shared_vars = _full_model(problem)
+    parameters = cp_model.CpSolver().parameters
+    result = asyncio.run(
+        solve_phase1_decomposed(
+            problem,
+            model,
+            shared_vars,
+            partition,
+            parameters=parameters,
+            time_limit=time_limit,
+            num_workers=3,
+        )
+    )
+    starts = {
+        exam_id: slot_id
+        for (exam_id, slot_id), var in shared_vars.x_vars.items()
+        if result.solver.BooleanValue(var)
+    }
+    return result, starts
+
+
+def _assert_valid_timetable(problem, starts):
+    assert set(starts) == set(problem.exams)
+    occupancy = defaultdict(list)
+    for exam_id, slot_id in starts.items():
+        for occupied in problem.get_occupancy_slots(exam_id, slot_id):
+            occupancy[occupied].append(exam_id)
+    for exam_ids in occupancy.values():
+        assert len(exam_ids) <= len(problem.rooms)
+        students = [s for e in exam_ids for s in problem.exams[e].students]
+        assert len(students) == len(set(students))
+
+
+class TestPartition:
+    def test_independent_faculties_become_parts(self):
+        problem, faculty_exams = _build_session()
+
+        partition = partition_exams(problem, max_parts=8)
+
+        assert sorted(map(sorted, partition.parts)) == sorted(
+            sorted(e.id for e in exams) for exams in faculty_exams
+        )
+        assert partition.cut_edges == {}
+
+    def test_weak_couplings_are_cut_only_when_allowed(self):
+        problem, faculty_exams = _build_session()
+        first, second = _add_cross_student(faculty_exams, 0, 1)
+
+        assert len(partition_exams(problem, max_parts=8).parts) == 2
+
+        partition = partition_exams(problem, max_parts=8, max_cut_students=1)
+        assert len(partition.parts) == 3
+        assert list(partition.cut_edges.values()) == [1]
+        assert set(next(iter(partition.cut_edges))) == {first, second}
+
+    def test_components_are_packed_into_at_most_max_parts(self):
+        problem, _ = _build_session(faculties=5, exams_per_faculty=4)
+
+        partition = partition_exams(problem, max_parts=2)
+
+        assert [len(p) for p in partition.parts] == [12, 8]
+
+    def test_capacity_shares_follow_demand(self):
+        problem, _ = _build_session()
+        partition = partition_exams(problem, max_parts=8)
+
+        shares = capacity_shares(problem, partition.parts)
+
+        # Shares round up, so they over-commit the four rooms slightly.
+        assert [rooms for rooms, _ in shares] == [2, 2, 2]
+        assert 240 <= sum(seats for _, seats in shares) <= 243
+
+    def test_views_hold_only_their_exams(self):
+        problem, faculty_exams = _build_session()
+        part = [e.id for e in faculty_exams[1]]
+
+        view = problem_view(problem, part, (2, 120))
+
+        assert set(view.exams) == set(part)
+        assert view.rooms is problem.rooms
+        assert view.aggregate_capacity_limits == (2, 120)
+        assert problem.aggregate_capacity_limits is None
+        assert len(problem.exams) == 24
+
+
+class TestDecomposedSolve:
+    def test_parts_merge_into_a_valid_timetable(self):
+        problem, _ = _build_session()
+        partition = partition_exams(problem, max_parts=8)
+
+        result, starts = _solve_decomposed(problem, partition)
+
+        assert result.status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        assert result.mode == "repair"
+        assert [p.status for p in result.parts] == [cp_model.OPTIMAL] * 3
+        _assert_valid_timetable(problem, starts)
+
+    def test_cut_couplings_are_repaired(self):
+        problem, faculty_exams = _build_session(seed=1)
+        first, second = _add_cross_student(faculty_exams, 0, 2)
+        partition = partition_exams(problem, max_parts=8, max_cut_students=1)
+
+        result, starts = _solve_decomposed(problem, partition)
+
+        assert result.status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        _assert_valid_timetable(problem, starts)
+        assert starts[first] != starts[second]
+
+    def test_overcommitted_slots_and_cut_pairs_are_freed(self):
+        problem, faculty_exams = _build_session()
+        first, second = _add_cross_student(faculty_exams, 0, 1)
+        partition = ExamPartition(
+            parts=[[e.id for e in exams] for exams in faculty_exams],
+            cut_edges={(first, second): 1},
+        )
+        slots = list(problem.timeslots)
+        # Five exams in one slot exceed the four rooms; the cut pair shares a day.
+        crowded = [e.id for exams in faculty_exams for e in exams[1:3]][:5]
+        starts = {exam_id: slots[0] for exam_id in crowded}
+        starts[first], starts[second] = slots[4], slots[5]
+        starts[faculty_exams[2][5].id] = slots[8]
+
+        freed = _freed_exams(problem, partition, starts)
+
+        unplaced = set(problem.exams) - set(starts)
+        assert freed == unplaced | set(crowded) | {first, second}
+
+    def test_solves_never_get_more_than_the_time_left(self, monkeypatch):
+        problem, _ = _build_session()
+        partition = partition_exams(problem, max_parts=8)
+        clock = SimpleNamespace(now=0.0)
+        lock = threading.Lock()
+        calls = []
+
+        def fake_solve(model, parameters, time_limit, num_workers):
+            # Every solve overshoots its limit by two seconds; the parts run
+            # side by side from the start.
+            with lock:
+                start = 0.0 if len(calls) < len(partition.parts) else clock.now
+                calls.append((start, time_limit))
+                clock.now = max(clock.now, start + time_limit + 2)
+            solver = SimpleNamespace(
+                WallTime=lambda: time_limit,
+                StatusName=lambda: "UNKNOWN",
+                BooleanValue=lambda var: False,
+            )
+            return solver, cp_model.UNKNOWN
+
+        monkeypatch.setattr(decomposed_phase1, "_solve", fake_solve)
+        monkeypatch.setattr(
+            decomposed_phase1, "time", SimpleNamespace(monotonic=lambda: clock.now)
+        )
+
+        _solve_decomposed(problem, partition, time_limit=40)
+
+        assert len(calls) == 4
+        assert all(limit <= 40 - started for started, limit in calls)
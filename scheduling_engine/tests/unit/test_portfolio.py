@@ -0,0 +1,178 @@
+# scheduling_engine/tests/unit/test_portfolio.py
+
+"""
+Tests for CP-SAT portfolio racing.
+
+Races run real solvers on a small weighted independent-set model: they must
+agree with a plain solve, share incumbents between racers, stop on a proof or
+at the deadline, and remember the winning configuration.
+"""
+
+import multiprocessing
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+from ortools.sat.python import cp_model
+
+from scheduling_engine.cp_sat.portfolio import (
+    CONFIGS_BY_NAME,
+    DEFAULT_CONFIG,
+    PORTFOLIO,
+    IncumbentBoard,
+    PortfolioStore,
+    race_lineup,
+    race_portfolio,
+    session_fingerprint,
+)
+
+
+def _independent_set_model(seed=0, n=90, density=0.08):
+    rng = random.Random(seed)
+    model = cp_model.CpModel()
+    picked = [model.NewBoolVar(f"x{i}") for i in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            if rng.random() < density:
+                model.AddBoolOr([picked[i].Not(), picked[j].Not()])
+    weights = [rng.randint(1, 20) for _ in range(n)]
+    model.Maximize(sum(w * x for w, x in zip(weights, picked)))
+    return model, picked, weights
+
+
+def _plain_optimum(model):
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    assert solver.Solve(model) == cp_model.OPTIMAL
+    return solver.ObjectiveValue()
+
+
+class TestRace:
+    @pytest.mark.parametrize("use_processes", [False, True])
+    def test_race_proves_the_same_optimum(self, use_processes):
+        model, picked, weights = _independent_set_model()
+
+        result = race_portfolio(
+            model,
+            race_lineup(3),
+            time_limit=60,
+            total_workers=3,
+            first_round_seconds=0.2,
+            use_processes=use_processes,
+        )
+
+        assert result.status == cp_model.OPTIMAL
+        assert result.StatusName() == "OPTIMAL"
+        assert result.objective == _plain_optimum(model)
+        assert result.winner in CONFIGS_BY_NAME
+        assert result.prover in CONFIGS_BY_NAME
+        # The result reads like a solver for the solution extractor.
+        assert sum(w * result.Value(x) for w, x in zip(weights, picked)) == (
+            result.objective
+        )
+        assert len(result.reports) == 3
+
+    def test_racers_pick_up_shared_incumbents(self):
+        model, _, _ = _independent_set_model(seed=1, n=110)
+
+        result = race_portfolio(
+            model,
+            race_lineup(3),
+            time_limit=60,
+            total_workers=3,
+            first_round_seconds=0.05,
+            use_processes=False,
+        )
+
+        assert result.status == cp_model.OPTIMAL
+        assert sum(r["published"] for r in result.reports) >= 1
+        assert any(r["hinted_rounds"] for r in result.reports)
+
+    def test_race_stops_at_the_deadline(self):
+        model, _, _ = _independent_set_model(seed=2, n=300, density=0.03)
+
+        started = time.monotonic()
+        result = race_portfolio(
+            model,
+            race_lineup(2),
+            time_limit=1.0,
+            total_workers=2,
+            use_processes=False,
+        )
+
+        assert time.monotonic() - started < 4.0
+        assert result.status == cp_model.FEASIBLE
+        assert result.winner in CONFIGS_BY_NAME
+        assert result.prover is None
+
+    def test_infeasible_model_is_reported(self):
+        model = cp_model.CpModel()
+        x = model.NewIntVar(0, 5, "x")
+        model.Add(x > 5)
+        model.Minimize(x)
+
+        result = race_portfolio(model, race_lineup(2), 10, use_processes=False)
+
+        assert result.status == cp_model.INFEASIBLE
+        assert result.objective is None
+
+
+class TestIncumbentBoard:
+    def test_only_improving_incumbents_are_accepted(self):
+        ctx = multiprocessing.get_context("spawn")
+        board = IncumbentBoard(ctx, num_vars=2, sense=-1)  # maximisation
+
+        assert board.read() is None
+        assert board.publish(0, 10, [1, 0])
+        assert not board.publish(1, 7, [0, 1])
+        assert board.publish(1, 12, [1, 1])
+
+        incumbent = board.read()
+        assert incumbent["objective"] == 12
+        assert incumbent["owner"] == 1
+        assert incumbent["values"] == [1, 1]
+        assert board.read(newer_than=incumbent["version"]) is None
+
+
+class TestPortfolioMemory:
+    def test_lineup_starts_with_the_preferred_config(self):
+        assert race_lineup(1) == [DEFAULT_CONFIG]
+        assert race_lineup(3, "core_bound")[0].name == "core_bound"
+        assert race_lineup(3, "unknown")[0] is DEFAULT_CONFIG
+        assert len(race_lineup(len(PORTFOLIO) + 2)) == len(PORTFOLIO) + 2
+
+    def test_store_remembers_winners_per_fingerprint(self, tmp_path):
+        store = PortfolioStore(tmp_path / "portfolio.json")
+        assert store.preferred("phase1:e7") is None
+
+        store.record("phase1:e7", "no_lp", objective=10.0)
+        store.record("phase1:e7", "quick_restart")
+        store.record("phase1:e7", "quick_restart")
+        store.record("phase1:e3", "lb_tree")
+
+        reopened = PortfolioStore(tmp_path / "portfolio.json")
+        assert reopened.preferred("phase1:e7") == "quick_restart"
+        assert reopened.preferred("phase1:e3") == "lb_tree"
+
+    def test_corrupt_store_is_ignored(self, tmp_path):
+        path = tmp_path / "portfolio.json"
+        path.write_text("{not json")
+        assert PortfolioStore(path).preferred("phase1:e7") is None
+
+    def test_similar_sessions_share_a_fingerprint(self):
+        def problem(exams, rooms):
+            return SimpleNamespace(
+                exams=dict.fromkeys(range(exams)),
+                students={},
+                rooms=dict.fromkeys(range(rooms)),
+                timeslots=dict.fromkeys(range(30)),
+                invigilators={},
+            )
+
+        assert session_fingerprint(problem(300, 40), "phase1") == (
+            session_fingerprint(problem(400, 50), "phase1")
+        )
+        assert session_fingerprint(problem(300, 40), "phase1") != (
+            session_fingerprint(problem(1200, 40), "phase1")
+        )
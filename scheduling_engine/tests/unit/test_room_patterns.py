@@ -0,0 +1,228 @@
+# scheduling_engine/tests/unit/test_room_patterns.py
+
+"""
+Tests for the pattern-based Phase 2 room model.
+
+Patterns must be minimal covers ranked by building and waste, the pool must
+widen when grown, and a Phase 2 model built from patterns must split exams
+over several rooms without ever seating more than a room holds.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import date, time
+from uuid import uuid4
+
+from ortools.sat.python import cp_model
+
+from scheduling_engine.core.problem_model import (
+    Day,
+    Exam,
+    ExamSchedulingProblem,
+    Invigilator,
+    Room,
+    Timeslot,
+)
+from scheduling_engine.core.room_patterns import (
+    RoomPatternPool,
+    fill_rooms,
+    minimal_covers,
+)
+from scheduling_engine.cp_sat.model_builder import CPSATModelBuilder
+
+
+def _build_problem(capacities=((50, 50, 50), (50, 50, 50)), sizes=(120, 90)):
+    start = date(2025, 1, 6)
+    problem = ExamSchedulingProblem(
+        session_id=uuid4(), exam_period_start=start, exam_period_end=start
+    )
+    day = Day(id=uuid4(), date=start)
+    day.timeslots.append(
+        Timeslot(
+            id=uuid4(),
+            parent_day_id=day.id,
+            name="S0",
+            start_time=time(8),
+            end_time=time(11),
+            duration_minutes=180,
+        )
+    )
+    problem.days[day.id] = day
+    problem.base_slot_duration_minutes = 180
+    for b, building in enumerate(capacities):
+        for r, capacity in enumerate(building):
+            room = Room(
+                id=uuid4(),
+                code=f"B{b}R{r}",
+                capacity=capacity,
+                exam_capacity=capacity,
+                building_name=f"B{b}",
+            )
+            problem.rooms[room.id] = room
+    for i in range(12):
+        invigilator = Invigilator(id=uuid4(), name=f"I{i}")
+        problem.invigilators[invigilator.id] = invigilator
+    exams = []
+    for students in sizes:
+        exam = Exam(
+            id=uuid4(),
+            course_id=uuid4(),
+            duration_minutes=180,
+            expected_students=students,
+        )
+        problem.exams[exam.id] = exam
+        exams.append(exam)
+    return problem, exams
+
+
+def _phase1_results(problem):
+    slot_id = next(iter(problem.timeslots))
+    day = next(iter(problem.days.values())).date
+    return {exam_id: (slot_id, day) for exam_id in problem.exams}
+
+
+def _solve(model):
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    solver.parameters.max_time_in_seconds = 30
+    status = solver.Solve(model)
+    return solver, status
+
+
+class TestPatterns:
+    def test_covers_are_minimal(self):
+        capacities = [("a", 60), ("b", 50), ("c", 40), ("d", 10)]
+
+        covers = minimal_covers(capacities, 90, max_rooms=3, node_budget=100)
+
+        assert ["a", "b"] in covers and ["a", "c"] in covers
+        assert ["b", "c"] in covers
+        assert not any(len(cover) > 2 and cover[:2] == ["a", "b"] for cover in covers)
+        assert all(sum(dict(capacities)[r] for r in cover) >= 90 for cover in covers)
+
+    def test_last_room_takes_the_remainder(self):
+        problem, _ = _build_problem(capacities=((80, 50),))
+        rooms = sorted(problem.rooms, key=lambda r: -problem.rooms[r].exam_capacity)
+
+        assert fill_rooms(problem, 100, rooms) == (80, 20)
+
+    def test_same_building_and_low_waste_rank_first(self):
+        problem, exams = _build_problem(capacities=((70, 30), (60, 50)), sizes=(100,))
+        pool = RoomPatternPool(problem)
+
+        patterns = pool.patterns_for(exams[0].id)
+
+        best = patterns[0]
+        assert best.buildings == 1 and best.waste == 0
+        assert {problem.rooms[r].code for r in best.rooms} == {"B0R0", "B0R1"}
+        assert patterns[1].waste == 10 and patterns[1].buildings == 1
+        assert all(p.buildings >= best.buildings for p in patterns)
+
+    def test_grow_offers_more_patterns(self):
+        capacities = tuple(tuple(40 + 10 * r for r in range(6)) for _ in range(3))
+        problem, exams = _build_problem(capacities=capacities, sizes=(200,))
+        pool = RoomPatternPool(problem, patterns_per_exam=4)
+
+        before = pool.patterns_for(exams[0].id)
+        pool.grow()
+        after = pool.patterns_for(exams[0].id)
+
+        assert len(before) == 4
+        assert len(after) > len(before)
+        assert max(p.waste for p in after) >= max(p.waste for p in before)
+
+    def test_first_fit_uses_disjoint_rooms(self):
+        problem, exams = _build_problem(sizes=(100, 90, 60))
+        pool = RoomPatternPool(problem)
+
+        packing = pool.first_fit({exam.id: frozenset() for exam in exams})
+
+        rooms = [r for pattern in packing.values() for r in pattern.rooms]
+        assert set(packing) == {exam.id for exam in exams}
+        assert len(rooms) == len(set(rooms))
+
+
+class TestPhase2:
+    def test_patterns_split_exams_within_room_capacity(self):
+        problem, exams = _build_problem()
+        results = _phase1_results(problem)
+
+        builder = CPSATModelBuilder(problem=problem)
+        model, shared_vars = asyncio.run(
+            builder.build_phase2_full_model(
+                results, room_patterns=RoomPatternPool(problem)
+            )
+        )
+        solver, status = _solve(model)
+
+        assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        patterns = builder.encoder.pattern_choices
+        seats = defaultdict(int)
+        for (exam_id, index), var in shared_vars.pattern_vars.items():
+            if solver.BooleanValue(var):
+                pattern = patterns[exam_id][index]
+                assert sum(pattern.seats) == problem.exams[exam_id].expected_students
+                for room_id, taken in pattern.allocations().items():
+                    seats[room_id] += taken
+                    assert solver.BooleanValue(
+                        shared_vars.y_vars[(exam_id, room_id, results[exam_id][0])]
+                    )
+        assert all(seats[r] <= problem.rooms[r].exam_capacity for r in seats)
+        assert sum(seats.values()) == sum(e.expected_students for e in exams)
+
+    def test_overbookable_rooms_are_shared_up_to_the_overbook_rate(self):
+        def build(overbookable):
+            problem, _ = _build_problem(capacities=((50,),), sizes=(30, 25))
+            room = next(iter(problem.rooms.values()))
+            setattr(room, "_overbookable", overbookable)
+            builder = CPSATModelBuilder(problem=problem)
+            model, _ = asyncio.run(
+                builder.build_phase2_full_model(
+                    _phase1_results(problem), room_patterns=RoomPatternPool(problem)
+                )
+            )
+            return problem, room, model
+
+        problem, room, model = build(overbookable=True)
+        assert problem.get_room_seat_limit(room.id) == 55
+        assert _solve(model)[1] in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+        problem, room, model = build(overbookable=False)
+        assert problem.get_room_seat_limit(room.id) == 50
+        assert _solve(model)[1] == cp_model.INFEASIBLE
+
+    def test_assignment_model_cannot_split_exams(self):
+        problem, _ = _build_problem()
+
+        builder = CPSATModelBuilder(problem=problem)
+        model, _ = asyncio.run(
+            builder.build_phase2_full_model(_phase1_results(problem))
+        )
+
+        assert _solve(model)[1] == cp_model.INFEASIBLE
+
+    def test_room_lock_leaves_one_fixed_pattern(self):
+        problem, exams = _build_problem()
+        slot_id = next(iter(problem.timeslots))
+        locked_rooms = list(problem.rooms)[3:6]
+        problem.locks = [
+            {
+                "exam_id": exams[0].id,
+                "time_slot_id": slot_id,
+                "room_ids": locked_rooms,
+                "invigilator_ids": [],
+            }
+        ]
+
+        builder = CPSATModelBuilder(problem=problem)
+        model, shared_vars = asyncio.run(
+            builder.build_phase2_full_model(
+                _phase1_results(problem), room_patterns=RoomPatternPool(problem)
+            )
+        )
+
+        (pattern,) = builder.encoder.pattern_choices[exams[0].id]
+        assert set(pattern.rooms) == set(locked_rooms)
+        var = shared_vars.pattern_vars[(exams[0].id, 0)]
+        assert list(model.Proto().variables[var.Index()].domain) == [1, 1]
+        assert _solve(model)[1] in (cp_model.OPTIMAL, cp_model.FEASIBLE)
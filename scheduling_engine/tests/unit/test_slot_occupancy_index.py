@@ -0,0 +1,196 @@
+# scheduling_engine/tests/unit/test_slot_occupancy_index.py
+
+"""
+Tests for SlotOccupancyIndex and the indexed path of
+ComprehensiveSolutionValidator.validate_incremental_change.
+"""
+
+import time
+
+import pytest
+
+from scheduling_engine.utils.validation import (
+    ComprehensiveSolutionValidator,
+    SlotOccupancyIndex,
+    ViolationType,
+)
+
+
+def _solution_data():
+    return {
+        "exam_assignments": [
+            {
+                "exam_id": "A",
+                "course_id": "CA",
+                "exam_date": "d1",
+                "time_slot_id": "s1",
+            },
+            {
+                "exam_id": "B",
+                "course_id": "CB",
+                "exam_date": "d1",
+                "time_slot_id": "s2",
+            },
+            {
+                "exam_id": "C",
+                "course_id": "CC",
+                "exam_date": "d2",
+                "time_slot_id": "s1",
+            },
+        ],
+        "student_registrations": [
+            {"student_id": "st1", "course_id": "CA"},
+            {"student_id": "st1", "course_id": "CB"},
+            {"student_id": "st2", "course_id": "CB"},
+            {"student_id": "st3", "course_id": "CC"},
+        ],
+        "room_assignments": [
+            {"exam_id": "A", "room_id": "R1", "allocated_capacity": 30},
+            {"exam_id": "B", "room_id": "R1", "allocated_capacity": 40},
+            {"exam_id": "C", "room_id": "R2", "allocated_capacity": 10},
+        ],
+        "rooms": [
+            {"id": "R1", "exam_capacity": 50},
+            {"id": "R2", "exam_capacity": 100},
+        ],
+        "staff_assignments": [
+            {"exam_id": "A", "staff_id": "inv1"},
+            {"exam_id": "C", "staff_id": "inv1"},
+        ],
+    }
+
+
+def _types(violations):
+    return sorted(v.violation_type.value for v in violations)
+
+
+class TestSlotOccupancyIndex:
+    def test_move_reports_student_room_and_staff_clashes(self):
+        index = SlotOccupancyIndex.from_solution_data(_solution_data())
+
+        violations = index.check_move("A", ("d1", "s2"))
+
+        assert _types(violations) == ["room_capacity", "student_conflict"]
+        clash = violations[0]
+        assert clash.metadata == {"conflicting_exam_id": "B", "student_count": 1}
+
+        staff = index.check_move("A", ("d2", "s1"))
+        assert _types(staff) == [ViolationType.STAFF_AVAILABILITY.value]
+
+    def test_free_slot_and_new_room_are_clean(self):
+        index = SlotOccupancyIndex.from_solution_data(_solution_data())
+        assert index.check_move("A", ("d2", "s2")) == []
+        assert index.check_move("A", ("d1", "s2"), rooms={"R2": 30})[0].metadata == {
+            "conflicting_exam_id": "B",
+            "student_count": 1,
+        }
+
+    def test_swap_ignores_the_partner_exam(self):
+        index = SlotOccupancyIndex.from_solution_data(_solution_data())
+        # B and C share no students, rooms or staff, so trading slots is fine.
+        assert index.check_swap("B", "C") == []
+        with pytest.raises(KeyError):
+            index.check_swap("B", "missing")
+
+    def test_applied_moves_update_the_index(self):
+        index = SlotOccupancyIndex.from_solution_data(_solution_data())
+        index.apply_move("B", ("d2", "s2"))
+
+        assert index.check_move("A", ("d1", "s2")) == []
+        assert index.student_slots["st2"][("d1", "s2")] == set()
+        assert index.student_slots["st2"][("d2", "s2")] == {"B"}
+        assert index.check_move("C", ("d2", "s2")) == []
+
+    def test_move_check_only_touches_affected_entities(self):
+        exams, registrations = [], []
+        for e in range(2000):
+            exams.append(
+                {
+                    "exam_id": f"E{e}",
+                    "course_id": f"C{e}",
+                    "exam_date": f"d{e % 10}",
+                    "time_slot_id": f"s{e % 3}",
+                }
+            )
+            registrations.extend(
+                {"student_id": f"st{(e * 7 + k) % 5000}", "course_id": f"C{e}"}
+                for k in range(25)
+            )
+        index = SlotOccupancyIndex.from_solution_data(
+            {"exam_assignments": exams, "student_registrations": registrations}
+        )
+
+        start = time.perf_counter()
+        for e in range(200):
+            index.check_move(f"E{e}", ("d0", "s1"))
+        assert (time.perf_counter() - start) / 200 < 0.005
+
+
+def _long_exam_data():
+    data = _solution_data()
+    data["time_slots"] = [
+        {"id": slot, "exam_date": day, "start_time": start, "duration_minutes": 180}
+        for day in ("d1", "d2")
+        for slot, start in (("s1", "09:00:00"), ("s2", "12:00:00"), ("s3", "15:00:00"))
+    ]
+    data["exams"] = [
+        {"id": "A", "duration_minutes": 360},
+        {"id": "B", "duration_minutes": 180},
+        {"id": "C", "duration_minutes": 180},
+    ]
+    # A no longer shares a room with B, so only the students clash.
+    data["room_assignments"][0]["room_id"] = "R2"
+    data["exam_assignments"][1]["time_slot_id"] = "s3"
+    return data
+
+
+class TestMultiSlotExams:
+    def test_long_exam_holds_every_slot_it_runs_through(self):
+        index = SlotOccupancyIndex.from_solution_data(_long_exam_data())
+
+        assert index.occupied_slots("A", ("d1", "s1")) == [
+            ("d1", "s1"),
+            ("d1", "s2"),
+        ]
+        assert index.student_slots["st1"][("d1", "s2")] == {"A"}
+        # B starts in s2, the second half of A, where st1 is still sitting A.
+        violations = index.check_move("B", ("d1", "s2"))
+        assert _types(violations) == ["student_conflict"]
+        assert violations[0].metadata["conflicting_exam_id"] == "A"
+        assert index.check_move("B", ("d1", "s3")) == []
+
+    def test_moving_a_long_exam_frees_all_of_its_slots(self):
+        index = SlotOccupancyIndex.from_solution_data(_long_exam_data())
+        index.apply_move("A", ("d2", "s2"))
+
+        assert index.student_slots["st1"][("d1", "s2")] == set()
+        assert index.room_slots["R2"][("d2", "s3")] == {"A": 30}
+        assert index.check_move("B", ("d1", "s2")) == []
+        # C is in d2/s1 and R2 holds 100, so A beside it in s2-s3 is fine.
+        assert index.check_move("C", ("d2", "s2"), rooms={"R2": 80}) != []
+
+
+class TestIndexedIncrementalValidation:
+    def test_move_and_swap_use_the_index(self):
+        data = _solution_data()
+        validator = ComprehensiveSolutionValidator()
+        index = SlotOccupancyIndex.from_solution_data(data)
+
+        move = validator.validate_incremental_change(
+            data,
+            {
+                "change_type": "exam_move",
+                "exam_id": "A",
+                "exam_date": "d1",
+                "time_slot_id": "s2",
+            },
+            occupancy_index=index,
+        )
+        assert not move.is_feasible
+        assert move.performance_metrics["indexed_validation"] is True
+
+        swap = validator.validate_incremental_change(
+            data,
+            {"change_type": "exam_swap", "exam_id": "B", "swap_with_exam_id": "C"},
+        )
+        assert swap.is_feasible and swap.total_violations == 0
@@ -0,0 +1,224 @@
+# scheduling_engine/tests/unit/test_symmetry_breaking.py
+
+"""
+Tests for room and invigilator symmetry breaking in the Phase 2 encoder.
+
+Identical rooms and interchangeable invigilators are grouped into classes and
+ordered inside each class. The ordering must never change the optimal packing
+objective, and it should shrink the search CP-SAT has to do.
+"""
+
+import asyncio
+import random
+from datetime import date, time
+from uuid import UUID
+
+import pytest
+from ortools.sat.python import cp_model
+
+from scheduling_engine.constraints.hard_constraints import (
+    InvigilatorContinuityConstraint,
+    InvigilatorRequirementConstraint,
+    InvigilatorSinglePresenceConstraint,
+    RoomAssignmentConsistencyConstraint,
+    RoomCapacityHardConstraint,
+    RoomContinuityConstraint,
+)
+from scheduling_engine.constraints.soft_constraints.invigilator_load_balance import (
+    InvigilatorLoadBalanceConstraint,
+)
+from scheduling_engine.constraints.soft_constraints.room_fit_penalty import (
+    RoomFitPenaltyConstraint,
+)
+from scheduling_engine.core.constraint_types import (
+    ConstraintCategory,
+    ConstraintDefinition,
+    ConstraintType,
+)
+from scheduling_engine.core.problem_model import (
+    Day,
+    Exam,
+    ExamSchedulingProblem,
+    Invigilator,
+    Room,
+    Timeslot,
+)
+from scheduling_engine.core.symmetry import detect_symmetry
+from scheduling_engine.cp_sat.constraint_encoder import ConstraintEncoder
+
+PHASE2_CONSTRAINTS = [
+    (RoomAssignmentConsistencyConstraint, ConstraintType.HARD),
+    (RoomCapacityHardConstraint, ConstraintType.HARD),
+    (RoomContinuityConstraint, ConstraintType.HARD),
+    (InvigilatorRequirementConstraint, ConstraintType.HARD),
+    (InvigilatorSinglePresenceConstraint, ConstraintType.HARD),
+    (InvigilatorContinuityConstraint, ConstraintType.HARD),
+    (RoomFitPenaltyConstraint, ConstraintType.SOFT),
+    (InvigilatorLoadBalanceConstraint, ConstraintType.SOFT),
+]
+
+
+def _uuid(rng):
+    # Seeded IDs keep variable order, and so the search, reproducible.
+    return UUID(int=rng.getrandbits(128), version=4)
+
+
+def _build_problem(
+    seed, capacities=(40, 40, 40, 80, 80, 120), n_exams=4, n_invigilators=8
+):
+    rng = random.Random(seed)
+    start = date(2025, 1, 6)
+    problem = ExamSchedulingProblem(
+        session_id=_uuid(rng), exam_period_start=start, exam_period_end=start
+    )
+    day = Day(id=_uuid(rng), date=start)
+    for s in range(3):
+        day.timeslots.append(
+            Timeslot(
+                id=_uuid(rng),
+                parent_day_id=day.id,
+                name=f"S{s}",
+                start_time=time(8 + s),
+                end_time=time(9 + s),
+                duration_minutes=60,
+            )
+        )
+    problem.days[day.id] = day
+    problem.base_slot_duration_minutes = 60
+    problem.max_students_per_invigilator = 30
+
+    for r, capacity in enumerate(capacities):
+        room = Room(
+            id=_uuid(rng),
+            code=f"R{r}",
+            capacity=capacity,
+            exam_capacity=capacity,
+            building_name="Main",
+        )
+        problem.rooms[room.id] = room
+    for _ in range(n_exams):
+        exam = Exam(
+            id=_uuid(rng),
+            course_id=_uuid(rng),
+            duration_minutes=rng.choice([60, 120]),
+            expected_students=rng.randint(5, 70),
+        )
+        problem.exams[exam.id] = exam
+    for i in range(n_invigilators):
+        invigilator = Invigilator(id=_uuid(rng), name=f"I{i}")
+        problem.invigilators[invigilator.id] = invigilator
+    return problem
+
+
+def _packing_model(problem, break_symmetry):
+    """All exams start together in the first slot, as one Phase 2 group."""
+    first_slot = next(iter(problem.days.values())).timeslots[0]
+    phase1_results = {exam_id: (first_slot.id, None) for exam_id in problem.exams}
+    model = cp_model.CpModel()
+    encoder = ConstraintEncoder(
+        problem, model, use_ga_filter=False, break_symmetry=break_symmetry
+    )
+    shared_vars = encoder.encode_phase2_full(phase1_results)
+
+    terms = []
+    for cls, constraint_type in PHASE2_CONSTRAINTS:
+        definition = ConstraintDefinition(
+            id=cls.__name__,
+            name=cls.__name__,
+            description="",
+            constraint_type=constraint_type,
+            category=ConstraintCategory.CORE,
+            weight=1,
+        )
+        constraint = cls(definition, problem, shared_vars, model)
+        constraint.initialize_variables()
+        asyncio.run(constraint.add_constraints())
+        terms.extend(constraint.get_penalty_terms())
+    model.Minimize(sum(int(weight) * var for weight, var in terms))
+    return model, shared_vars, encoder
+
+
+def _solve(model):
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    solver.parameters.random_seed = 0
+    status = solver.Solve(model)
+    assert status == cp_model.OPTIMAL
+    return solver
+
+
+class TestSymmetryDetection:
+    def test_rooms_and_invigilators_are_grouped_by_attributes(self):
+        problem = _build_problem(0)
+        rooms = {room.code: room_id for room_id, room in problem.rooms.items()}
+
+        symmetry = detect_symmetry(problem)
+
+        room_classes = sorted(
+            sorted(problem.rooms[r].code for r in members) for members in symmetry.rooms
+        )
+        assert room_classes == [["R0", "R1", "R2"], ["R3", "R4"]]
+        assert [len(c) for c in symmetry.invigilators] == [8]
+
+        problem.rooms[rooms["R4"]].has_computers = True
+        invigilator = next(iter(problem.invigilators.values()))
+        invigilator.availability = {"2025-01-06": ["S0"]}
+        symmetry = detect_symmetry(problem)
+        assert [len(c) for c in symmetry.rooms] == [3]
+        assert [len(c) for c in symmetry.invigilators] == [7]
+
+    def test_locked_rooms_and_invigilators_are_left_out(self):
+        problem = _build_problem(0)
+        room_id = next(iter(problem.rooms))
+        inv_id = next(iter(problem.invigilators))
+        problem.locks = [
+            {
+                "exam_id": next(iter(problem.exams)),
+                "time_slot_id": next(iter(problem.timeslots)),
+                "room_ids": [room_id],
+                "invigilator_ids": [inv_id],
+            }
+        ]
+
+        symmetry = detect_symmetry(problem)
+
+        grouped = {r for members in symmetry.rooms for r in members}
+        grouped |= {i for members in symmetry.invigilators for i in members}
+        assert room_id not in grouped
+        assert inv_id not in grouped
+
+
+class TestSymmetryBreaking:
+    @pytest.mark.parametrize("seed", range(6))
+    def test_optimal_objective_is_unchanged(self, seed):
+        problem = _build_problem(seed)
+
+        plain, _, _ = _packing_model(problem, break_symmetry=False)
+        ordered, _, encoder = _packing_model(problem, break_symmetry=True)
+
+        assert encoder.encoding_stats["symmetry_breaking_constraints"] > 0
+        assert _solve(ordered).ObjectiveValue() == _solve(plain).ObjectiveValue()
+
+    def test_solution_respects_class_ordering(self):
+        problem = _build_problem(1)
+        model, shared_vars, _ = _packing_model(problem, break_symmetry=True)
+        solver = _solve(model)
+
+        symmetry = shared_vars.precomputed_data["symmetry_classes"]
+        for members in symmetry.invigilators:
+            posts = [
+                sum(solver.Value(v) for k, v in shared_vars.w_vars.items() if k[0] == i)
+                for i in members
+            ]
+            assert posts == sorted(posts, reverse=True)
+
+    def test_search_is_smaller(self):
+        problem = _build_problem(3)
+
+        plain, _, _ = _packing_model(problem, break_symmetry=False)
+        ordered, _, _ = _packing_model(problem, break_symmetry=True)
+        plain_solver = _solve(plain)
+        ordered_solver = _solve(ordered)
+
+        assert ordered_solver.ObjectiveValue() == plain_solver.ObjectiveValue()
+        assert ordered_solver.NumBranches() * 3 < plain_solver.NumBranches()
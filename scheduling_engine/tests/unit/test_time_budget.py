@@ -0,0 +1,137 @@
+# scheduling_engine/tests/unit/test_time_budget.py
+
+"""
+Tests for sharing one job deadline across the solve stages.
+
+A fake clock drives the budget: stages must be planned within the deadline,
+time a stage leaves unused must flow to the stages still pending, and the
+report must show planned against actual time per stage.
+"""
+
+from types import SimpleNamespace
+
+from scheduling_engine.cp_sat.time_budget import (
+    PHASE1_BUILD,
+    PHASE1_SOLVE,
+    PHASE2,
+    RESERVE,
+    TimeBudget,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def _problem(exams=100, slots=30, rooms=20, invigilators=10):
+    return SimpleNamespace(
+        exams=dict.fromkeys(range(exams)),
+        timeslots=dict.fromkeys(range(slots)),
+        rooms=dict.fromkeys(range(rooms)),
+        invigilators=dict.fromkeys(range(invigilators)),
+    )
+
+
+def _budget(deadline=100.0, **plan):
+    clock = FakeClock()
+    plan = plan or {"a": 40.0, "b": 40.0, RESERVE: 20.0}
+    return TimeBudget(deadline, plan, clock=clock), clock
+
+
+class TestPlan:
+    def test_stages_are_planned_within_the_deadline(self):
+        budget = TimeBudget.for_problem(_problem(), 600, clock=FakeClock())
+
+        planned = {name: s.planned for name, s in budget.stages.items()}
+        assert list(planned) == [PHASE1_BUILD, PHASE1_SOLVE, PHASE2, RESERVE]
+        assert abs(sum(planned.values()) - 600) < 1e-6
+        solve = planned[PHASE1_SOLVE] + planned[PHASE2]
+        assert 0.4 <= planned[PHASE1_SOLVE] / solve <= 0.8
+
+    def test_larger_phase2_models_get_more_of_the_solve_time(self):
+        small = TimeBudget.for_problem(_problem(invigilators=2), 600, clock=FakeClock())
+        large = TimeBudget.for_problem(
+            _problem(invigilators=200), 600, clock=FakeClock()
+        )
+
+        assert large.stages[PHASE2].planned > small.stages[PHASE2].planned
+
+
+class TestAllotment:
+    def test_allotment_follows_the_plan(self):
+        budget, _ = _budget()
+
+        assert budget.start("a") == 40.0
+
+    def test_spare_time_flows_to_pending_stages(self):
+        budget, clock = _budget()
+        budget.start("a")
+        clock.advance(10)
+        budget.finish("a", "OPTIMAL")
+
+        # 90s left over b (40) and the reserve (20).
+        assert budget.start("b") == 60.0
+
+    def test_overruns_shrink_later_stages(self):
+        budget, clock = _budget()
+        budget.start("a")
+        clock.advance(70)
+        budget.finish("a")
+
+        assert budget.start("b") == 20.0
+
+    def test_split_runs_smallest_first_and_keeps_the_reserve(self):
+        budget, clock = _budget(**{"p1": 30.0, PHASE2: 60.0, RESERVE: 10.0})
+        budget.start("p1")
+        clock.advance(30)
+        budget.finish("p1")
+
+        order = budget.split(PHASE2, {"hard": 3, "easy": 1})
+
+        assert order == ["easy", "hard"]
+        assert list(budget.stages)[-1] == RESERVE
+        assert budget.stages["hard"].planned == 45.0
+        easy = budget.start("easy")
+        assert easy == 15.0
+        clock.advance(5)
+        budget.finish("easy")
+        # The 10s easy left unused mostly go to hard.
+        assert abs(budget.start("hard") - 65 * 45 / 55) < 1e-9
+
+    def test_stage_remaining_and_expiry(self):
+        budget, clock = _budget()
+        budget.start("a")
+        clock.advance(15)
+
+        assert budget.stage_remaining("a") == 25.0
+        clock.advance(100)
+        assert budget.stage_remaining("a") == 0.0
+        assert budget.expired()
+        assert budget.start("b") == 0.0
+
+
+class TestReport:
+    def test_report_shows_planned_and_actual_time(self):
+        budget, clock = _budget()
+        budget.start("a")
+        clock.advance(12.5)
+        budget.finish("a", "FEASIBLE")
+
+        report = budget.report()
+
+        assert report["deadline_seconds"] == 100.0
+        assert report["elapsed_seconds"] == 12.5
+        assert report["stages"]["a"] == {
+            "planned_seconds": 40.0,
+            "allotted_seconds": 40.0,
+            "actual_seconds": 12.5,
+            "status": "FEASIBLE",
+        }
+        assert report["stages"]["b"]["actual_seconds"] is None
@@ -0,0 +1,168 @@
+# scheduling_engine/tests/unit/test_timetable_gui_viewer.py
+
+"""
+Headless tests for the TimetableGUIViewer entity indexes and calendar
+virtualization. No Tk window is created: the viewer is built without running
+setup_gui and only its data-processing methods are exercised.
+"""
+
+import random
+import time
+from datetime import date, time as dt_time, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from scheduling_engine.core.solution import AssignmentStatus, ExamAssignment
+from scheduling_engine.gui.timetable_gui_viewer import (
+    CALENDAR_CELL_HEIGHT,
+    CALENDAR_CELL_WIDTH,
+    CALENDAR_HEADER_HEIGHT,
+    CALENDAR_HEADER_WIDTH,
+    TimetableGUIViewer,
+)
+
+N_STUDENTS = 25_000
+N_EXAMS = 1_500
+STUDENTS_PER_EXAM = 80
+N_DAYS = 15
+TEMPLATES = [(dt_time(9), dt_time(12)), (dt_time(13), dt_time(16))]
+
+
+def _viewer(seed=7):
+    rng = random.Random(seed)
+    students = [uuid4() for _ in range(N_STUDENTS)]
+    rooms = {
+        rid: SimpleNamespace(id=rid, code=f"R{i}", capacity=200)
+        for i, rid in enumerate(uuid4() for _ in range(60))
+    }
+    invigilators = {
+        iid: SimpleNamespace(id=iid) for iid in (uuid4() for _ in range(300))
+    }
+    start = date(2025, 1, 6)
+    timeslots = {}
+    for d in range(N_DAYS):
+        for begin, end in TEMPLATES:
+            tid = uuid4()
+            timeslots[tid] = SimpleNamespace(
+                id=tid, date=start + timedelta(days=d), start_time=begin, end_time=end
+            )
+    slot_ids = list(timeslots)
+
+    exams, course_students, assignments = {}, {}, {}
+    for _ in range(N_EXAMS):
+        exam_id, course_id = uuid4(), uuid4()
+        course_students[course_id] = set(rng.sample(students, STUDENTS_PER_EXAM))
+        exams[exam_id] = SimpleNamespace(
+            id=exam_id,
+            course_id=course_id,
+            duration_minutes=180,
+            expected_students=STUDENTS_PER_EXAM,
+            is_practical=False,
+        )
+        slot = timeslots[rng.choice(slot_ids)]
+        room_id = rng.choice(list(rooms))
+        assignments[exam_id] = ExamAssignment(
+            exam_id=exam_id,
+            time_slot_id=slot.id,
+            room_ids=[room_id],
+            assigned_date=slot.date,
+            status=AssignmentStatus.ASSIGNED,
+            room_allocations={room_id: STUDENTS_PER_EXAM},
+            invigilator_ids=rng.sample(list(invigilators), 2),
+        )
+
+    problem = SimpleNamespace(
+        exams=exams,
+        students={sid: SimpleNamespace(id=sid) for sid in students},
+        rooms=rooms,
+        invigilators=invigilators,
+        timeslots=timeslots,
+        course_students=course_students,
+        get_students_for_course=lambda cid: course_students.get(cid, set()),
+    )
+    viewer = TimetableGUIViewer.__new__(TimetableGUIViewer)
+    viewer.problem = problem
+    viewer.solution = SimpleNamespace(assignments=assignments)
+    viewer.processed_data = None
+    viewer.process_solution_data()
+    return viewer
+
+
+@pytest.fixture(scope="module")
+def viewer():
+    return _viewer()
+
+
+def _brute_force(viewer, student_id):
+    problem, rows = viewer.problem, []
+    for assignment in viewer.solution.assignments.values():
+        exam = problem.exams[assignment.exam_id]
+        if student_id in problem.course_students[exam.course_id]:
+            rows.append(assignment.exam_id)
+    return set(rows)
+
+
+class TestEntityIndexes:
+    def test_student_schedule_matches_full_scan(self, viewer):
+        for student_id in list(viewer.problem.students)[:20]:
+            rows = viewer.get_entity_schedule_data(student_id, "student")
+            assert {r["exam_id"] for r in rows} == _brute_force(viewer, student_id)
+            keys = [(r["date"], r["timeslot"].start_time) for r in rows]
+            assert keys == sorted(keys)
+
+    def test_room_and_invigilator_schedules(self, viewer):
+        assignments = viewer.solution.assignments.values()
+        room_id = next(iter(viewer.problem.rooms))
+        invigilator_id = next(iter(viewer.problem.invigilators))
+
+        room_rows = viewer.get_entity_schedule_data(room_id, "room")
+        assert {r["exam_id"] for r in room_rows} == {
+            a.exam_id for a in assignments if room_id in a.room_ids
+        }
+        assert viewer.get_invigilator_assignments(invigilator_id) == (
+            viewer.get_entity_schedule_data(invigilator_id, "invigilator")
+        )
+        assert len(viewer.get_invigilator_assignments()) == N_EXAMS
+        assert viewer.get_entity_schedule_data(room_id, "unknown") == []
+
+    def test_student_lookup_latency_at_25k_students(self, viewer):
+        students = random.Random(3).sample(list(viewer.problem.students), 2_000)
+
+        start = time.perf_counter()
+        for student_id in students:
+            viewer.get_entity_schedule_data(student_id, "student")
+        per_lookup = (time.perf_counter() - start) / len(students)
+
+        assert per_lookup < 0.001
+
+
+class TestCalendarVirtualization:
+    def test_calendar_cells_cover_every_assignment(self, viewer):
+        cells = viewer.processed_data["calendar_cells"]
+        assert sum(len(a) for a in cells.values()) == N_EXAMS
+        assert len(viewer.processed_data["calendar_dates"]) == N_DAYS
+        assert viewer.processed_data["calendar_templates"] == TEMPLATES
+
+    def test_visible_cell_range_only_covers_the_viewport(self):
+        rows, cols = TimetableGUIViewer.visible_cell_range(
+            0, 0, CALENDAR_HEADER_WIDTH + 2 * CALENDAR_CELL_WIDTH, 300, 40, 100
+        )
+        assert cols == range(0, 3)
+        assert rows == range(
+            0, (300 - CALENDAR_HEADER_HEIGHT) // CALENDAR_CELL_HEIGHT + 1
+        )
+
+        rows, cols = TimetableGUIViewer.visible_cell_range(
+            CALENDAR_HEADER_WIDTH + 50 * CALENDAR_CELL_WIDTH,
+            CALENDAR_HEADER_HEIGHT + 38 * CALENDAR_CELL_HEIGHT,
+            CALENDAR_CELL_WIDTH,
+            10 * CALENDAR_CELL_HEIGHT,
+            40,
+            100,
+        )
+        assert cols == range(50, 52)
+        assert rows == range(38, 40)
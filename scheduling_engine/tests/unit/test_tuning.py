@@ -0,0 +1,156 @@
+# scheduling_engine/tests/unit/test_tuning.py
+
+"""
+Tests for offline CP-SAT parameter tuning.
+
+Tiny models are exported, tuned with sub-second budgets and the resulting
+profiles loaded back the way CPSATSolverManager does at solve time.
+"""
+
+import json
+import random
+from types import SimpleNamespace
+
+from ortools.sat import cp_model_pb2
+from ortools.sat.python import cp_model
+
+from scheduling_engine.cp_sat.portfolio import DEFAULT_CONFIG, PortfolioConfig
+from scheduling_engine.cp_sat.solver_manager import CPSATSolverManager
+from scheduling_engine.cp_sat.tuning import (
+    export_model,
+    load_instances,
+    load_tuned_profile,
+    sample_candidates,
+    score_results,
+    size_tier,
+    successive_halving,
+    tune,
+)
+
+
+def _knapsack_model(seed, n=25):
+    rng = random.Random(seed)
+    model = cp_model.CpModel()
+    picked = [model.NewBoolVar(f"exam_{i}") for i in range(n)]
+    model.Add(sum(rng.randint(1, 30) * x for x in picked) <= 150).WithName("cap")
+    model.Maximize(sum(rng.randint(1, 30) * x for x in picked))
+    return model
+
+
+def _problem(exams):
+    return SimpleNamespace(exams=dict.fromkeys(range(exams)))
+
+
+def _candidates():
+    return sample_candidates(4, random.Random(0), max_workers=2)
+
+
+class TestExport:
+    def test_exported_models_are_anonymous_and_grouped(self, tmp_path):
+        export_model(_knapsack_model(0), tmp_path, "small", "phase1")
+        export_model(_knapsack_model(1), tmp_path, "small", "phase1")
+        export_model(_knapsack_model(2), tmp_path, "large", "phase2")
+        (tmp_path / "notes.pb").write_bytes(b"")
+
+        instances = load_instances(tmp_path)
+
+        assert {k: len(v) for k, v in instances.items()} == {
+            ("small", "phase1"): 2,
+            ("large", "phase2"): 1,
+        }
+        proto = cp_model_pb2.CpModelProto()
+        proto.ParseFromString(instances[("large", "phase2")][0].read_bytes())
+        assert len(proto.variables) == 25
+        assert all(not v.name for v in proto.variables)
+        assert all(not c.name for c in proto.constraints)
+
+    def test_size_tiers(self):
+        assert size_tier(_problem(10)) == "small"
+        assert size_tier(_problem(100)) == "medium"
+        assert size_tier(_problem(1999)) == "large"
+        assert size_tier(_problem(5000)) == "xlarge"
+
+
+class TestSearch:
+    def test_candidates_start_with_the_default_and_respect_cores(self):
+        candidates = _candidates()
+
+        assert candidates[0]["use_lns"] is True
+        assert len({json.dumps(c, sort_keys=True) for c in candidates}) == 4
+        assert all(c["num_workers"] <= 2 for c in candidates)
+
+    def test_scores_prefer_better_objectives_then_speed(self):
+        def result(objective, wall_time, status=cp_model.OPTIMAL):
+            return {
+                "status": status,
+                "objective": objective,
+                "sense": -1,
+                "wall_time": wall_time,
+                "time_to_best": wall_time,
+            }
+
+        results = {
+            (0, 0): result(100, 1.0),
+            (1, 0): result(100, 4.0),
+            (2, 0): result(80, 10.0, cp_model.FEASIBLE),
+            (3, 0): result(None, 10.0, cp_model.UNKNOWN),
+        }
+
+        scores = score_results(results, [0, 1, 2, 3], [0], budget=10.0)
+
+        assert scores[0] < scores[1] < scores[2] < scores[3] == 2.0
+
+    def test_successive_halving_narrows_to_one_candidate(self, tmp_path):
+        paths = [
+            export_model(_knapsack_model(seed), tmp_path, "small", "phase1")
+            for seed in range(2)
+        ]
+
+        outcome = successive_halving(
+            paths, _candidates(), min_budget=0.5, eta=2, max_rungs=3, cores=1
+        )
+
+        assert [r["candidates"] for r in outcome.rungs] == [4, 2, 1]
+        assert [r["budget"] for r in outcome.rungs] == [0.5, 1.0, 2.0]
+        assert outcome.parameters in _candidates()
+        assert len(outcome.time_needed) == 2
+
+
+class TestProfiles:
+    def test_tuned_profiles_are_loaded_per_tier(self, tmp_path):
+        instances = tmp_path / "instances"
+        export_model(_knapsack_model(0), instances, "small", "phase1")
+        export_model(_knapsack_model(1), instances, "small", "phase2")
+
+        profiles = tune(instances, candidates=2, min_budget=0.5, eta=2, cores=1)
+        profiles["small"]["phase2"]["parameters"]["not_a_parameter"] = 1
+        path = tmp_path / "profiles.json"
+        path.write_text(json.dumps(profiles))
+
+        profile = load_tuned_profile(path, _problem(20))
+
+        assert profile.tier == "small"
+        assert profile.phase1_time_limit_seconds >= 1
+        assert profile.subproblem_time_limit_seconds >= 1
+        assert "not_a_parameter" not in profile.config_for("phase2").parameters
+        params = cp_model.CpSolver().parameters
+        profile.config_for("phase1").apply(params)
+        assert load_tuned_profile(path, _problem(800)) is None
+        assert load_tuned_profile(tmp_path / "missing.json", _problem(20)) is None
+
+    def test_a_profile_does_not_leak_into_the_next_solve(self):
+        manager = CPSATSolverManager(_problem(20))
+        tuned = PortfolioConfig(
+            "tuned", {"optimize_with_lb_tree_search": True, "num_workers": 1}
+        )
+
+        manager._configure_solver_parameters(10, log_progress=False, config=tuned)
+        assert manager.solver.parameters.optimize_with_lb_tree_search
+        manager._configure_solver_parameters(
+            10, log_progress=False, config=DEFAULT_CONFIG
+        )
+
+        params = manager.solver.parameters
+        assert not params.optimize_with_lb_tree_search
+        assert params.num_workers == 0
+        assert params.max_time_in_seconds == 10
@@ -43,6 +43,7 @@ from .validation import (
     ConstraintViolation,
     ValidationResult,
     SolutionQualityAssessor,
+    SlotOccupancyIndex,
     quick_validate,
     validate_with_report,
 )
@@ -83,6 +84,7 @@ __all__ = [
     "ConstraintViolation",
     "ValidationResult",
     "SolutionQualityAssessor",
+    "SlotOccupancyIndex",
     "quick_validate",
     "validate_with_report",
 ]
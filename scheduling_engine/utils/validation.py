@@ -6,6 +6,7 @@ Provides constraint validation, solution quality assessment, and
 feasibility checking based on constraint programming principles.
 """
 
+import math
 import time
 from typing import Dict, List, Any, Optional, Set, Tuple, DefaultDict, Type
 from dataclasses import dataclass, field
@@ -679,6 +680,306 @@ class SolutionQualityAssessor:
         return 0.5
 
 
+SlotKey = Tuple[Optional[str], Optional[str]]
+
+
+def _minutes(start_time: str) -> int:
+    hours, minutes = start_time.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+class SlotOccupancyIndex:
+    """
+    Occupancy index over one timetable for checking manual edits.
+
+    Keeps student -> slot -> exams, room -> slot -> load and staff -> slot ->
+    exams maps, so that a move or swap is checked against only the students,
+    rooms and staff of the exams involved instead of rescanning every
+    assignment. A slot is the `(exam_date, time_slot_id)` pair.
+
+    An exam longer than a slot is indexed under every slot it runs through, as
+    the engine's `get_occupancy_slots` does: its length in slots is its duration
+    over `base_slot_minutes`, rounded up, counted from its start slot along the
+    day's slots in start-time order. Slots whose start time is unknown hold
+    only the exams starting in them.
+    """
+
+    def __init__(self, base_slot_minutes: int = 180) -> None:
+        self.base_slot_minutes = base_slot_minutes
+        self.exam_slots: Dict[str, SlotKey] = {}
+        self.exam_occupancy: Dict[str, List[SlotKey]] = {}
+        self.exam_durations: Dict[str, int] = {}
+        self.exam_students: Dict[str, Set[str]] = {}
+        self.exam_rooms: Dict[str, Dict[str, int]] = {}
+        self.exam_staff: Dict[str, Set[str]] = {}
+        self.room_capacities: Dict[str, int] = {}
+        # exam_date -> time_slot_ids of that day in start-time order
+        self.day_slots: Dict[Optional[str], List[str]] = {}
+        self.slot_starts: Dict[str, str] = {}
+
+        self.student_slots: DefaultDict[str, DefaultDict[SlotKey, Set[str]]] = (
+            defaultdict(lambda: defaultdict(set))
+        )
+        self.room_slots: DefaultDict[str, DefaultDict[SlotKey, Dict[str, int]]] = (
+            defaultdict(lambda: defaultdict(dict))
+        )
+        self.staff_slots: DefaultDict[str, DefaultDict[SlotKey, Set[str]]] = (
+            defaultdict(lambda: defaultdict(set))
+        )
+
+    @classmethod
+    def from_solution_data(cls, solution_data: Dict[str, Any]) -> "SlotOccupancyIndex":
+        """Builds the index from the same `solution_data` the validators use."""
+        time_slots = solution_data.get("time_slots", [])
+        index = cls(
+            base_slot_minutes=solution_data.get("base_slot_duration_minutes")
+            or next(
+                (
+                    ts["duration_minutes"]
+                    for ts in time_slots
+                    if ts.get("duration_minutes")
+                ),
+                180,
+            )
+        )
+        for room in solution_data.get("rooms", []):
+            index.room_capacities[room["id"]] = room.get(
+                "exam_capacity", room.get("capacity", 0)
+            )
+        slot_starts = {ts["id"]: ts.get("start_time") for ts in time_slots}
+        exam_durations = {
+            e["id"]: e.get("duration_minutes") for e in solution_data.get("exams", [])
+        }
+
+        course_students: DefaultDict[str, Set[str]] = defaultdict(set)
+        for reg in solution_data.get("student_registrations", []):
+            course_students[reg["course_id"]].add(reg["student_id"])
+
+        exam_rooms: DefaultDict[str, Dict[str, int]] = defaultdict(dict)
+        for ra in solution_data.get("room_assignments", []):
+            exam_rooms[ra["exam_id"]][ra["room_id"]] = ra.get("allocated_capacity", 0)
+
+        exam_staff: DefaultDict[str, Set[str]] = defaultdict(set)
+        for sa in solution_data.get("staff_assignments", []):
+            exam_staff[sa["exam_id"]].add(sa["staff_id"])
+
+        assignments = solution_data.get("exam_assignments", [])
+        # Every slot must be known before any exam is placed across slots.
+        for ts in time_slots:
+            exam_date = ts.get("exam_date") or ts.get("date")
+            if exam_date:
+                index.add_slot((exam_date, ts["id"]), ts.get("start_time"))
+        for assignment in assignments:
+            slot_id = assignment.get("time_slot_id")
+            index.add_slot(
+                (assignment.get("exam_date"), slot_id), slot_starts.get(slot_id)
+            )
+        for assignment in assignments:
+            exam_id = assignment["exam_id"]
+            index.place(
+                exam_id,
+                (assignment.get("exam_date"), assignment.get("time_slot_id")),
+                students=course_students.get(assignment.get("course_id"), set()),
+                rooms=exam_rooms.get(exam_id, {}),
+                staff=exam_staff.get(exam_id, set()),
+                duration_minutes=exam_durations.get(exam_id),
+            )
+        return index
+
+    # --- Slots ---
+
+    def add_slot(self, slot: SlotKey, start_time: Optional[Any] = None) -> None:
+        """Registers a slot of a day, keeping each day's slots in start-time order."""
+        exam_date, slot_id = slot
+        if slot_id is None or start_time is None:
+            return
+        self.slot_starts.setdefault(slot_id, str(start_time))
+        day = self.day_slots.setdefault(exam_date, [])
+        if slot_id not in day:
+            day.append(slot_id)
+            day.sort(key=lambda s: (self.slot_starts[s], s))
+
+    def shortest_slot_gap(self) -> Optional[int]:
+        """Minutes between the closest consecutive slot starts of any day."""
+        gaps = []
+        for day in self.day_slots.values():
+            starts = [_minutes(self.slot_starts[s]) for s in day]
+            gaps.extend(b - a for a, b in zip(starts, starts[1:]) if b > a)
+        return min(gaps, default=None)
+
+    def duration_in_slots(self, exam_id: str) -> int:
+        minutes = self.exam_durations.get(exam_id)
+        if not minutes or self.base_slot_minutes <= 0:
+            return 1
+        return math.ceil(minutes / self.base_slot_minutes)
+
+    def occupied_slots(self, exam_id: str, slot: SlotKey) -> List[SlotKey]:
+        """The slots an exam starting in `slot` runs through."""
+        exam_date, slot_id = slot
+        day = self.day_slots.get(exam_date, [])
+        if slot_id not in day:
+            return [slot]
+        first = day.index(slot_id)
+        return [
+            (exam_date, s) for s in day[first : first + self.duration_in_slots(exam_id)]
+        ]
+
+    # --- Maintenance ---
+
+    def place(
+        self,
+        exam_id: str,
+        slot: SlotKey,
+        students: Optional[Set[str]] = None,
+        rooms: Optional[Dict[str, int]] = None,
+        staff: Optional[Set[str]] = None,
+        duration_minutes: Optional[int] = None,
+    ) -> None:
+        """Places an exam in a slot; omitted entity sets keep their current value."""
+        self.remove(exam_id)
+        if students is not None:
+            self.exam_students[exam_id] = set(students)
+        if rooms is not None:
+            self.exam_rooms[exam_id] = dict(rooms)
+        if staff is not None:
+            self.exam_staff[exam_id] = set(staff)
+        if duration_minutes is not None:
+            self.exam_durations[exam_id] = duration_minutes
+        self.exam_slots[exam_id] = slot
+        occupied = self.occupied_slots(exam_id, slot)
+        self.exam_occupancy[exam_id] = occupied
+
+        for held in occupied:
+            for student_id in self.exam_students.get(exam_id, ()):
+                self.student_slots[student_id][held].add(exam_id)
+            for room_id, allocated in self.exam_rooms.get(exam_id, {}).items():
+                self.room_slots[room_id][held][exam_id] = allocated
+            for staff_id in self.exam_staff.get(exam_id, ()):
+                self.staff_slots[staff_id][held].add(exam_id)
+
+    def remove(self, exam_id: str) -> None:
+        """Takes an exam out of its slots, keeping its entity sets."""
+        self.exam_slots.pop(exam_id, None)
+        for held in self.exam_occupancy.pop(exam_id, ()):
+            for student_id in self.exam_students.get(exam_id, ()):
+                self.student_slots[student_id][held].discard(exam_id)
+            for room_id in self.exam_rooms.get(exam_id, {}):
+                self.room_slots[room_id][held].pop(exam_id, None)
+            for staff_id in self.exam_staff.get(exam_id, ()):
+                self.staff_slots[staff_id][held].discard(exam_id)
+
+    def apply_move(
+        self, exam_id: str, slot: SlotKey, rooms: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Records an accepted move."""
+        self.place(exam_id, slot, rooms=rooms)
+
+    # --- Checks ---
+
+    def check_move(
+        self,
+        exam_id: str,
+        slot: SlotKey,
+        rooms: Optional[Dict[str, int]] = None,
+        ignore: Tuple[str, ...] = (),
+    ) -> List[ConstraintViolation]:
+        """
+        Returns the violations an exam would cause in `slot` (and `rooms`, if
+        given) against every other exam except those in `ignore`, over every
+        slot the exam would run through.
+        """
+        ignored = {exam_id, *ignore}
+        rooms = self.exam_rooms.get(exam_id, {}) if rooms is None else rooms
+        occupied = self.occupied_slots(exam_id, slot)
+        violations: List[ConstraintViolation] = []
+
+        clashes: DefaultDict[str, Set[str]] = defaultdict(set)
+        for student_id in self.exam_students.get(exam_id, ()):
+            slots = self.student_slots.get(student_id)
+            if not slots:
+                continue
+            for held in occupied:
+                for other in slots.get(held, ()):
+                    if other not in ignored:
+                        clashes[other].add(student_id)
+        for other, students in clashes.items():
+            violations.append(
+                ConstraintViolation(
+                    violation_type=ViolationType.STUDENT_CONFLICT,
+                    constraint_type=ConstraintType.HARD,
+                    severity=1.0,
+                    entities_involved=[exam_id, other, *sorted(students)],
+                    description=f"Exam {exam_id} clashes with exam {other} for {len(students)} student(s)",
+                    suggested_fix="Choose a slot where these students are free",
+                    metadata={
+                        "conflicting_exam_id": other,
+                        "student_count": len(students),
+                    },
+                )
+            )
+
+        for room_id, allocated in rooms.items():
+            # The busiest of the slots the exam would hold the room for.
+            load, sharing = allocated, {}
+            for held in occupied:
+                occupants = self.room_slots.get(room_id, {}).get(held, {})
+                others = {e: n for e, n in occupants.items() if e not in ignored}
+                if allocated + sum(others.values()) > load:
+                    load, sharing = allocated + sum(others.values()), others
+            capacity = self.room_capacities.get(room_id)
+            if capacity is not None and load > capacity:
+                violations.append(
+                    ConstraintViolation(
+                        violation_type=ViolationType.ROOM_CAPACITY,
+                        constraint_type=ConstraintType.HARD,
+                        severity=0.9,
+                        entities_involved=[exam_id, room_id, *sharing],
+                        description=f"Room {room_id} would seat {load} students against a capacity of {capacity}",
+                        suggested_fix="Use another room or a slot where the room is free",
+                        metadata={
+                            "room_id": room_id,
+                            "load": load,
+                            "capacity": capacity,
+                        },
+                    )
+                )
+
+        for staff_id in self.exam_staff.get(exam_id, ()):
+            staff_slots = self.staff_slots.get(staff_id, {})
+            others = list(
+                dict.fromkeys(
+                    e
+                    for held in occupied
+                    for e in staff_slots.get(held, ())
+                    if e not in ignored
+                    and not set(self.exam_rooms.get(e, {})) & set(rooms)
+                )
+            )
+            if others:
+                violations.append(
+                    ConstraintViolation(
+                        violation_type=ViolationType.STAFF_AVAILABILITY,
+                        constraint_type=ConstraintType.HARD,
+                        severity=1.0,
+                        entities_involved=[staff_id, exam_id, *others],
+                        description=f"Staff {staff_id} is already invigilating in another room at that time",
+                        suggested_fix="Reassign the invigilator or choose another slot",
+                        metadata={"staff_id": staff_id, "conflicting_exam_ids": others},
+                    )
+                )
+
+        return violations
+
+    def check_swap(self, exam_a: str, exam_b: str) -> List[ConstraintViolation]:
+        """Returns the violations caused by exchanging the slots of two exams."""
+        slot_a, slot_b = self.exam_slots.get(exam_a), self.exam_slots.get(exam_b)
+        if slot_a is None or slot_b is None:
+            raise KeyError("Both exams must be placed to be swapped.")
+        return self.check_move(exam_a, slot_b, ignore=(exam_b,)) + self.check_move(
+            exam_b, slot_a, ignore=(exam_a,)
+        )
+
+
 class ComprehensiveSolutionValidator:
     """
     Main validation engine that coordinates all constraint validators
@@ -799,12 +1100,24 @@ class ComprehensiveSolutionValidator:
         return result
 
     def validate_incremental_change(
-        self, solution_data: Dict[str, Any], change_description: Dict[str, Any]
+        self,
+        solution_data: Dict[str, Any],
+        change_description: Dict[str, Any],
+        occupancy_index: Optional[SlotOccupancyIndex] = None,
     ) -> ValidationResult:
         """
         Validate only the constraints affected by an incremental change
         for efficient re-validation after modifications.
+
+        Moves and swaps ("exam_move" / "exam_swap") are checked through a
+        SlotOccupancyIndex against only the affected students, rooms and
+        staff; pass a long-lived index to avoid rebuilding it per change.
         """
+        if change_description.get("change_type") in ("exam_move", "exam_swap"):
+            return self._validate_indexed_change(
+                solution_data, change_description, occupancy_index
+            )
+
         # Identify affected validators based on change type
         affected_validators = self._identify_affected_validators(change_description)
 
@@ -825,6 +1138,50 @@ class ComprehensiveSolutionValidator:
             # Restore all validators
             self.validators = all_validators
 
+    def _validate_indexed_change(
+        self,
+        solution_data: Dict[str, Any],
+        change_description: Dict[str, Any],
+        occupancy_index: Optional[SlotOccupancyIndex],
+    ) -> ValidationResult:
+        """Checks a single move or swap against the occupancy index."""
+        start_time = time.time()
+        index = occupancy_index or SlotOccupancyIndex.from_solution_data(solution_data)
+        exam_id = change_description["exam_id"]
+
+        if change_description["change_type"] == "exam_swap":
+            violations = index.check_swap(
+                exam_id, change_description["swap_with_exam_id"]
+            )
+        else:
+            violations = index.check_move(
+                exam_id,
+                (
+                    change_description.get("exam_date"),
+                    change_description.get("time_slot_id"),
+                ),
+                rooms=change_description.get("rooms"),
+            )
+
+        is_feasible = not any(
+            v.constraint_type == ConstraintType.HARD for v in violations
+        )
+        critical_violations = len([v for v in violations if v.severity > 0.8])
+        return ValidationResult(
+            is_valid=is_feasible and critical_violations == 0,
+            is_feasible=is_feasible,
+            validation_level=self.validation_level,
+            total_violations=len(violations),
+            critical_violations=critical_violations,
+            violations=violations,
+            performance_metrics={
+                "total_validation_time": time.time() - start_time,
+                "incremental_validation": True,
+                "indexed_validation": True,
+            },
+            validation_timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
     def _identify_affected_validators(
         self, change_description: Dict[str, Any]
     ) -> List[ConstraintValidator]: